@@ -11,10 +11,13 @@ import warnings
 from agno.os import AgentOS
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from hive import __version__
 from hive.config import settings
 from hive.discovery import discover_agents, discover_teams, discover_workflows
+from hive.knowledge.metrics import ingest_metrics
+from hive.knowledge.readiness import readiness
 
 # Suppress AgentOS route conflict warnings (expected behavior when merging routes)
 warnings.filterwarnings("ignore", message=".*Route conflict detected.*")
@@ -72,6 +75,20 @@ def create_app() -> FastAPI:
     # We let AgentOS handle those to avoid route conflicts
     # (The warning about route conflicts is expected and harmless)
 
+    @base_app.get("/ready", tags=["Health"])
+    def ready() -> JSONResponse:
+        """Readiness probe: 503 until every background knowledge load has finished."""
+        report = readiness()
+        return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+    # AgentOS serves its own usage metrics at /metrics and overrides conflicting routes
+    if config.hive_enable_metrics:
+
+        @base_app.get("/knowledge/metrics", tags=["Health"])
+        def metrics() -> JSONResponse:
+            """Knowledge ingestion metrics: per-phase timings, rows/sec, tokens and batches per table."""
+            return JSONResponse(ingest_metrics())
+
     # Initialize AgentOS with agents and base app
     # AgentOS will auto-generate:
     # - POST /agents/{agent_id}/runs
@@ -7,6 +7,7 @@ from .create import create_app
 from .create_ai import create_agent_with_ai
 from .dev import dev_command, serve_command
 from .init import init_app
+from .knowledge import knowledge_app
 from .version import version_app
 
 # Create main app
@@ -22,6 +23,7 @@ app = typer.Typer(
 app.add_typer(init_app, name="init", help="Initialize a new Hive project")
 app.add_typer(create_app, name="create", help="Create agents, teams, workflows, or tools (templates)")
 app.add_typer(version_app, name="version", help="Show version information")
+app.add_typer(knowledge_app, name="knowledge", help="Plan, ingest and check knowledge sources; export/import snapshots")
 
 # Add dev and serve as direct commands (not subcommands)
 app.command(name="dev", help="Start development server with hot reload")(dev_command)
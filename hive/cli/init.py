@@ -270,6 +270,14 @@ tools:
 knowledge:
   csv_path: "data/csv"
   auto_reload: true
+  search:
+    type: "hybrid"
+    distance: "cosine"
+    vector_score_weight: 0.5
+    hnsw:
+      m: 16
+      ef_construction: 200
+      ef_search: 40
 """
     (project_path / "hive.yaml").write_text(hive_config)
 
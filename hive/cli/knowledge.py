@@ -0,0 +1,333 @@
+"""Knowledge commands - Plan, ingest and inspect knowledge sources; export and import snapshots."""
+
+import os
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import typer
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn, TimeRemainingColumn
+from rich.table import Table
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from hive.config.defaults import CLI_EMOJIS
+
+knowledge_app = typer.Typer()
+console = Console()
+
+# create_knowledge_base arguments that only affect the Knowledge wrapper, not loading
+_KNOWLEDGE_ONLY_ARGS = (
+    "num_documents",
+    "hot_reload",
+    "debounce_delay",
+    "use_shared",
+    "context",
+    "background_load",
+    "coordination",
+    "maintenance",
+    "read_replicas",
+    "keyword_index",
+)
+
+
+def _engine(db_url: str | None) -> Engine:
+    """Create an engine for the given URL or HIVE_DATABASE_URL."""
+    url = db_url or os.getenv("HIVE_DATABASE_URL")
+    if not url:
+        console.print(f"\n{CLI_EMOJIS['error']} HIVE_DATABASE_URL not set. Pass --db-url or set it in .env\n")
+        raise typer.Exit(1)
+    return create_engine(url)
+
+
+def _show_tables(manifest: dict[str, Any], title: str) -> None:
+    """Print the tables of a snapshot manifest."""
+    table = Table(title=title, show_header=True, header_style="bold cyan")
+    table.add_column("Table", style="cyan")
+    table.add_column("Rows", justify="right", style="green")
+    table.add_column("Vectors", style="dim")
+    for spec in manifest["tables"]:
+        name = f"{spec['schema']}.{spec['name']}" if spec["schema"] else spec["name"]
+        table.add_row(name, str(spec["rows"]), ", ".join(spec.get("vectors", {})) or "-")
+    console.print(table)
+
+
+@knowledge_app.command("export")
+def export_command(
+    path: Path = typer.Argument(..., help="Snapshot directory to write"),
+    table: str = typer.Option("knowledge_base", "--table", "-t", help="Knowledge table name"),
+    schema: str = typer.Option("agno", "--schema", help="Schema of the knowledge table"),
+    db_url: str | None = typer.Option(None, "--db-url", help="Database URL (defaults to HIVE_DATABASE_URL)"),
+):
+    """Export embeddings and change-detection state to a snapshot directory."""
+    from hive.knowledge.snapshot import export_snapshot
+
+    engine = _engine(db_url)
+    try:
+        manifest = export_snapshot(engine, table, path, schema=schema)
+    except (ImportError, ValueError) as e:
+        console.print(f"\n{CLI_EMOJIS['error']} {e}\n")
+        raise typer.Exit(1) from e
+
+    _show_tables(manifest, f"{CLI_EMOJIS['database']} Exported {table}")
+    console.print(f"\n{CLI_EMOJIS['success']} Snapshot written to [cyan]{path}[/cyan]\n")
+
+
+@knowledge_app.command("import")
+def import_command(
+    path: Path = typer.Argument(..., help="Snapshot directory written by 'hive knowledge export'"),
+    replace: bool = typer.Option(False, "--replace", help="Drop existing tables of the knowledge base first"),
+    db_url: str | None = typer.Option(None, "--db-url", help="Database URL (defaults to HIVE_DATABASE_URL)"),
+):
+    """Bulk-load a snapshot so a new node starts without re-embedding."""
+    from hive.knowledge.snapshot import import_snapshot
+
+    engine = _engine(db_url)
+    try:
+        manifest = import_snapshot(engine, path, replace=replace)
+    except (FileNotFoundError, ImportError, ValueError) as e:
+        console.print(f"\n{CLI_EMOJIS['error']} {e}\n")
+        raise typer.Exit(1) from e
+
+    _show_tables(manifest, f"{CLI_EMOJIS['database']} Imported {manifest['table']}")
+    console.print(
+        f"\n{CLI_EMOJIS['success']} Snapshot loaded. The next knowledge load only embeds rows changed since "
+        f"{manifest['created_at']}\n"
+    )
+
+
+def _sources(name: str | None) -> dict[str, dict[str, Any]]:
+    """Knowledge sources of the current project, optionally narrowed to one."""
+    from hive.knowledge.config import discover_knowledge_sources
+
+    sources = discover_knowledge_sources()
+    if not sources:
+        console.print(
+            f"\n{CLI_EMOJIS['error']} No knowledge sources found. Configure [yellow]knowledge:[/yellow] "
+            "in hive.yaml or an agent config.yaml\n"
+        )
+        raise typer.Exit(1)
+    if name is None:
+        return sources
+    matches = {key: config for key, config in sources.items() if name in key.split(", ")}
+    if not matches:
+        console.print(f"\n{CLI_EMOJIS['error']} Unknown knowledge source '{name}'. Available: {', '.join(sources)}\n")
+        raise typer.Exit(1)
+    return matches
+
+
+def _loader(config: dict[str, Any]) -> tuple[Any, Path, str]:
+    """Build the loader of a source; returns the loader, source path and embedder."""
+    from hive.knowledge.config import knowledge_kwargs
+    from hive.knowledge.knowledge import create_loader
+
+    kwargs = knowledge_kwargs(config)
+    for key in _KNOWLEDGE_ONLY_ARGS:
+        kwargs.pop(key, None)
+    loader, path = create_loader(**kwargs)
+    return loader, path, kwargs.get("embedder", "text-embedding-3-small")
+
+
+def _plan(loader: Any, path: Path, full: bool) -> Any | None:
+    """Plan a load, or None for sources that are synced without a plan (folders, tables)."""
+    planner = getattr(loader, "plan", None)
+    if planner is None:
+        return None
+    try:
+        return planner(path, force_full=full)
+    except NotImplementedError:
+        return None
+
+
+@knowledge_app.command("plan")
+def plan_command(
+    name: str | None = typer.Argument(None, help="Source to plan (agent name or 'project'; default: all)"),
+    full: bool = typer.Option(False, "--full", help="Plan a full reload instead of an incremental one"),
+):
+    """Show what the next ingest would embed, with token, time and cost estimates (dry run)."""
+    from hive.knowledge.ingest import estimate_plan, format_duration
+
+    table = Table(title=f"{CLI_EMOJIS['database']} Knowledge plan", show_header=True, header_style="bold cyan")
+    for column in ("Source", "Mode", "Added", "Changed", "Deleted", "Documents", "Tokens", "Est. time", "Est. cost"):
+        table.add_column(column, justify="left" if column in ("Source", "Mode") else "right")
+
+    for source, config in _sources(name).items():
+        try:
+            loader, path, embedder = _loader(config)
+            plan = _plan(loader, path, full)
+            if plan is None:
+                pending = loader.pending(path)
+                table.add_row(source, str(config.get("type")), "-", "-", "-", f"{pending} pending", "-", "-", "-")
+                continue
+            estimate = estimate_plan(plan, embedder, loader.incremental_loader.throughput())
+        except Exception as e:
+            table.add_row(source, "[red]error[/red]", *["-"] * 6, f"[red]{e}[/red]")
+            continue
+        cost = f"${estimate.cost:.4f}" if estimate.cost is not None else "-"
+        duration = format_duration(estimate.seconds) + ("" if estimate.measured else "*")
+        table.add_row(
+            source,
+            plan.mode,
+            str(len(plan.added)),
+            str(len(plan.changed)),
+            str(len(plan.deleted)),
+            str(estimate.documents),
+            f"{estimate.tokens:,}",
+            duration,
+            cost,
+        )
+
+    console.print(table)
+    console.print("[dim]* default throughput; measured after the first ingest[/dim]\n")
+
+
+@knowledge_app.command("ingest")
+def ingest_command(
+    name: str | None = typer.Argument(None, help="Source to ingest (agent name or 'project'; default: all)"),
+    full: bool = typer.Option(False, "--full", help="Re-embed everything instead of only changes"),
+):
+    """Load knowledge sources with a live progress bar and per-phase timings."""
+    from hive.knowledge.ingest import format_duration
+
+    failed = False
+    for source, config in _sources(name).items():
+        console.print(f"\n{CLI_EMOJIS['database']} [bold cyan]{source}[/bold cyan]")
+        try:
+            loader, path, _ = _loader(config)
+            timings: dict[str, float] = {}
+            plan = _plan(loader, path, full)
+            if plan is None:
+                started = time.perf_counter()
+                with console.status("Syncing..."):
+                    stats = loader.load(path, force_full=full)
+                timings["load"] = time.perf_counter() - started
+            elif plan.is_noop:
+                console.print(f"{CLI_EMOJIS['success']} Up to date")
+                continue
+            else:
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    BarColumn(),
+                    MofNCompleteColumn(),
+                    TimeRemainingColumn(),
+                    console=console,
+                ) as progress:
+                    task = progress.add_task(f"Embedding ({plan.mode})", total=len(plan.documents))
+                    stats = {"mode": plan.mode, **loader.apply(plan, partial(progress.advance, task))}
+                timings.update(plan.timings)
+
+            # Same index step as create_knowledge_base; no-op when the indexes exist
+            started = time.perf_counter()
+            loader.vector_db.optimize()
+            timings["index"] = time.perf_counter() - started
+        except Exception as e:
+            console.print(f"{CLI_EMOJIS['error']} {e}")
+            failed = True
+            continue
+
+        console.print(f"{CLI_EMOJIS['success']} " + ", ".join(f"{key}: {value}" for key, value in stats.items()))
+        phases = Table(show_header=True, header_style="bold cyan", box=None)
+        phases.add_column("Phase", style="cyan")
+        phases.add_column("Time", justify="right", style="green")
+        for phase, seconds in timings.items():
+            phases.add_row(phase, format_duration(seconds) if seconds >= 1 else f"{seconds * 1000:.0f}ms")
+        console.print(phases)
+
+    if failed:
+        raise typer.Exit(1)
+
+
+@knowledge_app.command("status")
+def status_command(
+    name: str | None = typer.Argument(None, help="Source to check (agent name or 'project'; default: all)"),
+):
+    """Show per-source freshness: last sync and changes waiting to be ingested."""
+    table = Table(title=f"{CLI_EMOJIS['database']} Knowledge status", show_header=True, header_style="bold cyan")
+    for column in ("Source", "Type", "Table", "Last synced", "Pending", "State"):
+        table.add_column(column)
+
+    for source, config in _sources(name).items():
+        kb_type = str(config.get("type"))
+        try:
+            loader, path, _ = _loader(config)
+            synced = loader.last_synced()
+            pending = loader.pending(path)
+        except Exception as e:
+            table.add_row(source, kb_type, "-", "-", "-", f"[red]error: {e}[/red]")
+            continue
+        if synced is None:
+            state = "[yellow]not loaded[/yellow]"
+        elif pending:
+            state = "[yellow]stale[/yellow]"
+        else:
+            state = "[green]fresh[/green]"
+        unit = "files" if kb_type == "documents" else "rows"
+        table.add_row(
+            source,
+            kb_type,
+            loader.vector_db.table_name,
+            synced.strftime("%Y-%m-%d %H:%M:%S") if synced else "never",
+            f"{pending} {unit}",
+            state,
+        )
+
+    console.print(table)
+
+
+def _size(num_bytes: int) -> str:
+    """Human-readable byte count."""
+    size = float(num_bytes)
+    for unit in ("B", "kB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+@knowledge_app.command("health")
+def health_command(
+    name: str | None = typer.Argument(None, help="Source to check (agent name or 'project'; default: all)"),
+    run: bool = typer.Option(False, "--run", help="Vacuum and rebuild tables that are due now, ignoring the window"),
+):
+    """Show dead tuples, estimated bloat, index sizes and churn per knowledge table."""
+    from hive.knowledge.config import MaintenanceConfig
+    from hive.knowledge.maintenance import IndexMaintainer, knowledge_tables
+
+    table = Table(title=f"{CLI_EMOJIS['database']} Knowledge health", show_header=True, header_style="bold cyan")
+    for column in ("Source", "Table", "Rows", "Dead", "Bloat", "Indexes", "Churn", "Due"):
+        table.add_column(column, justify="left" if column in ("Source", "Table", "Due") else "right")
+
+    for source, config in _sources(name).items():
+        maintenance = MaintenanceConfig.from_dict(config.get("maintenance")) or MaintenanceConfig()
+        try:
+            loader, _, _ = _loader(config)
+            stores = knowledge_tables(loader.vector_db)
+        except Exception as e:
+            table.add_row(source, "-", *["-"] * 5, f"[red]error: {e}[/red]")
+            continue
+        for store in stores:
+            maintainer = IndexMaintainer(store)
+            try:
+                health = maintainer.health()
+                due = health.due(maintenance.vacuum_threshold, maintenance.reindex_threshold)
+                if run and due:
+                    maintainer.maintain(maintenance.vacuum_threshold, maintenance.reindex_threshold)
+                    due = [f"[green]{action} done[/green]" for action in due]
+            except Exception as e:
+                table.add_row(source, store.table_name, *["-"] * 5, f"[red]error: {e}[/red]")
+                continue
+            table.add_row(
+                source,
+                store.table_name,
+                f"{health.live_rows:,}",
+                f"{health.dead_rows:,} ({health.dead_ratio:.0%})",
+                _size(health.bloat_bytes),
+                _size(sum(health.index_bytes.values())),
+                f"{health.churn_ratio:.0%}",
+                ", ".join(due) or "[green]-[/green]",
+            )
+
+    console.print(table)
@@ -0,0 +1,535 @@
+"""
+Recall/latency benchmark harness for knowledge search settings.
+
+Sweeps search type, distance, HNSW parameters and hybrid weighting over a
+labelled query set and reports recall@k against p50/p99 search latency.
+Storage variants (reduced dimensions, halfvec/binary quantization) can be
+swept alongside and compared with the default float32 storage for index
+size and latency via ``storage_savings()``.
+
+Index-time parameters (distance, m, ef_construction) need their own table,
+so configs are grouped by index and each group is loaded once. Query-time
+parameters (search type, ef_search, hybrid weight) are swept on the same
+table without re-embedding.
+
+Labelled query CSV format (relevant = ``;``-separated row ids or document names):
+
+    query,relevant
+    How do I reset my password?,3
+    Refund policy for annual plans,12;13
+
+Usage:
+    from hive.knowledge.benchmark import load_labelled_queries, run_benchmark, sweep_grid, format_results
+
+    queries = load_labelled_queries("data/eval/queries.csv")
+    configs = sweep_grid(search_types=["vector", "hybrid"], hnsw_ef_search=[10, 40, 100])
+    results = run_benchmark("data/csv/faq.csv", queries, configs, k=5)
+    print(format_results(results))
+
+Concurrency (event-loop lag and throughput of the search path under 50-200
+concurrent retrieval-heavy requests, per search mode):
+
+    from hive.knowledge.benchmark import format_concurrency_results, run_concurrency_benchmark
+
+    results = run_concurrency_benchmark(kb.vector_db, [q.query for q in queries], levels=(50, 100, 200))
+    print(format_concurrency_results(results))
+
+Modes: ``blocking`` (sync search called on the loop), ``thread`` (agno's
+``async_search``: the sync search in ``asyncio.to_thread``) and ``async``
+(``HivePgVector.async_search`` on the pooled async engine).
+"""
+
+import asyncio
+import itertools
+import math
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+from agno.knowledge.document import Document
+from loguru import logger
+
+from hive.knowledge.config import SearchConfig, StorageConfig
+
+
+@dataclass
+class LabelledQuery:
+    """A query with the document names that count as relevant hits."""
+
+    query: str
+    relevant: set[str]
+
+
+@dataclass
+class BenchmarkResult:
+    """Recall and latency for one search configuration."""
+
+    config: SearchConfig
+    k: int
+    queries: int
+    recall_at_k: float
+    p50_ms: float
+    p99_ms: float
+    storage: StorageConfig = field(default_factory=StorageConfig)
+    index_bytes: int = 0
+
+
+def _document_key(label: str) -> str:
+    """Normalize a relevance label (row id or document name) to a document name."""
+    label = label.strip()
+    return f"csv_row_{label}" if label.isdigit() else label
+
+
+def load_labelled_queries(path: str | Path) -> list[LabelledQuery]:
+    """
+    Load a labelled query set from CSV.
+
+    Args:
+        path: CSV with ``query`` and ``relevant`` columns
+
+    Returns:
+        List of labelled queries
+    """
+    df = pd.read_csv(path)
+    missing = {"query", "relevant"} - set(df.columns)
+    if missing:
+        raise ValueError(f"Labelled query CSV missing columns: {sorted(missing)}")
+
+    queries = []
+    for _, row in df.iterrows():
+        labels = [_document_key(label) for label in str(row["relevant"]).split(";") if label.strip()]
+        queries.append(LabelledQuery(query=str(row["query"]), relevant=set(labels)))
+    return queries
+
+
+def recall_at_k(retrieved: Sequence[str], relevant: set[str], k: int) -> float:
+    """
+    Fraction of relevant documents present in the top-k results.
+
+    Args:
+        retrieved: Retrieved document names in rank order
+        relevant: Relevant document names
+        k: Cutoff
+
+    Returns:
+        Recall in [0, 1] (1.0 when nothing is relevant)
+    """
+    if not relevant:
+        return 1.0
+    return len(set(retrieved[:k]) & relevant) / len(relevant)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Samples
+        pct: Percentile in [0, 100]
+
+    Returns:
+        Percentile value (0.0 for no samples)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def evaluate(
+    search: Callable[[str, int], list[Document]],
+    queries: Sequence[LabelledQuery],
+    k: int = 5,
+    warmup: int = 1,
+) -> tuple[float, float, float]:
+    """
+    Measure mean recall@k and p50/p99 latency of a search function.
+
+    Args:
+        search: Callable taking (query, limit) and returning documents
+        queries: Labelled queries
+        k: Recall cutoff and search limit
+        warmup: Queries to run untimed first (connection setup, caches)
+
+    Returns:
+        Tuple of (recall@k, p50 ms, p99 ms)
+    """
+    for labelled in queries[:warmup]:
+        search(labelled.query, k)
+
+    recalls: list[float] = []
+    latencies: list[float] = []
+    for labelled in queries:
+        start = time.perf_counter()
+        docs = search(labelled.query, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(recall_at_k([doc.name or "" for doc in docs], labelled.relevant, k))
+
+    recall = sum(recalls) / len(recalls) if recalls else 0.0
+    return recall, percentile(latencies, 50), percentile(latencies, 99)
+
+
+def sweep_grid(
+    search_types: Sequence[str] = ("hybrid",),
+    distances: Sequence[str] = ("cosine",),
+    hnsw_m: Sequence[int] = (16,),
+    hnsw_ef_construction: Sequence[int] = (200,),
+    hnsw_ef_search: Sequence[int] = (5,),
+    vector_score_weights: Sequence[float] = (0.5,),
+) -> list[SearchConfig]:
+    """
+    Build the cartesian product of search settings.
+
+    The hybrid weight only applies to hybrid search, so other search types
+    get a single config per combination instead of one per weight.
+
+    Returns:
+        List of distinct search configs
+    """
+    configs: list[SearchConfig] = []
+    seen: set[tuple[Any, ...]] = set()
+    for search_type, distance, m, efc, efs, weight in itertools.product(
+        search_types, distances, hnsw_m, hnsw_ef_construction, hnsw_ef_search, vector_score_weights
+    ):
+        config = SearchConfig(
+            search_type=search_type,  # type: ignore[arg-type]
+            distance=distance,  # type: ignore[arg-type]
+            vector_score_weight=weight if search_type == "hybrid" else 0.5,
+            hnsw_m=m,
+            hnsw_ef_construction=efc,
+            hnsw_ef_search=efs,
+        )
+        key = (config.search_type, config.index_key, config.hnsw_ef_search, config.vector_score_weight)
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+    return configs
+
+
+def run_benchmark(
+    csv_path: str | Path,
+    queries: Sequence[LabelledQuery],
+    configs: Sequence[SearchConfig],
+    k: int = 5,
+    table_prefix: str = "knowledge_bench",
+    storages: Sequence[StorageConfig] = (StorageConfig(),),
+    **kb_kwargs: Any,
+) -> list[BenchmarkResult]:
+    """
+    Load the CSV once per index variant and evaluate every config against it.
+
+    Args:
+        csv_path: Knowledge CSV to benchmark
+        queries: Labelled queries
+        configs: Search configs to evaluate
+        k: Recall cutoff and search limit
+        table_prefix: Prefix for the benchmark tables (one per index variant)
+        storages: Storage variants to compare (include StorageConfig() as the baseline)
+        **kb_kwargs: Extra create_knowledge_base arguments (embedder, content_column, ...)
+
+    Returns:
+        One result per (storage, config) pair, storages outermost, configs in input order
+    """
+    from hive.knowledge.knowledge import create_knowledge_base
+    from hive.knowledge.quantized import storage_report
+
+    groups: dict[tuple[Any, ...], list[tuple[StorageConfig, SearchConfig]]] = {}
+    for storage in storages:
+        for config in configs:
+            key = (storage.dimensions, storage.quantization, *config.index_key)
+            groups.setdefault(key, []).append((storage, config))
+
+    results: dict[tuple[int, int], BenchmarkResult] = {}
+    for group_index, group in enumerate(groups.values()):
+        kb = create_knowledge_base(
+            csv_path=csv_path,
+            table_name=f"{table_prefix}_{group_index}",
+            use_shared=False,
+            search=group[0][1],
+            storage=group[0][0],
+            **kb_kwargs,
+        )
+        vector_db: Any = kb.vector_db
+        index_bytes = storage_report(vector_db)["index_bytes"]
+
+        def search(query: str, limit: int) -> list[Document]:
+            return vector_db.search(query=query, limit=limit)  # noqa: B023
+
+        for storage, config in group:
+            # Query-time parameters: no rebuild needed
+            vector_db.search_type = config.search_type
+            vector_db.vector_score_weight = config.vector_score_weight
+            vector_db.vector_index.ef_search = config.hnsw_ef_search
+            if storage.is_quantized:
+                vector_db.rerank_candidates = storage.rerank_candidates
+
+            recall, p50, p99 = evaluate(search, queries, k)
+            results[(id(storage), id(config))] = BenchmarkResult(
+                config=config,
+                k=k,
+                queries=len(queries),
+                recall_at_k=recall,
+                p50_ms=p50,
+                p99_ms=p99,
+                storage=storage,
+                index_bytes=index_bytes,
+            )
+            logger.info(
+                "Benchmark config complete",
+                config=config.label(),
+                storage=storage.label(),
+                recall=recall,
+                p50_ms=p50,
+                p99_ms=p99,
+                index_bytes=index_bytes,
+            )
+
+    return [results[(id(storage), id(config))] for storage in storages for config in configs]
+
+
+def format_results(results: Sequence[BenchmarkResult]) -> str:
+    """
+    Render results as a plain-text table sorted by recall, then p99 latency.
+
+    Args:
+        results: Benchmark results
+
+    Returns:
+        Table string
+    """
+    rows = sorted(results, key=lambda r: (-r.recall_at_k, r.p99_ms))
+    header = f"{'config':<60} {'storage':<28} {'index MB':>9} {'recall@k':>9} {'p50 ms':>9} {'p99 ms':>9}"
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r.config.label():<60} {r.storage.label():<28} {r.index_bytes / 1e6:>9.1f} "
+            f"{r.recall_at_k:>9.3f} {r.p50_ms:>9.2f} {r.p99_ms:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def storage_savings(results: Sequence[BenchmarkResult]) -> list[dict[str, Any]]:
+    """
+    Compare each storage variant against the default float32 storage.
+
+    Results are matched on identical search configs; a variant is reported
+    only when the baseline (``StorageConfig()``) was part of the sweep.
+
+    Args:
+        results: Benchmark results including the default storage
+
+    Returns:
+        One row per non-default result with index size and latency deltas (percent)
+    """
+    baseline_storage = StorageConfig()
+    baselines = {r.config.label(): r for r in results if r.storage == baseline_storage}
+
+    rows = []
+    for r in results:
+        base = baselines.get(r.config.label())
+        if base is None or r.storage == baseline_storage:
+            continue
+        rows.append(
+            {
+                "config": r.config.label(),
+                "storage": r.storage.label(),
+                "index_saving_pct": _pct_change(base.index_bytes, r.index_bytes),
+                "p50_saving_pct": _pct_change(base.p50_ms, r.p50_ms),
+                "p99_saving_pct": _pct_change(base.p99_ms, r.p99_ms),
+                "recall_delta": r.recall_at_k - base.recall_at_k,
+            }
+        )
+    return rows
+
+
+def _pct_change(baseline: float, value: float) -> float:
+    """Percentage saved relative to baseline (positive = smaller/faster)."""
+    if not baseline:
+        return 0.0
+    return (baseline - value) / baseline * 100
+
+
+# --- concurrency benchmark ---
+
+SEARCH_MODES = ("blocking", "thread", "async")
+
+
+@dataclass
+class ConcurrencyResult:
+    """Throughput, request latency and event-loop lag of one search mode at one concurrency level."""
+
+    mode: str
+    concurrency: int
+    requests: int
+    throughput: float  # requests per second
+    p50_ms: float
+    p99_ms: float
+    lag_p99_ms: float
+    lag_max_ms: float
+
+
+def _mode_search(vector_db: Any, mode: str) -> Callable[[str, int], Awaitable[list[Document]]]:
+    """Async search callable of a search mode."""
+    if mode == "blocking":
+
+        async def blocking(query: str, limit: int) -> list[Document]:
+            return vector_db.search(query=query, limit=limit)
+
+        return blocking
+    if mode == "thread":
+
+        async def thread(query: str, limit: int) -> list[Document]:
+            return await asyncio.to_thread(vector_db.search, query, limit)
+
+        return thread
+    if mode == "async":
+
+        async def native(query: str, limit: int) -> list[Document]:
+            return await vector_db.async_search(query=query, limit=limit)
+
+        return native
+    raise ValueError(f"Unknown search mode '{mode}'. Use one of: {', '.join(SEARCH_MODES)}")
+
+
+async def _monitor_loop_lag(samples: list[float], stop: asyncio.Event, interval: float) -> None:
+    """Record how late the loop wakes a sleeper, every ``interval`` seconds, until stopped."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def measure_concurrency(
+    search: Callable[[str, int], Awaitable[list[Document]]],
+    queries: Sequence[str],
+    concurrency: int,
+    requests: int | None = None,
+    searches_per_request: int = 3,
+    limit: int = 5,
+    lag_interval: float = 0.005,
+) -> tuple[float, float, float, float, float]:
+    """
+    Run requests of several searches each, ``concurrency`` at a time, while sampling loop lag.
+
+    Args:
+        search: Async callable taking (query, limit)
+        queries: Query texts, cycled through
+        concurrency: Requests in flight at once
+        requests: Total requests (default: 4 x concurrency)
+        searches_per_request: Sequential searches per request (retrieval-heavy agent runs search repeatedly)
+        limit: Search limit
+        lag_interval: Seconds between loop-lag samples
+
+    Returns:
+        Tuple of (requests per second, p50 ms, p99 ms, loop lag p99 ms, loop lag max ms)
+    """
+    total = requests or concurrency * 4
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def request(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            for offset in range(searches_per_request):
+                await search(queries[(index * searches_per_request + offset) % len(queries)], limit)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    lag: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_loop_lag(lag, stop, lag_interval))
+    started = time.perf_counter()
+    await asyncio.gather(*(request(index) for index in range(total)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    return (
+        total / elapsed if elapsed else 0.0,
+        percentile(latencies, 50),
+        percentile(latencies, 99),
+        percentile(lag, 99),
+        max(lag, default=0.0),
+    )
+
+
+def run_concurrency_benchmark(
+    vector_db: Any,
+    queries: Sequence[str],
+    levels: Sequence[int] = (50, 100, 200),
+    modes: Sequence[str] = SEARCH_MODES,
+    searches_per_request: int = 3,
+    limit: int = 5,
+    requests: int | None = None,
+) -> list[ConcurrencyResult]:
+    """
+    Compare search modes at each concurrency level on one event loop.
+
+    All runs share one loop so the async engine's pooled connections are reused
+    across them; each mode gets an untimed warmup first.
+
+    Args:
+        vector_db: Loaded vector store (``kb.vector_db``)
+        queries: Query texts
+        levels: Concurrent requests to test
+        modes: Search modes to compare (see ``SEARCH_MODES``)
+        searches_per_request: Sequential searches per request
+        limit: Search limit
+        requests: Requests per run (default: 4 x concurrency)
+
+    Returns:
+        One result per (mode, level), modes outermost
+    """
+    if not queries:
+        raise ValueError("Concurrency benchmark needs at least one query")
+
+    async def run_all() -> list[ConcurrencyResult]:
+        results = []
+        for mode in modes:
+            search = _mode_search(vector_db, mode)
+            await search(queries[0], limit)
+            for level in levels:
+                throughput, p50, p99, lag_p99, lag_max = await measure_concurrency(
+                    search, queries, level, requests, searches_per_request, limit
+                )
+                results.append(
+                    ConcurrencyResult(
+                        mode=mode,
+                        concurrency=level,
+                        requests=requests or level * 4,
+                        throughput=throughput,
+                        p50_ms=p50,
+                        p99_ms=p99,
+                        lag_p99_ms=lag_p99,
+                        lag_max_ms=lag_max,
+                    )
+                )
+                logger.info("Concurrency run complete", mode=mode, concurrency=level, throughput=throughput)
+        return results
+
+    return asyncio.run(run_all())
+
+
+def format_concurrency_results(results: Sequence[ConcurrencyResult]) -> str:
+    """
+    Render concurrency results as a plain-text table grouped by concurrency level.
+
+    Args:
+        results: Concurrency benchmark results
+
+    Returns:
+        Table string
+    """
+    rows = sorted(results, key=lambda r: (r.concurrency, SEARCH_MODES.index(r.mode) if r.mode in SEARCH_MODES else 0))
+    header = f"{'mode':<10} {'concurrency':>11} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'lag p99 ms':>11} {'lag max ms':>11}"
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r.mode:<10} {r.concurrency:>11} {r.throughput:>9.1f} {r.p50_ms:>9.2f} {r.p99_ms:>9.2f} "
+            f"{r.lag_p99_ms:>11.2f} {r.lag_max_ms:>11.2f}"
+        )
+    return "\n".join(lines)
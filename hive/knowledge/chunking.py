@@ -0,0 +1,122 @@
+"""
+Content chunking for long CSV cells.
+
+By default every CSV row is one document. With chunking configured, content
+cells longer than ``size`` characters are split, and each chunk is embedded
+and hashed on its own. Search then returns the relevant chunk, and an edit
+only re-embeds the chunks whose text changed.
+
+Strategies:
+- ``sentence``: paragraphs are chunk boundaries; long paragraphs are packed
+  sentence by sentence and short ones merged with the next. An edit only
+  moves the chunks of the paragraph it touches
+- ``fixed``: ``size``-character windows (snapped to whitespace) that step by
+  ``size - overlap``. Inserting text shifts every later window
+
+Usage:
+    from hive.knowledge.chunking import chunk_text
+    from hive.knowledge.config import ChunkingConfig
+
+    chunks = chunk_text(long_answer, ChunkingConfig(strategy="sentence", size=800, overlap=80))
+"""
+
+import re
+
+from hive.knowledge.config import ChunkingConfig
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def _fixed_chunks(text: str, size: int, overlap: int) -> list[str]:
+    """Split text into overlapping windows, ending each at whitespace where possible."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            # Do not cut words in half unless a single word fills most of the window
+            cut = text.rfind(" ", start + size // 2, end)
+            if cut != -1:
+                end = cut
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+        if not text[start - 1].isspace():
+            # Start the overlap at a word boundary too
+            space = text.find(" ", start, end)
+            if space != -1:
+                start = space + 1
+    return [chunk for chunk in chunks if chunk]
+
+
+def _pack_sentences(paragraph: str, size: int, overlap: int) -> list[str]:
+    """Pack a paragraph's sentences into chunks, repeating trailing sentences up to ``overlap``."""
+    chunks: list[str] = []
+    current: list[str] = []
+    for sentence in (s.strip() for s in _SENTENCE_SPLIT.split(paragraph)):
+        if not sentence:
+            continue
+        if len(sentence) > size:
+            if current:
+                chunks.append(" ".join(current))
+                current = []
+            chunks.extend(_fixed_chunks(sentence, size, overlap))
+            continue
+        if current and len(" ".join([*current, sentence])) > size:
+            chunks.append(" ".join(current))
+            carried: list[str] = []
+            for previous in reversed(current):
+                if len(" ".join([previous, *carried, sentence])) > min(overlap + len(sentence), size):
+                    break
+                carried.insert(0, previous)
+            current = carried
+        current.append(sentence)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _sentence_chunks(text: str, size: int, overlap: int) -> list[str]:
+    """Chunk on paragraph boundaries, packing sentences inside long paragraphs."""
+    chunks: list[str] = []
+    pending = ""
+    for paragraph in (p.strip() for p in _PARAGRAPH_SPLIT.split(text)):
+        if not paragraph:
+            continue
+        if pending:
+            paragraph = f"{pending}\n\n{paragraph}"
+            pending = ""
+        if len(paragraph) > size:
+            chunks.extend(_pack_sentences(paragraph, size, overlap))
+        elif len(paragraph) < size // 4:
+            # Headings and one-liners embed poorly alone; attach them to the next paragraph
+            pending = paragraph
+        else:
+            chunks.append(paragraph)
+    if pending:
+        if chunks and len(chunks[-1]) + len(pending) + 2 <= size:
+            chunks[-1] = f"{chunks[-1]}\n\n{pending}"
+        else:
+            chunks.append(pending)
+    return chunks
+
+
+def chunk_text(text: str, config: ChunkingConfig) -> list[str]:
+    """
+    Split content into chunks.
+
+    Args:
+        text: Content cell
+        config: Strategy, maximum chunk size and overlap (characters)
+
+    Returns:
+        Chunks in document order (the whole text when it fits in one chunk)
+    """
+    text = text.strip()
+    if len(text) <= config.size:
+        return [text]
+    if config.strategy == "sentence":
+        return _sentence_chunks(text, config.size, config.overlap)
+    return _fixed_chunks(text, config.size, config.overlap)
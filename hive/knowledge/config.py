@@ -0,0 +1,879 @@
+"""
+Knowledge configuration from YAML.
+
+Maps the ``knowledge:`` section of ``hive.yaml`` (project defaults) and of an
+agent ``config.yaml`` (per-agent overrides) onto ``create_knowledge_base()``
+arguments.
+
+Example:
+    knowledge:
+      type: csv                   # csv | parquet | arrow | jsonl | documents (folder of .md/.txt/.pdf)
+      source: data/csv/faq.csv    # stored in knowledge_faq unless table_name is set
+      columns: [question, answer, category]   # read only these columns (default: all)
+    # or a database table, synced by updated_at watermark:
+    #   type: database
+    #   table: public.articles    # source table (the knowledge table defaults to knowledge_articles)
+    #   connection: postgresql+psycopg://...   # default: HIVE_DATABASE_URL
+    #   tombstone_column: deleted # soft-delete flag (default: deletes found by key diff)
+      num_documents: 5
+      partition_by: product       # one table + HNSW index per product value
+      search:
+        type: hybrid              # vector | keyword | hybrid
+        distance: cosine          # cosine | l2 | max_inner_product
+        vector_score_weight: 0.5  # hybrid weighting (1.0 = vector only)
+        hnsw:
+          m: 16
+          ef_construction: 200
+          ef_search: 40
+      storage:
+        dimensions: 512           # Matryoshka truncation (text-embedding-3 models)
+        quantization: halfvec     # none | halfvec | binary
+        rerank_candidates: 40     # full-precision re-rank of top candidates
+      metadata:
+        infer_types: true         # use CSV dtypes (int/float/bool) instead of strings
+        schema:                   # explicit types win over inferred ones
+          price: float
+          published: date
+        filter_columns: [category, price]   # indexed for filtered search
+      chunking:
+        strategy: sentence        # fixed | sentence (paragraph/sentence boundaries)
+        size: 1000                # max characters per chunk; shorter cells stay whole
+        overlap: 100              # characters repeated between neighbouring chunks
+      context:
+        max_tokens: 1500          # token budget for retrieved documents per search
+        max_document_tokens: 300  # longer documents are cut to their most relevant sentences
+        min_score: 0.3            # drop hits below this similarity_score
+        relative_score: 0.7       # ... or below 70% of the top hit's score
+        dedupe_threshold: 0.9     # drop hits this similar to a higher-ranked one
+      dedup:
+        threshold: 0.8            # embed one row per cluster of near-identical rows (MinHash/LSH)
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+from agno.vectordb.distance import Distance
+from agno.vectordb.pgvector import HNSW, SearchType
+from loguru import logger
+
+from hive.knowledge.metadata import METADATA_TYPES
+
+# hive.yaml keys that differ from their agent config.yaml equivalents. ``auto_reload`` is
+# deliberately not mapped to ``hot_reload``: each agent opts into its own file watcher.
+_PROJECT_KEY_ALIASES = {
+    "embedder_model": "embedder",
+}
+
+# Vector index representations (see hive.knowledge.quantized)
+QUANTIZATION_MODES = ("none", "halfvec", "binary")
+
+# Content chunking strategies (see hive.knowledge.chunking)
+CHUNKING_STRATEGIES = ("fixed", "sentence")
+
+# Knowledge types loaded by create_knowledge_base (federated knowledge combines these)
+LOADABLE_SOURCE_TYPES = ("csv", "parquet", "arrow", "jsonl", "documents", "database")
+
+# Postgres truncates identifiers beyond 63 bytes
+_MAX_IDENTIFIER = 63
+
+
+def default_table_name(name: str) -> str:
+    """
+    Default knowledge table for a source without ``table_name``.
+
+    The change-tracking tables are created with unquoted SQL, so the name is
+    reduced to lowercase ASCII letters, digits and underscores.
+
+    Args:
+        name: Source name (file or folder stem, federated source name or database table)
+
+    Returns:
+        ``knowledge_{slug}``, with a hash suffix when the slug is lossy or too long
+    """
+    slug = "".join(ch if ch.isascii() and ch.isalnum() else "_" for ch in name.lower()).strip("_") or "source"
+    table_name = f"knowledge_{slug}"
+    if slug == name and len(table_name) <= _MAX_IDENTIFIER:
+        return table_name
+    # Distinct names can share a slug ("faq-v1" / "faq_v1"), so disambiguate with a hash
+    digest = hashlib.md5(name.encode()).hexdigest()[:8]  # noqa: S324
+    return f"{table_name[: _MAX_IDENTIFIER - len(digest) - 1]}_{digest}"
+
+
+@dataclass
+class SearchConfig:
+    """Search strategy and HNSW index parameters for a knowledge base."""
+
+    search_type: SearchType = SearchType.hybrid
+    distance: Distance = Distance.cosine
+    vector_score_weight: float = 0.5
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 5
+
+    def __post_init__(self) -> None:
+        """Coerce enum values and validate ranges."""
+        try:
+            self.search_type = SearchType(self.search_type)
+        except ValueError:
+            raise ValueError(f"Unknown search type: {self.search_type}")
+        try:
+            self.distance = Distance(self.distance)
+        except ValueError:
+            raise ValueError(f"Unknown distance: {self.distance}")
+        if not 0.0 <= self.vector_score_weight <= 1.0:
+            raise ValueError("vector_score_weight must be between 0 and 1")
+        if self.hnsw_m < 2 or self.hnsw_ef_construction < 1 or self.hnsw_ef_search < 1:
+            raise ValueError("HNSW parameters must be positive (m >= 2)")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "SearchConfig":
+        """
+        Build a search config from the YAML ``search:`` mapping.
+
+        Args:
+            data: Mapping with optional type, distance, vector_score_weight and hnsw keys
+
+        Returns:
+            SearchConfig with unspecified values left at their defaults
+        """
+        if not data:
+            return cls()
+
+        hnsw = data.get("hnsw") or {}
+        defaults = cls()
+        return cls(
+            search_type=data.get("type", defaults.search_type),
+            distance=data.get("distance", defaults.distance),
+            vector_score_weight=float(data.get("vector_score_weight", defaults.vector_score_weight)),
+            hnsw_m=int(hnsw.get("m", defaults.hnsw_m)),
+            hnsw_ef_construction=int(hnsw.get("ef_construction", defaults.hnsw_ef_construction)),
+            hnsw_ef_search=int(hnsw.get("ef_search", defaults.hnsw_ef_search)),
+        )
+
+    def vector_index(self) -> HNSW:
+        """Build the PgVector HNSW index definition."""
+        return HNSW(m=self.hnsw_m, ef_construction=self.hnsw_ef_construction, ef_search=self.hnsw_ef_search)
+
+    @property
+    def index_key(self) -> tuple[str, int, int]:
+        """Parameters baked into the index at build time (changing them requires a rebuild)."""
+        return (self.distance.value, self.hnsw_m, self.hnsw_ef_construction)
+
+    def label(self) -> str:
+        """Short human-readable description for reports."""
+        label = f"{self.search_type.value}/{self.distance.value} m={self.hnsw_m} efc={self.hnsw_ef_construction}"
+        label += f" efs={self.hnsw_ef_search}"
+        if self.search_type == SearchType.hybrid:
+            label += f" w={self.vector_score_weight:g}"
+        return label
+
+
+@dataclass
+class StorageConfig:
+    """Vector storage options: reduced dimensions and index quantization."""
+
+    dimensions: int | None = None
+    quantization: str = "none"
+    rerank_candidates: int = 0
+
+    def __post_init__(self) -> None:
+        """Validate storage options."""
+        if self.quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization: {self.quantization} (expected one of {QUANTIZATION_MODES})")
+        if self.dimensions is not None and self.dimensions < 1:
+            raise ValueError("dimensions must be positive")
+        if self.rerank_candidates < 0:
+            raise ValueError("rerank_candidates must be >= 0")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "StorageConfig":
+        """
+        Build a storage config from the YAML ``storage:`` mapping.
+
+        Args:
+            data: Mapping with optional dimensions, quantization and rerank_candidates keys
+
+        Returns:
+            StorageConfig with unspecified values left at their defaults
+        """
+        if not data:
+            return cls()
+        dimensions = data.get("dimensions")
+        return cls(
+            dimensions=int(dimensions) if dimensions is not None else None,
+            quantization=str(data.get("quantization", "none")),
+            rerank_candidates=int(data.get("rerank_candidates", 0)),
+        )
+
+    @property
+    def is_quantized(self) -> bool:
+        """Whether the index is built over a compressed representation."""
+        return self.quantization != "none"
+
+    def label(self) -> str:
+        """Short human-readable description for reports."""
+        label = f"{self.dimensions or 'native'}d {self.quantization}"
+        if self.is_quantized and self.rerank_candidates:
+            label += f" rerank={self.rerank_candidates}"
+        return label
+
+
+@dataclass
+class MetadataConfig:
+    """Typed metadata coercion and filter-column indexing."""
+
+    schema: dict[str, str] = field(default_factory=dict)
+    infer_types: bool = False
+    filter_columns: list[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        """Validate declared types."""
+        for column, type_name in self.schema.items():
+            if type_name not in METADATA_TYPES:
+                raise ValueError(
+                    f"Unknown metadata type for '{column}': {type_name} (expected one of {METADATA_TYPES})"
+                )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "MetadataConfig":
+        """
+        Build a metadata config from the YAML ``metadata:`` mapping.
+
+        Args:
+            data: Mapping with optional schema, infer_types and filter_columns keys
+
+        Returns:
+            MetadataConfig (untyped string metadata when empty)
+        """
+        if not data:
+            return cls()
+        return cls(
+            schema={str(k): str(v) for k, v in (data.get("schema") or {}).items()},
+            infer_types=bool(data.get("infer_types", False)),
+            filter_columns=[str(c) for c in data.get("filter_columns") or []],
+        )
+
+    @property
+    def is_typed(self) -> bool:
+        """Whether metadata values keep their types instead of becoming strings."""
+        return bool(self.schema) or self.infer_types
+
+
+@dataclass
+class ChunkingConfig:
+    """Splitting of long content cells into separately embedded chunks."""
+
+    strategy: str = "sentence"
+    size: int = 1000
+    overlap: int = 100
+
+    def __post_init__(self) -> None:
+        """Validate the strategy and sizes."""
+        if self.strategy not in CHUNKING_STRATEGIES:
+            raise ValueError(f"Unknown chunking strategy: {self.strategy} (expected one of {CHUNKING_STRATEGIES})")
+        if self.size < 1:
+            raise ValueError("chunk size must be positive")
+        if not 0 <= self.overlap < self.size:
+            raise ValueError("chunk overlap must be >= 0 and smaller than the chunk size")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "ChunkingConfig | None":
+        """
+        Build a chunking config from the YAML ``chunking:`` mapping.
+
+        Args:
+            data: Mapping with optional strategy, size and overlap keys
+
+        Returns:
+            ChunkingConfig, or None when chunking is not configured (one document per row)
+        """
+        if not data:
+            return None
+        defaults = cls()
+        return cls(
+            strategy=str(data.get("strategy", defaults.strategy)),
+            size=int(data.get("size", defaults.size)),
+            overlap=int(data.get("overlap", defaults.overlap)),
+        )
+
+
+@dataclass
+class DedupConfig:
+    """Near-duplicate clustering of rows before embedding (see hive.knowledge.dedup)."""
+
+    threshold: float = 0.8
+    shingle_size: int = 3
+    num_perm: int = 128
+
+    def __post_init__(self) -> None:
+        """Validate the clustering settings."""
+        if not 0.0 < self.threshold <= 1.0:
+            raise ValueError("dedup threshold must be in (0, 1]")
+        if self.shingle_size < 1:
+            raise ValueError("dedup shingle_size must be positive")
+        if self.num_perm < 1:
+            raise ValueError("dedup num_perm must be positive")
+
+    @classmethod
+    def from_dict(cls, data: bool | dict[str, Any] | None) -> "DedupConfig | None":
+        """
+        Build a dedup config from the YAML ``dedup:`` value.
+
+        Args:
+            data: ``true`` for the defaults, or a mapping with optional threshold, shingle_size
+                and num_perm keys
+
+        Returns:
+            DedupConfig, or None when every row is embedded
+        """
+        if not data:
+            return None
+        if data is True:
+            return cls()
+        return cls(
+            threshold=float(data.get("threshold", cls.threshold)),
+            shingle_size=int(data.get("shingle_size", cls.shingle_size)),
+            num_perm=int(data.get("num_perm", cls.num_perm)),
+        )
+
+
+@dataclass
+class SQLSourceConfig:
+    """Database table knowledge source (see hive.knowledge.sql_loader)."""
+
+    table: str
+    connection: str | None = None
+    schema: str | None = None
+    key_column: str = "id"
+    updated_at_column: str = "updated_at"
+    tombstone_column: str | None = None
+    lookback_seconds: float = 0.0
+    poll_interval: float = 60.0
+    batch_size: int = 500
+
+    def __post_init__(self) -> None:
+        """Validate the sync settings."""
+        if self.lookback_seconds < 0:
+            raise ValueError("lookback_seconds must be >= 0")
+        if self.poll_interval <= 0:
+            raise ValueError("poll_interval must be positive")
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+    @property
+    def qualified_name(self) -> str:
+        """Schema-qualified source table name."""
+        return f"{self.schema}.{self.table}" if self.schema else self.table
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SQLSourceConfig":
+        """
+        Build a source config from a ``type: database`` knowledge section.
+
+        Args:
+            data: Mapping with table (``schema.table`` allowed), connection, key_column,
+                updated_at_column, tombstone_column, lookback_seconds, poll_interval and batch_size
+
+        Returns:
+            SQLSourceConfig
+
+        Raises:
+            ValueError: If no source table is configured
+        """
+        table = data.get("table")
+        if not table:
+            raise ValueError("Database knowledge requires a 'table'")
+        schema = data.get("schema")
+        if schema is None and "." in str(table):
+            schema, table = str(table).split(".", 1)
+        tombstone_column = data.get("tombstone_column")
+        return cls(
+            table=str(table),
+            connection=data.get("connection"),
+            schema=schema,
+            key_column=str(data.get("key_column", "id")),
+            updated_at_column=str(data.get("updated_at_column", "updated_at")),
+            tombstone_column=str(tombstone_column) if tombstone_column else None,
+            lookback_seconds=float(data.get("lookback_seconds", 0.0)),
+            poll_interval=float(data.get("poll_interval", 60.0)),
+            batch_size=int(data.get("batch_size", 500)),
+        )
+
+
+@dataclass
+class ContextConfig:
+    """Token budget and filtering for retrieved documents (see hive.knowledge.context)."""
+
+    max_tokens: int = 2000
+    max_document_tokens: int | None = None
+    min_score: float | None = None
+    relative_score: float = 0.0
+    dedupe_threshold: float = 0.9
+    candidates: int | None = None
+    model: str = "gpt-4o"
+
+    def __post_init__(self) -> None:
+        """Validate budget and thresholds."""
+        if self.max_tokens < 1:
+            raise ValueError("max_tokens must be positive")
+        if self.max_document_tokens is not None and self.max_document_tokens < 1:
+            raise ValueError("max_document_tokens must be positive")
+        if not 0.0 <= self.relative_score <= 1.0:
+            raise ValueError("relative_score must be between 0 and 1")
+        if not 0.0 < self.dedupe_threshold <= 1.0:
+            raise ValueError("dedupe_threshold must be in (0, 1]")
+        if self.candidates is not None and self.candidates < 1:
+            raise ValueError("candidates must be positive")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "ContextConfig | None":
+        """
+        Build a context config from the YAML ``context:`` mapping.
+
+        Args:
+            data: Mapping with optional max_tokens, max_document_tokens, min_score,
+                relative_score, dedupe_threshold, candidates and model keys
+
+        Returns:
+            ContextConfig, or None when no budget is configured
+        """
+        if not data:
+            return None
+        defaults = cls()
+        max_document_tokens = data.get("max_document_tokens")
+        min_score = data.get("min_score")
+        candidates = data.get("candidates")
+        return cls(
+            max_tokens=int(data.get("max_tokens", defaults.max_tokens)),
+            max_document_tokens=int(max_document_tokens) if max_document_tokens is not None else None,
+            min_score=float(min_score) if min_score is not None else None,
+            relative_score=float(data.get("relative_score", defaults.relative_score)),
+            dedupe_threshold=float(data.get("dedupe_threshold", defaults.dedupe_threshold)),
+            candidates=int(candidates) if candidates is not None else None,
+            model=str(data.get("model", defaults.model)),
+        )
+
+
+@dataclass
+class BackgroundLoadConfig:
+    """Initial load on a background thread with readiness reporting (see hive.knowledge.readiness)."""
+
+    wait_timeout: float = 5.0
+
+    def __post_init__(self) -> None:
+        """Validate the search wait."""
+        if self.wait_timeout < 0:
+            raise ValueError("wait_timeout must not be negative")
+
+    @classmethod
+    def from_dict(cls, data: bool | dict[str, Any] | None) -> "BackgroundLoadConfig | None":
+        """
+        Build a background-load config from the YAML ``background_load:`` value.
+
+        Args:
+            data: ``true`` for the defaults, or a mapping with an optional wait_timeout key
+
+        Returns:
+            BackgroundLoadConfig, or None when knowledge loads before the agent is created
+        """
+        if not data:
+            return None
+        if data is True:
+            return cls()
+        return cls(wait_timeout=float(data.get("wait_timeout", cls.wait_timeout)))
+
+
+@dataclass
+class CoordinationConfig:
+    """Cross-process ingestion leader election and invalidation (see hive.knowledge.coordination)."""
+
+    channel: str = "hive_knowledge"
+
+    def __post_init__(self) -> None:
+        """Validate the channel name."""
+        if not self.channel:
+            raise ValueError("coordination channel must not be empty")
+
+    @classmethod
+    def from_dict(cls, data: bool | dict[str, Any] | None) -> "CoordinationConfig | None":
+        """
+        Build a coordination config from the YAML ``coordination:`` value.
+
+        Args:
+            data: ``true`` for the defaults, or a mapping with an optional channel key
+
+        Returns:
+            CoordinationConfig, or None when every process ingests on its own
+        """
+        if not data:
+            return None
+        if data is True:
+            return cls()
+        return cls(channel=str(data.get("channel", cls.channel)))
+
+
+@dataclass
+class MigrationConfig:
+    """Background re-embedding into a new embedding model (see hive.knowledge.migration)."""
+
+    embedder: str
+    dimensions: int | None = None
+    tokens_per_minute: int = 1_000_000
+    quota_share: float = 0.25
+    batch_size: int = 20
+
+    def __post_init__(self) -> None:
+        """Validate the target model and throttle."""
+        if not self.embedder:
+            raise ValueError("migration embedder must not be empty")
+        if self.dimensions is not None and self.dimensions < 1:
+            raise ValueError("dimensions must be positive")
+        if self.tokens_per_minute < 1:
+            raise ValueError("tokens_per_minute must be positive")
+        if not 0.0 < self.quota_share <= 1.0:
+            raise ValueError("quota_share must be in (0, 1]")
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "MigrationConfig | None":
+        """
+        Build a migration config from the YAML ``migration:`` mapping.
+
+        Args:
+            data: Mapping with an embedder key and optional dimensions, tokens_per_minute,
+                quota_share and batch_size keys
+
+        Returns:
+            MigrationConfig, or None when no migration is configured
+        """
+        if not data:
+            return None
+        dimensions = data.get("dimensions")
+        return cls(
+            embedder=str(data["embedder"]),
+            dimensions=int(dimensions) if dimensions is not None else None,
+            tokens_per_minute=int(data.get("tokens_per_minute", cls.tokens_per_minute)),
+            quota_share=float(data.get("quota_share", cls.quota_share)),
+            batch_size=int(data.get("batch_size", cls.batch_size)),
+        )
+
+    @property
+    def token_rate(self) -> float:
+        """Tokens per second the backfill may embed."""
+        return self.tokens_per_minute * self.quota_share / 60.0
+
+
+@dataclass
+class MaintenanceConfig:
+    """Scheduled VACUUM/ANALYZE, index rebuilds and prewarming (see hive.knowledge.maintenance)."""
+
+    window: str | None = "02:00-05:00"
+    check_interval: float = 900.0
+    vacuum_threshold: float = 0.1
+    reindex_threshold: float = 0.5
+    prewarm: bool = False
+
+    def __post_init__(self) -> None:
+        """Validate the window and thresholds."""
+        if self.window is not None:
+            from hive.knowledge.maintenance import parse_window
+
+            parse_window(self.window)
+        if self.check_interval <= 0:
+            raise ValueError("check_interval must be positive")
+        if not 0.0 < self.vacuum_threshold <= 1.0:
+            raise ValueError("vacuum_threshold must be in (0, 1]")
+        if self.reindex_threshold <= 0:
+            raise ValueError("reindex_threshold must be positive")
+
+    @classmethod
+    def from_dict(cls, data: bool | dict[str, Any] | None) -> "MaintenanceConfig | None":
+        """
+        Build a maintenance config from the YAML ``maintenance:`` value.
+
+        Args:
+            data: ``true`` for the defaults, or a mapping with optional window, check_interval,
+                vacuum_threshold, reindex_threshold and prewarm keys
+
+        Returns:
+            MaintenanceConfig, or None when tables are left to autovacuum
+        """
+        if not data:
+            return None
+        if data is True:
+            return cls()
+        return cls(
+            window=data.get("window", cls.window),
+            check_interval=float(data.get("check_interval", cls.check_interval)),
+            vacuum_threshold=float(data.get("vacuum_threshold", cls.vacuum_threshold)),
+            reindex_threshold=float(data.get("reindex_threshold", cls.reindex_threshold)),
+            prewarm=bool(data.get("prewarm", cls.prewarm)),
+        )
+
+
+@dataclass
+class ReplicaConfig:
+    """Read-only databases that serve knowledge searches (see hive.knowledge.replicas)."""
+
+    urls: list[str] = field(default_factory=list)
+    check_interval: float = 1.0
+
+    def __post_init__(self) -> None:
+        """Validate the lag check interval."""
+        if self.check_interval < 0:
+            raise ValueError("check_interval must be >= 0")
+
+    @classmethod
+    def from_dict(cls, data: bool | str | list[str] | dict[str, Any] | None) -> "ReplicaConfig | None":
+        """
+        Build a replica config from the YAML ``read_replicas:`` value.
+
+        Args:
+            data: ``true`` for the URLs in HIVE_DATABASE_REPLICA_URLS, a URL, a list of URLs,
+                or a mapping with urls and check_interval
+
+        Returns:
+            ReplicaConfig, or None when searches use the primary database
+        """
+        if not data:
+            return None
+        if data is True:
+            return cls()
+        if isinstance(data, str):
+            return cls(urls=[data])
+        if isinstance(data, list):
+            return cls(urls=[str(url) for url in data])
+        urls = data.get("urls") or []
+        return cls(
+            urls=[urls] if isinstance(urls, str) else [str(url) for url in urls],
+            check_interval=float(data.get("check_interval", cls.check_interval)),
+        )
+
+
+@dataclass
+class KeywordIndexConfig:
+    """In-process BM25 index fused with vector results for hybrid search (see hive.knowledge.lexical)."""
+
+    k1: float = 1.2
+    b: float = 0.75
+    vector_candidates: int = 20
+
+    def __post_init__(self) -> None:
+        """Validate the BM25 parameters."""
+        if self.k1 < 0:
+            raise ValueError("keyword_index k1 must be >= 0")
+        if not 0.0 <= self.b <= 1.0:
+            raise ValueError("keyword_index b must be between 0 and 1")
+        if self.vector_candidates < 1:
+            raise ValueError("keyword_index vector_candidates must be positive")
+
+    @classmethod
+    def from_dict(cls, data: bool | dict[str, Any] | None) -> "KeywordIndexConfig | None":
+        """
+        Build a keyword index config from the YAML ``keyword_index:`` value.
+
+        Args:
+            data: ``true`` for the defaults, or a mapping with optional k1, b and vector_candidates keys
+
+        Returns:
+            KeywordIndexConfig, or None when hybrid search runs its keyword half in Postgres
+        """
+        if not data:
+            return None
+        if data is True:
+            return cls()
+        return cls(
+            k1=float(data.get("k1", cls.k1)),
+            b=float(data.get("b", cls.b)),
+            vector_candidates=int(data.get("vector_candidates", cls.vector_candidates)),
+        )
+
+
+def load_project_knowledge_config(project_root: Path | None = None) -> dict[str, Any]:
+    """
+    Load the ``knowledge:`` section of hive.yaml.
+
+    Args:
+        project_root: Project directory (default: search upward from cwd)
+
+    Returns:
+        Knowledge section with keys normalized to agent config names, or {} outside a project
+    """
+    if project_root is None:
+        from hive.discovery import _find_project_root
+
+        project_root = _find_project_root()
+    if project_root is None:
+        return {}
+
+    config_path = project_root / "hive.yaml"
+    if not config_path.exists():
+        return {}
+
+    try:
+        with open(config_path) as f:
+            section = (yaml.safe_load(f) or {}).get("knowledge") or {}
+    except Exception as e:
+        logger.warning("Failed to read knowledge section from hive.yaml", error=str(e))
+        return {}
+
+    return {_PROJECT_KEY_ALIASES.get(key, key): value for key, value in section.items()}
+
+
+def discover_knowledge_sources(project_root: Path | None = None) -> dict[str, dict[str, Any]]:
+    """
+    Find the loadable knowledge sources of a project.
+
+    Sources come from the hive.yaml ``knowledge:`` section (when it names a
+    source) and from each agent ``config.yaml`` (merged with the project
+    defaults). Agents with the same config on one knowledge table are listed
+    once; a different config on a table already taken is skipped with a
+    warning. Relative source paths are resolved against the project root.
+
+    Args:
+        project_root: Project directory (default: search upward from cwd)
+
+    Returns:
+        Mapping of source name ("project" or comma-separated agent directory names) to merged config
+    """
+    if project_root is None:
+        from hive.discovery import _find_project_root
+
+        project_root = _find_project_root()
+    if project_root is None:
+        return {}
+
+    project = load_project_knowledge_config(project_root)
+    candidates: list[tuple[str, dict[str, Any]]] = []
+    if project.get("source") or project.get("type") == "database":
+        candidates.append(("project", project))
+
+    try:
+        with open(project_root / "hive.yaml") as f:
+            hive_config = yaml.safe_load(f) or {}
+    except Exception:
+        hive_config = {}
+    agents_dir = project_root / (hive_config.get("agents") or {}).get("discovery_path", "ai/agents")
+    for config_path in sorted(agents_dir.glob("*/config.yaml")):
+        try:
+            with open(config_path) as f:
+                agent_knowledge = (yaml.safe_load(f) or {}).get("knowledge")
+        except Exception as e:
+            logger.warning("Failed to read agent config", path=str(config_path), error=str(e))
+            continue
+        if isinstance(agent_knowledge, dict) and agent_knowledge.get("type") in LOADABLE_SOURCE_TYPES:
+            candidates.append((config_path.parent.name, merge_knowledge_config(project, agent_knowledge)))
+
+    sources: dict[str, dict[str, Any]] = {}
+    names_by_table: dict[str, str] = {}
+    for name, config in candidates:
+        config = dict(config)
+        source = config.get("source")
+        if not source and config.get("type") != "database":
+            logger.warning("Knowledge config has no source", name=name)
+            continue
+        if source and not Path(source).is_absolute():
+            config["source"] = str(project_root / source)
+        try:
+            table = knowledge_kwargs(config)["table_name"]
+        except ValueError as e:
+            logger.warning("Invalid knowledge config", name=name, error=str(e))
+            continue
+        if table in names_by_table:
+            previous = names_by_table[table]
+            if sources[previous] != config:
+                # Loading either would overwrite the other's documents
+                logger.warning(
+                    "Knowledge sources conflict on one table, skipping",
+                    table=table,
+                    loaded=previous,
+                    skipped=name,
+                )
+                continue
+            # Several agents with the same config share one source
+            names_by_table[table] = f"{previous}, {name}"
+            sources[names_by_table[table]] = sources.pop(previous)
+            continue
+        names_by_table[table] = name
+        sources[name] = config
+    return sources
+
+
+def merge_knowledge_config(project: dict[str, Any], agent: dict[str, Any]) -> dict[str, Any]:
+    """
+    Overlay an agent's knowledge config on the project defaults.
+
+    Nested mappings (e.g. ``search`` and ``search.hnsw``) are merged key by key,
+    so an agent can override a single HNSW parameter.
+
+    Args:
+        project: Defaults from hive.yaml
+        agent: Agent-level knowledge config
+
+    Returns:
+        Merged configuration
+    """
+    merged = dict(project)
+    for key, value in agent.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_knowledge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def knowledge_kwargs(config: dict[str, Any]) -> dict[str, Any]:
+    """
+    Translate a knowledge config mapping into ``create_knowledge_base()`` arguments.
+
+    Args:
+        config: Merged knowledge configuration
+
+    Returns:
+        Keyword arguments for create_knowledge_base
+    """
+    is_database = config.get("type") == "database"
+    kwargs: dict[str, Any] = {
+        "search": SearchConfig.from_dict(config.get("search")),
+        "storage": StorageConfig.from_dict(config.get("storage")),
+        "metadata": MetadataConfig.from_dict(config.get("metadata")),
+        "chunking": ChunkingConfig.from_dict(config.get("chunking")),
+        "dedup": DedupConfig.from_dict(config.get("dedup")),
+        "context": ContextConfig.from_dict(config.get("context")),
+        "background_load": BackgroundLoadConfig.from_dict(config.get("background_load")),
+        "coordination": CoordinationConfig.from_dict(config.get("coordination")),
+        "migration": MigrationConfig.from_dict(config.get("migration")),
+        "maintenance": MaintenanceConfig.from_dict(config.get("maintenance")),
+        "read_replicas": ReplicaConfig.from_dict(config.get("read_replicas")),
+        "keyword_index": KeywordIndexConfig.from_dict(config.get("keyword_index")),
+        # Agents configured from YAML each get their own knowledge base
+        "use_shared": config.get("use_shared", False),
+    }
+    for key in (
+        "embedder",
+        "num_documents",
+        "content_column",
+        "hash_columns",
+        "columns",
+        "hot_reload",
+        "debounce_delay",
+        "partition_by",
+    ):
+        if key in config:
+            kwargs[key] = config[key]
+    if is_database:
+        # ``table`` names the source table; the knowledge table gets its own name
+        sql_source = SQLSourceConfig.from_dict(config)
+        kwargs["sql_source"] = sql_source
+        kwargs["table_name"] = config.get("table_name", default_table_name(sql_source.table))
+        return kwargs
+    kwargs["csv_path"] = config["source"]
+    # Each source gets its own table by default (as federated sources do), so agents on
+    # different files don't overwrite each other in the shared ``knowledge_base`` table
+    default_table = default_table_name(Path(str(config["source"])).stem)
+    kwargs["table_name"] = config.get("table_name", config.get("table", default_table))
+    return kwargs
@@ -0,0 +1,319 @@
+"""
+Token-budgeted context assembly for retrieved documents.
+
+Agents inject retrieved documents whole, and ``num_documents`` is a fixed
+count, so a few long CSV rows can dominate prompt size, latency and cost.
+``ContextAssembler`` turns a ranked candidate list into a context that fits a
+token budget:
+
+1. Adaptive k: drop hits below ``min_score`` or below ``relative_score`` times
+   the top hit's score, so weak tails are not padded in to reach k
+2. Dedupe: drop hits whose word shingles overlap a higher-ranked hit by
+   ``dedupe_threshold`` or more (Jaccard similarity)
+3. Span extraction: documents over ``max_document_tokens`` keep only the
+   sentences that share the most terms with the query, in original order
+4. Budget: documents are added in rank order until ``max_tokens`` is used; the
+   first document that does not fit is cut to the remaining budget
+
+``BudgetedKnowledge`` applies the assembler to any knowledge base and reports
+tokens saved per search (debug log) and in total (``stats``).
+
+Configuration (agent config.yaml):
+    knowledge:
+      type: csv
+      source: data/faq.csv
+      num_documents: 5            # upper bound; fewer are returned when the tail is weak
+      context:
+        max_tokens: 1500
+        max_document_tokens: 300
+        min_score: 0.3
+        relative_score: 0.7
+
+Token counts use agno's tokenizer support (tiktoken when installed, otherwise
+about four characters per token).
+"""
+
+import json
+import re
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from agno.knowledge import Knowledge
+from agno.knowledge.document import Document
+from agno.utils.tokens import count_text_tokens
+from loguru import logger
+
+from hive.knowledge.config import ContextConfig
+
+# Shingle size for near-duplicate detection
+_SHINGLE_WORDS = 3
+
+# Remaining budget below which a partial document is not worth adding
+_MIN_PARTIAL_TOKENS = 32
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"\w+")
+
+
+def _words(text: str) -> list[str]:
+    """Lowercased words of a text."""
+    return _WORD.findall(text.lower())
+
+
+def _shingles(text: str) -> set[tuple[str, ...]]:
+    """Word shingles used for near-duplicate detection."""
+    words = _words(text)
+    if len(words) <= _SHINGLE_WORDS:
+        return {tuple(words)}
+    return {tuple(words[i : i + _SHINGLE_WORDS]) for i in range(len(words) - _SHINGLE_WORDS + 1)}
+
+
+def _jaccard(a: set[Any], b: set[Any]) -> float:
+    """Jaccard similarity of two sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _score(document: Document) -> float | None:
+    """Similarity score attached by the vector store, if any."""
+    score = (document.meta_data or {}).get("similarity_score")
+    return float(score) if isinstance(score, int | float) else None
+
+
+@dataclass
+class AssembledContext:
+    """Result of assembling one search's documents."""
+
+    documents: list[Document]
+    tokens_retrieved: int = 0
+    tokens_used: int = 0
+    below_cutoff: int = 0
+    duplicates: int = 0
+    truncated: int = 0
+    over_budget: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens kept out of the prompt."""
+        return self.tokens_retrieved - self.tokens_used
+
+
+@dataclass
+class ContextStats:
+    """Totals across searches."""
+
+    searches: int = 0
+    tokens_retrieved: int = 0
+    tokens_used: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, context: AssembledContext) -> None:
+        """Add one search to the totals."""
+        with self._lock:
+            self.searches += 1
+            self.tokens_retrieved += context.tokens_retrieved
+            self.tokens_used += context.tokens_used
+
+    def to_dict(self) -> dict[str, Any]:
+        """Snapshot for reporting."""
+        with self._lock:
+            return {
+                "searches": self.searches,
+                "tokens_retrieved": self.tokens_retrieved,
+                "tokens_used": self.tokens_used,
+                "tokens_saved": self.tokens_retrieved - self.tokens_used,
+            }
+
+
+class ContextAssembler:
+    """Fits ranked documents into a token budget."""
+
+    def __init__(self, config: ContextConfig | None = None) -> None:
+        """
+        Initialize the assembler.
+
+        Args:
+            config: Budget, score cutoffs and dedupe threshold
+        """
+        self.config = config or ContextConfig()
+
+    def count_tokens(self, document: Document) -> int:
+        """Tokens a document takes up as a prompt reference."""
+        return count_text_tokens(json.dumps(document.to_dict(), default=str), self.config.model)
+
+    def candidates(self, max_results: int) -> int:
+        """Number of documents to retrieve before filtering."""
+        return max(self.config.candidates or 2 * max_results, max_results)
+
+    def _passes_cutoff(self, score: float | None, top_score: float | None) -> bool:
+        """Adaptive k: keep hits close enough to the top hit."""
+        if score is None:
+            return True
+        if self.config.min_score is not None and score < self.config.min_score:
+            return False
+        return top_score is None or score >= top_score * self.config.relative_score
+
+    def _shorten(self, document: Document, query: str, max_tokens: int) -> Document | None:
+        """Cut a document to its most query-relevant sentences within max_tokens."""
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(document.content) if s.strip()]
+        terms = {word for word in _words(query) if len(word) > 2}
+        ranked = sorted(
+            range(len(sentences)),
+            key=lambda i: (-len(terms.intersection(_words(sentences[i]))), i),
+        )
+
+        chosen: list[int] = []
+        for index in ranked:
+            candidate = sorted([*chosen, index])
+            content = " ... ".join(sentences[i] for i in candidate)
+            if self.count_tokens(replace(document, content=content)) > max_tokens:
+                continue
+            chosen = candidate
+        if not chosen:
+            return None
+        return replace(document, content=" ... ".join(sentences[i] for i in chosen))
+
+    def assemble(self, query: str, documents: list[Document], max_results: int | None = None) -> AssembledContext:
+        """
+        Select and trim documents to fit the budget.
+
+        Args:
+            query: Search query (used to pick relevant sentences)
+            documents: Ranked candidates, best first
+            max_results: Upper bound on returned documents
+
+        Returns:
+            AssembledContext with the kept documents and token accounting
+        """
+        limit = max_results or len(documents)
+        result = AssembledContext(documents=[])
+        result.tokens_retrieved = sum(self.count_tokens(document) for document in documents[:limit])
+
+        scores = [score for score in (_score(document) for document in documents) if score is not None]
+        top_score = max(scores) if scores else None
+        kept_shingles: list[set[tuple[str, ...]]] = []
+        remaining = self.config.max_tokens
+
+        for document in documents:
+            if len(result.documents) >= limit:
+                break
+            if not self._passes_cutoff(_score(document), top_score):
+                result.below_cutoff += 1
+                continue
+            shingles = _shingles(document.content)
+            if any(_jaccard(shingles, kept) >= self.config.dedupe_threshold for kept in kept_shingles):
+                result.duplicates += 1
+                continue
+
+            tokens = self.count_tokens(document)
+            cap = min(remaining, self.config.max_document_tokens or remaining)
+            if tokens > cap:
+                if cap < _MIN_PARTIAL_TOKENS:
+                    result.over_budget += 1
+                    continue
+                shortened = self._shorten(document, query, cap)
+                if shortened is None:
+                    result.over_budget += 1
+                    continue
+                document, tokens = shortened, self.count_tokens(shortened)
+                result.truncated += 1
+
+            result.documents.append(document)
+            kept_shingles.append(shingles)
+            remaining -= tokens
+            result.tokens_used += tokens
+
+        return result
+
+
+class BudgetedKnowledge(Knowledge):
+    """Knowledge that fits another knowledge base's results into a token budget."""
+
+    def __init__(self, knowledge: Knowledge, config: ContextConfig | None = None, name: str | None = None) -> None:
+        """
+        Wrap a knowledge base.
+
+        Args:
+            knowledge: Knowledge base to search
+            config: Token budget and filtering
+            name: Knowledge name (default: the wrapped knowledge's name)
+        """
+        super().__init__(name=name or knowledge.name, max_results=knowledge.max_results)
+        # Set after init so the wrapped store is not checked or created again
+        self.vector_db = getattr(knowledge, "vector_db", None)
+        self.knowledge = knowledge
+        self.assembler = ContextAssembler(config)
+        self.stats = ContextStats()
+
+    def _assemble(self, query: str, documents: list[Document], limit: int) -> list[Document]:
+        """Apply the budget and record the savings."""
+        context = self.assembler.assemble(query, documents, limit)
+        self.stats.record(context)
+        logger.debug(
+            "Context assembled",
+            documents=len(context.documents),
+            candidates=len(documents),
+            tokens_used=context.tokens_used,
+            tokens_saved=context.tokens_saved,
+            below_cutoff=context.below_cutoff,
+            duplicates=context.duplicates,
+            truncated=context.truncated,
+        )
+        return context.documents
+
+    def search(
+        self,
+        query: str,
+        max_results: int | None = None,
+        filters: Any = None,
+        search_type: str | None = None,
+        user_id: str | None = None,
+        run_response: Any = None,
+    ) -> list[Document]:
+        """
+        Search the wrapped knowledge base and fit the results to the budget.
+
+        Args:
+            query: Search query
+            max_results: Upper bound on returned documents (default: max_results)
+            filters: Metadata filters
+            search_type: Search type override
+            user_id: Owner scope
+            run_response: Run that query-transformer model calls are billed to
+
+        Returns:
+            Documents within the token budget
+        """
+        limit = max_results or self.max_results
+        documents = self.knowledge.search(
+            query=query,
+            max_results=self.assembler.candidates(limit),
+            filters=filters,
+            search_type=search_type,
+            user_id=user_id,
+            run_response=run_response,
+        )
+        return self._assemble(query, documents, limit)
+
+    async def asearch(
+        self,
+        query: str,
+        max_results: int | None = None,
+        filters: Any = None,
+        search_type: str | None = None,
+        user_id: str | None = None,
+        run_response: Any = None,
+    ) -> list[Document]:
+        """Async version of search."""
+        limit = max_results or self.max_results
+        documents = await self.knowledge.asearch(
+            query=query,
+            max_results=self.assembler.candidates(limit),
+            filters=filters,
+            search_type=search_type,
+            user_id=user_id,
+            run_response=run_response,
+        )
+        return self._assemble(query, documents, limit)
@@ -0,0 +1,273 @@
+"""
+Cross-process coordination of knowledge ingestion.
+
+With ``uvicorn --workers N`` or several pods, every process that creates a
+knowledge base with ``hot_reload`` watches the same source (or polls the same
+table) and would run the same incremental reload N times. With
+``coordination`` enabled:
+
+- A reload runs under a Postgres session advisory lock keyed by the knowledge
+  table; a process that cannot take the lock skips the reload, because
+  another process is already ingesting that source
+- The initial load waits for the lock instead of skipping, so workers that
+  start together embed the source once; the others then find nothing changed
+- After a load, the process that ran it sends ``NOTIFY hive_knowledge`` with
+  the table and its stats; every other process runs the invalidation
+  callbacks subscribed for that table (e.g. the partition registry)
+- The lock belongs to the connection, so a leader that crashes releases it
+
+Configuration (agent config.yaml or hive.yaml):
+    knowledge:
+      hot_reload: true
+      coordination: true          # or a mapping: {channel: hive_knowledge}
+
+Notes:
+- Notifications sent while a listener is reconnecting are lost; after a
+  reconnect every subscribed table is invalidated
+- Payloads are small JSON objects (Postgres limits them to 8000 bytes)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+from uuid import uuid4
+
+import psycopg
+from loguru import logger
+from psycopg import sql
+from sqlalchemy.engine import make_url
+
+DEFAULT_CHANNEL = "hive_knowledge"
+
+# Seconds the listener waits for notifications before checking for stop
+_LISTEN_TIMEOUT = 1.0
+# Seconds between listener reconnect attempts
+_RECONNECT_DELAY = 5.0
+
+InvalidationCallback = Callable[[dict[str, Any]], None]
+
+
+def advisory_lock_key(name: str) -> int:
+    """
+    Advisory lock key of a knowledge source.
+
+    Args:
+        name: Knowledge table name
+
+    Returns:
+        Signed 64-bit key (the range of ``pg_advisory_lock(bigint)``)
+    """
+    digest = hashlib.md5(f"hive_knowledge:{name}".encode()).digest()  # noqa: S324
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def libpq_url(url: str) -> str:
+    """
+    Connection string for psycopg from a SQLAlchemy URL.
+
+    Args:
+        url: SQLAlchemy URL (``postgresql+psycopg://...``, ``postgresql+psycopg2://...``)
+
+    Returns:
+        ``postgresql://`` URL with the driver suffix removed
+    """
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class IngestCoordinator:
+    """Advisory-lock leader election and LISTEN/NOTIFY invalidation for one database."""
+
+    def __init__(self, db_url: str, channel: str = DEFAULT_CHANNEL) -> None:
+        """
+        Initialize the coordinator.
+
+        Args:
+            db_url: Database URL (SQLAlchemy or libpq form)
+            channel: NOTIFY channel shared by every process
+        """
+        self.conninfo = libpq_url(db_url)
+        self.channel = channel
+        # Identifies this process's notifications so it skips its own
+        self.origin = f"{os.getpid()}-{uuid4().hex[:8]}"
+        self._callbacks: dict[str, list[InvalidationCallback]] = {}
+        self._callbacks_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _connect(self) -> psycopg.Connection:
+        """Open a dedicated autocommit connection."""
+        return psycopg.connect(self.conninfo, autocommit=True)
+
+    @contextmanager
+    def leadership(self, source: str, wait: bool = False) -> Iterator[psycopg.Connection | None]:
+        """
+        Hold the source's advisory lock for the duration of the block.
+
+        Args:
+            source: Knowledge table name
+            wait: Block until the lock is free instead of giving up
+
+        Yields:
+            The connection holding the lock, or None when another process holds it
+        """
+        key = advisory_lock_key(source)
+        with self._connect() as conn:
+            if wait:
+                conn.execute("SELECT pg_advisory_lock(%s)", (key,))
+                acquired = True
+            else:
+                row = conn.execute("SELECT pg_try_advisory_lock(%s)", (key,)).fetchone()
+                acquired = bool(row and row[0])
+            if not acquired:
+                yield None
+                return
+            try:
+                yield conn
+            finally:
+                conn.execute("SELECT pg_advisory_unlock(%s)", (key,))
+
+    def run(self, source: str, func: Callable[[], Any], wait: bool = False) -> Any | None:
+        """
+        Run an ingestion as the source's leader and notify the other processes.
+
+        Args:
+            source: Knowledge table name
+            func: Load to run (its dict result is sent as the notification's stats)
+            wait: Wait for the lock (initial loads) instead of skipping (reloads)
+
+        Returns:
+            func's result, or None when another process is ingesting the source
+        """
+        with self.leadership(source, wait=wait) as conn:
+            if conn is None:
+                logger.info("Skipping knowledge ingestion, another process holds it", table=source)
+                return None
+            result = func()
+            self._notify(conn, source, result if isinstance(result, dict) else {})
+            return result
+
+    def _notify(self, conn: psycopg.Connection, source: str, stats: dict[str, Any]) -> None:
+        """Tell the other processes that a source changed."""
+        payload = json.dumps({"table": source, "origin": self.origin, "stats": stats}, default=str)
+        try:
+            conn.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+        except Exception as e:
+            logger.warning("Knowledge change notification failed", table=source, error=str(e))
+
+    def subscribe(self, source: str, callback: InvalidationCallback) -> None:
+        """
+        Run a callback when another process finishes ingesting a source.
+
+        Starts the listener on first use.
+
+        Args:
+            source: Knowledge table name
+            callback: Called with the notification payload (table, origin, stats)
+        """
+        with self._callbacks_lock:
+            self._callbacks.setdefault(source, []).append(callback)
+        self.start()
+
+    def dispatch(self, payload: str) -> None:
+        """
+        Run the callbacks of a received notification.
+
+        Args:
+            payload: JSON notification payload
+        """
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed knowledge notification", payload=payload[:200])
+            return
+        if message.get("origin") == self.origin:
+            return
+        self._invalidate(message.get("table", ""), message)
+
+    def _invalidate(self, source: str, message: dict[str, Any]) -> None:
+        """Run the callbacks subscribed for a source."""
+        with self._callbacks_lock:
+            callbacks = list(self._callbacks.get(source, ()))
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error("Knowledge cache invalidation failed", table=source, error=str(e))
+        if callbacks:
+            logger.info("Knowledge caches invalidated", table=source, origin=message.get("origin"))
+
+    def _invalidate_all(self) -> None:
+        """Invalidate every subscribed source (notifications may have been missed)."""
+        with self._callbacks_lock:
+            sources = list(self._callbacks)
+        for source in sources:
+            self._invalidate(source, {"table": source, "origin": None, "stats": {}})
+
+    def _listen(self) -> None:
+        """Receive notifications until stopped, reconnecting after errors."""
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                with self._connect() as conn:
+                    conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                    if connected_before:
+                        self._invalidate_all()
+                    connected_before = True
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=_LISTEN_TIMEOUT):
+                            self.dispatch(notify.payload)
+            except Exception as e:
+                logger.warning("Knowledge notification listener disconnected", channel=self.channel, error=str(e))
+                self._stop.wait(_RECONNECT_DELAY)
+
+    def start(self) -> None:
+        """Start the listener in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="hive-knowledge-listen", daemon=True)
+        self._thread.start()
+        logger.info("Listening for knowledge changes", channel=self.channel)
+
+    def stop(self) -> None:
+        """Stop the listener."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=_LISTEN_TIMEOUT + 5)
+            self._thread = None
+
+
+_coordinators: dict[tuple[str, str], IngestCoordinator] = {}
+_coordinators_lock = threading.Lock()
+
+
+def get_coordinator(db_url: str, channel: str = DEFAULT_CHANNEL) -> IngestCoordinator:
+    """
+    Get the process-wide coordinator for a database and channel.
+
+    Args:
+        db_url: Database URL
+        channel: NOTIFY channel
+
+    Returns:
+        Shared IngestCoordinator (one listener connection per database and channel)
+    """
+    key = (libpq_url(db_url), channel)
+    with _coordinators_lock:
+        coordinator = _coordinators.get(key)
+        if coordinator is None:
+            coordinator = _coordinators[key] = IngestCoordinator(db_url, channel)
+        return coordinator
+
+
+def clear_coordinators() -> None:
+    """Stop and forget every coordinator (useful for testing)."""
+    with _coordinators_lock:
+        coordinators = list(_coordinators.values())
+        _coordinators.clear()
+    for coordinator in coordinators:
+        coordinator.stop()
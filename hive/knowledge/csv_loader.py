@@ -1,16 +1,46 @@
 """
 CSV loader for Agno DocumentKnowledgeBase.
 
-Loads CSV files into Agno's knowledge base with optional hot reload.
-Each CSV row becomes a single document with all columns as metadata.
+Loads CSV files (or Parquet, Arrow IPC and JSONL, see hive.knowledge.sources)
+into Agno's knowledge base with optional hot reload.
+Each CSV row becomes a single document with all columns as metadata
+(strings by default, typed when a metadata schema is configured).
 
 Features:
 - Row-based document creation (one doc per row)
+- Optional chunking of long content cells (one doc per chunk, see
+  hive.knowledge.chunking); only chunks whose text changed are re-embedded
+- Optional near-duplicate clustering (one embedded document per cluster of
+  near-identical rows, see hive.knowledge.dedup)
 - Incremental loading (only process changed rows)
 - Hot reload with file watching
 - PgVector storage for efficient retrieval
+
+Documents are named ``csv_row_{row_id}``, or ``csv_row_{row_id}_chunk_{hash}``
+when chunked, so unchanged chunks keep their name and embedding. Documents are
+written in batched upserts; a full load writes the new version before deleting
+the old one, so searches never see an empty table mid-reload.
+
+``plan()`` reads the source and the stored hashes once and works out what a
+load would embed; ``apply()`` executes that plan (``load()`` is the two in a
+row). The ``hive knowledge`` CLI shows the plan before running it.
+
+``aload()`` / ``aload_incremental()`` run the same load without blocking an
+event loop: parsing, hashing and the state tables run in a small worker pool
+(not the default executor FastAPI uses for sync endpoints), embeddings use the
+embedder's async API and vector writes go through an async engine.
 """
 
+import asyncio
+import contextvars
+import hashlib
+import inspect
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Any, cast
 
@@ -19,17 +49,90 @@ from agno.knowledge.document import Document
 from agno.vectordb.pgvector import PgVector
 from loguru import logger
 
-from hive.knowledge.incremental import IncrementalCSVLoader
+from hive.knowledge.chunking import chunk_text
+from hive.knowledge.config import ChunkingConfig, DedupConfig, MetadataConfig
+from hive.knowledge.dedup import cluster_near_duplicates, clusters, duplicate_metadata
+from hive.knowledge.incremental import ChangeSet, IncrementalCSVLoader
+from hive.knowledge.metadata import coerce_value, infer_metadata_types
+from hive.knowledge.metrics import collect_phases, embedding_tokens, record_ingest
+from hive.knowledge.sources import compute_row_hashes, read_source
+
+# Parse, hash and state-table work of async loads; small so reloads cannot starve request handling
+_INGEST_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="knowledge-ingest")
+
+
+async def run_in_ingest_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run blocking ingestion work in the ingestion worker pool.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments
+
+    Returns:
+        Result of ``func(*args)``
+    """
+    # Carry the caller's context, so stores report ingest phases to the load that runs them
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(_INGEST_POOL, context.run, func, *args)
+
+
+def _async_method(obj: Any, name: str) -> Callable[..., Any] | None:
+    """Coroutine method ``name`` of obj, or None when it has none (plain or fake stores)."""
+    method = getattr(obj, name, None)
+    return method if inspect.iscoroutinefunction(method) else None
+
+
+@dataclass
+class IngestPlan:
+    """Changes one load makes, computed from a single read of the source and the stored hashes."""
+
+    mode: str  # "full" or "incremental"
+    dataframe: pd.DataFrame
+    hashes: dict[int, str]
+    added: list[int]
+    changed: list[int]
+    deleted: list[int]
+    documents: list[Document]  # to embed
+    stale: list[str]  # stored documents replaced by the new ones
+    chunk_hashes: dict[int, list[str]] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)  # seconds per phase
+    version: int | None = None  # change-log version, set once applied (None when nothing changed)
+    representatives: dict[int, int] | None = None  # near-duplicate clusters to store (dedup only)
+    batches: int = 0  # write batches, set once applied
+    embedding_tokens: int = 0  # tokens the embedder reported, set once applied
+
+    @property
+    def characters(self) -> int:
+        """Characters to embed."""
+        return sum(len(doc.content) for doc in self.documents)
+
+    @property
+    def is_noop(self) -> bool:
+        """True when applying the plan would not change the knowledge table."""
+        return self.mode == "incremental" and not (self.added or self.changed or self.deleted)
 
 
 class CSVKnowledgeLoader:
     """Loads CSV files into Agno DocumentKnowledgeBase with incremental updates."""
 
+    # Document names are "{document_prefix}_{row_id}", metadata "source" is source_name
+    document_prefix = "csv_row"
+    source_name = "csv"
+
+    # Documents embedded and upserted per write (progress is reported per batch)
+    write_batch_size = 100
+
     def __init__(
         self,
         vector_db: PgVector,
         content_column: str = "content",
         hash_columns: list[str] | None = None,
+        metadata: MetadataConfig | None = None,
+        partition_by: str | None = None,
+        chunking: ChunkingConfig | None = None,
+        columns: list[str] | None = None,
+        dedup: DedupConfig | None = None,
     ) -> None:
         """
         Initialize the CSV loader.
@@ -38,14 +141,121 @@ class CSVKnowledgeLoader:
             vector_db: PgVector instance for document storage
             content_column: Column name containing main text content
             hash_columns: Columns to hash for change detection (default: all)
+            metadata: Typed metadata settings (default: all metadata as strings)
+            partition_by: Column that selects the partition table (requires a PartitionedPgVector)
+            chunking: Split long content cells into chunks (default: one document per row)
+            columns: Columns to read from the source (default: all); the content, hash and
+                partition columns are always read
+            dedup: Embed one representative per cluster of near-identical rows (default: every row)
+
+        Raises:
+            ValueError: If the store's partition column differs, or dedup is combined with chunking
         """
         self.vector_db = vector_db
         self.content_column = content_column
+        self.metadata = metadata or MetadataConfig()
+        self._metadata_types: dict[str, str] = dict(self.metadata.schema)
+        self.partition_by = partition_by
+        self.chunking = chunking
+        if dedup is not None and chunking is not None:
+            raise ValueError("dedup cannot be combined with chunking")
+        self.dedup = dedup
+        self.columns: list[str] | None = None
+        if columns:
+            required = [content_column, *(hash_columns or []), *([partition_by] if partition_by else [])]
+            self.columns = list(dict.fromkeys([*required, *columns]))
+        store_partition = getattr(vector_db, "partition_by", None)
+        if partition_by and isinstance(store_partition, str) and store_partition != partition_by:
+            raise ValueError(f"Vector DB is partitioned by '{store_partition}', not '{partition_by}'")
         self.incremental_loader = IncrementalCSVLoader(
             vector_db=vector_db,
             hash_columns=hash_columns,
         )
 
+    def _check_partition_column(self, df: pd.DataFrame) -> None:
+        """
+        Validate the partition column and log rows per partition.
+
+        Args:
+            df: Parsed CSV dataframe
+
+        Raises:
+            ValueError: If the partition column is missing from the CSV
+        """
+        if not self.partition_by:
+            return
+        if self.partition_by not in df.columns:
+            raise ValueError(f"Partition column '{self.partition_by}' not found in CSV")
+        if self.partition_by == self.content_column:
+            raise ValueError("Partition column cannot be the content column")
+
+        counts = df[self.partition_by].value_counts(dropna=False)
+        logger.debug(
+            "Rows per partition", column=self.partition_by, partitions={str(k): int(v) for k, v in counts.items()}
+        )
+
+    def _resolve_metadata_types(self, df: pd.DataFrame) -> None:
+        """
+        Resolve metadata types for a parsed CSV (inferred dtypes, then explicit schema).
+
+        Args:
+            df: Parsed CSV dataframe
+        """
+        if not self.metadata.is_typed:
+            return
+
+        types = infer_metadata_types(df) if self.metadata.infer_types else {}
+        types.update(self.metadata.schema)
+        types.pop(self.content_column, None)
+        self._metadata_types = types
+
+        # Filters compile against the same types the documents were stored with
+        vector_db_types = getattr(self.vector_db, "metadata_types", None)
+        if isinstance(vector_db_types, dict):
+            vector_db_types.update(types)
+
+    def _metadata_value(self, column: str, value: Any, row_id: int) -> Any:
+        """
+        Convert a cell to its metadata value.
+
+        Args:
+            column: Column name
+            value: Raw cell value
+            row_id: Row identifier (for error reporting)
+
+        Returns:
+            Typed value for declared columns, string otherwise
+        """
+        type_name = self._metadata_types.get(column)
+        if type_name is None:
+            return str(value)
+        try:
+            return coerce_value(value, type_name)
+        except (TypeError, ValueError) as e:
+            # A stray string would break the typed expression index, so store null instead
+            logger.warning("Metadata coercion failed", column=column, row_id=row_id, type=type_name, error=str(e))
+            return None
+
+    def _row_metadata(self, row: pd.Series, row_id: int) -> dict[str, Any]:
+        """
+        Build document metadata from all non-content columns.
+
+        Args:
+            row: Pandas Series representing a CSV row
+            row_id: Unique row identifier
+
+        Returns:
+            Metadata dictionary
+        """
+        metadata: dict[str, Any] = {
+            "row_id": row_id,
+            "source": self.source_name,
+        }
+        for col, value in row.items():
+            if col != self.content_column:
+                metadata[str(col)] = self._metadata_value(str(col), value, row_id)
+        return metadata
+
     def _row_to_document(self, row: pd.Series, row_id: int) -> Document:
         """
         Convert a CSV row to an Agno Document.
@@ -60,107 +270,701 @@ class CSVKnowledgeLoader:
         # Extract content
         content = str(row.get(self.content_column, ""))
 
-        # Build metadata from all other columns
-        metadata = {
-            "row_id": row_id,
-            "source": "csv",
-        }
-        for col, value in row.items():
-            if col != self.content_column:
-                metadata[str(col)] = str(value)
-
         # Create document
         return Document(
-            name=f"csv_row_{row_id}",
+            name=self._document_name(row_id),
             content=content,
-            meta_data=metadata,
+            meta_data=self._row_metadata(row, row_id),
         )
 
-    def load_full(self, csv_path: str | Path) -> int:
+    def _row_to_chunks(self, row: pd.Series, row_id: int) -> dict[str, Document]:
         """
-        Load entire CSV file (initial load).
+        Convert a CSV row to one Agno Document per content chunk.
 
         Args:
-            csv_path: Path to CSV file
+            row: Pandas Series representing a CSV row
+            row_id: Unique row identifier
 
         Returns:
-            Number of documents loaded
+            Dictionary mapping chunk hash to document (identical chunks collapse into one)
         """
-        logger.info("Starting full CSV load", path=str(csv_path))
+        assert self.chunking is not None
+        metadata = self._row_metadata(row, row_id)
+        chunks: dict[str, Document] = {}
+        for content in chunk_text(str(row.get(self.content_column, "")), self.chunking):
+            chunk_hash = self.incremental_loader.compute_chunk_hash(content, metadata)
+            chunks[chunk_hash] = Document(
+                name=self._chunk_name(row_id, chunk_hash),
+                content=content,
+                meta_data=dict(metadata),
+            )
+        return chunks
+
+    def _representatives(self, df: pd.DataFrame) -> dict[int, int]:
+        """
+        Cluster near-identical rows (within a partition).
 
-        # Load CSV
-        df = pd.read_csv(csv_path)
+        Args:
+            df: Rows indexed by row id
 
-        # Convert rows to documents
-        documents = []
-        current_hashes: dict[int, str] = {}
-        for idx, row in df.iterrows():
-            idx_int = cast(int, idx)
-            doc = self._row_to_document(row, idx_int)
-            documents.append(doc)
-            row_hash = self.incremental_loader._compute_row_hash(row)
-            current_hashes[idx_int] = row_hash
+        Returns:
+            Representative per row id
+        """
+        assert self.dedup is not None
+        texts = {cast(int, idx): str(value) for idx, value in df[self.content_column].items()}
+        groups = None
+        if self.partition_by:
+            groups = {cast(int, idx): str(value) for idx, value in df[self.partition_by].items()}
+        return cluster_near_duplicates(
+            texts,
+            groups,
+            threshold=self.dedup.threshold,
+            shingle_size=self.dedup.shingle_size,
+            num_perm=self.dedup.num_perm,
+        )
 
-        # Upsert documents to vector DB
-        self.vector_db.upsert(documents=documents)  # type: ignore[call-arg]
+    def _cluster_to_document(self, df: pd.DataFrame, members: list[int]) -> Document:
+        """
+        Convert a cluster of near-identical rows to the representative's document.
 
-        # Store hashes for future incremental loads
-        self.incremental_loader.update_hashes(current_hashes)
+        Args:
+            df: Rows indexed by row id
+            members: Row ids of the cluster, representative first
 
-        logger.info("Full load complete", documents=len(documents))
-        return len(documents)
+        Returns:
+            Document of the representative, listing the other rows and their differing metadata
+        """
+        representative, *others = members
+        document = self._row_to_document(df.loc[representative], representative)
+        if others:
+            document.meta_data["duplicate_rows"] = others
+            document.meta_data["duplicates"] = duplicate_metadata(
+                document.meta_data, [(row_id, self._row_metadata(df.loc[row_id], row_id)) for row_id in others]
+            )
+        return document
+
+    def _dedup_plan(
+        self, df: pd.DataFrame, touched: set[int], previous: dict[int, int]
+    ) -> tuple[list[Document], list[str], dict[int, int]]:
+        """
+        Work out which cluster documents to (re)write.
+
+        Args:
+            df: Rows indexed by row id (every current row)
+            touched: Added and changed rows
+            previous: Representative per row stored before this load (empty for a full load)
+
+        Returns:
+            Documents to write, names of documents to drop first, and the new representatives
+        """
+        representatives = self._representatives(df)
+        members = clusters(representatives)
+        previous_members = clusters(previous)
+        # A cluster is rewritten when a member's content changed or its membership did
+        dirty = [
+            rep for rep, rows in members.items() if touched.intersection(rows) or rows != previous_members.get(rep)
+        ]
+        documents = [self._cluster_to_document(df, members[rep]) for rep in dirty]
+        dirty_set = set(dirty)
+        stale = [
+            self._document_name(rep)
+            for rep in previous_members
+            if rep in representatives and (rep not in members or rep in dirty_set)
+        ]
+        merged = len(representatives) - len(members)
+        if merged:
+            logger.info("Near-duplicate rows merged", rows=len(representatives), clusters=len(members), merged=merged)
+        return documents, stale, representatives
+
+    def _document_name(self, row_id: int) -> str:
+        """Document name of an unchunked row."""
+        return f"{self.document_prefix}_{row_id}"
+
+    def _chunk_name(self, row_id: int, chunk_hash: str) -> str:
+        """Document name of a chunk (content-addressed, so unchanged chunks keep their name)."""
+        return f"{self.document_prefix}_{row_id}_chunk_{chunk_hash[:12]}"
+
+    def _read_source(self, csv_path: str | Path) -> pd.DataFrame:
+        """
+        Read every row of the source.
+
+        Args:
+            csv_path: Path to CSV, Parquet, Arrow or JSONL file
+
+        Returns:
+            Dataframe indexed by row id
+        """
+        return read_source(csv_path, self.columns)
+
+    def _content_hash(self, documents: list[Document]) -> str:
+        """
+        Content hash of a write batch (also gives each document its stable id).
+
+        Args:
+            documents: Documents to write
+
+        Returns:
+            Content hash the documents are stored under
+        """
+        # Content fingerprint of the batch, not used for security
+        fingerprint = hashlib.md5()  # noqa: S324
+        for doc in documents:
+            # Stable ids: the stored record id derives from the document id and content hash
+            doc.id = doc.name
+            fingerprint.update(f"{doc.name}\u241f{doc.content}\u241e".encode())
+            if self.partition_by:
+                # A row moved to another partition must not keep its old copy's hash (see delete_stale)
+                fingerprint.update(f"{(doc.meta_data or {}).get(self.partition_by)}\u241e".encode())
+        return fingerprint.hexdigest()
+
+    def _write(self, documents: list[Document]) -> str:
+        """
+        Embed and store documents in one batched upsert.
+
+        Args:
+            documents: Documents to write
+
+        Returns:
+            Content hash the documents were stored under
+        """
+        content_hash = self._content_hash(documents)
+        if documents:
+            self.vector_db.upsert(content_hash=content_hash, documents=documents)
+        return content_hash
+
+    async def _awrite(self, documents: list[Document]) -> str:
+        """Async version of _write (async embedding and engine when the store supports them)."""
+        content_hash = self._content_hash(documents)
+        if not documents:
+            return content_hash
+        async_write = _async_method(self.vector_db, "async_write")
+        if async_write is not None:
+            await async_write(content_hash, documents)
+        else:
+            await run_in_ingest_pool(partial(self.vector_db.upsert, content_hash=content_hash, documents=documents))
+        return content_hash
+
+    def _write_batches(
+        self,
+        documents: list[Document],
+        progress: Callable[[int], None] | None = None,
+    ) -> list[str]:
+        """
+        Embed and store documents in batches of ``write_batch_size``.
+
+        Args:
+            documents: Documents to write
+            progress: Called with the number of documents after each batch
+
+        Returns:
+            Content hashes of the batches
+        """
+        content_hashes = []
+        for start in range(0, len(documents), self.write_batch_size):
+            batch = documents[start : start + self.write_batch_size]
+            content_hashes.append(self._write(batch))
+            if progress is not None:
+                progress(len(batch))
+        return content_hashes or [self._write([])]
+
+    async def _awrite_batches(
+        self,
+        documents: list[Document],
+        progress: Callable[[int], None] | None = None,
+    ) -> list[str]:
+        """Async version of _write_batches."""
+        content_hashes = []
+        for start in range(0, len(documents), self.write_batch_size):
+            batch = documents[start : start + self.write_batch_size]
+            content_hashes.append(await self._awrite(batch))
+            if progress is not None:
+                progress(len(batch))
+        return content_hashes or [self._content_hash([])]
+
+    def _delete_names(self, names: list[str]) -> None:
+        """
+        Delete stored documents by name (one statement when the store supports it).
+
+        Args:
+            names: Document names
+        """
+        if not names:
+            return
+        delete_by_names = getattr(self.vector_db, "delete_by_names", None)
+        if callable(delete_by_names):
+            delete_by_names(names)
+            return
+        for name in names:
+            self.vector_db.delete(name=name)  # type: ignore[call-arg]
+
+    async def _adelete_names(self, names: list[str]) -> None:
+        """Async version of _delete_names (one statement when the store supports it)."""
+        if not names:
+            return
+        async_delete = _async_method(self.vector_db, "async_delete_by_names")
+        if async_delete is not None:
+            await async_delete(names)
+        else:
+            await run_in_ingest_pool(self._delete_names, names)
+
+    def load_full(self, csv_path: str | Path) -> int:
+        """
+        Load the entire source file (initial load).
+
+        Args:
+            csv_path: Path to CSV, Parquet, Arrow or JSONL file
+
+        Returns:
+            Number of documents loaded
+        """
+        logger.info("Starting full CSV load", path=str(csv_path))
+
+        # Load source
+        df = self._read_source(csv_path)
+        self._check_partition_column(df)
+        self._resolve_metadata_types(df)
+
+        plan = self._full_plan(df, compute_row_hashes(df, self.incremental_loader.hash_columns))
+        return cast(int, self.apply(plan)["documents"])
 
     def load_incremental(self, csv_path: str | Path) -> dict[str, int]:
         """
         Load only changed rows (incremental update).
 
         Args:
-            csv_path: Path to CSV file
+            csv_path: Path to CSV, Parquet, Arrow or JSONL file
 
         Returns:
-            Dictionary with counts of added, changed, deleted documents
+            Dictionary with counts of added, changed, deleted rows
+            (and embedded chunks when chunking is enabled)
         """
         logger.info("Starting incremental CSV load", path=str(csv_path))
+        result = self.apply(self._plan_changes(csv_path))
+        logger.info("Incremental load complete", **result)
+        return result
 
-        # Detect changes
-        changes = self.incremental_loader.detect_changes(csv_path)
-        df = changes["dataframe"]
-        added = changes["added"]
-        changed = changes["changed"]
-        deleted = changes["deleted"]
-
-        # Process additions
-        if added:
-            add_docs = [self._row_to_document(df.loc[idx], idx) for idx in added]
-            self.vector_db.upsert(documents=add_docs)  # type: ignore[call-arg]
-            logger.info("Added documents", count=len(add_docs))
-
-        # Process changes (re-embed)
-        if changed:
-            change_docs = [self._row_to_document(df.loc[idx], idx) for idx in changed]
-            self.vector_db.upsert(documents=change_docs)  # type: ignore[call-arg]
-            logger.info("Updated documents", count=len(change_docs))
-
-        # Process deletions
-        if deleted:
-            # Delete by metadata filter
-            for row_id in deleted:
-                self.vector_db.delete(name=f"csv_row_{row_id}")  # type: ignore[call-arg]
-            self.incremental_loader.delete_hashes(deleted)
-            logger.info("Deleted documents", count=len(deleted))
-
-        # Update hashes for all current rows
-        self.incremental_loader.update_hashes(changes["current_hashes"])
-
-        result = {
-            "added": len(added),
-            "changed": len(changed),
-            "deleted": len(deleted),
-        }
+    async def aload_incremental(self, csv_path: str | Path) -> dict[str, int]:
+        """
+        Async version of load_incremental; never blocks the event loop.
 
+        Args:
+            csv_path: Path to CSV, Parquet, Arrow or JSONL file
+
+        Returns:
+            Dictionary with counts of added, changed, deleted rows
+            (and embedded chunks when chunking is enabled)
+        """
+        logger.info("Starting async incremental CSV load", path=str(csv_path))
+        plan = await run_in_ingest_pool(self._plan_changes, csv_path)
+        result = await self.aapply(plan)
         logger.info("Incremental load complete", **result)
         return result
 
+    def _plan_changes(self, csv_path: str | Path) -> IngestPlan:
+        """
+        Plan an incremental load of the source (every row is added before the first load).
+
+        Args:
+            csv_path: Path to CSV, Parquet, Arrow or JSONL file
+
+        Returns:
+            Incremental plan
+        """
+        changes = self.incremental_loader.detect_changes(csv_path, self.columns)
+        df = changes["dataframe"]
+        self._check_partition_column(df)
+        self._resolve_metadata_types(df)
+        return self._incremental_plan(
+            df, changes["added"], changes["changed"], changes["deleted"], changes["current_hashes"]
+        )
+
+    def _apply_changes(
+        self,
+        df: pd.DataFrame,
+        added: list[int],
+        changed: list[int],
+        deleted: list[int],
+        hashes: dict[int, str],
+    ) -> dict[str, int]:
+        """
+        Write added and changed rows, remove deleted ones and store the new hashes.
+
+        Args:
+            df: Rows indexed by row id (must contain the added and changed rows)
+            added: New row ids
+            changed: Row ids whose hash changed
+            deleted: Removed row ids
+            hashes: Row hashes to store (at least those of the added and changed rows)
+
+        Returns:
+            Dictionary with counts of added, changed, deleted rows
+            (and embedded chunks when chunking is enabled)
+        """
+        return self.apply(self._incremental_plan(df, added, changed, deleted, hashes))
+
+    def _full_plan(self, df: pd.DataFrame, hashes: dict[int, str]) -> IngestPlan:
+        """
+        Plan a full load: every row is embedded and earlier documents are dropped.
+
+        Args:
+            df: Rows indexed by row id
+            hashes: Row hashes of every row
+
+        Returns:
+            Full-load plan
+        """
+        documents: list[Document] = []
+        chunk_hashes: dict[int, list[str]] = {}
+        representatives = None
+        if self.dedup:
+            documents, _, representatives = self._dedup_plan(df, set(hashes), {})
+        else:
+            for idx, row in df.iterrows():
+                idx_int = cast(int, idx)
+                if self.chunking:
+                    chunks = self._row_to_chunks(row, idx_int)
+                    documents.extend(chunks.values())
+                    chunk_hashes[idx_int] = list(chunks)
+                else:
+                    documents.append(self._row_to_document(row, idx_int))
+        return IngestPlan(
+            mode="full",
+            dataframe=df,
+            hashes=hashes,
+            added=list(hashes),
+            changed=[],
+            deleted=[],
+            documents=documents,
+            stale=[],
+            chunk_hashes=chunk_hashes,
+            representatives=representatives,
+        )
+
+    def _incremental_plan(
+        self,
+        df: pd.DataFrame,
+        added: list[int],
+        changed: list[int],
+        deleted: list[int],
+        hashes: dict[int, str],
+    ) -> IngestPlan:
+        """
+        Plan an incremental load from a row diff.
+
+        Args:
+            df: Rows indexed by row id (must contain the added and changed rows)
+            added: New row ids
+            changed: Row ids whose hash changed
+            deleted: Removed row ids
+            hashes: Row hashes to store
+
+        Returns:
+            Incremental plan
+        """
+        chunk_hashes: dict[int, list[str]] = {}
+        representatives = None
+        if self.dedup:
+            # Rows stored before this load, with their stored cluster
+            stored = self.incremental_loader.load_representatives()
+            new_rows = set(added)
+            previous_rows = [idx for idx in hashes if idx not in new_rows] + deleted
+            previous = {idx: stored.get(idx, idx) for idx in previous_rows}
+            documents, stale, representatives = self._dedup_plan(df, {*added, *changed}, previous)
+        elif self.chunking:
+            documents, stale, chunk_hashes = self._diff_chunks(df, added + changed)
+        else:
+            documents = [self._row_to_document(df.loc[idx], idx) for idx in added + changed]
+            # Changed rows are stored under a new content hash; drop the old version first
+            stale = [self._document_name(idx) for idx in changed]
+        return IngestPlan(
+            mode="incremental",
+            dataframe=df,
+            hashes=hashes,
+            added=added,
+            changed=changed,
+            deleted=deleted,
+            documents=documents,
+            stale=stale,
+            chunk_hashes=chunk_hashes,
+            representatives=representatives,
+        )
+
+    def plan(self, csv_path: str | Path, force_full: bool = False) -> IngestPlan:
+        """
+        Work out what loading the source would embed, without writing anything.
+
+        The source and the stored hashes are read once; ``apply()`` reuses both.
+
+        Args:
+            csv_path: Path to CSV, Parquet, Arrow or JSONL file
+            force_full: Plan a full reload even if hashes exist
+
+        Returns:
+            Full plan on the first load (or when forced), incremental plan otherwise
+        """
+        started = time.perf_counter()
+        changes = self.incremental_loader.detect_changes(csv_path, self.columns)
+        df = changes["dataframe"]
+        self._check_partition_column(df)
+        self._resolve_metadata_types(df)
+        diffed = time.perf_counter()
+
+        if force_full or not changes["existing_hashes"]:
+            plan = self._full_plan(df, changes["current_hashes"])
+        else:
+            plan = self._incremental_plan(
+                df, changes["added"], changes["changed"], changes["deleted"], changes["current_hashes"]
+            )
+        # Parse, hash and diff times from change detection (the whole step when it reports none)
+        plan.timings = {**changes.get("timings", {"diff": diffed - started}), "prepare": time.perf_counter() - diffed}
+        return plan
+
+    def apply(self, plan: IngestPlan, progress: Callable[[int], None] | None = None) -> dict[str, int]:
+        """
+        Execute a plan: embed and write its documents, remove stale ones and store the hashes.
+
+        Args:
+            plan: Plan from ``plan()``
+            progress: Called with the number of documents after each written batch
+
+        Returns:
+            ``{"documents": n}`` for a full plan; counts of added, changed, deleted rows
+            (and embedded chunks when chunking is enabled) for an incremental plan
+        """
+        loader = self.incremental_loader
+        timings = plan.timings
+
+        started = time.perf_counter()
+        if plan.mode == "full":
+            # Write the new version, then drop documents from earlier loads
+            loader.reset_hashes()
+            with collect_phases() as phases:
+                content_hashes = self._write_batches(plan.documents, progress)
+            written = self._record_write(plan, phases, time.perf_counter() - started)
+            delete_stale = getattr(self.vector_db, "delete_stale", None)
+            if callable(delete_stale):
+                delete_stale(*content_hashes)
+            result = {"documents": len(plan.documents)}
+            logger.info("Full load complete", documents=len(plan.documents))
+        else:
+            self._delete_names(plan.stale)
+            embed_started = time.perf_counter()
+            with collect_phases() as phases:
+                self._write_batches(plan.documents, progress)
+            written = self._record_write(plan, phases, time.perf_counter() - embed_started)
+            if plan.added:
+                logger.info("Added documents", count=len(plan.added))
+            if plan.changed:
+                logger.info("Updated documents", count=len(plan.changed))
+
+            # Process deletions
+            if plan.deleted:
+                names = [self._document_name(row_id) for row_id in plan.deleted]
+                if self.chunking:
+                    stored = loader.load_chunk_hashes(plan.deleted)
+                    names += [self._chunk_name(idx, h) for idx, hashes in stored.items() for h in sorted(hashes)]
+                    loader.delete_chunk_hashes(plan.deleted)
+                self._delete_names(names)
+                loader.delete_hashes(plan.deleted)
+                logger.info("Deleted documents", count=len(plan.deleted))
+            result = {"added": len(plan.added), "changed": len(plan.changed), "deleted": len(plan.deleted)}
+            if self.chunking or self.dedup:
+                result["embedded"] = len(plan.documents)
+        timings["cleanup"] = time.perf_counter() - started - written
+        self._store_state(plan)
+        return result
+
+    async def aapply(self, plan: IngestPlan, progress: Callable[[int], None] | None = None) -> dict[str, int]:
+        """
+        Async version of apply(): async embedding and vector writes, state tables in the worker pool.
+
+        Args:
+            plan: Plan from ``plan()``
+            progress: Called with the number of documents after each written batch
+
+        Returns:
+            Same statistics as ``apply()``
+        """
+        loader = self.incremental_loader
+        timings = plan.timings
+
+        started = time.perf_counter()
+        if plan.mode == "full":
+            await run_in_ingest_pool(loader.reset_hashes)
+            with collect_phases() as phases:
+                content_hashes = await self._awrite_batches(plan.documents, progress)
+            written = self._record_write(plan, phases, time.perf_counter() - started)
+            async_delete_stale = _async_method(self.vector_db, "async_delete_stale")
+            delete_stale = getattr(self.vector_db, "delete_stale", None)
+            if async_delete_stale is not None:
+                await async_delete_stale(*content_hashes)
+            elif callable(delete_stale):
+                await run_in_ingest_pool(delete_stale, *content_hashes)
+            result = {"documents": len(plan.documents)}
+            logger.info("Full load complete", documents=len(plan.documents))
+        else:
+            await self._adelete_names(plan.stale)
+            embed_started = time.perf_counter()
+            with collect_phases() as phases:
+                await self._awrite_batches(plan.documents, progress)
+            written = self._record_write(plan, phases, time.perf_counter() - embed_started)
+
+            if plan.deleted:
+                names = [self._document_name(row_id) for row_id in plan.deleted]
+                if self.chunking:
+                    stored = await run_in_ingest_pool(loader.load_chunk_hashes, plan.deleted)
+                    names += [self._chunk_name(idx, h) for idx, hashes in stored.items() for h in sorted(hashes)]
+                    await run_in_ingest_pool(loader.delete_chunk_hashes, plan.deleted)
+                await self._adelete_names(names)
+                await run_in_ingest_pool(loader.delete_hashes, plan.deleted)
+            result = {"added": len(plan.added), "changed": len(plan.changed), "deleted": len(plan.deleted)}
+            if self.chunking or self.dedup:
+                result["embedded"] = len(plan.documents)
+            logger.info("Incremental changes applied", **result)
+        timings["cleanup"] = time.perf_counter() - started - written
+        await run_in_ingest_pool(self._store_state, plan)
+        return result
+
+    def _record_write(self, plan: IngestPlan, phases: dict[str, float], seconds: float) -> float:
+        """
+        Record the embed and upsert time, batches and embedding tokens of a plan's writes.
+
+        Args:
+            plan: Plan whose documents were just written
+            phases: Phases the store reported during the writes
+            seconds: Time the writes took
+
+        Returns:
+            ``seconds``
+        """
+        if "embed" in phases:
+            plan.timings["embed"] = phases["embed"]
+            plan.timings["upsert"] = max(seconds - phases["embed"], 0.0)
+        else:
+            # The store embeds inside its writes: count them as embedding
+            plan.timings["embed"] = seconds
+        plan.batches = -(-len(plan.documents) // self.write_batch_size)
+        plan.embedding_tokens = embedding_tokens(plan.documents)
+        return seconds
+
+    def _store_state(self, plan: IngestPlan) -> None:
+        """
+        Store the hashes of an applied plan, log its changes and record its throughput and metrics.
+
+        Args:
+            plan: Applied plan (its ``hashes`` timing and change-log ``version`` are set here)
+        """
+        loader = self.incremental_loader
+        hashes_started = time.perf_counter()
+        plan.version = loader.store_load(
+            plan.mode,
+            plan.hashes,
+            plan.added,
+            plan.changed,
+            plan.deleted,
+            chunk_hashes=plan.chunk_hashes if self.chunking else None,
+            representatives=plan.representatives,
+        )
+        plan.timings["hashes"] = time.perf_counter() - hashes_started
+
+        if plan.documents:
+            write_seconds = plan.timings["embed"] + plan.timings.get("upsert", 0.0)
+            loader.record_run(plan.mode, len(plan.documents), plan.characters, write_seconds)
+
+        rows = len(plan.dataframe)
+        elapsed = sum(plan.timings.values())
+        logger.info(
+            "Load phases",
+            table=self.vector_db.table_name,
+            mode=plan.mode,
+            rows=rows,
+            rows_per_second=round(rows / elapsed, 1) if elapsed else None,
+            documents=len(plan.documents),
+            batches=plan.batches,
+            embedding_tokens=plan.embedding_tokens,
+            **{f"{phase}_seconds": round(seconds, 3) for phase, seconds in plan.timings.items()},
+        )
+        record_ingest(
+            self.vector_db.table_name,
+            plan.mode,
+            rows,
+            len(plan.documents),
+            plan.batches,
+            plan.embedding_tokens,
+            plan.timings,
+        )
+
+    def _diff_chunks(
+        self, df: pd.DataFrame, row_ids: list[int]
+    ) -> tuple[list[Document], list[str], dict[int, list[str]]]:
+        """
+        Compare the chunks of added and changed rows with the stored chunk hashes.
+
+        Args:
+            df: Parsed CSV dataframe
+            row_ids: Added and changed rows
+
+        Returns:
+            Chunks to embed, names of stale chunks to delete, and the new chunk hashes per row
+        """
+        stored = self.incremental_loader.load_chunk_hashes(row_ids)
+        to_write: list[Document] = []
+        stale: list[str] = []
+        chunk_hashes: dict[int, list[str]] = {}
+        for idx in row_ids:
+            chunks = self._row_to_chunks(df.loc[idx], idx)
+            previous = stored.get(idx, set())
+            to_write.extend(doc for chunk_hash, doc in chunks.items() if chunk_hash not in previous)
+            stale.extend(self._chunk_name(idx, chunk_hash) for chunk_hash in sorted(previous - chunks.keys()))
+            chunk_hashes[idx] = list(chunks)
+        return to_write, stale, chunk_hashes
+
+    def pending(self, csv_path: str | Path) -> int:
+        """
+        Count rows the next load would add, change or delete.
+
+        Args:
+            csv_path: Path to CSV, Parquet, Arrow or JSONL file
+
+        Returns:
+            Number of pending row changes (every row before the first load)
+        """
+        changes = self.incremental_loader.detect_changes(csv_path, self.columns)
+        return len(changes["added"]) + len(changes["changed"]) + len(changes["deleted"])
+
+    def current_version(self) -> int:
+        """
+        Change-log version of the last load that changed something.
+
+        Returns:
+            Latest version, or 0 before the first load
+        """
+        return self.incremental_loader.current_version()
+
+    def changes_since(self, version: int, limit: int | None = None) -> ChangeSet:
+        """
+        Row changes after a change-log version, for downstream copies to catch up.
+
+        Documents of a row are named ``{document_prefix}_{row_id}`` (chunks share that prefix).
+
+        Args:
+            version: Last version the caller applied (0 for everything since the last full load)
+            limit: Read at most this many versions
+
+        Returns:
+            Net added, changed and deleted rows with their hashes
+        """
+        return self.incremental_loader.changes_since(version, limit)
+
+    def last_synced(self) -> datetime | None:
+        """
+        Time of the last load.
+
+        Returns:
+            Latest hash update, or None before the first load
+        """
+        return self.incremental_loader.last_synced()
+
     def load(
         self,
         csv_path: str | Path,
@@ -170,19 +974,31 @@ class CSVKnowledgeLoader:
         Load CSV file (auto-detects full vs incremental).
 
         Args:
-            csv_path: Path to CSV file
+            csv_path: Path to CSV, Parquet, Arrow or JSONL file
             force_full: Force full reload even if hashes exist
 
         Returns:
             Dictionary with load statistics
         """
-        # Check if this is the first load
-        existing_hashes = self.incremental_loader._load_existing_hashes()
-        is_first_load = not existing_hashes or force_full
+        plan = self.plan(csv_path, force_full=force_full)
+        stats = self.apply(plan)
+        return {"mode": plan.mode, **stats}
 
-        if is_first_load:
-            count = self.load_full(csv_path)
-            return {"mode": "full", "documents": count}
-        else:
-            stats = self.load_incremental(csv_path)
-            return {"mode": "incremental", **stats}
+    async def aload(
+        self,
+        csv_path: str | Path,
+        force_full: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Async version of load; never blocks the event loop.
+
+        Args:
+            csv_path: Path to CSV, Parquet, Arrow or JSONL file
+            force_full: Force full reload even if hashes exist
+
+        Returns:
+            Dictionary with load statistics
+        """
+        plan = await run_in_ingest_pool(partial(self.plan, csv_path, force_full=force_full))
+        stats = await self.aapply(plan)
+        return {"mode": plan.mode, **stats}
@@ -0,0 +1,217 @@
+"""
+Near-duplicate detection for tabular knowledge sources.
+
+Scraped sources often hold many near-identical rows (boilerplate answers
+with another product name). Embedded one by one they cost an embedding call
+each, grow the index, and crowd the top-k with copies of one answer. With
+``dedup`` configured, ``CSVKnowledgeLoader`` clusters such rows before
+embedding and embeds one representative per cluster:
+
+- Content is split into word shingles (``shingle_size`` consecutive words)
+  and summarized by a MinHash signature of ``num_perm`` hash values, so the
+  share of equal values estimates the Jaccard similarity of two rows
+- LSH banding buckets signatures, so only rows sharing a bucket are compared;
+  pairs whose estimated similarity reaches ``threshold`` join a cluster
+- Rows only cluster within one partition (``partition_by`` value)
+- The representative is the cluster's lowest row id; its document lists the
+  other rows under ``duplicate_rows`` and their differing metadata under
+  ``duplicates``
+
+Configuration (agent config.yaml or hive.yaml):
+    knowledge:
+      dedup:
+        threshold: 0.8      # estimated Jaccard similarity of word shingles
+        shingle_size: 3     # words per shingle
+        num_perm: 128       # MinHash signature length
+
+Notes:
+- A filter on a metadata value that only a duplicate row has does not match
+  the representative's document
+- Clustering is approximate: a pair above the threshold is found with high
+  probability (about 95% at 0.8), not always
+"""
+
+import re
+import zlib
+from collections.abc import Hashable, Sequence
+from typing import Any
+
+import numpy as np
+
+# Prime just above 2**32: shingle hashes are 32-bit, so (a * x + b) mod p is a permutation of them
+_PRIME = 4294967311
+_SEED = 1
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = 3) -> set[int]:
+    """
+    Hashed word shingles of a text.
+
+    Args:
+        text: Text to shingle (case and punctuation are ignored)
+        size: Words per shingle
+
+    Returns:
+        32-bit hashes of every run of ``size`` consecutive words (one shingle for shorter texts,
+        none for texts without words)
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return set()
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode())}
+    return {zlib.crc32(" ".join(words[i : i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+def lsh_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """
+    Split a signature into LSH bands.
+
+    Picks the longest band whose candidate threshold ``(1 / bands) ** (1 / rows)``
+    is still at or below ``threshold``, so pairs above it become candidates
+    with high probability while dissimilar pairs rarely do.
+
+    Args:
+        num_perm: Signature length
+        threshold: Target Jaccard similarity
+
+    Returns:
+        Number of bands and rows per band (``bands * rows == num_perm``)
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class MinHasher:
+    """MinHash signatures over hashed shingles with a fixed (reproducible) permutation family."""
+
+    def __init__(self, num_perm: int = 128) -> None:
+        """
+        Draw the permutations.
+
+        Args:
+            num_perm: Signature length
+        """
+        rng = np.random.default_rng(_SEED)
+        # a < 2**31 keeps a * x + b below 2**64 for 32-bit x
+        self._a = rng.integers(1, 2**31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2**31, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, shingle_hashes: set[int]) -> np.ndarray:
+        """
+        MinHash signature of a shingle set.
+
+        Args:
+            shingle_hashes: 32-bit shingle hashes (non-empty)
+
+        Returns:
+            Minimum of each permutation over the shingles
+        """
+        values = np.fromiter(shingle_hashes, dtype=np.uint64, count=len(shingle_hashes))
+        permuted = (self._a[:, None] * values[None, :] + self._b[:, None]) % np.uint64(_PRIME)
+        return permuted.min(axis=1)
+
+
+def _find(parent: dict[int, int], row: int) -> int:
+    """Root of a row's cluster (with path halving)."""
+    while parent[row] != row:
+        parent[row] = parent[parent[row]]
+        row = parent[row]
+    return row
+
+
+def cluster_near_duplicates(
+    texts: dict[int, str],
+    groups: dict[int, Hashable] | None = None,
+    threshold: float = 0.8,
+    shingle_size: int = 3,
+    num_perm: int = 128,
+) -> dict[int, int]:
+    """
+    Cluster rows with near-identical text.
+
+    Args:
+        texts: Text per row id
+        groups: Group per row id; rows only cluster within their group (default: one group)
+        threshold: Estimated Jaccard similarity at which two rows are duplicates
+        shingle_size: Words per shingle
+        num_perm: MinHash signature length
+
+    Returns:
+        Representative (lowest row id of its cluster) per row id; rows without
+        near duplicates map to themselves
+    """
+    hasher = MinHasher(num_perm)
+    bands, rows = lsh_bands(num_perm, threshold)
+    signatures: dict[int, np.ndarray] = {}
+    for row_id, text in texts.items():
+        hashes = shingles(text, shingle_size)
+        # Rows without words are never duplicates of anything
+        if hashes:
+            signatures[row_id] = hasher.signature(hashes)
+
+    parent = {row_id: row_id for row_id in texts}
+    for band in range(bands):
+        buckets: dict[tuple[Any, bytes], int] = {}
+        for row_id in sorted(signatures):
+            signature = signatures[row_id]
+            key = ((groups or {}).get(row_id), signature[band * rows : (band + 1) * rows].tobytes())
+            first = buckets.setdefault(key, row_id)
+            if first == row_id or _find(parent, first) == _find(parent, row_id):
+                continue
+            # Compare with the bucket's first row only: duplicate clusters are tight, so this
+            # keeps large boilerplate buckets linear instead of quadratic
+            if float(np.mean(signatures[first] == signature)) >= threshold:
+                root, other = sorted((_find(parent, first), _find(parent, row_id)))
+                parent[other] = root
+    return {row_id: _find(parent, row_id) for row_id in texts}
+
+
+def clusters(representatives: dict[int, int]) -> dict[int, list[int]]:
+    """
+    Members of each cluster.
+
+    Args:
+        representatives: Representative per row id
+
+    Returns:
+        Sorted member row ids per representative (including the representative)
+    """
+    members: dict[int, list[int]] = {}
+    for row_id in sorted(representatives):
+        members.setdefault(representatives[row_id], []).append(row_id)
+    return members
+
+
+def duplicate_metadata(
+    representative: dict[str, Any], members: Sequence[tuple[int, dict[str, Any]]]
+) -> list[dict[str, Any]]:
+    """
+    Metadata of a cluster's other rows, as attached to the representative's document.
+
+    Args:
+        representative: Metadata of the representative row
+        members: Row id and metadata of each other row
+
+    Returns:
+        One entry per row: its row id and the values that differ from the representative's
+    """
+    return [
+        {
+            "row_id": row_id,
+            **{
+                key: value
+                for key, value in metadata.items()
+                if key not in ("row_id", "source") and value != representative.get(key)
+            },
+        }
+        for row_id, metadata in members
+    ]
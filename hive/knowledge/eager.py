@@ -0,0 +1,315 @@
+"""
+Eager retrieval: search the knowledge base while the agent prepares the run.
+
+With only the ``search_knowledge`` tool, a RAG turn costs three sequential
+steps: a model call that decides to search, the search, and a second model
+call that answers. ``EagerRetrievalAgent`` starts a knowledge search on the raw
+user message as soon as ``run()``/``arun()`` is called. The search runs while
+the agent loads the session, resolves tools and builds the system prompt. Its
+results go into the first prompt as references, so most turns need a single
+model call. The search tool stays available for follow-up queries.
+
+Configuration (agent config.yaml):
+    settings:
+      eager_retrieval: true
+      # or
+      eager_retrieval:
+        num_documents: 3        # references injected (default: knowledge max_results)
+        timeout: 2.0            # seconds to wait for a slow search before answering without it
+
+Notes:
+- Only string messages are prefetched; other inputs run unchanged
+- The prefetch is used when the prompt's query, filters and owner (``user_id``) match it; any other
+  search (e.g. a tool call with a rewritten query) goes to the knowledge base
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from agno.agent import Agent
+from agno.knowledge.document import Document
+from loguru import logger
+
+
+@dataclass
+class EagerRetrievalConfig:
+    """Eager retrieval settings."""
+
+    num_documents: int | None = None
+    timeout: float | None = 5.0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | bool | None) -> "EagerRetrievalConfig | None":
+        """
+        Build a config from the ``eager_retrieval`` setting.
+
+        Args:
+            data: ``true``/``false`` or a mapping with num_documents and timeout
+
+        Returns:
+            EagerRetrievalConfig, or None when eager retrieval is disabled
+        """
+        if not data:
+            return None
+        if data is True:
+            return cls()
+        defaults = cls()
+        return cls(
+            num_documents=data.get("num_documents", defaults.num_documents),
+            timeout=data.get("timeout", defaults.timeout),
+        )
+
+
+@dataclass
+class _Prefetch:
+    """A search started at the beginning of a run."""
+
+    query: str
+    filters: Any
+    user_id: str | None
+    limit: int
+    handle: "Future[list[Document]] | asyncio.Task[list[Document]]"
+    started: float
+    used: bool = False
+
+
+# Prefetch of the run executing in the current context (thread or task)
+_current: ContextVar[_Prefetch | None] = ContextVar("hive_eager_prefetch", default=None)
+
+
+def _to_references(documents: list[Document] | None, limit: int) -> list[dict[str, Any]] | None:
+    """Convert documents to the reference dicts agents add to the prompt."""
+    if not documents:
+        return None
+    return [document.to_dict() for document in documents[:limit]]
+
+
+class EagerRetriever:
+    """Knowledge retriever that serves prefetched results to the agent's first prompt."""
+
+    def __init__(self, knowledge: Any, config: EagerRetrievalConfig | None = None) -> None:
+        """
+        Initialize the retriever.
+
+        Args:
+            knowledge: Knowledge base to search
+            config: Number of references and wait timeout
+        """
+        self.knowledge = knowledge
+        self.config = config or EagerRetrievalConfig()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hive-eager")
+
+    def _limit(self, num_documents: int | None = None) -> int:
+        """Number of documents to retrieve."""
+        return self.config.num_documents or num_documents or getattr(self.knowledge, "max_results", None) or 10
+
+    def start(self, query: str, filters: Any = None, user_id: str | None = None) -> _Prefetch:
+        """
+        Start a search in the background thread pool.
+
+        Args:
+            query: Raw user message
+            filters: Knowledge filters of the run
+            user_id: Owner scope of the run
+
+        Returns:
+            Handle to pass to the agent's run context
+        """
+        limit = self._limit()
+        future = self._executor.submit(
+            self.knowledge.search, query=query, max_results=limit, filters=filters, user_id=user_id
+        )
+        return _Prefetch(
+            query=query, filters=filters, user_id=user_id, limit=limit, handle=future, started=time.perf_counter()
+        )
+
+    def astart(self, query: str, filters: Any = None, user_id: str | None = None) -> _Prefetch:
+        """Async version of start (the search runs as a task on the current event loop)."""
+        limit = self._limit()
+        task = asyncio.create_task(
+            self.knowledge.asearch(query=query, max_results=limit, filters=filters, user_id=user_id)
+        )
+        return _Prefetch(
+            query=query, filters=filters, user_id=user_id, limit=limit, handle=task, started=time.perf_counter()
+        )
+
+    def _claim(self, query: str, num_documents: int | None, filters: Any, user_id: str | None) -> _Prefetch | None:
+        """Take the current run's prefetch if it answers this query."""
+        prefetch = _current.get()
+        if prefetch is None or prefetch.used:
+            return None
+        if prefetch.query != query or prefetch.filters != filters or prefetch.user_id != user_id:
+            return None
+        if self._limit(num_documents) > prefetch.limit:
+            return None
+        prefetch.used = True
+        return prefetch
+
+    def _log_used(self, prefetch: _Prefetch, waited: float, references: list[dict[str, Any]] | None) -> None:
+        """Report how much of the search overlapped with run setup."""
+        elapsed_ms = (time.perf_counter() - prefetch.started) * 1000
+        logger.debug(
+            "Eager retrieval used",
+            results=len(references or []),
+            search_ms=round(elapsed_ms, 1),
+            waited_ms=round((time.perf_counter() - waited) * 1000, 1),
+        )
+
+    def __call__(
+        self,
+        query: str,
+        num_documents: int | None = None,
+        filters: Any = None,
+        user_id: str | None = None,
+        **kwargs: Any,
+    ) -> list[dict[str, Any]] | None | Any:
+        """
+        Return references for a query (agno ``knowledge_retriever`` interface).
+
+        Uses the run's prefetched search when it matches, otherwise searches
+        the knowledge base. Inside ``arun`` the result is awaitable.
+
+        Args:
+            query: Search query
+            num_documents: Number of documents
+            filters: Knowledge filters
+            user_id: Owner scope of the run
+            **kwargs: Other retriever arguments (ignored)
+
+        Returns:
+            Reference dicts, None when nothing was found, or an awaitable of either
+        """
+        limit = self._limit(num_documents)
+        current = _current.get()
+        is_async = current is not None and isinstance(current.handle, asyncio.Task)
+        prefetch = self._claim(query, num_documents, filters, user_id)
+
+        if prefetch is None:
+            if is_async:
+                return self._asearch(query, limit, filters, user_id)
+            documents = self.knowledge.search(query=query, max_results=limit, filters=filters, user_id=user_id)
+            return _to_references(documents, limit)
+        if is_async:
+            return self._await_prefetch(prefetch, limit)
+
+        waited = time.perf_counter()
+        try:
+            references = _to_references(prefetch.handle.result(timeout=self.config.timeout), limit)
+        except FutureTimeoutError:
+            logger.warning("Eager retrieval timed out, answering without references", timeout=self.config.timeout)
+            return None
+        except Exception as e:
+            logger.warning("Eager retrieval failed", error=str(e))
+            return None
+        self._log_used(prefetch, waited, references)
+        return references
+
+    async def _asearch(self, query: str, limit: int, filters: Any, user_id: str | None) -> list[dict[str, Any]] | None:
+        """Search without a prefetch on the async path."""
+        documents = await self.knowledge.asearch(query=query, max_results=limit, filters=filters, user_id=user_id)
+        return _to_references(documents, limit)
+
+    async def _await_prefetch(self, prefetch: _Prefetch, limit: int) -> list[dict[str, Any]] | None:
+        """Wait for an async prefetch."""
+        waited = time.perf_counter()
+        try:
+            references = _to_references(await asyncio.wait_for(prefetch.handle, self.config.timeout), limit)
+        except TimeoutError:
+            logger.warning("Eager retrieval timed out, answering without references", timeout=self.config.timeout)
+            return None
+        except Exception as e:
+            logger.warning("Eager retrieval failed", error=str(e))
+            return None
+        self._log_used(prefetch, waited, references)
+        return references
+
+    def close(self) -> None:
+        """Stop the search thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class EagerRetrievalAgent(Agent):
+    """Agent that retrieves knowledge for the raw message while the run is being set up."""
+
+    def __init__(self, *args: Any, eager_retrieval: EagerRetrievalConfig | None = None, **kwargs: Any) -> None:
+        """
+        Initialize the agent.
+
+        Args:
+            *args: Agent positional arguments
+            eager_retrieval: Eager retrieval settings (None disables it)
+            **kwargs: Agent keyword arguments
+        """
+        super().__init__(*args, **kwargs)
+        self.eager: EagerRetriever | None = None
+        if eager_retrieval is None or self.knowledge is None:
+            return
+        if self.knowledge_retriever is not None:
+            logger.warning("Eager retrieval disabled: agent already has a knowledge_retriever", agent=self.name)
+            return
+        self.eager = EagerRetriever(self.knowledge, eager_retrieval)
+        self.knowledge_retriever = self.eager
+        self.add_knowledge_to_context = True
+
+    def _filters(self, kwargs: dict[str, Any]) -> Any:
+        """Knowledge filters the run will search with."""
+        return kwargs.get("knowledge_filters") or self.knowledge_filters
+
+    def _user_id(self, kwargs: dict[str, Any]) -> str | None:
+        """Owner scope the run will search with."""
+        return kwargs.get("user_id") or self.user_id
+
+    def run(self, input: Any, *, stream: bool | None = None, **kwargs: Any) -> Any:  # noqa: A002
+        """Start retrieval for the message, then run the agent with the results in the first prompt."""
+        if self.eager is None or not isinstance(input, str):
+            return super().run(input, stream=stream, **kwargs)
+
+        prefetch = self.eager.start(input, self._filters(kwargs), self._user_id(kwargs))
+        if bool(self.stream if stream is None else stream):
+            return self._run_stream(prefetch, super().run(input, stream=stream, **kwargs))
+        token = _current.set(prefetch)
+        try:
+            return super().run(input, stream=stream, **kwargs)
+        finally:
+            _current.reset(token)
+
+    def _run_stream(self, prefetch: _Prefetch, events: Iterator[Any]) -> Iterator[Any]:
+        """Expose the prefetch while a streaming run is consumed."""
+        token = _current.set(prefetch)
+        try:
+            yield from events
+        finally:
+            _current.reset(token)
+
+    def arun(self, input: Any, *, stream: bool | None = None, **kwargs: Any) -> Any:  # noqa: A002
+        """Async version of run (returns an awaitable, or an async iterator when streaming)."""
+        if self.eager is None or not isinstance(input, str):
+            return super().arun(input, stream=stream, **kwargs)
+        if bool(self.stream if stream is None else stream):
+            return self._arun_stream(input, stream, kwargs)
+        return self._arun(input, stream, kwargs)
+
+    async def _arun(self, message: str, stream: bool | None, kwargs: dict[str, Any]) -> Any:
+        """Non-streaming async run with eager retrieval."""
+        assert self.eager is not None
+        token = _current.set(self.eager.astart(message, self._filters(kwargs), self._user_id(kwargs)))
+        try:
+            return await super().arun(message, stream=stream, **kwargs)
+        finally:
+            _current.reset(token)
+
+    async def _arun_stream(self, message: str, stream: bool | None, kwargs: dict[str, Any]) -> AsyncIterator[Any]:
+        """Streaming async run with eager retrieval."""
+        assert self.eager is not None
+        token = _current.set(self.eager.astart(message, self._filters(kwargs), self._user_id(kwargs)))
+        try:
+            async for event in super().arun(message, stream=stream, **kwargs):
+                yield event
+        finally:
+            _current.reset(token)
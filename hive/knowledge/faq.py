@@ -0,0 +1,385 @@
+"""
+FAQ short-circuit: answer near-verbatim FAQ questions without calling the model.
+
+Much support traffic repeats questions already in the FAQ CSV. For agents
+with CSV knowledge, ``FAQAgent`` searches the knowledge base before the run.
+When the top hit's ``similarity_score`` clears the threshold and the row has
+an answer, that answer (optionally templated) is returned immediately and the
+model is never called.
+
+Hit rates, lookup time and estimated latency saved are recorded per agent
+(see ``get_faq_stats()``). Latency saved is estimated from the agent's
+average model-run latency on misses.
+
+Configuration (agent config.yaml):
+    knowledge:
+      type: csv
+      source: data/faq.csv
+      content_column: question
+      faq:
+        threshold: 0.92           # minimum similarity_score of the top hit
+        answer_column: answer     # CSV column returned as the answer
+        template: "{answer}\\n\\n(From our FAQ: {question})"
+
+Notes:
+- ``similarity_score`` follows the store's search type; vector search gives the
+  most predictable threshold (hybrid scores blend in keyword rank)
+- The lookup uses the run's ``knowledge_filters`` and ``user_id``, so it only
+  answers from rows the run itself could retrieve
+- Short-circuited answers are not sent through the model, so they are not
+  added to the agent's session history
+"""
+
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import uuid4
+
+from agno.agent import Agent
+from agno.knowledge.document import Document
+from agno.run.agent import RunCompletedEvent, RunContentEvent, RunOutput
+from agno.run.base import RunStatus
+from loguru import logger
+
+from hive.knowledge.context import BudgetedKnowledge
+
+# Weight of the newest sample in the model-latency moving average
+_LATENCY_SMOOTHING = 0.2
+
+
+@dataclass
+class FAQConfig:
+    """FAQ short-circuit settings."""
+
+    threshold: float = 0.9
+    answer_column: str = "answer"
+    template: str | None = None
+
+    def __post_init__(self) -> None:
+        """Validate the threshold."""
+        if not 0.0 < self.threshold <= 1.0:
+            raise ValueError("FAQ threshold must be in (0, 1]")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "FAQConfig":
+        """
+        Build an FAQ config from the YAML ``faq:`` mapping.
+
+        Args:
+            data: Mapping with optional threshold, answer_column and template keys
+
+        Returns:
+            FAQConfig with unspecified values left at their defaults
+        """
+        if not data:
+            return cls()
+        defaults = cls()
+        return cls(
+            threshold=float(data.get("threshold", defaults.threshold)),
+            answer_column=str(data.get("answer_column", defaults.answer_column)),
+            template=data.get("template"),
+        )
+
+
+@dataclass
+class FAQHit:
+    """A knowledge hit confident enough to answer directly."""
+
+    answer: str
+    score: float
+    document: Document
+
+
+@dataclass
+class FAQStats:
+    """Short-circuit counters for one agent."""
+
+    lookups: int = 0
+    hits: int = 0
+    lookup_ms: float = 0.0
+    saved_ms: float = 0.0
+    model_run_ms: float = 0.0
+    model_runs: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the FAQ."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def record_lookup(self, elapsed_ms: float, hit: bool) -> None:
+        """Count a lookup; a hit saves one average model run."""
+        with self._lock:
+            self.lookups += 1
+            self.lookup_ms += elapsed_ms
+            if hit:
+                self.hits += 1
+                self.saved_ms += max(self.model_run_ms - elapsed_ms, 0.0)
+
+    def record_model_run(self, elapsed_ms: float) -> None:
+        """Update the average latency of runs that went to the model."""
+        with self._lock:
+            if self.model_runs == 0:
+                self.model_run_ms = elapsed_ms
+            else:
+                self.model_run_ms += _LATENCY_SMOOTHING * (elapsed_ms - self.model_run_ms)
+            self.model_runs += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """Snapshot for reporting."""
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": self.hit_rate,
+                "lookup_ms": self.lookup_ms,
+                "saved_ms": self.saved_ms,
+                "model_run_ms": self.model_run_ms,
+                "model_runs": self.model_runs,
+            }
+
+
+_stats: dict[str, FAQStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_faq_stats(agent_name: str | None = None) -> dict[str, dict[str, Any]]:
+    """
+    Report FAQ short-circuit stats.
+
+    Args:
+        agent_name: Limit the report to one agent
+
+    Returns:
+        Stats per agent name (lookups, hits, hit_rate, lookup_ms, saved_ms, ...)
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    return {name: s.to_dict() for name, s in stats.items() if agent_name is None or name == agent_name}
+
+
+def _stats_for(agent_name: str) -> FAQStats:
+    """Get or create the stats record for an agent."""
+    with _stats_lock:
+        return _stats.setdefault(agent_name, FAQStats())
+
+
+class FAQShortCircuit:
+    """Looks up a message in CSV knowledge and decides whether it can be answered directly."""
+
+    def __init__(
+        self,
+        knowledge: Any,
+        config: FAQConfig | None = None,
+        content_column: str = "content",
+        agent_name: str = "agent",
+    ) -> None:
+        """
+        Initialize the FAQ lookup.
+
+        Args:
+            knowledge: Knowledge base built from the FAQ CSV
+            config: Threshold, answer column and template
+            content_column: CSV column stored as document content
+            agent_name: Name stats are recorded under
+        """
+        self.knowledge = knowledge
+        self.config = config or FAQConfig()
+        self.content_column = content_column
+        self.stats = _stats_for(agent_name)
+
+    def _answer(self, document: Document) -> str | None:
+        """Answer text for a hit, or None when the row has no answer."""
+        meta_data = document.meta_data or {}
+        if self.config.answer_column == self.content_column:
+            answer: Any = document.content
+        else:
+            answer = meta_data.get(self.config.answer_column)
+        if answer is None or not str(answer).strip() or str(answer) == "nan":
+            return None
+
+        answer = str(answer)
+        if not self.config.template:
+            return answer
+        fields = {key: value for key, value in meta_data.items() if isinstance(key, str)}
+        fields.update({"answer": answer, self.content_column: document.content})
+        try:
+            return self.config.template.format(**fields)
+        except (KeyError, IndexError, ValueError) as e:
+            logger.warning("FAQ template failed, returning the plain answer", error=str(e))
+            return answer
+
+    def _evaluate(self, documents: list[Document], started: float) -> FAQHit | None:
+        """Turn the top search result into a hit (or a miss) and record the lookup."""
+        hit = None
+        if documents:
+            top = documents[0]
+            score = float((top.meta_data or {}).get("similarity_score", 0.0))
+            if score >= self.config.threshold:
+                answer = self._answer(top)
+                if answer is not None:
+                    hit = FAQHit(answer=answer, score=score, document=top)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.stats.record_lookup(elapsed_ms, hit is not None)
+        if hit is not None:
+            logger.debug("FAQ short-circuit hit", document=hit.document.name, score=hit.score, lookup_ms=elapsed_ms)
+        return hit
+
+    def match(self, message: str, filters: Any = None, user_id: str | None = None) -> FAQHit | None:
+        """
+        Find a direct answer for a user message.
+
+        Args:
+            message: Raw user message
+            filters: Knowledge filters of the run
+            user_id: Owner scope of the run
+
+        Returns:
+            FAQHit when the top result clears the threshold, else None
+        """
+        started = time.perf_counter()
+        try:
+            documents = self.knowledge.search(query=message, max_results=1, filters=filters, user_id=user_id)
+        except Exception as e:
+            logger.warning("FAQ lookup failed", error=str(e))
+            documents = []
+        return self._evaluate(documents, started)
+
+    async def amatch(self, message: str, filters: Any = None, user_id: str | None = None) -> FAQHit | None:
+        """Async version of match."""
+        started = time.perf_counter()
+        try:
+            documents = await self.knowledge.asearch(query=message, max_results=1, filters=filters, user_id=user_id)
+        except Exception as e:
+            logger.warning("FAQ lookup failed", error=str(e))
+            documents = []
+        return self._evaluate(documents, started)
+
+
+class FAQAgent(Agent):
+    """Agent that answers high-confidence FAQ matches without calling the model."""
+
+    def __init__(self, *args: Any, faq: FAQConfig | None = None, content_column: str = "content", **kwargs: Any):
+        """
+        Initialize the agent.
+
+        Args:
+            *args: Agent positional arguments
+            faq: FAQ short-circuit settings (None disables the short-circuit)
+            content_column: CSV column stored as document content
+            **kwargs: Agent keyword arguments (``knowledge`` must be the FAQ knowledge base)
+        """
+        super().__init__(*args, **kwargs)
+        self.faq: FAQShortCircuit | None = None
+        if faq is not None and self.knowledge is not None:
+            # Answers come from whole rows, not the token-budgeted excerpts
+            knowledge = self.knowledge
+            if isinstance(knowledge, BudgetedKnowledge):
+                knowledge = knowledge.knowledge
+            self.faq = FAQShortCircuit(
+                knowledge, faq, content_column=content_column, agent_name=self.name or self.id or "agent"
+            )
+
+    def _faq_output(self, message: str, hit: FAQHit, kwargs: dict[str, Any]) -> RunOutput:
+        """Build a completed run for a short-circuited answer."""
+        return RunOutput(
+            run_id=kwargs.get("run_id") or str(uuid4()),
+            agent_id=self.id,
+            agent_name=self.name,
+            session_id=kwargs.get("session_id") or self.session_id,
+            user_id=kwargs.get("user_id") or self.user_id,
+            content=hit.answer,
+            model="faq",
+            model_provider="hive",
+            metadata={"faq_short_circuit": {"document": hit.document.name, "score": hit.score, "query": message}},
+            status=RunStatus.completed,
+        )
+
+    def _faq_events(self, output: RunOutput, kwargs: dict[str, Any]) -> list[Any]:
+        """Stream events for a short-circuited answer."""
+        base = {
+            "agent_id": output.agent_id or "",
+            "agent_name": output.agent_name or "",
+            "run_id": output.run_id,
+            "session_id": output.session_id,
+        }
+        events: list[Any] = [RunContentEvent(content=output.content, **base)]
+        events.append(RunCompletedEvent(content=output.content, metadata=output.metadata, **base))
+        if kwargs.get("yield_run_output"):
+            events.append(output)
+        return events
+
+    def _lookup_scope(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Knowledge filters and owner the run searches with, so the FAQ only answers from rows it could retrieve."""
+        return {
+            "filters": kwargs.get("knowledge_filters") or self.knowledge_filters,
+            "user_id": kwargs.get("user_id") or self.user_id,
+        }
+
+    def _is_streaming(self, stream: bool | None) -> bool:
+        """Resolve the stream flag the way Agent does (explicit argument, then agent default)."""
+        return bool(self.stream if stream is None else stream)
+
+    def run(self, input: Any, *, stream: bool | None = None, **kwargs: Any) -> Any:  # noqa: A002
+        """Answer from the FAQ when confident, otherwise run the agent normally."""
+        if self.faq is None or not isinstance(input, str):
+            return super().run(input, stream=stream, **kwargs)
+
+        hit = self.faq.match(input, **self._lookup_scope(kwargs))
+        if hit is not None:
+            output = self._faq_output(input, hit, kwargs)
+            return iter(self._faq_events(output, kwargs)) if self._is_streaming(stream) else output
+
+        started = time.perf_counter()
+        if self._is_streaming(stream):
+            return self._timed_stream(super().run(input, stream=stream, **kwargs), started)
+        result = super().run(input, stream=stream, **kwargs)
+        self.faq.stats.record_model_run((time.perf_counter() - started) * 1000)
+        return result
+
+    def _timed_stream(self, events: Iterator[Any], started: float) -> Iterator[Any]:
+        """Pass a model stream through and record its latency once it is exhausted."""
+        assert self.faq is not None
+        try:
+            yield from events
+        finally:
+            self.faq.stats.record_model_run((time.perf_counter() - started) * 1000)
+
+    def arun(self, input: Any, *, stream: bool | None = None, **kwargs: Any) -> Any:  # noqa: A002
+        """Async version of run (returns an awaitable, or an async iterator when streaming)."""
+        if self.faq is None or not isinstance(input, str):
+            return super().arun(input, stream=stream, **kwargs)
+        if self._is_streaming(stream):
+            return self._arun_stream(input, stream, kwargs)
+        return self._arun(input, stream, kwargs)
+
+    async def _arun(self, message: str, stream: bool | None, kwargs: dict[str, Any]) -> Any:
+        """Non-streaming async run with FAQ lookup."""
+        assert self.faq is not None
+        hit = await self.faq.amatch(message, **self._lookup_scope(kwargs))
+        if hit is not None:
+            return self._faq_output(message, hit, kwargs)
+
+        started = time.perf_counter()
+        result = await super().arun(message, stream=stream, **kwargs)
+        self.faq.stats.record_model_run((time.perf_counter() - started) * 1000)
+        return result
+
+    async def _arun_stream(self, message: str, stream: bool | None, kwargs: dict[str, Any]) -> AsyncIterator[Any]:
+        """Streaming async run with FAQ lookup."""
+        assert self.faq is not None
+        hit = await self.faq.amatch(message, **self._lookup_scope(kwargs))
+        if hit is not None:
+            for event in self._faq_events(self._faq_output(message, hit, kwargs), kwargs):
+                yield event
+            return
+
+        started = time.perf_counter()
+        try:
+            async for event in super().arun(message, stream=stream, **kwargs):
+                yield event
+        finally:
+            self.faq.stats.record_model_run((time.perf_counter() - started) * 1000)
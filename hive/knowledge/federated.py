@@ -0,0 +1,241 @@
+"""
+Federated search across several knowledge bases.
+
+An agent takes a single ``knowledge`` object. ``FederatedKnowledge`` lets it
+search several Hive knowledge bases (e.g. an FAQ CSV and a product-spec CSV)
+without merging them into one table:
+
+- Every source is queried concurrently (thread pool, or asyncio for ``asearch``)
+- One time budget covers the whole search; sources that miss it are skipped
+- Results are merged with reciprocal-rank fusion (RRF), which needs only ranks,
+  so scores from different search types and distances never have to be compared
+
+Latency is that of the slowest source within the budget, not the sum of all sources.
+
+Usage:
+    from hive.knowledge import create_knowledge_base
+    from hive.knowledge.federated import FederatedKnowledge
+
+    kb = FederatedKnowledge(
+        sources={
+            "faq": create_knowledge_base("data/faq.csv", table_name="faq", use_shared=False),
+            "specs": create_knowledge_base("data/specs.csv", table_name="specs", use_shared=False),
+        },
+        max_results=5,
+        time_budget=1.5,
+    )
+"""
+
+import asyncio
+import time
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any
+
+from agno.knowledge import Knowledge
+from agno.knowledge.document import Document
+from loguru import logger
+
+# Standard RRF damping constant (Cormack et al.); larger values flatten rank differences
+DEFAULT_RRF_K = 60
+
+# Metadata keys added to fused documents
+SOURCE_KEY = "knowledge_source"
+RRF_SCORE_KEY = "rrf_score"
+
+
+def _fusion_key(document: Document) -> tuple[str | None, str]:
+    """Identity of a document across result lists."""
+    return (document.name, document.content)
+
+
+def reciprocal_rank_fusion(
+    rankings: Mapping[str, Sequence[Document]],
+    k: int = DEFAULT_RRF_K,
+    weights: Mapping[str, float] | None = None,
+) -> list[Document]:
+    """
+    Merge ranked result lists with reciprocal-rank fusion.
+
+    Each document scores ``sum(weight / (k + rank))`` over the lists it appears
+    in (rank starts at 1). Documents returned by several sources are merged.
+
+    Args:
+        rankings: Ranked documents per source name
+        k: RRF damping constant
+        weights: Optional per-source weight (default 1.0)
+
+    Returns:
+        Documents ordered by fused score, tagged with their source and RRF score
+    """
+    weights = weights or {}
+    scores: dict[tuple[str | None, str], float] = {}
+    documents: dict[tuple[str | None, str], Document] = {}
+    sources: dict[tuple[str | None, str], list[str]] = {}
+
+    for source, ranked in rankings.items():
+        weight = weights.get(source, 1.0)
+        for rank, document in enumerate(ranked, start=1):
+            key = _fusion_key(document)
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+            documents.setdefault(key, document)
+            sources.setdefault(key, []).append(source)
+
+    fused = []
+    for key in sorted(scores, key=lambda key: scores[key], reverse=True):
+        document = documents[key]
+        meta_data = dict(document.meta_data or {})
+        meta_data[SOURCE_KEY] = sources[key][0] if len(sources[key]) == 1 else sources[key]
+        meta_data[RRF_SCORE_KEY] = scores[key]
+        document.meta_data = meta_data
+        fused.append(document)
+    return fused
+
+
+class FederatedKnowledge(Knowledge):
+    """Knowledge that searches several knowledge bases concurrently and fuses the results."""
+
+    def __init__(
+        self,
+        sources: Mapping[str, Knowledge] | Sequence[Knowledge],
+        max_results: int = 10,
+        time_budget: float | None = 2.0,
+        rrf_k: int = DEFAULT_RRF_K,
+        weights: Mapping[str, float] | None = None,
+        name: str | None = None,
+    ) -> None:
+        """
+        Initialize federated knowledge.
+
+        Args:
+            sources: Knowledge bases by name (a list is named source_0, source_1, ...)
+            max_results: Number of fused results (each source returns this many candidates)
+            time_budget: Seconds for the whole search; late sources are skipped (None = wait for all)
+            rrf_k: Reciprocal-rank fusion constant
+            weights: Per-source RRF weights (default 1.0)
+            name: Knowledge name
+        """
+        if not isinstance(sources, Mapping):
+            sources = {f"source_{i}": source for i, source in enumerate(sources)}
+        if not sources:
+            raise ValueError("FederatedKnowledge needs at least one source")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+
+        super().__init__(name=name, max_results=max_results)
+        self.sources: dict[str, Knowledge] = dict(sources)
+        self.time_budget = time_budget
+        self.rrf_k = rrf_k
+        self.weights: dict[str, float] = dict(weights or {})
+        # Headroom so a source still running past an earlier budget cannot starve the next search
+        self._executor = ThreadPoolExecutor(max_workers=2 * len(self.sources), thread_name_prefix="hive-federated")
+
+    def _fuse(
+        self, rankings: dict[str, list[Document]], limit: int, started: float, skipped: list[str]
+    ) -> list[Document]:
+        """Fuse per-source results and log the outcome."""
+        # Completion order varies; fuse in source order so ties break deterministically
+        ordered = {name: rankings[name] for name in self.sources if name in rankings}
+        documents = reciprocal_rank_fusion(ordered, k=self.rrf_k, weights=self.weights)[:limit]
+        if skipped:
+            logger.warning("Knowledge sources missed the time budget", sources=skipped, time_budget=self.time_budget)
+        logger.debug(
+            "Federated search complete",
+            sources=len(rankings),
+            skipped=len(skipped),
+            results=len(documents),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        return documents
+
+    def search(
+        self,
+        query: str,
+        max_results: int | None = None,
+        filters: Any = None,
+        search_type: str | None = None,
+        user_id: str | None = None,
+        run_response: Any = None,
+    ) -> list[Document]:
+        """
+        Search every source in parallel and fuse the results.
+
+        Args:
+            query: Search query
+            max_results: Number of fused results (default: max_results)
+            filters: Metadata filters passed to every source
+            search_type: Search type override passed to every source
+            user_id: Owner scope passed to every source
+            run_response: Run that query-transformer model calls are billed to
+
+        Returns:
+            Fused documents
+        """
+        limit = max_results or self.max_results
+        started = time.perf_counter()
+        futures = {
+            self._executor.submit(
+                source.search,
+                query=query,
+                max_results=limit,
+                filters=filters,
+                search_type=search_type,
+                user_id=user_id,
+                run_response=run_response,
+            ): name
+            for name, source in self.sources.items()
+        }
+        done, pending = wait(futures, timeout=self.time_budget)
+
+        rankings: dict[str, list[Document]] = {}
+        for future in done:
+            try:
+                rankings[futures[future]] = future.result()
+            except Exception as e:
+                logger.error("Knowledge source search failed", source=futures[future], error=str(e))
+        for future in pending:
+            future.cancel()
+
+        return self._fuse(rankings, limit, started, sorted(futures[f] for f in pending))
+
+    async def asearch(
+        self,
+        query: str,
+        max_results: int | None = None,
+        filters: Any = None,
+        search_type: str | None = None,
+        user_id: str | None = None,
+        run_response: Any = None,
+    ) -> list[Document]:
+        """Async version of search: sources run as tasks and late ones are cancelled."""
+        limit = max_results or self.max_results
+        started = time.perf_counter()
+        tasks = {
+            asyncio.create_task(
+                source.asearch(
+                    query=query,
+                    max_results=limit,
+                    filters=filters,
+                    search_type=search_type,
+                    user_id=user_id,
+                    run_response=run_response,
+                )
+            ): name
+            for name, source in self.sources.items()
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.time_budget)
+
+        rankings: dict[str, list[Document]] = {}
+        for task in done:
+            try:
+                rankings[tasks[task]] = task.result()
+            except Exception as e:
+                logger.error("Knowledge source search failed", source=tasks[task], error=str(e))
+        for task in pending:
+            task.cancel()
+
+        return self._fuse(rankings, limit, started, sorted(tasks[t] for t in pending))
+
+    def close(self) -> None:
+        """Stop the search thread pool (in-flight source searches finish in the background)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
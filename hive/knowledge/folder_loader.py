@@ -0,0 +1,530 @@
+"""
+Document-folder loader for Agno knowledge bases.
+
+Loads a folder of Markdown, text and PDF files (``data/documents/`` in a
+scaffolded project) into PgVector. Each file is chunked (see
+hive.knowledge.chunking) and every chunk becomes a document named
+``doc_{path}_chunk_{hash}`` with the file's path, title and format as metadata.
+
+Incremental ingestion works at two levels:
+1. File fingerprints (``{table}_file_hashes``): size and mtime are compared
+   first, so unchanged files are never read; files whose stat changed are
+   hashed and only re-parsed when their bytes changed
+2. Chunk hashes (``{table}_file_chunk_hashes``): only chunks whose text changed
+   are embedded, and only stale chunks are deleted
+
+Changed files are read, extracted and chunked in a thread pool, and chunks are
+embedded and written in batches on a second pool while parsing continues.
+Adding one file to a large folder therefore costs a stat scan plus one file's
+parse and embedding.
+
+PDF text extraction needs ``pypdf`` (``uv add pypdf``).
+"""
+
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from agno.knowledge.document import Document
+from loguru import logger
+from sqlalchemy import text
+
+from hive.knowledge.chunking import chunk_text
+from hive.knowledge.config import ChunkingConfig
+from hive.knowledge.vectordb import HivePgVector
+
+# File types the loader ingests
+DOCUMENT_SUFFIXES = (".md", ".markdown", ".txt", ".pdf")
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """Stored state of an ingested file."""
+
+    size: int
+    mtime_ns: int
+    hash: str
+
+
+@dataclass
+class _ParsedFile:
+    """A changed file, read and chunked."""
+
+    path: str
+    fingerprint: FileFingerprint
+    chunks: dict[str, Document] = field(default_factory=dict)
+
+
+def read_document(path: Path, data: bytes | None = None) -> str:
+    """
+    Extract the text of a document.
+
+    Args:
+        path: File path (the suffix selects the reader)
+        data: File bytes, when already read
+
+    Returns:
+        Document text
+
+    Raises:
+        ImportError: If a PDF is read without pypdf installed
+    """
+    if path.suffix.lower() == ".pdf":
+        try:
+            from pypdf import PdfReader
+        except ImportError as e:
+            raise ImportError("pypdf is required for PDF documents. Install with: uv add pypdf") from e
+
+        reader = PdfReader(io.BytesIO(data) if data is not None else str(path))
+        return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+    raw = data if data is not None else path.read_bytes()
+    return raw.decode("utf-8", errors="replace")
+
+
+def _title(path: Path, content: str) -> str:
+    """First Markdown heading, or the file name."""
+    for line in content.splitlines()[:20]:
+        if line.startswith("#"):
+            return line.lstrip("#").strip()
+    return path.stem.replace("_", " ").replace("-", " ")
+
+
+def _chunk_name(path: str, chunk_hash: str) -> str:
+    """Document name of a file chunk (content-addressed, so unchanged chunks keep their name)."""
+    return f"doc_{path}_chunk_{chunk_hash[:12]}"
+
+
+class DocumentFolderLoader:
+    """Loads a document folder into PgVector with per-file and per-chunk change detection."""
+
+    def __init__(
+        self,
+        vector_db: HivePgVector,
+        chunking: ChunkingConfig | None = None,
+        suffixes: tuple[str, ...] = DOCUMENT_SUFFIXES,
+        max_workers: int = 4,
+        batch_size: int = 100,
+    ) -> None:
+        """
+        Initialize the folder loader.
+
+        Args:
+            vector_db: HivePgVector instance for document storage
+            chunking: Chunking settings (default: sentence chunks of 1000 characters)
+            suffixes: File suffixes to ingest
+            max_workers: Threads for parsing, and for embedding/writing batches
+            batch_size: Chunks per embedding batch
+        """
+        self.vector_db = vector_db
+        self.chunking = chunking or ChunkingConfig()
+        self.suffixes = tuple(suffix.lower() for suffix in suffixes)
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._file_table = f"{vector_db.table_name}_file_hashes"
+        self._chunk_table = f"{vector_db.table_name}_file_chunk_hashes"
+
+    # --- fingerprint storage ---
+
+    def _ensure_tables(self) -> None:
+        """Create the fingerprint tables if they don't exist."""
+        # Table names are controlled internally, not user input
+        create_files = f"""
+            CREATE TABLE IF NOT EXISTS {self._file_table} (
+                path TEXT PRIMARY KEY,
+                size BIGINT NOT NULL,
+                mtime_ns BIGINT NOT NULL,
+                hash TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        create_chunks = f"""
+            CREATE TABLE IF NOT EXISTS {self._chunk_table} (
+                path TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                PRIMARY KEY (path, hash)
+            )
+        """
+        with self.vector_db.Session() as session:
+            session.execute(text(create_files))
+            session.execute(text(create_chunks))
+            session.commit()
+
+    def _load_fingerprints(self) -> dict[str, FileFingerprint]:
+        """
+        Load stored file fingerprints.
+
+        Returns:
+            Dictionary mapping relative path to fingerprint ({} before the first load)
+        """
+        try:
+            query = f"SELECT path, size, mtime_ns, hash FROM {self._file_table}"  # noqa: S608
+            with self.vector_db.Session() as session:
+                return {
+                    path: FileFingerprint(int(size), int(mtime_ns), file_hash)
+                    for path, size, mtime_ns, file_hash in session.execute(text(query))
+                }
+        except Exception:
+            logger.debug("No existing file fingerprints found", table=self._file_table)
+            return {}
+
+    def _load_chunk_hashes(self, paths: list[str]) -> dict[str, set[str]]:
+        """
+        Load stored chunk hashes for some files.
+
+        Args:
+            paths: Relative paths
+
+        Returns:
+            Dictionary mapping relative path to the hashes of its stored chunks
+        """
+        if not paths:
+            return {}
+        query = f"SELECT path, hash FROM {self._chunk_table} WHERE path = ANY(:paths)"  # noqa: S608
+        chunk_hashes: dict[str, set[str]] = {}
+        with self.vector_db.Session() as session:
+            for path, chunk_hash in session.execute(text(query), {"paths": paths}):
+                chunk_hashes.setdefault(path, set()).add(chunk_hash)
+        return chunk_hashes
+
+    def _save(self, fingerprints: dict[str, FileFingerprint], chunk_hashes: dict[str, list[str]]) -> None:
+        """
+        Store file fingerprints and replace the chunk hashes of re-chunked files.
+
+        Args:
+            fingerprints: New fingerprints per relative path
+            chunk_hashes: All current chunk hashes of each re-chunked file
+        """
+        upsert = f"""
+            INSERT INTO {self._file_table} (path, size, mtime_ns, hash, updated_at)
+            VALUES (:path, :size, :mtime_ns, :hash, CURRENT_TIMESTAMP)
+            ON CONFLICT (path)
+            DO UPDATE SET size = :size, mtime_ns = :mtime_ns, hash = :hash, updated_at = CURRENT_TIMESTAMP
+        """  # noqa: S608
+        delete_chunks = f"DELETE FROM {self._chunk_table} WHERE path = ANY(:paths)"  # noqa: S608
+        insert_chunk = f"INSERT INTO {self._chunk_table} (path, hash) VALUES (:path, :hash) ON CONFLICT DO NOTHING"  # noqa: S608
+        with self.vector_db.Session() as session:
+            if fingerprints:
+                session.execute(
+                    text(upsert),
+                    [
+                        {"path": path, "size": fp.size, "mtime_ns": fp.mtime_ns, "hash": fp.hash}
+                        for path, fp in fingerprints.items()
+                    ],
+                )
+            if chunk_hashes:
+                session.execute(text(delete_chunks), {"paths": list(chunk_hashes)})
+                rows = [{"path": path, "hash": h} for path, hashes in chunk_hashes.items() for h in hashes]
+                if rows:
+                    session.execute(text(insert_chunk), rows)
+            session.commit()
+
+    def _forget(self, paths: list[str]) -> None:
+        """
+        Delete the fingerprints and chunk hashes of removed files.
+
+        Args:
+            paths: Relative paths
+        """
+        if not paths:
+            return
+        with self.vector_db.Session() as session:
+            for table in (self._file_table, self._chunk_table):
+                session.execute(text(f"DELETE FROM {table} WHERE path = ANY(:paths)"), {"paths": paths})  # noqa: S608
+            session.commit()
+
+    def _reset(self) -> None:
+        """Create the fingerprint tables if needed and forget every stored fingerprint."""
+        self._ensure_tables()
+        with self.vector_db.Session() as session:
+            session.execute(text(f"DELETE FROM {self._file_table}"))  # noqa: S608
+            session.execute(text(f"DELETE FROM {self._chunk_table}"))  # noqa: S608
+            session.commit()
+
+    # --- parsing ---
+
+    def scan(self, folder: str | Path) -> dict[str, os.stat_result]:
+        """
+        List ingestible files (hidden files and folders are skipped).
+
+        Args:
+            folder: Document folder
+
+        Returns:
+            Dictionary mapping POSIX path relative to the folder to its stat result
+        """
+        root = Path(folder)
+        files: dict[str, os.stat_result] = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            for filename in filenames:
+                if filename.startswith(".") or not filename.lower().endswith(self.suffixes):
+                    continue
+                path = Path(dirpath) / filename
+                files[path.relative_to(root).as_posix()] = path.stat()
+        return files
+
+    def _parse(self, folder: Path, path: str, previous: FileFingerprint | None) -> _ParsedFile:
+        """
+        Read a file and chunk it unless its bytes are unchanged.
+
+        Args:
+            folder: Document folder
+            path: Relative path
+            previous: Stored fingerprint, if any
+
+        Returns:
+            Parsed file (no chunks when only the file's stat changed)
+        """
+        file_path = folder / path
+        stat = file_path.stat()
+        data = file_path.read_bytes()
+        # MD5 is used for content fingerprinting, not cryptographic purposes
+        fingerprint = FileFingerprint(stat.st_size, stat.st_mtime_ns, hashlib.md5(data).hexdigest())  # noqa: S324
+        parsed = _ParsedFile(path=path, fingerprint=fingerprint)
+        if previous is not None and previous.hash == fingerprint.hash:
+            return parsed
+
+        content = read_document(file_path, data)
+        metadata: dict[str, Any] = {
+            "source": "documents",
+            "path": path,
+            "title": _title(file_path, content),
+            "format": file_path.suffix.lower().lstrip("."),
+        }
+        for chunk in chunk_text(content, self.chunking):
+            if not chunk:
+                continue
+            data_key = json.dumps(metadata, sort_keys=True) + "\u241f" + chunk
+            chunk_hash = hashlib.md5(data_key.encode()).hexdigest()  # noqa: S324
+            parsed.chunks[chunk_hash] = Document(
+                name=_chunk_name(path, chunk_hash), content=chunk, meta_data=dict(metadata)
+            )
+        return parsed
+
+    def _write(self, documents: list[Document]) -> str:
+        """
+        Embed and store one batch of chunks.
+
+        Args:
+            documents: Chunks to write
+
+        Returns:
+            Content hash the batch was stored under
+        """
+        # Content fingerprint of the batch, not used for security
+        fingerprint = hashlib.md5()  # noqa: S324
+        for doc in documents:
+            doc.id = doc.name
+            fingerprint.update(f"{doc.name}\u241f{doc.content}\u241e".encode())
+        content_hash = fingerprint.hexdigest()
+        self.vector_db.upsert(content_hash=content_hash, documents=documents)
+        return content_hash
+
+    def _ingest(self, folder: Path, paths: list[str], stored: dict[str, FileFingerprint]) -> dict[str, Any]:
+        """
+        Parse files and write their new chunks, overlapping parsing with embedding.
+
+        Args:
+            folder: Document folder
+            paths: Relative paths whose stat changed (or all paths on a full load)
+            stored: Stored fingerprints
+
+        Returns:
+            Fingerprints and chunk hashes to store, stale chunk names, batch content hashes and counts
+        """
+        previous_chunks = self._load_chunk_hashes([path for path in paths if path in stored])
+        fingerprints: dict[str, FileFingerprint] = {}
+        chunk_hashes: dict[str, list[str]] = {}
+        stale: list[str] = []
+        failed: list[str] = []
+        writes: list[Future[str]] = []
+        batch: list[Document] = []
+        embedded = 0
+        changed_files = 0
+
+        with (
+            ThreadPoolExecutor(self.max_workers, thread_name_prefix="hive-docs-parse") as parse_pool,
+            ThreadPoolExecutor(self.max_workers, thread_name_prefix="hive-docs-embed") as write_pool,
+        ):
+            futures = {parse_pool.submit(self._parse, folder, path, stored.get(path)): path for path in paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    # Keep the stored version; the file is retried on the next load
+                    logger.warning("Document parse failed", path=path, error=str(e))
+                    failed.append(path)
+                    continue
+
+                fingerprints[path] = parsed.fingerprint
+                previous = stored.get(path)
+                if previous is not None and previous.hash == parsed.fingerprint.hash:
+                    continue
+
+                changed_files += 1
+                old = previous_chunks.get(path, set())
+                new_docs = [doc for chunk_hash, doc in parsed.chunks.items() if chunk_hash not in old]
+                stale.extend(_chunk_name(path, chunk_hash) for chunk_hash in sorted(old - parsed.chunks.keys()))
+                chunk_hashes[path] = list(parsed.chunks)
+                embedded += len(new_docs)
+                batch.extend(new_docs)
+                while len(batch) >= self.batch_size:
+                    writes.append(write_pool.submit(self._write, batch[: self.batch_size]))
+                    batch = batch[self.batch_size :]
+            if batch:
+                writes.append(write_pool.submit(self._write, batch))
+            content_hashes = [write.result() for write in writes]
+
+        return {
+            "fingerprints": fingerprints,
+            "chunk_hashes": chunk_hashes,
+            "stale": stale,
+            "content_hashes": content_hashes,
+            "changed_files": changed_files,
+            "embedded": embedded,
+            "failed": failed,
+        }
+
+    # --- loading ---
+
+    def _diff_files(
+        self, files: dict[str, os.stat_result], stored: dict[str, FileFingerprint]
+    ) -> tuple[list[str], list[str], list[str]]:
+        """
+        Compare a folder scan with the stored fingerprints.
+
+        Args:
+            files: Scan result
+            stored: Stored fingerprints
+
+        Returns:
+            Added paths, paths whose size or mtime changed, and deleted paths
+        """
+        added = [path for path in files if path not in stored]
+        deleted = [path for path in stored if path not in files]
+        # Size and mtime identify unchanged files without reading them
+        touched = [
+            path
+            for path, stat in files.items()
+            if path in stored and (stat.st_size, stat.st_mtime_ns) != (stored[path].size, stored[path].mtime_ns)
+        ]
+        return added, touched, deleted
+
+    def pending(self, folder: str | Path) -> int:
+        """
+        Count files the next load would look at (stat scan only, nothing is read).
+
+        Args:
+            folder: Document folder
+
+        Returns:
+            Added, modified and deleted files (every file before the first load)
+        """
+        added, touched, deleted = self._diff_files(self.scan(folder), self._load_fingerprints())
+        return len(added) + len(touched) + len(deleted)
+
+    def last_synced(self) -> datetime | None:
+        """
+        Time the last file change was ingested.
+
+        Returns:
+            Latest fingerprint update, or None before the first load
+        """
+        try:
+            query = f"SELECT max(updated_at) FROM {self._file_table}"  # noqa: S608
+            with self.vector_db.Session() as session:
+                value = session.execute(text(query)).scalar()
+                return value if isinstance(value, datetime) else None
+        except Exception:
+            logger.debug("No existing file fingerprints found", table=self._file_table)
+            return None
+
+    def load_full(self, folder: str | Path) -> int:
+        """
+        Load every file in the folder (initial load or forced rebuild).
+
+        Args:
+            folder: Document folder
+
+        Returns:
+            Number of chunks loaded
+        """
+        logger.info("Starting full document load", path=str(folder))
+        folder = Path(folder)
+        files = self.scan(folder)
+
+        self._reset()
+        result = self._ingest(folder, sorted(files), {})
+        # Drop documents from earlier loads once the new version is written
+        self.vector_db.delete_stale(*result["content_hashes"])
+        self._save(result["fingerprints"], result["chunk_hashes"])
+
+        logger.info(
+            "Full document load complete", files=len(files), chunks=result["embedded"], failed=len(result["failed"])
+        )
+        return result["embedded"]
+
+    def load_incremental(self, folder: str | Path) -> dict[str, int]:
+        """
+        Load only added, changed and deleted files.
+
+        Args:
+            folder: Document folder
+
+        Returns:
+            Dictionary with counts of added, changed, deleted files and embedded chunks
+        """
+        logger.info("Starting incremental document load", path=str(folder))
+        folder = Path(folder)
+        self._ensure_tables()
+        stored = self._load_fingerprints()
+        added, touched, deleted = self._diff_files(self.scan(folder), stored)
+
+        result = self._ingest(folder, sorted(added + touched), stored)
+
+        stale = list(result["stale"])
+        if deleted:
+            stale.extend(
+                _chunk_name(path, chunk_hash)
+                for path, hashes in self._load_chunk_hashes(deleted).items()
+                for chunk_hash in sorted(hashes)
+            )
+        if stale:
+            self.vector_db.delete_by_names(stale)
+        self._forget(deleted)
+        self._save(result["fingerprints"], result["chunk_hashes"])
+
+        added_count = sum(1 for path in added if path in result["fingerprints"])
+        stats = {
+            "added": added_count,
+            "changed": result["changed_files"] - added_count,
+            "deleted": len(deleted),
+            "embedded": result["embedded"],
+            "failed": len(result["failed"]),
+        }
+        logger.info("Incremental document load complete", **stats)
+        return stats
+
+    def load(self, folder: str | Path, force_full: bool = False) -> dict[str, Any]:
+        """
+        Load a document folder (auto-detects full vs incremental).
+
+        Args:
+            folder: Document folder
+            force_full: Force full reload even if fingerprints exist
+
+        Returns:
+            Dictionary with load statistics
+        """
+        if force_full or not self._load_fingerprints():
+            count = self.load_full(folder)
+            return {"mode": "full", "documents": count}
+        stats = self.load_incremental(folder)
+        return {"mode": "incremental", **stats}
@@ -10,6 +10,22 @@ Algorithm:
 4. Process only the differences
 5. Update database with new hashes
 
+With chunking enabled, changed rows are diffed again at chunk level
+(``{table}_chunk_hashes``) so only chunks whose text changed are re-embedded.
+
+Each load that embeds something is recorded in ``{table}_ingest_runs``; the
+measured embedding throughput drives the time estimates of ``hive knowledge plan``.
+
+Each load that changes something also appends its added, changed and deleted
+row ids to ``{table}_changes`` under a new version (from the
+``{table}_change_version`` sequence). ``changes_since(version)`` returns the
+net changes after a version, so a replica, edge cache or second region syncs
+in O(changes) instead of re-diffing every row. A full load is logged as a
+reset followed by every row, and drops the entries it supersedes.
+``store_load()`` writes a load's hashes and its change-log entry in one
+transaction, and versions are allocated under a transaction-level advisory
+lock, so concurrent writers commit versions in the order they were issued.
+
 Performance Benefits:
 - 10x faster for large CSVs (1000+ rows)
 - Saves embedding costs (only process changes)
@@ -17,12 +33,84 @@ Performance Benefits:
 """
 
 import hashlib
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Any, cast
+from typing import Any
 
 import pandas as pd
 from agno.vectordb.pgvector import PgVector
 from loguru import logger
+from sqlalchemy import text
+
+from hive.knowledge.coordination import advisory_lock_key
+from hive.knowledge.sources import compute_row_hashes, read_source
+
+
+@dataclass
+class ChangeSet:
+    """Net row changes between two change-log versions."""
+
+    since: int
+    version: int  # latest version included (== since when nothing changed)
+    reset: bool = False  # a full load happened: drop every row not in added
+    added: dict[int, str] = field(default_factory=dict)  # row_id -> hash
+    changed: dict[int, str] = field(default_factory=dict)  # row_id -> hash
+    deleted: list[int] = field(default_factory=list)
+
+    @classmethod
+    def from_entries(cls, since: int, entries: list[tuple[int, str, int | None, str | None]]) -> "ChangeSet":
+        """
+        Collapse change-log entries into one net change per row.
+
+        Args:
+            since: Version the caller already has
+            entries: ``(version, op, row_id, hash)`` tuples ordered by version (a reset first in its version)
+
+        Returns:
+            ChangeSet where each row appears once, under its latest operation
+        """
+        changes = cls(since=since, version=since)
+        latest: dict[int, tuple[str, str | None]] = {}
+        for version, op, row_id, row_hash in entries:
+            changes.version = max(changes.version, int(version))
+            if op == "reset":
+                changes.reset = True
+                latest.clear()
+            elif row_id is not None:
+                previous = latest.get(int(row_id))
+                if op == "changed" and previous is not None and previous[0] == "added":
+                    # Still new to the caller
+                    op = "added"
+                latest[int(row_id)] = (op, row_hash)
+        for row_id, (op, row_hash) in latest.items():
+            if op == "deleted":
+                changes.deleted.append(row_id)
+            elif changes.reset or op == "added":
+                changes.added[row_id] = row_hash or ""
+            else:
+                changes.changed[row_id] = row_hash or ""
+        return changes
+
+    @property
+    def is_empty(self) -> bool:
+        """True when nothing changed after ``since``."""
+        return not (self.reset or self.added or self.changed or self.deleted)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable change set."""
+        return {
+            "since": self.since,
+            "version": self.version,
+            "reset": self.reset,
+            "added": self.added,
+            "changed": self.changed,
+            "deleted": self.deleted,
+        }
 
 
 class IncrementalCSVLoader:
@@ -43,6 +131,21 @@ class IncrementalCSVLoader:
         self.vector_db = vector_db
         self.hash_columns = hash_columns
         self._hash_table = f"{vector_db.table_name}_hashes"
+        self._chunk_hash_table = f"{vector_db.table_name}_chunk_hashes"
+        self._duplicates_table = f"{vector_db.table_name}_duplicates"
+        self._runs_table = f"{vector_db.table_name}_ingest_runs"
+        self._changes_table = f"{vector_db.table_name}_changes"
+        self._version_sequence = f"{vector_db.table_name}_change_version"
+
+    @contextmanager
+    def _transaction(self, session: Any | None) -> Iterator[Any]:
+        """Use the caller's session (committed by the caller), or a new one committed on exit."""
+        if session is not None:
+            yield session
+            return
+        with self.vector_db.Session() as own:
+            yield own
+            own.commit()
 
     def _compute_row_hash(self, row: pd.Series) -> str:
         """
@@ -64,6 +167,20 @@ class IncrementalCSVLoader:
         # Compute MD5 hash (used for content fingerprinting, not cryptographic purposes)
         return hashlib.md5(data.encode()).hexdigest()  # noqa: S324
 
+    def compute_chunk_hash(self, content: str, metadata: dict[str, Any]) -> str:
+        """
+        Compute MD5 hash of a chunk and the row metadata stored with it.
+
+        Args:
+            content: Chunk text
+            metadata: Row metadata (a metadata change rewrites the row's chunks)
+
+        Returns:
+            MD5 hash hex string
+        """
+        data = json.dumps(metadata, sort_keys=True, default=str) + "\u241f" + content
+        return hashlib.md5(data.encode()).hexdigest()  # noqa: S324
+
     def _load_existing_hashes(self) -> dict[int, str]:
         """
         Load existing row hashes from database.
@@ -80,13 +197,35 @@ class IncrementalCSVLoader:
                 ORDER BY row_id
             """  # noqa: S608
             with self.vector_db.Session() as session:
-                result = session.execute(query)
-                return dict(result)
+                result = session.execute(text(query))
+                return {int(row_id): row_hash for row_id, row_hash in result}
         except Exception:
             # Table doesn't exist yet or query failed
             logger.debug("No existing hashes found", table=self._hash_table)
             return {}
 
+    def load_hashes(self, row_ids: list[int]) -> dict[int, str]:
+        """
+        Load stored hashes for some rows.
+
+        Args:
+            row_ids: Rows to look up
+
+        Returns:
+            Dictionary mapping row_id to hash (rows without a stored hash are omitted)
+        """
+        if not row_ids:
+            return {}
+        try:
+            # Table name is controlled internally, not user input
+            query = f"SELECT row_id, hash FROM {self._hash_table} WHERE row_id = ANY(:row_ids)"  # noqa: S608
+            with self.vector_db.Session() as session:
+                result = session.execute(text(query), {"row_ids": [int(row_id) for row_id in row_ids]})
+                return {int(row_id): row_hash for row_id, row_hash in result}
+        except Exception:
+            logger.debug("No existing hashes found", table=self._hash_table)
+            return {}
+
     def _ensure_hash_table(self) -> None:
         """Create hash tracking table if it doesn't exist."""
         try:
@@ -98,38 +237,71 @@ class IncrementalCSVLoader:
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """
+            create_chunk_table = f"""
+                CREATE TABLE IF NOT EXISTS {self._chunk_hash_table} (
+                    row_id INTEGER NOT NULL,
+                    hash TEXT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (row_id, hash)
+                )
+            """
+            create_duplicates_table = f"""
+                CREATE TABLE IF NOT EXISTS {self._duplicates_table} (
+                    row_id INTEGER PRIMARY KEY,
+                    representative INTEGER NOT NULL
+                )
+            """
             with self.vector_db.Session() as session:
-                session.execute(create_table)
+                session.execute(text(create_table))
+                session.execute(text(create_chunk_table))
+                session.execute(text(create_duplicates_table))
                 session.commit()
             logger.debug("Hash table ready", table=self._hash_table)
         except Exception as e:
             logger.error("Failed to create hash table", error=str(e))
             raise
 
+    def reset_hashes(self) -> None:
+        """Create the hash tables if needed and forget every stored hash (before a full load)."""
+        self._ensure_hash_table()
+        try:
+            with self.vector_db.Session() as session:
+                # Table names are controlled internally, not user input
+                session.execute(text(f"DELETE FROM {self._hash_table}"))  # noqa: S608
+                session.execute(text(f"DELETE FROM {self._chunk_hash_table}"))  # noqa: S608
+                session.execute(text(f"DELETE FROM {self._duplicates_table}"))  # noqa: S608
+                session.commit()
+        except Exception as e:
+            logger.error("Failed to reset hashes", error=str(e))
+            raise
+
     def detect_changes(
         self,
         csv_path: str | Path,
+        columns: list[str] | None = None,
     ) -> dict[str, Any]:
         """
-        Detect changes in CSV file compared to stored hashes.
+        Detect changes in a source file compared to stored hashes.
 
         Args:
-            csv_path: Path to CSV file
+            csv_path: Path to CSV, Parquet, Arrow or JSONL file
+            columns: Columns to read (default: all)
 
         Returns:
-            Dictionary with added, changed, deleted row indices and current dataframe
+            Dictionary with added, changed, deleted row indices, current dataframe and
+            seconds spent parsing, hashing and diffing (``timings``)
         """
         # Ensure hash table exists
         self._ensure_hash_table()
 
-        # Load CSV
-        df = pd.read_csv(csv_path)
+        # Load source
+        started = time.perf_counter()
+        df = read_source(csv_path, columns)
+        parsed = time.perf_counter()
 
         # Compute hashes for current rows
-        current_hashes: dict[int, str] = {}
-        for idx, row in df.iterrows():
-            row_hash = self._compute_row_hash(row)
-            current_hashes[cast(int, idx)] = row_hash
+        current_hashes = compute_row_hashes(df, self.hash_columns)
+        hashed = time.perf_counter()
 
         # Load existing hashes
         existing_hashes = self._load_existing_hashes()
@@ -140,6 +312,7 @@ class IncrementalCSVLoader:
         changed = [
             idx for idx in current_hashes if idx in existing_hashes and current_hashes[idx] != existing_hashes[idx]
         ]
+        timings = {"parse": parsed - started, "hash": hashed - parsed, "diff": time.perf_counter() - hashed}
 
         logger.info(
             "Change detection complete",
@@ -151,21 +324,24 @@ class IncrementalCSVLoader:
 
         return {
             "dataframe": df,
+            "existing_hashes": existing_hashes,
             "current_hashes": current_hashes,
             "added": added,
             "changed": changed,
             "deleted": deleted,
+            "timings": timings,
         }
 
-    def update_hashes(self, hashes: dict[int, str]) -> None:
+    def update_hashes(self, hashes: dict[int, str], session: Any | None = None) -> None:
         """
         Update stored hashes in database.
 
         Args:
             hashes: Dictionary mapping row_id to hash
+            session: Session of an enclosing transaction (default: commit on its own)
         """
         try:
-            with self.vector_db.Session() as session:
+            with self._transaction(session) as session:
                 for row_id, hash_val in hashes.items():
                     # Upsert hash (table name is controlled internally, not user input)
                     upsert = f"""
@@ -174,8 +350,7 @@ class IncrementalCSVLoader:
                         ON CONFLICT (row_id)
                         DO UPDATE SET hash = :hash, updated_at = CURRENT_TIMESTAMP
                     """  # noqa: S608
-                    session.execute(upsert, {"row_id": int(row_id), "hash": hash_val})
-                session.commit()
+                    session.execute(text(upsert), {"row_id": int(row_id), "hash": hash_val})
             logger.debug("Hashes updated", count=len(hashes))
         except Exception as e:
             logger.error("Failed to update hashes", error=str(e))
@@ -198,9 +373,371 @@ class IncrementalCSVLoader:
                     DELETE FROM {self._hash_table}
                     WHERE row_id = ANY(:row_ids)
                 """  # noqa: S608
-                session.execute(delete, {"row_ids": row_ids})
+                session.execute(text(delete), {"row_ids": [int(row_id) for row_id in row_ids]})
                 session.commit()
             logger.debug("Hashes deleted", count=len(row_ids))
         except Exception as e:
             logger.error("Failed to delete hashes", error=str(e))
             raise
+
+    def load_chunk_hashes(self, row_ids: list[int]) -> dict[int, set[str]]:
+        """
+        Load stored chunk hashes for some rows.
+
+        Args:
+            row_ids: Rows to look up
+
+        Returns:
+            Dictionary mapping row_id to the hashes of its stored chunks
+        """
+        if not row_ids:
+            return {}
+        try:
+            # Table name is controlled internally, not user input
+            query = f"""
+                SELECT row_id, hash
+                FROM {self._chunk_hash_table}
+                WHERE row_id = ANY(:row_ids)
+            """  # noqa: S608
+            with self.vector_db.Session() as session:
+                result = session.execute(text(query), {"row_ids": [int(row_id) for row_id in row_ids]})
+                chunk_hashes: dict[int, set[str]] = {}
+                for row_id, chunk_hash in result:
+                    chunk_hashes.setdefault(int(row_id), set()).add(chunk_hash)
+                return chunk_hashes
+        except Exception:
+            logger.debug("No existing chunk hashes found", table=self._chunk_hash_table)
+            return {}
+
+    def update_chunk_hashes(self, chunk_hashes: dict[int, list[str]], session: Any | None = None) -> None:
+        """
+        Replace the stored chunk hashes of some rows.
+
+        Args:
+            chunk_hashes: Dictionary mapping row_id to the hashes of all its current chunks
+            session: Session of an enclosing transaction (default: commit on its own)
+        """
+        if not chunk_hashes:
+            return
+        try:
+            with self._transaction(session) as session:
+                # Table name is controlled internally, not user input
+                delete = f"DELETE FROM {self._chunk_hash_table} WHERE row_id = ANY(:row_ids)"  # noqa: S608
+                session.execute(text(delete), {"row_ids": [int(row_id) for row_id in chunk_hashes]})
+                insert = f"""
+                    INSERT INTO {self._chunk_hash_table} (row_id, hash)
+                    VALUES (:row_id, :hash)
+                    ON CONFLICT DO NOTHING
+                """  # noqa: S608
+                rows = [
+                    {"row_id": int(row_id), "hash": chunk_hash}
+                    for row_id, hashes in chunk_hashes.items()
+                    for chunk_hash in hashes
+                ]
+                if rows:
+                    session.execute(text(insert), rows)
+            logger.debug("Chunk hashes updated", rows=len(chunk_hashes))
+        except Exception as e:
+            logger.error("Failed to update chunk hashes", error=str(e))
+            raise
+
+    def delete_chunk_hashes(self, row_ids: list[int]) -> None:
+        """
+        Delete chunk hashes for removed rows.
+
+        Args:
+            row_ids: List of row IDs to delete
+        """
+        if not row_ids:
+            return
+        self.update_chunk_hashes(dict.fromkeys(row_ids, []))
+
+    def load_representatives(self) -> dict[int, int]:
+        """
+        Load the stored near-duplicate clusters.
+
+        Returns:
+            Representative row per duplicate row (representatives and unclustered rows are omitted)
+        """
+        try:
+            # Table name is controlled internally, not user input
+            query = f"SELECT row_id, representative FROM {self._duplicates_table}"  # noqa: S608
+            with self.vector_db.Session() as session:
+                return {int(row_id): int(rep) for row_id, rep in session.execute(text(query))}
+        except Exception:
+            logger.debug("No stored duplicate clusters", table=self._duplicates_table)
+            return {}
+
+    def update_representatives(self, representatives: dict[int, int], session: Any | None = None) -> None:
+        """
+        Replace the stored near-duplicate clusters.
+
+        Args:
+            representatives: Representative per row id (rows mapping to themselves are not stored)
+            session: Session of an enclosing transaction (default: commit on its own)
+        """
+        rows = [{"row_id": int(row_id), "rep": int(rep)} for row_id, rep in representatives.items() if row_id != rep]
+        try:
+            with self._transaction(session) as session:
+                # Table name is controlled internally, not user input
+                session.execute(text(f"DELETE FROM {self._duplicates_table}"))  # noqa: S608
+                if rows:
+                    insert = f"INSERT INTO {self._duplicates_table} (row_id, representative) VALUES (:row_id, :rep)"  # noqa: S608
+                    session.execute(text(insert), rows)
+            logger.debug("Duplicate clusters updated", duplicates=len(rows))
+        except Exception as e:
+            logger.error("Failed to update duplicate clusters", error=str(e))
+            raise
+
+    def last_synced(self) -> datetime | None:
+        """
+        Time of the last load that stored hashes.
+
+        Returns:
+            Latest hash update time, or None before the first load
+        """
+        try:
+            # Table name is controlled internally, not user input
+            query = f"SELECT max(updated_at) FROM {self._hash_table}"  # noqa: S608
+            with self.vector_db.Session() as session:
+                value = session.execute(text(query)).scalar()
+                return value if isinstance(value, datetime) else None
+        except Exception:
+            logger.debug("No existing hashes found", table=self._hash_table)
+            return None
+
+    def _ensure_change_log(self, session: Any) -> None:
+        """Create the change-log table and its version sequence if they don't exist."""
+        session.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {self._version_sequence}"))
+        session.execute(
+            text(f"""
+                CREATE TABLE IF NOT EXISTS {self._changes_table} (
+                    version BIGINT NOT NULL,
+                    op TEXT NOT NULL,
+                    row_id INTEGER,
+                    hash TEXT,
+                    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        )
+        session.execute(
+            text(f"CREATE INDEX IF NOT EXISTS {self._changes_table}_version_idx ON {self._changes_table} (version)")
+        )
+
+    def record_changes(
+        self,
+        mode: str,
+        added: list[int],
+        changed: list[int],
+        deleted: list[int],
+        hashes: dict[int, str],
+        session: Any | None = None,
+    ) -> int | None:
+        """
+        Append a load's row changes to the change log under a new version.
+
+        A full load is recorded as a reset plus every row and removes the
+        entries it supersedes, so the log stays proportional to the changes
+        since the last full load.
+
+        The version is allocated under a transaction-level advisory lock held
+        until commit, so a later version never becomes visible before an
+        earlier one and ``changes_since()`` readers can't skip a version.
+
+        Args:
+            mode: "full" or "incremental"
+            added: New row ids (every row for a full load)
+            changed: Row ids whose hash changed
+            deleted: Removed row ids
+            hashes: Row hashes (at least those of the added and changed rows)
+            session: Session of an enclosing transaction (default: commit on its own)
+
+        Returns:
+            The new version, or None when the load changed nothing
+        """
+        if mode != "full" and not (added or changed or deleted):
+            return None
+        try:
+            with self._transaction(session) as session:
+                self._ensure_change_log(session)
+                session.execute(
+                    text("SELECT pg_advisory_xact_lock(:key)"), {"key": advisory_lock_key(self._changes_table)}
+                )
+                version = int(session.execute(text(f"SELECT nextval('{self._version_sequence}')")).scalar_one())
+                entries: list[dict[str, Any]] = []
+                if mode == "full":
+                    # Table names are controlled internally, not user input
+                    session.execute(
+                        text(f"DELETE FROM {self._changes_table} WHERE version < :version"),  # noqa: S608
+                        {"version": version},
+                    )
+                    entries.append({"op": "reset", "row_id": None, "hash": None})
+                for op, row_ids in (("added", added), ("changed", changed), ("deleted", deleted)):
+                    entries.extend(
+                        {"op": op, "row_id": int(row_id), "hash": None if op == "deleted" else hashes.get(row_id)}
+                        for row_id in row_ids
+                    )
+                insert = f"""
+                    INSERT INTO {self._changes_table} (version, op, row_id, hash)
+                    VALUES (:version, :op, :row_id, :hash)
+                """  # noqa: S608
+                session.execute(text(insert), [{"version": version, **entry} for entry in entries])
+            logger.debug("Changes recorded", table=self._changes_table, version=version, entries=len(entries))
+            return version
+        except Exception as e:
+            logger.error("Failed to record changes", error=str(e))
+            raise
+
+    def store_load(
+        self,
+        mode: str,
+        hashes: dict[int, str],
+        added: list[int],
+        changed: list[int],
+        deleted: list[int],
+        chunk_hashes: dict[int, list[str]] | None = None,
+        representatives: dict[int, int] | None = None,
+    ) -> int | None:
+        """
+        Store an applied load's hashes and log its changes in one transaction.
+
+        A crash between the two can no longer leave hashes that say a row is
+        loaded while the change log never reports it.
+
+        Args:
+            mode: "full" or "incremental"
+            hashes: Row hashes to store
+            added: New row ids (every row for a full load)
+            changed: Row ids whose hash changed
+            deleted: Removed row ids
+            chunk_hashes: Chunk hashes per row (chunked loads)
+            representatives: Near-duplicate clusters (loads with dedup)
+
+        Returns:
+            The change-log version, or None when the load changed nothing
+        """
+        with self.vector_db.Session() as session:
+            self.update_hashes(hashes, session=session)
+            if chunk_hashes is not None:
+                self.update_chunk_hashes(chunk_hashes, session=session)
+            if representatives is not None:
+                self.update_representatives(representatives, session=session)
+            version = self.record_changes(mode, added, changed, deleted, hashes, session=session)
+            session.commit()
+        return version
+
+    def current_version(self) -> int:
+        """
+        Latest change-log version.
+
+        Returns:
+            Version of the last recorded load, or 0 before the first one
+        """
+        try:
+            # Table name is controlled internally, not user input
+            query = f"SELECT max(version) FROM {self._changes_table}"  # noqa: S608
+            with self.vector_db.Session() as session:
+                value = session.execute(text(query)).scalar()
+                return int(value) if value is not None else 0
+        except Exception:
+            logger.debug("No change log found", table=self._changes_table)
+            return 0
+
+    def changes_since(self, version: int, limit: int | None = None) -> ChangeSet:
+        """
+        Net row changes recorded after a version (the catch-up API for downstream copies).
+
+        Apply ``added`` and ``changed`` as upserts and ``deleted`` as deletes (with
+        ``reset``, first drop every row), then store ``version`` for the next call.
+
+        Args:
+            version: Last version the caller applied (0 for everything since the last full load)
+            limit: Read at most this many versions (page through a long backlog)
+
+        Returns:
+            ChangeSet with each changed row once, under its latest operation
+        """
+        params: dict[str, Any] = {"since": int(version)}
+        window = ""
+        if limit is not None:
+            window = f"""
+                AND version IN (
+                    SELECT DISTINCT version FROM {self._changes_table}
+                    WHERE version > :since ORDER BY version LIMIT :limit
+                )
+            """  # noqa: S608
+            params["limit"] = int(limit)
+        # Table name is controlled internally, not user input; the reset (NULL row_id) leads its version
+        query = f"""
+            SELECT version, op, row_id, hash
+            FROM {self._changes_table}
+            WHERE version > :since {window}
+            ORDER BY version, row_id NULLS FIRST
+        """  # noqa: S608
+        try:
+            with self.vector_db.Session() as session:
+                entries = [tuple(row) for row in session.execute(text(query), params)]
+        except Exception:
+            logger.debug("No change log found", table=self._changes_table)
+            entries = []
+        return ChangeSet.from_entries(int(version), entries)  # type: ignore[arg-type]
+
+    def record_run(self, mode: str, documents: int, characters: int, embed_seconds: float) -> None:
+        """
+        Record an ingestion run (best effort; failures are only logged).
+
+        Args:
+            mode: "full" or "incremental"
+            documents: Documents embedded
+            characters: Characters embedded
+            embed_seconds: Time spent embedding and writing
+        """
+        try:
+            create_table = f"""
+                CREATE TABLE IF NOT EXISTS {self._runs_table} (
+                    mode TEXT NOT NULL,
+                    documents INTEGER NOT NULL,
+                    characters BIGINT NOT NULL,
+                    embed_seconds DOUBLE PRECISION NOT NULL,
+                    finished_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            # Table name is controlled internally, not user input
+            insert = f"""
+                INSERT INTO {self._runs_table} (mode, documents, characters, embed_seconds)
+                VALUES (:mode, :documents, :characters, :embed_seconds)
+            """  # noqa: S608
+            with self.vector_db.Session() as session:
+                session.execute(text(create_table))
+                session.execute(
+                    text(insert),
+                    {"mode": mode, "documents": documents, "characters": characters, "embed_seconds": embed_seconds},
+                )
+                session.commit()
+        except Exception as e:
+            logger.debug("Failed to record ingest run", table=self._runs_table, error=str(e))
+
+    def throughput(self, runs: int = 5) -> float | None:
+        """
+        Measured embedding throughput over the most recent runs.
+
+        Args:
+            runs: Number of recent runs to average over
+
+        Returns:
+            Characters embedded per second, or None without recorded runs
+        """
+        try:
+            # Table name is controlled internally, not user input
+            query = f"""
+                SELECT sum(characters), sum(embed_seconds)
+                FROM (SELECT characters, embed_seconds FROM {self._runs_table} ORDER BY finished_at DESC LIMIT :runs) recent
+            """  # noqa: S608
+            with self.vector_db.Session() as session:
+                characters, seconds = session.execute(text(query), {"runs": runs}).one()
+        except Exception:
+            logger.debug("No ingest runs recorded", table=self._runs_table)
+            return None
+        if not characters or not seconds:
+            return None
+        return float(characters) / float(seconds)
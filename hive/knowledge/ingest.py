@@ -0,0 +1,88 @@
+"""
+Ingestion estimates for ``hive knowledge plan``.
+
+Given an ``IngestPlan`` (see hive.knowledge.csv_loader), reports how many
+tokens a load would embed, how long it should take and what it would cost:
+
+- Tokens use agno's tokenizer support (tiktoken when installed, otherwise
+  about four characters per token)
+- Time uses the embedding throughput measured on earlier loads of the same
+  table (``{table}_ingest_runs``), or a conservative default before the first
+- Cost uses the list prices of the OpenAI embedding models (None for others)
+"""
+
+from dataclasses import dataclass
+
+from agno.utils.tokens import count_text_tokens
+
+from hive.knowledge.csv_loader import IngestPlan
+
+# USD per million input tokens
+EMBEDDING_PRICES: dict[str, float] = {
+    "text-embedding-3-small": 0.02,
+    "text-embedding-3-large": 0.13,
+    "text-embedding-ada-002": 0.10,
+}
+
+# Embedding throughput assumed before any run was measured (batched OpenAI requests)
+DEFAULT_CHARACTERS_PER_SECOND = 20_000.0
+
+
+@dataclass
+class IngestEstimate:
+    """Tokens, time and cost of applying a plan."""
+
+    documents: int
+    characters: int
+    tokens: int
+    seconds: float
+    cost: float | None  # USD, None for embedders without a known price
+    measured: bool  # time based on recorded runs rather than the default throughput
+
+
+def estimate_plan(plan: IngestPlan, embedder: str, throughput: float | None = None) -> IngestEstimate:
+    """
+    Estimate the embedding work of a plan.
+
+    Args:
+        plan: Plan from ``CSVKnowledgeLoader.plan()``
+        embedder: Embedder model ID
+        throughput: Measured characters per second (default: DEFAULT_CHARACTERS_PER_SECOND)
+
+    Returns:
+        IngestEstimate
+    """
+    tokens = sum(count_text_tokens(doc.content, embedder) for doc in plan.documents)
+    characters = plan.characters
+    rate = throughput or DEFAULT_CHARACTERS_PER_SECOND
+    price = EMBEDDING_PRICES.get(embedder)
+    return IngestEstimate(
+        documents=len(plan.documents),
+        characters=characters,
+        tokens=tokens,
+        seconds=characters / rate,
+        cost=tokens * price / 1_000_000 if price is not None else None,
+        measured=throughput is not None,
+    )
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a duration for display.
+
+    Args:
+        seconds: Duration in seconds
+
+    Returns:
+        "<1s", "42s", "3m 20s" or "1h 05m"
+    """
+    if seconds < 1:
+        return "<1s"
+    total = round(seconds)
+    if total < 60:
+        return f"{total}s"
+    minutes, secs = divmod(total, 60)
+    if minutes < 60:
+        return f"{minutes}m {secs:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
@@ -2,9 +2,15 @@
 Thread-safe knowledge base factory.
 
 Creates and manages Agno DocumentKnowledgeBase instances with:
-- CSV loading with incremental updates
-- PgVector storage with HNSW indexing
+- CSV, Parquet, Arrow, JSONL or document-folder loading with incremental updates
+- PgVector storage with configurable search type and HNSW indexing
 - Optional hot reload with file watching
+- Optional background initial load with readiness reporting
+- Optional cross-process ingestion leader election (one process reloads a source)
+- Optional background migration to a new embedding model
+- Optional off-peak index maintenance (VACUUM ANALYZE, concurrent rebuilds, prewarm)
+- Optional lag-aware routing of searches to read replicas
+- Optional in-process BM25 keyword index for hybrid search
 - Thread-safe shared instance pattern
 
 Usage:
@@ -20,15 +26,43 @@ Usage:
 
 import os
 import threading
+from dataclasses import replace
 from pathlib import Path
+from typing import Any
 
 from agno.knowledge import Knowledge
 from agno.knowledge.embedder.openai import OpenAIEmbedder
-from agno.vectordb.distance import Distance
-from agno.vectordb.pgvector import HNSW, PgVector, SearchType
+from agno.vectordb.pgvector import SearchType
 from loguru import logger
 
+from hive.knowledge.config import (
+    BackgroundLoadConfig,
+    ChunkingConfig,
+    ContextConfig,
+    CoordinationConfig,
+    DedupConfig,
+    KeywordIndexConfig,
+    MaintenanceConfig,
+    MetadataConfig,
+    MigrationConfig,
+    ReplicaConfig,
+    SearchConfig,
+    SQLSourceConfig,
+    StorageConfig,
+)
+from hive.knowledge.context import BudgetedKnowledge
+from hive.knowledge.coordination import IngestCoordinator, get_coordinator
 from hive.knowledge.csv_loader import CSVKnowledgeLoader
+from hive.knowledge.folder_loader import DocumentFolderLoader
+from hive.knowledge.lexical import LocalKeywordVectorDb
+from hive.knowledge.maintenance import MaintenanceScheduler
+from hive.knowledge.migration import EmbeddingMigration, MigratingVectorDb, shadow_table_name
+from hive.knowledge.partitioned import PartitionedPgVector
+from hive.knowledge.quantized import QuantizedPgVector
+from hive.knowledge.readiness import BackgroundLoad, BackgroundLoadedKnowledge, register_load
+from hive.knowledge.replicas import ReplicatedVectorDb
+from hive.knowledge.sql_loader import PollingSync, SQLTableKnowledgeLoader
+from hive.knowledge.vectordb import HivePgVector
 from hive.knowledge.watcher import DebouncedFileWatcher
 
 # Global shared knowledge base instance
@@ -36,112 +70,451 @@ _shared_kb: Knowledge | None = None
 _kb_lock = threading.Lock()
 
 
-def create_knowledge_base(
+def _build_vector_db(
+    table_name: str,
+    db_url: str,
+    embedder: str,
+    search: SearchConfig,
+    storage: StorageConfig,
+    metadata: MetadataConfig,
+    partition_by: str | None = None,
+    read_replicas: ReplicaConfig | None = None,
+) -> HivePgVector:
+    """
+    Build the PgVector store for a knowledge table.
+
+    Args:
+        table_name: PgVector table name
+        db_url: Database connection URL
+        embedder: OpenAI embedder model ID
+        search: Search type, distance and HNSW parameters
+        storage: Vector dimensions and index quantization
+        metadata: Metadata types and filter columns
+        partition_by: Metadata column to split into per-value tables
+        read_replicas: Replica databases (with resolved URLs) to search instead of the primary
+
+    Returns:
+        HivePgVector (QuantizedPgVector when storage is quantized,
+        PartitionedPgVector over either when partitioned,
+        ReplicatedVectorDb over the result when replicas are configured)
+    """
+    embedder_kwargs = {"dimensions": storage.dimensions} if storage.dimensions else {}
+    vector_db_kwargs: dict[str, Any] = {
+        "table_name": table_name,
+        "schema": "agno",
+        "db_url": db_url,
+        "embedder": OpenAIEmbedder(id=embedder, **embedder_kwargs),
+        "search_type": search.search_type,
+        "vector_index": search.vector_index(),
+        "distance": search.distance,
+        "vector_score_weight": search.vector_score_weight,
+        "metadata_types": metadata.schema,
+        "filter_columns": metadata.filter_columns,
+    }
+
+    def build_store(name: str, url: str = db_url) -> HivePgVector:
+        store_kwargs = {**vector_db_kwargs, "table_name": name, "db_url": url, "vector_index": search.vector_index()}
+        if storage.is_quantized:
+            return QuantizedPgVector(
+                quantization=storage.quantization,
+                rerank_candidates=storage.rerank_candidates,
+                **store_kwargs,
+            )
+        return HivePgVector(**store_kwargs)
+
+    def build_table(url: str) -> HivePgVector:
+        if partition_by:
+            return PartitionedPgVector(
+                partition_by=partition_by,
+                store_factory=lambda name: build_store(name, url),
+                **{**vector_db_kwargs, "db_url": url},
+            )
+        return build_store(table_name, url)
+
+    primary = build_table(db_url)
+    if read_replicas is None:
+        return primary
+    replicas = [build_table(url) for url in read_replicas.urls]
+    return ReplicatedVectorDb(primary, replicas, check_interval=read_replicas.check_interval)  # type: ignore[return-value]
+
+
+KnowledgeLoader = CSVKnowledgeLoader | DocumentFolderLoader
+
+
+def create_loader(
     csv_path: str | Path = "data/knowledge.csv",
     embedder: str = "text-embedding-3-small",
-    num_documents: int = 5,
     content_column: str = "content",
     hash_columns: list[str] | None = None,
-    hot_reload: bool = False,
-    debounce_delay: float = 1.0,
     table_name: str = "knowledge_base",
-    use_shared: bool = True,
-) -> Knowledge:
+    search: SearchConfig | None = None,
+    storage: StorageConfig | None = None,
+    metadata: MetadataConfig | None = None,
+    partition_by: str | None = None,
+    chunking: ChunkingConfig | None = None,
+    dedup: DedupConfig | None = None,
+    columns: list[str] | None = None,
+    sql_source: SQLSourceConfig | None = None,
+    migration: MigrationConfig | None = None,
+    read_replicas: ReplicaConfig | None = None,
+    keyword_index: KeywordIndexConfig | None = None,
+) -> tuple[KnowledgeLoader, Path]:
     """
-    Create a knowledge base from CSV file.
+    Create the vector store and loader for a knowledge source without loading it.
+
+    ``create_knowledge_base`` loads through this loader; the ``hive knowledge``
+    CLI uses it to plan, ingest and check sources outside an agent.
 
     Args:
-        csv_path: Path to CSV file
+        csv_path: Path to a CSV, Parquet, Arrow or JSONL file, or to a document folder
         embedder: OpenAI embedder model ID
-        num_documents: Number of documents to retrieve
-        content_column: Column containing main text content
-        hash_columns: Columns to hash for change detection (default: all)
-        hot_reload: Enable file watching for auto-reload
-        debounce_delay: Seconds to wait before reload (if hot_reload=True)
+        content_column: Column containing main text content (CSV only)
+        hash_columns: Columns to hash for change detection (CSV only, default: all)
         table_name: PgVector table name
-        use_shared: Use thread-safe shared instance
+        search: Search type, distance and HNSW parameters (default: hybrid/cosine)
+        storage: Reduced dimensions / quantized index (default: native float32)
+        metadata: Typed metadata and indexed filter columns (default: string metadata)
+        partition_by: Column whose values get their own table and index (default: one table)
+        chunking: Split long content into separately embedded chunks
+        dedup: Embed one representative per cluster of near-identical rows (file tables only)
+        columns: Source columns to read (tabular sources only, default: all)
+        sql_source: Database table to load instead of a file (csv_path is then ignored)
+        migration: Target embedding model; writes then also go to its shadow table
+        read_replicas: Read-only databases for searches (default URLs: HIVE_DATABASE_REPLICA_URLS,
+            comma-separated)
+        keyword_index: Score the keyword half of hybrid search with an in-process BM25 index
 
     Returns:
-        Knowledge instance configured with CSV data
-    """
-    global _shared_kb
-
-    # Use shared instance if requested
-    if use_shared:
-        with _kb_lock:
-            if _shared_kb is not None:
-                logger.debug("Returning shared knowledge base")
-                return _shared_kb
+        Loader (its ``vector_db`` is the knowledge table) and the resolved source path
 
+    Raises:
+        FileNotFoundError: If the source file or folder does not exist
+        ValueError: If HIVE_DATABASE_URL is not set, replicas are enabled without URLs,
+            dedup is configured for a database table or document folder, or the keyword
+            index is configured without hybrid search
+    """
     # Resolve paths
     csv_path = Path(csv_path).resolve()
-    if not csv_path.exists():
+    if sql_source is None and not csv_path.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
     # Get database URL
     db_url = os.getenv("HIVE_DATABASE_URL")
     if not db_url:
         raise ValueError("HIVE_DATABASE_URL environment variable not set")
+    if dedup is not None and (sql_source is not None or csv_path.is_dir()):
+        raise ValueError("dedup requires a CSV, Parquet, Arrow or JSONL source")
+    if sql_source is not None and not sql_source.connection:
+        # The source table lives in the Hive database unless a connection is configured
+        sql_source = replace(sql_source, connection=db_url)
+    if read_replicas is not None and not read_replicas.urls:
+        urls = [url.strip() for url in os.getenv("HIVE_DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+        if not urls:
+            raise ValueError("read_replicas needs urls or the HIVE_DATABASE_REPLICA_URLS environment variable")
+        read_replicas = replace(read_replicas, urls=urls)
+
+    search = search or SearchConfig()
+    storage = storage or StorageConfig()
+    metadata = metadata or MetadataConfig()
+    if keyword_index is not None and search.search_type != SearchType.hybrid:
+        raise ValueError("keyword_index requires hybrid search")
+    # With a local keyword index the database answers the vector half only
+    store_search = replace(search, search_type=SearchType.vector) if keyword_index is not None else search
+    if storage.is_quantized and store_search.search_type == SearchType.hybrid:
+        # Hybrid scoring ranks every row by exact distance; the quantized index is never used
+        logger.warning(
+            "Quantized storage only speeds up vector search, hybrid search scans the table",
+            table_name=table_name,
+            storage=storage.label(),
+        )
 
     logger.info(
         "Creating knowledge base",
         csv_path=str(csv_path),
         table_name=table_name,
         embedder=embedder,
-        hot_reload=hot_reload,
+        search=search.label(),
+        storage=storage.label(),
+        partition_by=partition_by,
+        replicas=len(read_replicas.urls) if read_replicas else 0,
     )
 
     # Create PgVector instance
-    vector_db = PgVector(
-        table_name=table_name,
-        schema="agno",
-        db_url=db_url,
-        embedder=OpenAIEmbedder(id=embedder),
-        search_type=SearchType.hybrid,
-        vector_index=HNSW(),
-        distance=Distance.cosine,
+    vector_db: Any = _build_vector_db(
+        table_name, db_url, embedder, store_search, storage, metadata, partition_by, read_replicas
     )
+    if migration is not None:
+        shadow = _build_vector_db(
+            shadow_table_name(table_name, migration.embedder, migration.dimensions),
+            db_url,
+            migration.embedder,
+            store_search,
+            replace(storage, dimensions=migration.dimensions),
+            metadata,
+            partition_by,
+            read_replicas,
+        )
+        vector_db = MigratingVectorDb(vector_db, shadow)
+    if keyword_index is not None:
+        vector_db = LocalKeywordVectorDb(
+            vector_db,
+            vector_score_weight=search.vector_score_weight,
+            k1=keyword_index.k1,
+            b=keyword_index.b,
+            vector_candidates=keyword_index.vector_candidates,
+        )
 
-    # Create CSV loader
-    csv_loader = CSVKnowledgeLoader(
-        vector_db=vector_db,
-        content_column=content_column,
-        hash_columns=hash_columns,
-    )
+    # Create the CSV, document-folder or database-table loader
+    loader: KnowledgeLoader
+    if sql_source is not None:
+        loader = SQLTableKnowledgeLoader(
+            vector_db=vector_db,
+            source=sql_source,
+            content_column=content_column,
+            hash_columns=hash_columns,
+            metadata=metadata,
+            partition_by=partition_by,
+            chunking=chunking,
+            columns=columns,
+        )
+    elif csv_path.is_dir():
+        loader = DocumentFolderLoader(vector_db=vector_db, chunking=chunking)
+    else:
+        loader = CSVKnowledgeLoader(
+            vector_db=vector_db,
+            content_column=content_column,
+            hash_columns=hash_columns,
+            metadata=metadata,
+            partition_by=partition_by,
+            chunking=chunking,
+            columns=columns,
+            dedup=dedup,
+        )
+    return loader, csv_path
 
-    # Load CSV data
-    load_stats = csv_loader.load(csv_path)
-    logger.info("CSV loaded", **load_stats)
 
-    # Create knowledge base
+def _wrap_knowledge(vector_db: Any, num_documents: int, context: ContextConfig | None) -> Knowledge:
+    """Create the Knowledge over a vector store, token-budgeted when context is configured."""
     kb = Knowledge(
         vector_db=vector_db,
         max_results=num_documents,
     )
+    if context is not None:
+        kb = BudgetedKnowledge(kb, context)
+    return kb
+
+
+def _start_coordination(vector_db: Any, table_name: str, coordination: CoordinationConfig) -> IngestCoordinator:
+    """Get the database's coordinator and invalidate the store's caches when another process reloads it."""
+    url = vector_db.db_url or vector_db.db_engine.url.render_as_string(hide_password=False)
+    coordinator = get_coordinator(url, coordination.channel)
+    coordinator.subscribe(table_name, lambda _message: vector_db.invalidate_cache())
+    return coordinator
+
+
+def _start_migration(
+    kb: Knowledge, vector_db: Any, config: MigrationConfig, coordinator: IngestCoordinator | None = None
+) -> None:
+    """Start the embedding-model backfill and store it on kb."""
+    migration = EmbeddingMigration(vector_db, config, coordinator=coordinator)
+    if coordinator is not None:
+        # Processes that do not run the backfill switch when the one that does is done
+        coordinator.subscribe(vector_db.shadow.table_name, lambda _message: migration.refresh())
+    migration.start()
+    kb._migration = migration  # type: ignore[attr-defined]
 
-    # Set up hot reload if requested
-    if hot_reload:
-        logger.info("Enabling hot reload", debounce_delay=debounce_delay)
-
-        def reload_callback(path: str) -> None:
-            """Callback for file changes."""
-            try:
-                stats = csv_loader.load_incremental(path)
-                logger.info("Hot reload complete", **stats)
-            except Exception as e:
-                logger.error("Hot reload failed", error=str(e))
-
-        # Start file watcher
-        watcher = DebouncedFileWatcher(
-            file_path=csv_path,
-            callback=reload_callback,
-            debounce_delay=debounce_delay,
+
+def _start_maintenance(
+    kb: Knowledge, vector_db: Any, config: MaintenanceConfig, coordinator: IngestCoordinator | None = None
+) -> None:
+    """Start the index maintenance scheduler and store it on kb."""
+    scheduler = MaintenanceScheduler(vector_db, config, coordinator=coordinator)
+    scheduler.start()
+    kb._maintenance = scheduler  # type: ignore[attr-defined]
+
+
+def _start_hot_reload(
+    kb: Knowledge,
+    loader: KnowledgeLoader,
+    csv_path: Path,
+    debounce_delay: float,
+    coordinator: IngestCoordinator | None = None,
+) -> None:
+    """Watch the source file (or poll the database table) and store the watcher on kb."""
+    # Database tables are polled instead of watched
+    if isinstance(loader, SQLTableKnowledgeLoader):
+        poller = PollingSync(loader, interval=loader.source.poll_interval, coordinator=coordinator)
+        poller.start()
+        kb._csv_watcher = poller  # type: ignore[attr-defined]
+        return
+
+    logger.info("Enabling hot reload", debounce_delay=debounce_delay)
+
+    def reload_callback(path: str) -> None:
+        """Callback for file changes."""
+        try:
+            if coordinator is None:
+                stats = loader.load_incremental(path)
+            else:
+                # Only the process holding the source's lock reloads; the others are notified
+                stats = coordinator.run(loader.vector_db.table_name, lambda: loader.load_incremental(path))
+                if stats is None:
+                    return
+            logger.info("Hot reload complete", **stats)
+        except Exception as e:
+            logger.error("Hot reload failed", error=str(e))
+
+    # Start file watcher
+    watcher = DebouncedFileWatcher(
+        file_path=csv_path,
+        callback=reload_callback,
+        debounce_delay=debounce_delay,
+    )
+    watcher.start()
+
+    # Store watcher reference on knowledge base
+    kb._csv_watcher = watcher  # type: ignore[attr-defined]
+    logger.info("Hot reload enabled", path=str(csv_path))
+
+
+def create_knowledge_base(
+    csv_path: str | Path = "data/knowledge.csv",
+    embedder: str = "text-embedding-3-small",
+    num_documents: int = 5,
+    content_column: str = "content",
+    hash_columns: list[str] | None = None,
+    hot_reload: bool = False,
+    debounce_delay: float = 1.0,
+    table_name: str = "knowledge_base",
+    use_shared: bool = True,
+    search: SearchConfig | None = None,
+    storage: StorageConfig | None = None,
+    metadata: MetadataConfig | None = None,
+    partition_by: str | None = None,
+    chunking: ChunkingConfig | None = None,
+    dedup: DedupConfig | None = None,
+    context: ContextConfig | None = None,
+    columns: list[str] | None = None,
+    sql_source: SQLSourceConfig | None = None,
+    background_load: BackgroundLoadConfig | None = None,
+    coordination: CoordinationConfig | None = None,
+    migration: MigrationConfig | None = None,
+    maintenance: MaintenanceConfig | None = None,
+    read_replicas: ReplicaConfig | None = None,
+    keyword_index: KeywordIndexConfig | None = None,
+) -> Knowledge:
+    """
+    Create a knowledge base from a CSV file (or Parquet, Arrow IPC, JSONL, a document folder or a database table).
+
+    Args:
+        csv_path: Path to a CSV, Parquet, Arrow or JSONL file, or to a document folder
+        embedder: OpenAI embedder model ID
+        num_documents: Number of documents to retrieve
+        content_column: Column containing main text content (CSV only)
+        hash_columns: Columns to hash for change detection (CSV only, default: all)
+        hot_reload: Enable file watching for auto-reload
+        debounce_delay: Seconds to wait before reload (if hot_reload=True)
+        table_name: PgVector table name
+        use_shared: Use thread-safe shared instance
+        search: Search type, distance and HNSW parameters (default: hybrid/cosine)
+        storage: Reduced dimensions / quantized index (default: native float32)
+        metadata: Typed metadata and indexed filter columns (default: string metadata)
+        partition_by: Column whose values get their own table and index (default: one table)
+        chunking: Split long content cells into separately embedded chunks (default: one document per row;
+            documents are always chunked, with sentence chunks of 1000 characters by default)
+        dedup: Embed one representative per cluster of near-identical rows, listing the others in its
+            metadata (file tables only; default: every row)
+        context: Token budget for retrieved documents (default: whole documents, fixed count)
+        columns: Source columns to read (tabular sources only, default: all)
+        sql_source: Database table to load instead of a file (csv_path is then ignored;
+            hot_reload polls the table every sql_source.poll_interval seconds)
+        background_load: Return immediately and load on a background thread, reporting readiness
+            (default: load before returning)
+        coordination: Elect one process per source to run loads and reloads (Postgres advisory
+            locks) and invalidate the others' caches over LISTEN/NOTIFY (default: every process
+            loads on its own)
+        migration: Re-embed into a shadow table for another embedding model in the background,
+            dual-writing changes and switching reads once it has caught up (default: none)
+        maintenance: Vacuum, analyze and rebuild the indexes of churned tables in an off-peak window,
+            and prewarm them at startup (default: left to autovacuum)
+        read_replicas: Search read replicas that have replayed the latest ingestion, falling back
+            to the primary (default: searches use HIVE_DATABASE_URL)
+        keyword_index: Fuse vector results with an in-process BM25 index kept current by loads,
+            instead of Postgres full-text search (hybrid search only; default: in Postgres)
+
+    Returns:
+        Knowledge instance configured with CSV data
+    """
+    global _shared_kb
+
+    # Use shared instance if requested
+    if use_shared:
+        with _kb_lock:
+            if _shared_kb is not None:
+                logger.debug("Returning shared knowledge base")
+                return _shared_kb
+
+    loader, csv_path = create_loader(
+        csv_path=csv_path,
+        embedder=embedder,
+        content_column=content_column,
+        hash_columns=hash_columns,
+        table_name=table_name,
+        search=search,
+        storage=storage,
+        metadata=metadata,
+        partition_by=partition_by,
+        chunking=chunking,
+        dedup=dedup,
+        columns=columns,
+        sql_source=sql_source,
+        migration=migration,
+        read_replicas=read_replicas,
+        keyword_index=keyword_index,
+    )
+    vector_db = loader.vector_db
+    coordinator = None
+    if coordination is not None:
+        coordinator = _start_coordination(vector_db, table_name, coordination)
+
+    if background_load is not None:
+        # Return at once; searches wait (bounded) until the source is searchable
+        status = register_load(table_name, str(csv_path))
+        kb = BackgroundLoadedKnowledge(
+            _wrap_knowledge(vector_db, num_documents, context), status, background_load.wait_timeout
         )
-        watcher.start()
 
-        # Store watcher reference on knowledge base
-        kb._csv_watcher = watcher  # type: ignore[attr-defined]
-        logger.info("Hot reload enabled", path=str(csv_path))
+        def on_ready() -> None:
+            """Start hot reload (and any migration or maintenance) once the initial load is in."""
+            if hot_reload:
+                _start_hot_reload(kb, loader, csv_path, debounce_delay, coordinator)
+            if migration is not None:
+                _start_migration(kb, vector_db, migration, coordinator)
+            if maintenance is not None:
+                _start_maintenance(kb, vector_db, maintenance, coordinator)
+
+        BackgroundLoad(loader, csv_path, status, on_ready=on_ready, coordinator=coordinator).start()
+    else:
+        # Load data (after any other process loading the same source, which leaves little to do)
+        if coordinator is None:
+            load_stats = loader.load(csv_path)
+        else:
+            load_stats = coordinator.run(table_name, lambda: loader.load(csv_path), wait=True)
+        logger.info("Knowledge source loaded", **load_stats)
+
+        # Build the HNSW, full-text and filter-column indexes once rows exist; no-op when they already do
+        try:
+            vector_db.optimize()
+        except Exception as e:
+            logger.warning("Vector index creation failed", table_name=table_name, error=str(e))
+
+        kb = _wrap_knowledge(vector_db, num_documents, context)
+        if hot_reload:
+            _start_hot_reload(kb, loader, csv_path, debounce_delay, coordinator)
+        if migration is not None:
+            _start_migration(kb, vector_db, migration, coordinator)
+        if maintenance is not None:
+            _start_maintenance(kb, vector_db, maintenance, coordinator)
 
     # Store as shared instance if requested
     if use_shared:
@@ -171,5 +544,11 @@ def clear_shared_knowledge_base() -> None:
             # Stop watcher if exists
             if hasattr(_shared_kb, "_csv_watcher"):
                 _shared_kb._csv_watcher.stop()
+            # Stop the migration backfill and maintenance scheduler, so they don't outlive the instance
+            for name in ("_migration", "_maintenance"):
+                thread = getattr(_shared_kb, name, None)
+                if thread is not None:
+                    thread.stop()
+                    thread.join(timeout=5.0)
         _shared_kb = None
         logger.debug("Shared knowledge base cleared")
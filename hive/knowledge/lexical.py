@@ -0,0 +1,405 @@
+"""
+In-process keyword index for hybrid search.
+
+``SearchType.hybrid`` scores the keyword half with Postgres full-text search
+on every query. For small, hot knowledge bases ``LocalKeywordVectorDb`` keeps
+a BM25 inverted index of the table in memory and fuses it with vector results
+locally, so keyword-heavy queries (SKUs, error codes) need one vector query
+and no full-text scan:
+
+- The index is read from the table on first search, then kept current from
+  the loader's writes: upserted documents (added and changed rows) replace
+  their entry by name, deleted names and documents of earlier full loads
+  (``delete_stale``) are removed
+- Tokens keep identifiers whole (``ERR-404``, ``sku.12/b``) and also index
+  their parts, so ``404`` still matches
+- The store runs vector-only searches for ``vector_candidates`` results; each
+  candidate's score is ``vector_score_weight * vector + (1 - vector_score_weight)
+  * keyword``, where keyword is the BM25 score relative to the query's best
+  match. Keyword matches outside the vector candidates are added with their
+  keyword score alone
+- Another process's reload (``coordination`` notification) drops the index;
+  the next search reads it again
+
+Configuration (agent config.yaml or hive.yaml):
+    knowledge:
+      search:
+        type: hybrid               # required
+      keyword_index:               # or true for the defaults
+        k1: 1.2                    # BM25 term-frequency saturation
+        b: 0.75                    # BM25 length normalization
+        vector_candidates: 20      # vector results fused per search
+
+Notes:
+- Memory grows with the table (content, metadata and postings of every row)
+- Keyword-only matches are added for unfiltered searches and metadata-mapping
+  filters (matched locally); with filter expressions or a ``user_id`` the
+  keyword scores only rerank the vector candidates
+- Stemming and stop words are not applied: ``refund`` does not match ``refunds``
+"""
+
+import asyncio
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from agno.knowledge.document import Document
+from loguru import logger
+from sqlalchemy import select
+
+from hive.knowledge.maintenance import knowledge_tables
+
+# Words, optionally joined into identifiers by - . / : (ERR-404, v2.1, sku/12)
+_TOKEN = re.compile(r"\w+(?:[-./:]\w+)*")
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lowercase keyword tokens of a text.
+
+    Args:
+        text: Document content or query
+
+    Returns:
+        Tokens in order; a compound identifier yields itself followed by its parts
+    """
+    tokens: list[str] = []
+    for token in _TOKEN.findall(text.lower()):
+        tokens.append(token)
+        parts = _WORD.findall(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+@dataclass
+class _Entry:
+    """One indexed document."""
+
+    content: str
+    meta_data: dict[str, Any]
+    content_hash: str | None
+    terms: Counter[str]
+    length: int
+
+
+class BM25Index:
+    """BM25 inverted index of documents keyed by name (not thread-safe; see LocalKeywordVectorDb)."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        """
+        Create an empty index.
+
+        Args:
+            k1: Term-frequency saturation
+            b: Length normalization (0: none, 1: full)
+        """
+        self.k1 = k1
+        self.b = b
+        self._entries: dict[str, _Entry] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        """Number of indexed documents."""
+        return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        """Whether a document is indexed."""
+        return name in self._entries
+
+    def add(
+        self, name: str, content: str, meta_data: dict[str, Any] | None = None, content_hash: str | None = None
+    ) -> None:
+        """
+        Index a document, replacing any earlier one of the same name.
+
+        Args:
+            name: Document name
+            content: Text to index
+            meta_data: Metadata returned with keyword-only matches and used for local filters
+            content_hash: Content hash the document is stored under (for remove_stale)
+        """
+        self.remove(name)
+        tokens = tokenize(content)
+        terms = Counter(tokens)
+        self._entries[name] = _Entry(content, dict(meta_data or {}), content_hash, terms, len(tokens))
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[name] = count
+        self._total_length += len(tokens)
+
+    def remove(self, name: str) -> bool:
+        """
+        Drop a document.
+
+        Args:
+            name: Document name
+
+        Returns:
+            True if it was indexed
+        """
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return False
+        for term in entry.terms:
+            postings = self._postings[term]
+            del postings[name]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= entry.length
+        return True
+
+    def remove_stale(self, content_hashes: set[str]) -> int:
+        """
+        Drop every document not stored under one of ``content_hashes``.
+
+        Args:
+            content_hashes: Content hashes of the current load
+
+        Returns:
+            Number of documents dropped
+        """
+        stale = [name for name, entry in self._entries.items() if entry.content_hash not in content_hashes]
+        for name in stale:
+            self.remove(name)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every document."""
+        self._entries.clear()
+        self._postings.clear()
+        self._total_length = 0
+
+    def entry(self, name: str) -> _Entry | None:
+        """Indexed document by name."""
+        return self._entries.get(name)
+
+    def scores(self, query: str) -> dict[str, float]:
+        """
+        BM25 score of every document matching a query term.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Score per document name (documents without a query term are absent)
+        """
+        count = len(self._entries)
+        if not count:
+            return {}
+        average_length = self._total_length / count or 1.0
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for name, frequency in postings.items():
+                length = self._entries[name].length
+                norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                scores[name] = scores.get(name, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+
+def _matches(meta_data: dict[str, Any], filters: dict[str, Any]) -> bool:
+    """Whether metadata contains every key/value of a filter mapping."""
+    return all(meta_data.get(key) == value for key, value in filters.items())
+
+
+class LocalKeywordVectorDb:
+    """
+    Knowledge store whose hybrid search fuses vector results with an in-process BM25 index.
+
+    The wrapped store must run vector-only searches; everything but search
+    (Session, table_name, hash tables) is the wrapped store's, and writes pass
+    through to it before updating the index.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        vector_score_weight: float = 0.5,
+        k1: float = 1.2,
+        b: float = 0.75,
+        vector_candidates: int = 20,
+    ) -> None:
+        """
+        Wrap a store.
+
+        Args:
+            store: Knowledge store configured for vector search
+            vector_score_weight: Weight of the vector score in the fused score (keyword: the rest)
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            vector_candidates: Minimum vector results fetched per search
+        """
+        self.store = store
+        self.vector_score_weight = vector_score_weight
+        self.vector_candidates = vector_candidates
+        self.index = BM25Index(k1=k1, b=b)
+        self.loaded = False
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the wrapped store."""
+        return getattr(self.store, name)
+
+    def rebuild(self) -> None:
+        """Read every document of the table(s) into a fresh index."""
+        with self._lock:
+            self.index.clear()
+            self.loaded = False
+            for store in knowledge_tables(self.store):
+                if not store.table_exists():
+                    continue
+                table = store.table
+                columns = (table.c.name, table.c.content, table.c.meta_data, table.c.content_hash)
+                with store.Session() as sess:
+                    for name, content, meta_data, content_hash in sess.execute(select(*columns)):
+                        self.index.add(name, content or "", meta_data, content_hash)
+            self.loaded = True
+            logger.info("Keyword index built", table=self.store.table_name, documents=len(self.index))
+
+    def _ensure_loaded(self) -> bool:
+        """Build the index if needed; False when the table cannot be read."""
+        if self.loaded:
+            return True
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.warning("Keyword index unavailable, using vector results", error=str(e))
+        return self.loaded
+
+    def _index(self, content_hash: str, documents: list[Document]) -> None:
+        """Replace the entries of written documents."""
+        with self._lock:
+            if not self.loaded:
+                # Read from the table (writes included) on the next search
+                return
+            for doc in documents:
+                if doc.name:
+                    self.index.add(doc.name, doc.content, doc.meta_data, content_hash)
+
+    def _unindex(self, names: list[str]) -> None:
+        """Drop the entries of deleted documents."""
+        with self._lock:
+            for name in names:
+                self.index.remove(name)
+
+    def _fuse(
+        self, query: str, limit: int, filters: Any, user_id: str | None, candidates: list[Document]
+    ) -> list[Document]:
+        """
+        Rank vector candidates and keyword matches by their fused score.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+            filters: Metadata filters of the search
+            user_id: Owner the search is scoped to
+            candidates: Vector search results (``similarity_score`` in metadata)
+
+        Returns:
+            Top documents with the fused score as ``similarity_score``
+        """
+        weight = self.vector_score_weight
+        with self._lock:
+            scores = self.index.scores(query)
+            best = max(scores.values(), default=0.0) or 1.0
+            fused: dict[str, tuple[float, Document]] = {}
+            for doc in candidates:
+                vector = float(doc.meta_data.get("similarity_score") or 0.0)
+                keyword = scores.get(doc.name or "", 0.0) / best
+                fused[doc.name or str(id(doc))] = (weight * vector + (1 - weight) * keyword, doc)
+            # Keyword-only matches, where the index can apply the search's scope itself
+            if user_id is None and (filters is None or isinstance(filters, dict)):
+                for name, score in scores.items():
+                    entry = self.index.entry(name)
+                    if name in fused or entry is None or (filters and not _matches(entry.meta_data, filters)):
+                        continue
+                    doc = Document(id=name, name=name, content=entry.content, meta_data=dict(entry.meta_data))
+                    fused[name] = ((1 - weight) * score / best, doc)
+        ranked = sorted(fused.values(), key=lambda item: item[0], reverse=True)[:limit]
+        for score, doc in ranked:
+            doc.meta_data["similarity_score"] = score
+        return [doc for _score, doc in ranked]
+
+    def search(self, query: str, limit: int = 5, filters: Any = None, user_id: str | None = None) -> list[Document]:
+        """Vector search fused with local keyword scores (vector results alone if the index cannot load)."""
+        candidates = self.store.search(query, max(limit, self.vector_candidates), filters, user_id)
+        if not self._ensure_loaded():
+            return candidates[:limit]
+        return self._fuse(query, limit, filters, user_id, candidates)
+
+    async def async_search(
+        self, query: str, limit: int = 5, filters: Any = None, user_id: str | None = None
+    ) -> list[Document]:
+        """Async version of search (the index loads off the event loop)."""
+        candidates = await self.store.async_search(query, max(limit, self.vector_candidates), filters, user_id)
+        if not self.loaded and not await asyncio.to_thread(self._ensure_loaded):
+            return candidates[:limit]
+        return self._fuse(query, limit, filters, user_id, candidates)
+
+    def upsert(self, content_hash: str, documents: list[Document], *args: Any, **kwargs: Any) -> None:
+        """Upsert documents and index them."""
+        self.store.upsert(content_hash, documents, *args, **kwargs)
+        self._index(content_hash, documents)
+
+    def insert(self, content_hash: str, documents: list[Document], *args: Any, **kwargs: Any) -> None:
+        """Insert documents and index them."""
+        self.store.insert(content_hash, documents, *args, **kwargs)
+        self._index(content_hash, documents)
+
+    async def async_write(self, content_hash: str, documents: list[Document]) -> None:
+        """Async upsert, then index the documents."""
+        await self.store.async_write(content_hash, documents)
+        self._index(content_hash, documents)
+
+    def delete(self, name: str | None = None) -> bool:
+        """Delete documents by name (all without a name) and drop them from the index."""
+        result = self.store.delete(name=name)
+        if name is None:
+            with self._lock:
+                self.index.clear()
+        else:
+            self._unindex([name])
+        return bool(result)
+
+    def delete_by_names(self, names: list[str]) -> bool:
+        """Delete documents by name and drop them from the index."""
+        result = self.store.delete_by_names(names)
+        self._unindex(names)
+        return bool(result)
+
+    async def async_delete_by_names(self, names: list[str]) -> bool:
+        """Async version of delete_by_names."""
+        result = await self.store.async_delete_by_names(names)
+        self._unindex(names)
+        return bool(result)
+
+    def delete_stale(self, *content_hashes: str) -> int:
+        """Delete documents of earlier loads and drop them from the index."""
+        result = self.store.delete_stale(*content_hashes)
+        with self._lock:
+            self.index.remove_stale(set(content_hashes))
+        return int(result)
+
+    async def async_delete_stale(self, *content_hashes: str) -> int:
+        """Async version of delete_stale."""
+        result = await self.store.async_delete_stale(*content_hashes)
+        with self._lock:
+            self.index.remove_stale(set(content_hashes))
+        return int(result)
+
+    def invalidate_cache(self) -> None:
+        """Forget cached state after another process changed the table (the index is read again)."""
+        invalidate = getattr(self.store, "invalidate_cache", None)
+        if callable(invalidate):
+            invalidate()
+        with self._lock:
+            self.loaded = False
+            self.index.clear()
@@ -0,0 +1,388 @@
+"""
+Index maintenance for knowledge tables.
+
+Hot reloads keep upserting and deleting rows. Each one leaves a dead tuple in
+the table and a deleted node in the HNSW graph; autovacuum eventually cleans
+the heap, but search latency degrades as the graph accumulates deleted nodes
+and statistics drift. ``MaintenanceScheduler`` watches every knowledge table
+(each partition, the serving table during a migration) and, inside an
+off-peak window:
+
+- ``VACUUM (ANALYZE)`` when dead tuples exceed ``vacuum_threshold`` of the
+  table, or rows changed since the last ANALYZE do
+- ``REINDEX TABLE CONCURRENTLY`` when rows updated or deleted since the last
+  rebuild exceed ``reindex_threshold`` of the live rows (searches keep using
+  the old indexes while the new ones build)
+- Optionally ``pg_prewarm`` of the table's indexes once at startup, so the
+  first searches after a restart do not read the HNSW graph from disk
+
+Churn comes from ``pg_stat_user_tables``, so it covers writes from every
+process; the counter value at the last rebuild is kept in
+``hive_knowledge_maintenance``. ``TableHealth`` reports dead tuples, an
+estimate of the bloat they cause and the size of each index
+(``hive knowledge health`` prints it).
+
+Configuration (agent config.yaml or hive.yaml):
+    knowledge:
+      maintenance:
+        window: "02:00-05:00"     # local time; may wrap midnight; null = any time
+        check_interval: 900       # seconds between checks
+        vacuum_threshold: 0.1     # dead (or modified) share of rows that triggers VACUUM ANALYZE
+        reindex_threshold: 0.5    # updated+deleted rows since the last rebuild, per live row
+        prewarm: true             # load the indexes into shared buffers at startup
+"""
+
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from datetime import time as dt_time
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import text
+
+# Table names in the catalog queries are bound as parameters; these are internal
+_STATE_TABLE = "hive_knowledge_maintenance"
+
+
+def parse_window(window: str) -> tuple[dt_time, dt_time]:
+    """
+    Parse an off-peak window.
+
+    Args:
+        window: ``"HH:MM-HH:MM"`` in local time (the end may be earlier than the start)
+
+    Returns:
+        Start and end time
+
+    Raises:
+        ValueError: If the window is malformed
+    """
+    try:
+        start, end = (dt_time.fromisoformat(part.strip()) for part in window.split("-"))
+    except ValueError as e:
+        raise ValueError(f"Invalid maintenance window '{window}' (expected HH:MM-HH:MM)") from e
+    return start, end
+
+
+def in_window(window: str | None, now: datetime | None = None) -> bool:
+    """
+    Check whether a time falls inside an off-peak window.
+
+    Args:
+        window: ``"HH:MM-HH:MM"``, or None for any time
+        now: Time to check (default: now, local time)
+
+    Returns:
+        True inside the window
+    """
+    if window is None:
+        return True
+    start, end = parse_window(window)
+    current = (now or datetime.now()).time()
+    if start <= end:
+        return start <= current < end
+    # Wraps midnight (e.g. 22:00-04:00)
+    return current >= start or current < end
+
+
+def knowledge_tables(vector_db: Any) -> list[Any]:
+    """
+    Stores whose tables serve searches.
+
+    Args:
+        vector_db: Knowledge vector store (plain, partitioned or migrating)
+
+    Returns:
+        One store per physical table
+    """
+    active = getattr(vector_db, "active", None)
+    if active is not None:
+        return knowledge_tables(active)
+    partitions = getattr(vector_db, "partitions", None)
+    if callable(partitions):
+        return list(partitions().values())
+    return [vector_db]
+
+
+@dataclass
+class TableHealth:
+    """Churn, bloat and index sizes of one knowledge table."""
+
+    table: str
+    live_rows: int = 0
+    dead_rows: int = 0
+    modified_since_analyze: int = 0
+    churn_since_reindex: int = 0
+    table_bytes: int = 0
+    index_bytes: dict[str, int] = field(default_factory=dict)
+    last_vacuum: datetime | None = None
+    last_analyze: datetime | None = None
+    last_reindex: datetime | None = None
+
+    @property
+    def dead_ratio(self) -> float:
+        """Share of tuples that are dead."""
+        total = self.live_rows + self.dead_rows
+        return self.dead_rows / total if total else 0.0
+
+    @property
+    def churn_ratio(self) -> float:
+        """Rows updated or deleted since the last rebuild, per live row."""
+        return self.churn_since_reindex / max(self.live_rows, 1)
+
+    @property
+    def bloat_bytes(self) -> int:
+        """Estimated table space held by dead tuples."""
+        return int(self.table_bytes * self.dead_ratio)
+
+    def due(self, vacuum_threshold: float, reindex_threshold: float) -> list[str]:
+        """
+        Maintenance this table needs.
+
+        Args:
+            vacuum_threshold: Dead (or modified-since-ANALYZE) share of rows that calls for VACUUM ANALYZE
+            reindex_threshold: Churn per live row that calls for an index rebuild
+
+        Returns:
+            Subset of ``["vacuum", "reindex"]``
+        """
+        actions = []
+        modified_ratio = self.modified_since_analyze / max(self.live_rows, 1)
+        if self.dead_ratio >= vacuum_threshold or modified_ratio >= vacuum_threshold:
+            actions.append("vacuum")
+        if self.live_rows and self.churn_ratio >= reindex_threshold:
+            actions.append("reindex")
+        return actions
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable health report."""
+        return {
+            "table": self.table,
+            "live_rows": self.live_rows,
+            "dead_rows": self.dead_rows,
+            "dead_ratio": round(self.dead_ratio, 4),
+            "churn_since_reindex": self.churn_since_reindex,
+            "churn_ratio": round(self.churn_ratio, 4),
+            "table_bytes": self.table_bytes,
+            "bloat_bytes": self.bloat_bytes,
+            "index_bytes": self.index_bytes,
+            "last_vacuum": self.last_vacuum.isoformat() if self.last_vacuum else None,
+            "last_analyze": self.last_analyze.isoformat() if self.last_analyze else None,
+            "last_reindex": self.last_reindex.isoformat() if self.last_reindex else None,
+        }
+
+
+class IndexMaintainer:
+    """Health checks and maintenance statements for one knowledge table."""
+
+    def __init__(self, store: Any) -> None:
+        """
+        Initialize the maintainer.
+
+        Args:
+            store: PgVector store of the table
+        """
+        self.store = store
+        self.relation = f'"{store.schema}"."{store.table_name}"'
+        self._state_table = f'"{store.schema}"."{_STATE_TABLE}"'
+
+    def _autocommit(self) -> Any:
+        """Connection outside a transaction block (VACUUM and REINDEX CONCURRENTLY require one)."""
+        return self.store.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+    def _churn_counter(self, sess: Any) -> int:
+        """Rows updated or deleted since statistics were last reset."""
+        value = sess.execute(
+            text("SELECT n_tup_upd + n_tup_del FROM pg_stat_user_tables WHERE relid = CAST(:rel AS regclass)"),
+            {"rel": self.relation},
+        ).scalar()
+        return int(value or 0)
+
+    def _reindex_state(self, sess: Any) -> tuple[int, datetime | None]:
+        """Churn counter and time at the last rebuild (0 and None before the first)."""
+        try:
+            row = sess.execute(
+                text(f"SELECT churn_baseline, reindexed_at FROM {self._state_table} WHERE table_name = :table"),  # noqa: S608
+                {"table": self.store.table_name},
+            ).first()
+        except Exception:
+            sess.rollback()
+            return 0, None
+        return (int(row[0]), row[1]) if row else (0, None)
+
+    def health(self) -> TableHealth:
+        """
+        Read the table's statistics and sizes.
+
+        Returns:
+            TableHealth (zeros for a table that does not exist yet)
+        """
+        health = TableHealth(table=self.store.table_name)
+        with self.store.Session() as sess:
+            row = sess.execute(
+                text(
+                    "SELECT n_live_tup, n_dead_tup, n_mod_since_analyze, n_tup_upd + n_tup_del AS churn, "
+                    "greatest(last_vacuum, last_autovacuum) AS vacuumed, "
+                    "greatest(last_analyze, last_autoanalyze) AS analyzed, pg_relation_size(relid) AS size "
+                    "FROM pg_stat_user_tables WHERE schemaname = :schema AND relname = :table"
+                ),
+                {"schema": self.store.schema, "table": self.store.table_name},
+            ).first()
+            if row is None:
+                return health
+            health.live_rows = int(row.n_live_tup)
+            health.dead_rows = int(row.n_dead_tup)
+            health.modified_since_analyze = int(row.n_mod_since_analyze)
+            health.table_bytes = int(row.size)
+            health.last_vacuum = row.vacuumed
+            health.last_analyze = row.analyzed
+            indexes = sess.execute(
+                text(
+                    "SELECT indexrelname, pg_relation_size(indexrelid) FROM pg_stat_user_indexes "
+                    "WHERE schemaname = :schema AND relname = :table ORDER BY indexrelname"
+                ),
+                {"schema": self.store.schema, "table": self.store.table_name},
+            )
+            health.index_bytes = {name: int(size) for name, size in indexes}
+            baseline, health.last_reindex = self._reindex_state(sess)
+        churn = int(row.churn)
+        # Statistics resets (crash, pg_stat_reset) restart the counter below the baseline
+        health.churn_since_reindex = churn - baseline if churn >= baseline else churn
+        return health
+
+    def vacuum(self) -> None:
+        """Run VACUUM (ANALYZE): reclaim dead tuples, clean the index and refresh statistics."""
+        with self._autocommit() as conn:
+            conn.execute(text(f"VACUUM (ANALYZE) {self.relation}"))
+        logger.info("Knowledge table vacuumed", table=self.store.table_name)
+
+    def reindex(self) -> None:
+        """Rebuild every index of the table without blocking reads or writes, then reset the churn count."""
+        with self._autocommit() as conn:
+            conn.execute(text(f"REINDEX TABLE CONCURRENTLY {self.relation}"))
+        with self.store.Session() as sess, sess.begin():
+            sess.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {self._state_table} "
+                    "(table_name TEXT PRIMARY KEY, churn_baseline BIGINT NOT NULL, reindexed_at TIMESTAMP NOT NULL)"
+                )
+            )
+            sess.execute(
+                text(
+                    f"INSERT INTO {self._state_table} (table_name, churn_baseline, reindexed_at) "  # noqa: S608
+                    "VALUES (:table, :baseline, CURRENT_TIMESTAMP) ON CONFLICT (table_name) "
+                    "DO UPDATE SET churn_baseline = :baseline, reindexed_at = CURRENT_TIMESTAMP"
+                ),
+                {"table": self.store.table_name, "baseline": self._churn_counter(sess)},
+            )
+        logger.info("Knowledge table indexes rebuilt", table=self.store.table_name)
+
+    def prewarm(self) -> int:
+        """
+        Load the table's indexes into shared buffers with pg_prewarm.
+
+        Returns:
+            Blocks loaded (0 when the extension is not available)
+        """
+        try:
+            with self._autocommit() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_prewarm"))
+                blocks = conn.execute(
+                    text(
+                        "SELECT coalesce(sum(pg_prewarm(indexrelid)), 0) FROM pg_stat_user_indexes "
+                        "WHERE schemaname = :schema AND relname = :table"
+                    ),
+                    {"schema": self.store.schema, "table": self.store.table_name},
+                ).scalar()
+        except Exception as e:
+            logger.warning("Index prewarm failed", table=self.store.table_name, error=str(e))
+            return 0
+        logger.info("Knowledge indexes prewarmed", table=self.store.table_name, blocks=int(blocks or 0))
+        return int(blocks or 0)
+
+    def maintain(self, vacuum_threshold: float, reindex_threshold: float) -> list[str]:
+        """
+        Run the maintenance the table needs.
+
+        Args:
+            vacuum_threshold: See TableHealth.due
+            reindex_threshold: See TableHealth.due
+
+        Returns:
+            Actions performed
+        """
+        health = self.health()
+        actions = health.due(vacuum_threshold, reindex_threshold)
+        if "reindex" in actions:
+            # Rebuild first so VACUUM does not spend time cleaning indexes about to be replaced
+            self.reindex()
+        if "vacuum" in actions:
+            self.vacuum()
+        if actions:
+            logger.info("Knowledge table maintained", actions=actions, **health.to_dict())
+        return actions
+
+
+class MaintenanceScheduler(threading.Thread):
+    """Checks knowledge tables periodically and maintains them inside the off-peak window."""
+
+    def __init__(self, vector_db: Any, config: Any, coordinator: Any = None) -> None:
+        """
+        Prepare the scheduler.
+
+        Args:
+            vector_db: Knowledge vector store (its tables are resolved at every check)
+            config: MaintenanceConfig
+            coordinator: IngestCoordinator; only the process holding a table's maintenance
+                lock maintains it
+        """
+        super().__init__(name=f"knowledge-maintenance-{vector_db.table_name}", daemon=True)
+        self.vector_db = vector_db
+        self.config = config
+        self.coordinator = coordinator
+        self._stop_event = threading.Event()
+
+    def check(self, now: datetime | None = None) -> dict[str, list[str]]:
+        """
+        Maintain every table that needs it, if inside the window.
+
+        Args:
+            now: Time to check the window against (default: now)
+
+        Returns:
+            Actions performed per table
+        """
+        if not in_window(self.config.window, now):
+            return {}
+        performed: dict[str, list[str]] = {}
+        for store in knowledge_tables(self.vector_db):
+            lock = nullcontext(True)
+            if self.coordinator is not None:
+                lock = self.coordinator.leadership(f"{store.table_name}_maintenance")
+            try:
+                with lock as leader:
+                    if leader is None:
+                        continue
+                    actions = IndexMaintainer(store).maintain(
+                        self.config.vacuum_threshold, self.config.reindex_threshold
+                    )
+            except Exception as e:
+                logger.error("Knowledge table maintenance failed", table=store.table_name, error=str(e))
+                continue
+            if actions:
+                performed[store.table_name] = actions
+        return performed
+
+    def run(self) -> None:
+        """Prewarm if configured, then check every ``check_interval`` seconds until stopped."""
+        if self.config.prewarm:
+            for store in knowledge_tables(self.vector_db):
+                IndexMaintainer(store).prewarm()
+        while not self._stop_event.wait(self.config.check_interval):
+            self.check()
+
+    def stop(self) -> None:
+        """Stop checking."""
+        self._stop_event.set()
@@ -0,0 +1,206 @@
+"""
+Typed metadata for knowledge documents.
+
+By default every non-content CSV column is stored in ``meta_data`` as a string.
+With a metadata schema (explicit, or inferred from CSV dtypes) values keep
+their JSON type, so filters can use range predicates, and declared filter
+columns get expression indexes that let Postgres prune rows before ranking.
+
+Supported types:
+- ``str``: JSON string (default)
+- ``int`` / ``float``: JSON number, filtered as ``(meta_data->>'col')::numeric``
+- ``bool``: JSON boolean, filtered as ``(meta_data->>'col')::boolean``
+- ``date`` / ``datetime``: ISO 8601 string (sorts chronologically as text)
+"""
+
+import math
+import numbers
+from datetime import date, datetime
+from typing import Any
+
+import pandas as pd
+from sqlalchemy import Boolean, Numeric, and_, not_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+METADATA_TYPES = ("str", "int", "float", "bool", "date", "datetime")
+
+_NUMERIC_TYPES = ("int", "float")
+_TRUE_VALUES = {"true", "1", "yes", "y", "t"}
+_FALSE_VALUES = {"false", "0", "no", "n", "f"}
+
+
+def infer_metadata_types(df: pd.DataFrame) -> dict[str, str]:
+    """
+    Infer metadata types from pandas dtypes.
+
+    Args:
+        df: Parsed CSV dataframe
+
+    Returns:
+        Dictionary mapping column name to metadata type
+    """
+    types: dict[str, str] = {}
+    for column, dtype in df.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            types[str(column)] = "bool"
+        elif pd.api.types.is_integer_dtype(dtype):
+            types[str(column)] = "int"
+        elif pd.api.types.is_float_dtype(dtype):
+            types[str(column)] = "float"
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            types[str(column)] = "datetime"
+        else:
+            types[str(column)] = "str"
+    return types
+
+
+def _is_missing(value: Any) -> bool:
+    """Check for None/NaN/NaT."""
+    if value is None:
+        return True
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def coerce_value(value: Any, type_name: str) -> Any:
+    """
+    Coerce a CSV cell to its JSON-serializable metadata value.
+
+    Args:
+        value: Raw cell value
+        type_name: Metadata type
+
+    Returns:
+        Typed value (None for missing cells)
+
+    Raises:
+        ValueError: If the value cannot be converted
+    """
+    if _is_missing(value):
+        return None
+
+    if type_name == "str":
+        return str(value)
+    if type_name == "int":
+        # Parse integers exactly: floats lose precision above 2**53 (64-bit IDs, SKUs)
+        if isinstance(value, numbers.Integral):
+            return int(value)
+        try:
+            return int(str(value).strip())
+        except ValueError:
+            pass
+        # "3.0" and float dtypes
+        number = float(value)
+        if not number.is_integer():
+            raise ValueError(f"Not an integer: {value!r}")
+        return int(number)
+    if type_name == "float":
+        number = float(value)
+        return None if math.isnan(number) else number
+    if type_name == "bool":
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE_VALUES:
+            return True
+        if text in _FALSE_VALUES:
+            return False
+        raise ValueError(f"Not a boolean: {value!r}")
+    if type_name == "date":
+        parsed = value if isinstance(value, date) else pd.Timestamp(value)
+        return parsed.date().isoformat() if isinstance(parsed, datetime) else parsed.isoformat()
+    if type_name == "datetime":
+        return pd.Timestamp(value).isoformat()
+
+    raise ValueError(f"Unknown metadata type: {type_name}")
+
+
+def _typed_field(table: Any, key: str, type_name: str | None) -> Any:
+    """Metadata field expression matching the expression index for its type."""
+    field = table.c.meta_data[key].astext
+    if type_name in _NUMERIC_TYPES:
+        return field.cast(Numeric)
+    if type_name == "bool":
+        return field.cast(Boolean)
+    return field
+
+
+def _typed_value(value: Any, type_name: str | None) -> Any:
+    """Filter literal for a typed field."""
+    if type_name in _NUMERIC_TYPES or type_name == "bool":
+        return value
+    return str(value)
+
+
+def compile_filter(filter_expr: dict[str, Any], table: Any, types: dict[str, str]) -> ColumnElement[bool]:
+    """
+    Compile an agno FilterExpr dict into a typed SQLAlchemy condition.
+
+    Supports EQ, NEQ, IN, GT, GTE, LT, LTE, CONTAINS, STARTSWITH, NOT, AND and OR.
+    Keys without a declared type compare as text.
+
+    Args:
+        filter_expr: Filter expression dict (``FilterExpr.to_dict()``)
+        table: PgVector SQLAlchemy table
+        types: Metadata types by column
+
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    op = filter_expr["op"]
+
+    if op == "AND":
+        return and_(*[compile_filter(cond, table, types) for cond in filter_expr["conditions"]])
+    if op == "OR":
+        return or_(*[compile_filter(cond, table, types) for cond in filter_expr["conditions"]])
+    if op == "NOT":
+        return not_(compile_filter(filter_expr["condition"], table, types))
+
+    key = filter_expr["key"]
+    type_name = types.get(key)
+    field = _typed_field(table, key, type_name)
+
+    if op == "IN":
+        return field.in_([_typed_value(v, type_name) for v in filter_expr["values"]])
+    if op == "CONTAINS":
+        return table.c.meta_data[key].astext.contains(str(filter_expr["value"]))
+    if op == "STARTSWITH":
+        return table.c.meta_data[key].astext.startswith(str(filter_expr["value"]))
+
+    value = _typed_value(filter_expr["value"], type_name)
+    if op == "EQ":
+        return field == value
+    if op == "NEQ":
+        return field != value
+    if op == "GT":
+        return field > value
+    if op == "GTE":
+        return field >= value
+    if op == "LT":
+        return field < value
+    if op == "LTE":
+        return field <= value
+
+    raise ValueError(f"Unknown filter operator: {op}")
+
+
+def index_expression(column: str, type_name: str) -> str:
+    """
+    SQL expression indexed for a filter column (mirrors ``compile_filter``).
+
+    Args:
+        column: Metadata key
+        type_name: Metadata type
+
+    Returns:
+        Index expression SQL
+    """
+    literal = column.replace("'", "''")
+    field = f"(meta_data ->> '{literal}')"
+    if type_name in _NUMERIC_TYPES:
+        return f"(CAST({field} AS NUMERIC))"
+    if type_name == "bool":
+        return f"(CAST({field} AS BOOLEAN))"
+    return f"({field})"
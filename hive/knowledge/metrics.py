@@ -0,0 +1,198 @@
+"""
+Ingestion metrics for knowledge loads.
+
+The loaders time each phase of a load into ``IngestPlan.timings``:
+
+- ``parse``: reading the source file into a dataframe
+- ``hash``: row hashes of the source
+- ``diff``: reading the stored hashes and comparing them
+- ``prepare``: building (chunking, clustering) the documents to embed
+- ``embed``: embedding API calls
+- ``upsert``: the rest of the write batches (vector inserts)
+- ``cleanup``: deleting stale and removed documents
+- ``hashes``: storing hashes, clusters and the change log
+
+Stores that embed before writing (``HivePgVector``) report ``embed`` through
+``ingest_phase()`` while a load collects phases; with other stores the whole
+write time counts as ``embed``.
+
+Each applied load is added to a per-table registry, together with rows per
+second, documents, write batches and embedding tokens (from the embedder's
+usage). ``ingest_metrics()`` reports it; the API serves it at ``/knowledge/metrics``.
+Both are off when ``HIVE_ENABLE_METRICS`` is false.
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from agno.knowledge.document import Document
+
+from hive.config import settings
+
+# Phase timings of the load running in this context (None outside a load)
+_phases: ContextVar[dict[str, float] | None] = ContextVar("ingest_phases", default=None)
+
+
+def metrics_enabled() -> bool:
+    """Whether ingestion metrics are collected (``HIVE_ENABLE_METRICS``)."""
+    return settings().hive_enable_metrics
+
+
+@contextmanager
+def collect_phases() -> Iterator[dict[str, float]]:
+    """
+    Collect the phases stores report during a block.
+
+    Yields:
+        Seconds per phase, filled as the block runs
+    """
+    phases: dict[str, float] = {}
+    token = _phases.set(phases)
+    try:
+        yield phases
+    finally:
+        _phases.reset(token)
+
+
+@contextmanager
+def ingest_phase(name: str) -> Iterator[None]:
+    """
+    Time a block as a phase of the load collecting phases (no-op outside one).
+
+    Args:
+        name: Phase name (times of the same phase add up)
+    """
+    phases = _phases.get()
+    if phases is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - started
+
+
+def embedding_tokens(documents: list[Document]) -> int:
+    """
+    Embedding tokens billed for documents, from the usage their embedder reported.
+
+    Args:
+        documents: Embedded documents
+
+    Returns:
+        Total tokens (0 when the embedder reports no usage)
+    """
+    total = 0
+    for doc in documents:
+        usage = doc.usage or {}
+        tokens = usage.get("total_tokens", usage.get("prompt_tokens"))
+        if isinstance(tokens, int):
+            total += tokens
+    return total
+
+
+@dataclass
+class IngestStats:
+    """Cumulative ingestion metrics of one knowledge table."""
+
+    table: str
+    runs: int = 0
+    rows: int = 0
+    documents: int = 0
+    batches: int = 0
+    embedding_tokens: int = 0
+    seconds: dict[str, float] = field(default_factory=dict)  # per phase, over all runs
+    last_run: dict[str, Any] | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Snapshot for reporting."""
+        return {
+            "table": self.table,
+            "runs": self.runs,
+            "rows": self.rows,
+            "documents": self.documents,
+            "batches": self.batches,
+            "embedding_tokens": self.embedding_tokens,
+            "seconds": {phase: round(seconds, 4) for phase, seconds in self.seconds.items()},
+            "last_run": self.last_run,
+        }
+
+
+_stats: dict[str, IngestStats] = {}
+_stats_lock = threading.Lock()
+
+
+def record_ingest(
+    table: str,
+    mode: str,
+    rows: int,
+    documents: int,
+    batches: int,
+    tokens: int,
+    timings: dict[str, float],
+) -> dict[str, Any] | None:
+    """
+    Add an applied load to the registry.
+
+    Args:
+        table: Knowledge table
+        mode: "full" or "incremental"
+        rows: Source rows read
+        documents: Documents embedded
+        batches: Write batches
+        tokens: Embedding tokens
+        timings: Seconds per phase
+
+    Returns:
+        The run as reported under ``last_run``, or None when metrics are disabled
+    """
+    if not metrics_enabled():
+        return None
+    elapsed = sum(timings.values())
+    embedding = timings.get("embed", 0.0) + timings.get("upsert", 0.0)
+    run = {
+        "mode": mode,
+        "rows": rows,
+        "documents": documents,
+        "batches": batches,
+        "embedding_tokens": tokens,
+        "seconds": {phase: round(seconds, 4) for phase, seconds in timings.items()},
+        "rows_per_second": round(rows / elapsed, 1) if elapsed else None,
+        "documents_per_second": round(documents / embedding, 1) if documents and embedding else None,
+        "finished_at": time.time(),
+    }
+    with _stats_lock:
+        stats = _stats.setdefault(table, IngestStats(table=table))
+        stats.runs += 1
+        stats.rows += rows
+        stats.documents += documents
+        stats.batches += batches
+        stats.embedding_tokens += tokens
+        for phase, seconds in timings.items():
+            stats.seconds[phase] = stats.seconds.get(phase, 0.0) + seconds
+        stats.last_run = run
+    return run
+
+
+def ingest_metrics() -> dict[str, Any]:
+    """
+    Ingestion metrics report.
+
+    Returns:
+        ``{"enabled": bool, "tables": [...]}`` with cumulative counters and the last run per table
+    """
+    with _stats_lock:
+        tables = [stats.to_dict() for stats in _stats.values()]
+    return {"enabled": metrics_enabled(), "tables": tables}
+
+
+def clear_ingest_metrics() -> None:
+    """Forget every recorded load (useful for testing)."""
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,504 @@
+"""
+Background embedding-model migration with progressive cutover.
+
+Switching the embedder of a knowledge table used to mean a new table and a
+blocking full re-embed (or vectors from two models in one index). With
+``migration`` configured the knowledge layer migrates in the background:
+
+1. A shadow table for the target model is created next to the current one
+   (``{table}_m_{model}``, see ``shadow_table_name``)
+2. Searches keep using the current table; every load, reload and delete is
+   written to both tables (the shadow re-embeds with the target model)
+3. A backfill thread re-embeds what the shadow is missing, one write batch
+   (content hash) at a time, paced to ``quota_share`` of the target model's
+   ``tokens_per_minute`` so agent traffic keeps the rest of the quota
+4. When no batch is missing, the shadow's indexes are built and reads switch
+   to it in one step (under the write lock, so no dual write is half done);
+   from then on only the shadow is written
+
+Progress survives restarts: batches already in the shadow are not re-embedded,
+and ``{table}_embedding_migration`` records the switch so later processes
+read the shadow from the start. With ``coordination`` one process runs the
+backfill and the others switch when notified.
+
+Configuration (agent config.yaml or hive.yaml):
+    knowledge:
+      embedder: text-embedding-3-small        # current model (keeps serving)
+      migration:
+        embedder: text-embedding-3-large      # target model
+        dimensions: 1024                      # optional Matryoshka truncation
+        tokens_per_minute: 1000000            # provider quota of the target model
+        quota_share: 0.25                     # share of that quota the backfill uses
+        batch_size: 20                        # write batches selected per pass
+
+After the switch, point ``table_name`` at the shadow table and ``embedder``
+at the target model, then drop the migration block and the old table.
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from agno.knowledge.document import Document
+from agno.utils.tokens import count_text_tokens
+from loguru import logger
+from sqlalchemy import text
+
+from hive.knowledge.config import MigrationConfig
+
+# Postgres truncates identifiers beyond 63 bytes
+_MAX_IDENTIFIER = 63
+
+
+def shadow_table_name(table_name: str, embedder: str, dimensions: int | None = None) -> str:
+    """
+    Shadow table of a knowledge table for a target embedding model.
+
+    Args:
+        table_name: Current knowledge table
+        embedder: Target embedder model ID
+        dimensions: Target dimensions (None = the model's native size)
+
+    Returns:
+        ``{table}_m_{model}[_{dimensions}]``, shortened with a hash suffix when too long
+    """
+    model = embedder if dimensions is None else f"{embedder}_{dimensions}"
+    slug = "".join(ch if ch.isalnum() else "_" for ch in model.lower()).strip("_")
+    name = f"{table_name}_m_{slug}"
+    if len(name) <= _MAX_IDENTIFIER:
+        return name
+    digest = hashlib.md5(model.encode()).hexdigest()[:8]  # noqa: S324
+    return f"{name[: _MAX_IDENTIFIER - len(digest) - 1]}_{digest}"
+
+
+class TokenRateLimiter:
+    """Paces token spending to a fixed rate (thread-safe)."""
+
+    def __init__(self, tokens_per_second: float) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            tokens_per_second: Sustained rate
+        """
+        self.tokens_per_second = tokens_per_second
+        self._available_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """
+        Reserve tokens.
+
+        Args:
+            tokens: Tokens about to be spent
+
+        Returns:
+            Seconds to wait before spending them
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._available_at)
+            self._available_at = start + tokens / self.tokens_per_second
+            return start - now
+
+
+def _fresh(documents: list[Document]) -> list[Document]:
+    """Copies of documents without embeddings, so the shadow store embeds them with its own model."""
+    fresh = []
+    for doc in documents:
+        clone = copy.copy(doc)
+        clone.embedding = None
+        clone.usage = None
+        fresh.append(clone)
+    return fresh
+
+
+class MigratingVectorDb:
+    """
+    Vector store pair during an embedding migration.
+
+    Reads go to the active store (the current table until the switch, the
+    shadow after it). Writes go to both until the switch, then to the shadow
+    only. Everything else (Session, table_name, hash tables) is the current
+    store's, so loader state is unaffected by the migration.
+    """
+
+    def __init__(self, source: Any, shadow: Any) -> None:
+        """
+        Pair the current store with its shadow.
+
+        Args:
+            source: Store of the current embedding model
+            shadow: Store of the target model (same type, search and metadata settings)
+        """
+        self.source = source
+        self.shadow = shadow
+        # One mapping for both, so metadata types inferred by the loader reach the shadow's filters
+        shadow.metadata_types = source.metadata_types
+        self.switched = False
+        # Held by every write and by the switch, so reads never flip mid dual write
+        self.write_lock = threading.RLock()
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the current store."""
+        return getattr(self.source, name)
+
+    @property
+    def active(self) -> Any:
+        """Store that serves searches."""
+        return self.shadow if self.switched else self.source
+
+    def switch(self) -> None:
+        """Serve reads from the shadow store (and stop writing the old one)."""
+        with self.write_lock:
+            self.switched = True
+
+    def _writes(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        """Run a write on the stores written at this stage; returns the serving store's result."""
+        with self.write_lock:
+            if self.switched:
+                return getattr(self.shadow, name)(*args, **kwargs)
+            result = getattr(self.source, name)(*args, **kwargs)
+            try:
+                getattr(self.shadow, name)(*args, **kwargs)
+            except Exception as e:
+                # The backfill re-copies batches the shadow is missing
+                logger.warning("Shadow write failed", table=self.shadow.table_name, operation=name, error=str(e))
+            return result
+
+    def _document_writes(self, name: str, content_hash: str, documents: list[Document], **kwargs: Any) -> None:
+        """Write documents to the stores written at this stage (the shadow embeds its own copies)."""
+        with self.write_lock:
+            if self.switched:
+                getattr(self.shadow, name)(content_hash=content_hash, documents=documents, **kwargs)
+                return
+            getattr(self.source, name)(content_hash=content_hash, documents=documents, **kwargs)
+            try:
+                getattr(self.shadow, name)(content_hash=content_hash, documents=_fresh(documents), **kwargs)
+            except Exception as e:
+                logger.warning("Shadow write failed", table=self.shadow.table_name, operation=name, error=str(e))
+
+    async def _async_document_writes(self, content_hash: str, documents: list[Document]) -> None:
+        """Async version of _document_writes for ``async_write``."""
+        # Not under the write lock (it would block the event loop). A batch in flight during the
+        # switch still reaches the shadow: the stage is read once, before either write
+        if self.switched:
+            await self.shadow.async_write(content_hash, documents)
+            return
+        await self.source.async_write(content_hash, documents)
+        try:
+            await self.shadow.async_write(content_hash, _fresh(documents))
+        except Exception as e:
+            logger.warning("Shadow write failed", table=self.shadow.table_name, operation="async_write", error=str(e))
+
+    def upsert(self, content_hash: str, documents: list[Document], **kwargs: Any) -> None:
+        """Upsert documents (both stores until the switch)."""
+        self._document_writes("upsert", content_hash, documents, **kwargs)
+
+    def insert(self, content_hash: str, documents: list[Document], **kwargs: Any) -> None:
+        """Insert documents (both stores until the switch)."""
+        self._document_writes("insert", content_hash, documents, **kwargs)
+
+    async def async_write(self, content_hash: str, documents: list[Document]) -> None:
+        """Async upsert (both stores until the switch)."""
+        await self._async_document_writes(content_hash, documents)
+
+    def delete(self, name: str | None = None) -> bool:
+        """Delete documents by name, or all of them (both stores until the switch)."""
+        return bool(self._writes("delete", name=name))
+
+    def delete_by_names(self, names: list[str]) -> bool:
+        """Delete documents by name in one statement (both stores until the switch)."""
+        return bool(self._writes("delete_by_names", names))
+
+    async def async_delete_by_names(self, names: list[str]) -> bool:
+        """Async version of delete_by_names."""
+        if self.switched:
+            return bool(await self.shadow.async_delete_by_names(names))
+        result = await self.source.async_delete_by_names(names)
+        await self.shadow.async_delete_by_names(names)
+        return bool(result)
+
+    def delete_stale(self, *content_hashes: str) -> int:
+        """Delete documents of earlier loads (both stores until the switch)."""
+        return int(self._writes("delete_stale", *content_hashes))
+
+    async def async_delete_stale(self, *content_hashes: str) -> int:
+        """Async version of delete_stale."""
+        if self.switched:
+            return int(await self.shadow.async_delete_stale(*content_hashes))
+        result = await self.source.async_delete_stale(*content_hashes)
+        await self.shadow.async_delete_stale(*content_hashes)
+        return int(result)
+
+    def search(self, *args: Any, **kwargs: Any) -> list[Document]:
+        """Search the active store."""
+        return self.active.search(*args, **kwargs)
+
+    async def async_search(self, *args: Any, **kwargs: Any) -> list[Document]:
+        """Async search on the active store."""
+        return await self.active.async_search(*args, **kwargs)
+
+    def get_count(self) -> int:
+        """Documents in the active store."""
+        return int(self.active.get_count())
+
+    def exists(self) -> bool:
+        """True when both tables exist."""
+        return bool(self.source.exists() and self.shadow.exists())
+
+    def create(self) -> None:
+        """Create both tables."""
+        self.source.create()
+        self.shadow.create()
+
+    def optimize(self, force_recreate: bool = False) -> None:
+        """Build the indexes of the written stores."""
+        if not self.switched:
+            self.source.optimize(force_recreate=force_recreate)
+        self.shadow.optimize(force_recreate=force_recreate)
+
+    def invalidate_cache(self) -> None:
+        """Forget cached state of both stores."""
+        for store in (self.source, self.shadow):
+            invalidate = getattr(store, "invalidate_cache", None)
+            if callable(invalidate):
+                invalidate()
+
+
+def _store_pairs(store: MigratingVectorDb) -> Iterator[tuple[Any, Any]]:
+    """(current, shadow) table pairs: one per partition for partitioned stores."""
+    partitions = getattr(store.source, "partitions", None)
+    if callable(partitions):
+        for value, source in partitions().items():
+            yield source, store.shadow.partition(value)
+    else:
+        yield store.source, store.shadow
+
+
+class EmbeddingMigration(threading.Thread):
+    """Backfills the shadow store of a MigratingVectorDb and switches reads when it has caught up."""
+
+    def __init__(
+        self,
+        store: MigratingVectorDb,
+        config: MigrationConfig,
+        coordinator: Any = None,
+    ) -> None:
+        """
+        Prepare the migration.
+
+        Args:
+            store: Store pair to migrate
+            config: Target model and throttle
+            coordinator: IngestCoordinator; only the process holding the shadow table's lock
+                backfills, the others switch when notified (see ``refresh``)
+        """
+        super().__init__(name=f"knowledge-migrate-{store.source.table_name}", daemon=True)
+        self.store = store
+        self.config = config
+        self.coordinator = coordinator
+        self.limiter = TokenRateLimiter(config.token_rate)
+        self.state = "pending"
+        self.documents_copied = 0
+        self.tokens_embedded = 0
+        self.error: str | None = None
+        self._stop_event = threading.Event()
+        self._state_table = f'"{store.source.schema}"."{store.source.table_name}_embedding_migration"'
+
+    def _save_state(self, state: str) -> None:
+        """Record the migration state so restarted processes know whether reads switched."""
+        shadow = self.store.shadow.table_name
+        with self.store.source.Session() as sess, sess.begin():
+            sess.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {self._state_table} ("
+                    "shadow_table TEXT PRIMARY KEY, embedder TEXT NOT NULL, state TEXT NOT NULL, "
+                    "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+            sess.execute(
+                text(
+                    f"INSERT INTO {self._state_table} (shadow_table, embedder, state) "  # noqa: S608
+                    "VALUES (:shadow, :embedder, :state) "
+                    "ON CONFLICT (shadow_table) DO UPDATE SET state = :state, updated_at = CURRENT_TIMESTAMP"
+                ),
+                {"shadow": shadow, "embedder": self.config.embedder, "state": state},
+            )
+        self.state = state
+
+    def saved_state(self) -> str | None:
+        """
+        State recorded for this shadow table.
+
+        Returns:
+            "migrating" or "switched", or None before the migration started
+        """
+        try:
+            with self.store.source.Session() as sess:
+                return sess.execute(
+                    text(f"SELECT state FROM {self._state_table} WHERE shadow_table = :shadow"),  # noqa: S608
+                    {"shadow": self.store.shadow.table_name},
+                ).scalar()
+        except Exception:
+            return None
+
+    def refresh(self) -> None:
+        """Switch reads if another process finished the migration."""
+        if not self.store.switched and self.saved_state() == "switched":
+            self.store.switch()
+            self.state = "switched"
+            logger.info("Knowledge reads switched to migrated table", table=self.store.shadow.table_name)
+
+    def _missing(self, source: Any, shadow: Any, limit: int) -> list[str]:
+        """Content hashes whose documents the shadow table lacks (or holds a different number of)."""
+        query = f"""
+            SELECT s.content_hash
+            FROM (SELECT content_hash, count(*) AS n FROM {source.table.fullname} GROUP BY content_hash) s
+            LEFT JOIN (SELECT content_hash, count(*) AS n FROM {shadow.table.fullname} GROUP BY content_hash) d
+                ON d.content_hash = s.content_hash
+            WHERE s.content_hash IS NOT NULL AND d.n IS DISTINCT FROM s.n
+            ORDER BY s.content_hash
+            LIMIT :limit
+        """  # noqa: S608
+        with source.Session() as sess:
+            return [row[0] for row in sess.execute(text(query), {"limit": limit})]
+
+    def _documents(self, source: Any, content_hash: str) -> list[Document]:
+        """Documents of one write batch, read back from the current table."""
+        table = source.table
+        columns = [table.c.name, table.c.content, table.c.meta_data, table.c.content_id]
+        with source.Session() as sess:
+            rows = sess.execute(table.select().with_only_columns(*columns).where(table.c.content_hash == content_hash))
+            return [
+                # Loaders give documents their name as id, so the shadow record ids match dual writes
+                Document(
+                    id=row.name,
+                    name=row.name,
+                    content=row.content,
+                    meta_data=row.meta_data or {},
+                    content_id=row.content_id,
+                )
+                for row in rows
+            ]
+
+    def _copy(self, source: Any, shadow: Any, content_hash: str) -> None:
+        """Re-embed one write batch into the shadow table, paced to the token budget."""
+        documents = self._documents(source, content_hash)
+        if not documents:
+            return
+        tokens = sum(count_text_tokens(doc.content, self.config.embedder) for doc in documents)
+        if self._stop_event.wait(self.limiter.reserve(tokens)):
+            return
+        shadow.upsert(content_hash=content_hash, documents=documents)
+        self.documents_copied += len(documents)
+        self.tokens_embedded += tokens
+
+    def _remove_orphans(self, source: Any, shadow: Any) -> None:
+        """Drop shadow documents whose batch was deleted from the current table while it was copied."""
+        with shadow.Session() as sess, sess.begin():
+            sess.execute(
+                text(
+                    f"DELETE FROM {shadow.table.fullname} "  # noqa: S608
+                    f"WHERE content_hash NOT IN (SELECT content_hash FROM {source.table.fullname} "
+                    "WHERE content_hash IS NOT NULL)"
+                )
+            )
+
+    def _backfill(self) -> bool:
+        """
+        Copy missing batches until none are left.
+
+        Returns:
+            True when the shadow has caught up, False when stopped
+        """
+        while not self._stop_event.is_set():
+            copied = 0
+            for source, shadow in _store_pairs(self.store):
+                for content_hash in self._missing(source, shadow, self.config.batch_size):
+                    if self._stop_event.is_set():
+                        return False
+                    self._copy(source, shadow, content_hash)
+                    copied += 1
+            if not copied:
+                return True
+            logger.info(
+                "Embedding migration progress",
+                table=self.store.shadow.table_name,
+                documents=self.documents_copied,
+                tokens=self.tokens_embedded,
+            )
+        return False
+
+    def _switch_when_caught_up(self) -> bool:
+        """Under the write lock: drop orphans, confirm nothing is missing and switch reads."""
+        with self.store.write_lock:
+            for source, shadow in _store_pairs(self.store):
+                self._remove_orphans(source, shadow)
+                if self._missing(source, shadow, 1):
+                    return False
+            self.store.switch()
+        return True
+
+    def migrate(self) -> dict[str, Any]:
+        """
+        Backfill the shadow table, build its indexes and switch reads.
+
+        Returns:
+            Migration statistics (``switched`` is False when stopped early)
+        """
+        self._save_state("migrating")
+        logger.info(
+            "Embedding migration started",
+            table=self.store.source.table_name,
+            shadow=self.store.shadow.table_name,
+            embedder=self.config.embedder,
+            tokens_per_second=round(self.config.token_rate),
+        )
+        self.store.shadow.create()
+        while self._backfill():
+            # Index the shadow table before it serves reads
+            self.store.shadow.optimize()
+            if self._switch_when_caught_up():
+                self._save_state("switched")
+                logger.info(
+                    "Knowledge reads switched to migrated table",
+                    table=self.store.shadow.table_name,
+                    documents=self.documents_copied,
+                )
+                break
+        return {"switched": self.store.switched, "documents": self.documents_copied, "tokens": self.tokens_embedded}
+
+    def run(self) -> None:
+        """Migrate unless an earlier run already switched (or another process is migrating)."""
+        try:
+            self.refresh()
+            if self.store.switched:
+                return
+            if self.coordinator is None:
+                self.migrate()
+            elif self.coordinator.run(self.store.shadow.table_name, self.migrate) is None:
+                self.state = "waiting"
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            logger.error("Embedding migration failed", table=self.store.source.table_name, error=str(e))
+
+    def stop(self) -> None:
+        """Stop the backfill after the current batch."""
+        self._stop_event.set()
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable progress."""
+        return {
+            "table": self.store.source.table_name,
+            "shadow_table": self.store.shadow.table_name,
+            "embedder": self.config.embedder,
+            "state": "switched" if self.store.switched else self.state,
+            "documents_copied": self.documents_copied,
+            "tokens_embedded": self.tokens_embedded,
+            "error": self.error,
+        }
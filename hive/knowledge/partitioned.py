@@ -0,0 +1,511 @@
+"""
+Partitioned knowledge tables.
+
+Multi-product CSVs can be split on a metadata column (``partition_by``) so
+each product line gets its own PgVector table and its own HNSW index:
+
+    knowledge_base              rows without a partition value
+    knowledge_base_p_billing    rows with product == "billing"
+    knowledge_base_p_shipping   rows with product == "shipping"
+
+Searches whose filters pin the partition column (``{"product": "billing"}``,
+``EQ("product", "billing")`` or ``IN("product", [...])``) only touch the
+matching tables. Other searches fan out to every partition and merge results
+by similarity score. Known partitions are recorded in ``{table}_partitions``
+so a restarted process can still fan out to all of them.
+
+Writes only touch the partitions of the documents written. A row whose
+partition value changes leaves its old table the way any changed row does:
+incremental loads delete changed rows by name before writing them, and full
+loads fingerprint the partition value, so ``delete_stale`` drops the old copy.
+"""
+
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from agno.knowledge.document import Document
+from agno.vectordb.pgvector import SearchType
+from loguru import logger
+from sqlalchemy import text
+
+from hive.knowledge.vectordb import HivePgVector
+
+# Postgres truncates identifiers beyond 63 bytes
+_MAX_IDENTIFIER = 63
+
+# Query embeddings kept for fan-out searches
+_QUERY_CACHE_SIZE = 32
+
+
+def partition_table_name(table_name: str, value: str) -> str:
+    """
+    Table name for a partition value.
+
+    Args:
+        table_name: Base knowledge table
+        value: Partition value
+
+    Returns:
+        ``{table}_p_{slug}``, with a hash suffix when the slug is lossy or too long
+    """
+    slug = "".join(ch if ch.isalnum() else "_" for ch in value.lower()).strip("_") or "empty"
+    name = f"{table_name}_p_{slug}"
+    if slug == value and len(name) <= _MAX_IDENTIFIER:
+        return name
+    # Distinct values can share a slug ("A-1" / "a_1"), so disambiguate with a hash
+    digest = hashlib.md5(value.encode()).hexdigest()[:8]  # noqa: S324
+    prefix = name[: _MAX_IDENTIFIER - len(digest) - 1]
+    return f"{prefix}_{digest}"
+
+
+def _expr_dict(filter_expr: Any) -> dict[str, Any]:
+    """FilterExpr object or dict as a dict."""
+    return filter_expr.to_dict() if hasattr(filter_expr, "to_dict") else filter_expr
+
+
+def _expr_partitions(expr: dict[str, Any], key: str) -> set[str] | None:
+    """Partition values an expression is restricted to (None = unrestricted)."""
+    op = expr.get("op")
+    if op == "EQ" and expr.get("key") == key:
+        return {str(expr["value"])}
+    if op == "IN" and expr.get("key") == key:
+        return {str(v) for v in expr["values"]}
+    if op == "AND":
+        return _intersect(_expr_partitions(cond, key) for cond in expr["conditions"])
+    return None
+
+
+def _intersect(candidates: Any) -> set[str] | None:
+    """Intersect restrictions, ignoring unrestricted (None) entries."""
+    result: set[str] | None = None
+    for values in candidates:
+        if values is not None:
+            result = values if result is None else result & values
+    return result
+
+
+def partition_values(filters: Any, key: str) -> set[str] | None:
+    """
+    Determine which partitions a search filter can match.
+
+    Args:
+        filters: Search filters (metadata dict or list of FilterExpr)
+        key: Partition column
+
+    Returns:
+        Set of partition values, or None when every partition can match
+    """
+    if not filters:
+        return None
+    if isinstance(filters, dict):
+        return {str(filters[key])} if key in filters else None
+    # List entries are ANDed together
+    return _intersect(_expr_partitions(_expr_dict(f), key) for f in filters)
+
+
+def _all_succeeded(results: Any) -> bool:
+    """Run every operation (no short-circuit) and report whether all succeeded."""
+    return all(list(results))
+
+
+class _QueryEmbeddingCache:
+    """Embedder proxy that embeds each query once across partition searches."""
+
+    def __init__(self, embedder: Any) -> None:
+        """Wrap an embedder."""
+        self._embedder = embedder
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_embedding(self, text: str) -> list[float]:
+        """Embed a query, reusing the embedding for repeated text."""
+        with self._lock:
+            if text in self._cache:
+                self._cache.move_to_end(text)
+                return self._cache[text]
+        embedding = self._embedder.get_embedding(text)
+        if embedding:
+            with self._lock:
+                self._cache[text] = embedding
+                while len(self._cache) > _QUERY_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return embedding
+
+    async def async_get_embedding(self, text: str) -> list[float]:
+        """Async version of get_embedding (shares the cache)."""
+        with self._lock:
+            if text in self._cache:
+                self._cache.move_to_end(text)
+                return self._cache[text]
+        embedding = await self._embedder.async_get_embedding(text)
+        if embedding:
+            with self._lock:
+                self._cache[text] = embedding
+                while len(self._cache) > _QUERY_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return embedding
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the wrapped embedder."""
+        return getattr(self._embedder, name)
+
+
+class PartitionedPgVector(HivePgVector):
+    """PgVector facade that stores each partition value in its own table."""
+
+    def __init__(
+        self,
+        *args: Any,
+        partition_by: str,
+        store_factory: Callable[[str], HivePgVector],
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize a partitioned store.
+
+        Args:
+            *args: HivePgVector positional arguments (describe the base table)
+            partition_by: Metadata column whose value selects the partition
+            store_factory: Builds the store for a partition table name
+            **kwargs: HivePgVector keyword arguments
+        """
+        super().__init__(*args, **kwargs)
+        self.partition_by = partition_by
+        self._store_factory = store_factory
+        self._query_embedder = _QueryEmbeddingCache(self.embedder)
+        self._registry_table = f'"{self.schema}"."{self.table_name}_partitions"'
+        self._stores: dict[str | None, HivePgVector] = {}
+        self._registry_loaded = False
+        self._stores_lock = threading.RLock()
+
+    # --- partition bookkeeping ---
+
+    def _build_store(self, table_name: str) -> HivePgVector:
+        """Build a partition store sharing this store's embedder cache and metadata types."""
+        store = self._store_factory(table_name)
+        store.embedder = self._query_embedder
+        store.metadata_types = self.metadata_types
+        return store
+
+    def _load_registry(self) -> None:
+        """Load partitions created by earlier processes."""
+        if self._registry_loaded:
+            return
+        self._registry_loaded = True
+        try:
+            with self.Session() as sess:
+                rows = sess.execute(text(f"SELECT value, table_name FROM {self._registry_table}")).fetchall()  # noqa: S608
+        except Exception as e:
+            logger.debug("No partition registry yet", table=self.table_name, error=str(e))
+            return
+        for row in rows:
+            self._stores.setdefault(row.value, self._build_store(row.table_name))
+
+    def _register(self, value: str, table_name: str) -> None:
+        """Record a new partition so other processes can find it."""
+        with self.Session() as sess, sess.begin():
+            sess.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {self._registry_table} "
+                    "(value TEXT PRIMARY KEY, table_name TEXT NOT NULL)"
+                )
+            )
+            sess.execute(
+                text(
+                    f"INSERT INTO {self._registry_table} (value, table_name) "  # noqa: S608
+                    "VALUES (:value, :table_name) ON CONFLICT (value) DO NOTHING"
+                ),
+                {"value": value, "table_name": table_name},
+            )
+
+    def partition(self, value: str | None) -> HivePgVector:
+        """
+        Get (creating if needed) the store for a partition value.
+
+        Args:
+            value: Partition value (None = rows without one, kept in the base table)
+
+        Returns:
+            Partition store
+        """
+        with self._stores_lock:
+            self._load_registry()
+            store = self._stores.get(value)
+            if store is not None:
+                return store
+
+            table_name = self.table_name if value is None else partition_table_name(self.table_name, value)
+            store = self._build_store(table_name)
+            store.create()
+            if value is not None:
+                self._register(value, table_name)
+                logger.info("Created knowledge partition", partition=value, table=table_name)
+            self._stores[value] = store
+            return store
+
+    def invalidate_cache(self) -> None:
+        """Re-read the partition registry on next use, picking up partitions other processes created."""
+        super().invalidate_cache()
+        with self._stores_lock:
+            self._registry_loaded = False
+            stores = list(self._stores.values())
+        for store in stores:
+            store.invalidate_cache()
+
+    def partitions(self) -> dict[str | None, HivePgVector]:
+        """All known partition stores keyed by partition value."""
+        with self._stores_lock:
+            self._load_registry()
+            return dict(self._stores)
+
+    def _partition_key(self, document: Document) -> str | None:
+        """Partition value of a document (None when missing)."""
+        value = (document.meta_data or {}).get(self.partition_by)
+        return None if value is None or value == "" else str(value)
+
+    def _group(self, documents: list[Document]) -> dict[str | None, list[Document]]:
+        """Group documents by partition value."""
+        groups: dict[str | None, list[Document]] = {}
+        for document in documents:
+            groups.setdefault(self._partition_key(document), []).append(document)
+        return groups
+
+    def _sync(self, store: HivePgVector) -> HivePgVector:
+        """Apply query-time settings (changed by Knowledge or benchmarks) to a partition."""
+        store.search_type = self.search_type
+        store.vector_score_weight = self.vector_score_weight
+        store.similarity_threshold = self.similarity_threshold
+        if self.vector_index is not None and store.vector_index is not None:
+            store.vector_index.ef_search = self.vector_index.ef_search
+        return store
+
+    # --- writes ---
+
+    def create(self) -> None:
+        """Create the base table (partition tables are created on first write)."""
+        self.partition(None)
+
+    def upsert(
+        self,
+        content_hash: str,
+        documents: list[Document],
+        filters: dict[str, Any] | None = None,
+        batch_size: int = 100,
+        user_id: str | None = None,
+    ) -> None:
+        """Upsert documents into their partitions."""
+        for value, docs in self._group(documents).items():
+            self.partition(value).upsert(content_hash, docs, filters, batch_size, user_id=user_id)
+
+    async def async_upsert(self, content_hash: str, documents: list[Document], *args: Any, **kwargs: Any) -> None:
+        """Upsert documents into their partitions in a worker thread."""
+        await asyncio.to_thread(self.upsert, content_hash, documents, *args, **kwargs)
+
+    async def _async_partitions(self, values: list[str | None] | None = None) -> list[HivePgVector]:
+        """
+        Partition stores for async writes, sharing this store's async engine.
+
+        Args:
+            values: Partition values (created when missing), or None for every known partition
+
+        Returns:
+            Partition stores
+        """
+        if values is None:
+            stores = list((await asyncio.to_thread(self.partitions)).values())
+        else:
+            # Creating a partition runs DDL; keep it off the event loop
+            stores = [await asyncio.to_thread(self.partition, value) for value in values]
+        for store in stores:
+            store._async_engine = self.async_engine
+        return stores
+
+    async def async_write(self, content_hash: str, documents: list[Document]) -> None:
+        """Embed and upsert documents into their partitions on the async engine."""
+        groups = self._group(documents)
+        stores = await self._async_partitions(list(groups))
+        for store, docs in zip(stores, groups.values(), strict=True):
+            await store.async_write(content_hash, docs)
+
+    async def async_delete_by_names(self, names: list[str]) -> bool:
+        """Delete documents by name from every partition on the async engine."""
+        stores = await self._async_partitions()
+        return _all_succeeded(await asyncio.gather(*(store.async_delete_by_names(names) for store in stores)))
+
+    async def async_delete_stale(self, *content_hashes: str) -> int:
+        """Delete documents written under other content hashes from every partition on the async engine."""
+        stores = await self._async_partitions()
+        return sum(await asyncio.gather(*(store.async_delete_stale(*content_hashes) for store in stores)))
+
+    def insert(
+        self,
+        content_hash: str,
+        documents: list[Document],
+        filters: dict[str, Any] | None = None,
+        batch_size: int = 10,
+        user_id: str | None = None,
+    ) -> None:
+        """Insert documents into their partitions."""
+        for value, docs in self._group(documents).items():
+            self.partition(value).insert(content_hash, docs, filters, batch_size, user_id=user_id)
+
+    async def async_insert(self, content_hash: str, documents: list[Document], *args: Any, **kwargs: Any) -> None:
+        """Insert documents into their partitions in a worker thread."""
+        await asyncio.to_thread(self.insert, content_hash, documents, *args, **kwargs)
+
+    def delete(self, name: str | None = None) -> bool:
+        """Delete documents by name (or everything) from every partition."""
+        return _all_succeeded(store.delete(name=name) for store in self.partitions().values())
+
+    def delete_stale(self, *content_hashes: str) -> int:
+        """Delete documents written under other content hashes from every partition."""
+        return sum(store.delete_stale(*content_hashes) for store in self.partitions().values())
+
+    def delete_by_names(self, names: list[str]) -> bool:
+        """Delete documents by name from every partition."""
+        return _all_succeeded(store.delete_by_names(names) for store in self.partitions().values())
+
+    def delete_by_id(self, id: str) -> bool:  # noqa: A002
+        """Delete a document ID from every partition."""
+        return _all_succeeded(store.delete_by_id(id) for store in self.partitions().values())
+
+    def delete_by_name(self, name: str) -> bool:
+        """Delete a document name from every partition."""
+        return _all_succeeded(store.delete_by_name(name) for store in self.partitions().values())
+
+    def delete_by_metadata(self, metadata: dict[str, Any]) -> bool:
+        """Delete matching documents from the partitions the metadata can match."""
+        values = partition_values(metadata, self.partition_by)
+        stores = self._route(values)
+        return _all_succeeded(store.delete_by_metadata(metadata) for store in stores)
+
+    def delete_by_content_id(self, content_id: str, user_id: str | None = None) -> bool:
+        """Delete a content ID from every partition."""
+        return _all_succeeded(
+            store.delete_by_content_id(content_id, user_id=user_id) for store in self.partitions().values()
+        )
+
+    def update_metadata(self, content_id: str, metadata: dict[str, Any]) -> None:
+        """Update metadata for a content ID in every partition."""
+        for store in self.partitions().values():
+            store.update_metadata(content_id, metadata)
+
+    def drop(self) -> None:
+        """Drop every partition table and the registry."""
+        for store in self.partitions().values():
+            store.drop()
+        with self.Session() as sess, sess.begin():
+            sess.execute(text(f"DROP TABLE IF EXISTS {self._registry_table}"))
+        with self._stores_lock:
+            self._stores.clear()
+            self._registry_loaded = False
+
+    # --- reads ---
+
+    def exists(self) -> bool:
+        """Check whether the base table exists."""
+        return self.partition(None).exists()
+
+    def get_count(self) -> int:
+        """Count documents across partitions."""
+        return sum(store.get_count() for store in self.partitions().values())
+
+    def name_exists(self, name: str) -> bool:
+        """Check every partition for a document name."""
+        return any(store.name_exists(name) for store in self.partitions().values())
+
+    def id_exists(self, id: str) -> bool:  # noqa: A002
+        """Check every partition for a document ID."""
+        return any(store.id_exists(id) for store in self.partitions().values())
+
+    def content_hash_exists(self, content_hash: str, user_id: str | None = None) -> bool:
+        """Check every partition for a content hash."""
+        return any(store.content_hash_exists(content_hash, user_id=user_id) for store in self.partitions().values())
+
+    def _route(self, values: set[str] | None) -> list[HivePgVector]:
+        """Stores a search restricted to ``values`` has to visit."""
+        stores = self.partitions()
+        if values is None:
+            return list(stores.values())
+        # A pinned partition never matches rows without a partition value
+        return [stores[value] for value in sorted(values) if value in stores]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Any = None,
+        user_id: str | None = None,
+    ) -> list[Document]:
+        """
+        Search the partitions a filter can match.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+            filters: Metadata filters (pinning ``partition_by`` routes to one table)
+            user_id: Restrict results to this user's rows plus shared rows
+
+        Returns:
+            Matching documents ordered by similarity
+        """
+        values = partition_values(filters, self.partition_by)
+        stores = [self._sync(store) for store in self._route(values)]
+        logger.debug("Partitioned search", partitions=len(stores), routed=values is not None)
+
+        if len(stores) == 1:
+            documents = stores[0].search(query=query, limit=limit, filters=filters, user_id=user_id)
+        else:
+            documents = []
+            for store in stores:
+                documents.extend(store.search(query=query, limit=limit, filters=filters, user_id=user_id))
+            documents.sort(key=lambda doc: (doc.meta_data or {}).get("similarity_score", 0.0), reverse=True)
+            documents = documents[:limit]
+
+        if self.reranker:
+            documents = self.reranker.rerank(query=query, documents=documents)
+        return documents
+
+    async def async_search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Any = None,
+        user_id: str | None = None,
+    ) -> list[Document]:
+        """Async version of search: partitions are searched concurrently on the shared async engine."""
+        values = partition_values(filters, self.partition_by)
+        if not self._registry_loaded:
+            await asyncio.to_thread(self.partitions)
+        stores = [self._sync(store) for store in self._route(values)]
+        for store in stores:
+            store._async_engine = self.async_engine
+        # Embed once up front; partition searches then hit the shared query cache
+        if self.search_type != SearchType.keyword:
+            await self._query_embedder.async_get_embedding(query)
+
+        results = await asyncio.gather(
+            *(store.async_search(query=query, limit=limit, filters=filters, user_id=user_id) for store in stores)
+        )
+        documents = [doc for result in results for doc in result]
+        if len(stores) > 1:
+            documents.sort(key=lambda doc: (doc.meta_data or {}).get("similarity_score", 0.0), reverse=True)
+            documents = documents[:limit]
+
+        if self.reranker:
+            documents = self.reranker.rerank(query=query, documents=documents)
+        return documents
+
+    def optimize(self, force_recreate: bool = False) -> None:
+        """
+        Build vector, full-text and metadata indexes on every partition.
+
+        Args:
+            force_recreate: Drop and rebuild the vector and full-text indexes
+        """
+        for store in self.partitions().values():
+            store.optimize(force_recreate=force_recreate)
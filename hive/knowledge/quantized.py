@@ -0,0 +1,258 @@
+"""
+Quantized vector storage for large knowledge tables.
+
+Full-precision embeddings stay in the ``embedding`` column, but the HNSW index
+is built over a compressed expression of them:
+
+- ``halfvec``: 16-bit floats (``embedding::halfvec(n)``), ~50% index memory
+- ``binary``: 1 bit per dimension (``binary_quantize(embedding)::bit(n)``), ~97% index memory
+
+Searches walk the compressed index for the top candidates, then re-rank those
+candidates by exact distance on the full-precision column. Binary quantization
+always re-ranks; halfvec re-ranks ``rerank_candidates`` when set.
+
+Combine with ``StorageConfig.dimensions`` (Matryoshka truncation for
+text-embedding-3 models) to shrink the stored vectors as well.
+"""
+
+from typing import Any
+
+from agno.knowledge.document import Document
+from agno.vectordb.distance import Distance
+from agno.vectordb.pgvector import HNSW
+from agno.vectordb.score import normalize_score, score_to_distance_threshold
+from loguru import logger
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
+from sqlalchemy import and_, cast, func, literal, select, text
+
+from hive.knowledge.vectordb import HivePgVector
+
+# Candidates fetched per requested result when binary quantization re-ranks by default
+_BINARY_OVERSAMPLING = 4
+
+_HALFVEC_OPS = {
+    Distance.l2: "halfvec_l2_ops",
+    Distance.max_inner_product: "halfvec_ip_ops",
+    Distance.cosine: "halfvec_cosine_ops",
+}
+
+
+class QuantizedPgVector(HivePgVector):
+    """PgVector with a half-precision or binary-quantized HNSW index and full-precision re-rank."""
+
+    def __init__(
+        self,
+        *args: Any,
+        quantization: str = "halfvec",
+        rerank_candidates: int = 0,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize quantized vector storage.
+
+        Args:
+            *args: HivePgVector positional arguments
+            quantization: "halfvec" or "binary"
+            rerank_candidates: Candidates re-ranked at full precision (0 = limit, or 4x limit for binary)
+            **kwargs: HivePgVector keyword arguments
+        """
+        if quantization not in ("halfvec", "binary"):
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        super().__init__(*args, **kwargs)
+        self.quantization = quantization
+        self.rerank_candidates = rerank_candidates
+
+        # Distinct name so switching an existing table to quantized storage builds a new index
+        if self.vector_index is not None and self.vector_index.name is None:
+            self.vector_index.name = f"{self.table_name}_hnsw_{quantization}_index"
+
+    def _quantized_expression(self, query_embedding: list[float]) -> Any:
+        """Build the compressed distance expression (must match the index expression)."""
+        if self.quantization == "binary":
+            bits = "".join("1" if value > 0 else "0" for value in query_embedding)
+            column = cast(func.binary_quantize(self.table.c.embedding), BIT(self.dimensions))
+            return column.hamming_distance(literal(bits, BIT(self.dimensions)))
+
+        column = cast(self.table.c.embedding, HALFVEC(self.dimensions))
+        query = literal(query_embedding, HALFVEC(self.dimensions))
+        if self.distance == Distance.l2:
+            return column.l2_distance(query)
+        if self.distance == Distance.max_inner_product:
+            return column.max_inner_product(query)
+        return column.cosine_distance(query)
+
+    def _full_distance(self, query_embedding: list[float]) -> Any:
+        """Exact distance on the full-precision column."""
+        query = literal(query_embedding, Vector(self.dimensions))
+        if self.distance == Distance.l2:
+            return self.table.c.embedding.l2_distance(query)
+        if self.distance == Distance.max_inner_product:
+            return self.table.c.embedding.max_inner_product(query)
+        return self.table.c.embedding.cosine_distance(query)
+
+    def _candidate_count(self, limit: int) -> int:
+        """Number of candidates taken from the compressed index."""
+        if self.rerank_candidates:
+            return max(self.rerank_candidates, limit)
+        if self.quantization == "binary":
+            return limit * _BINARY_OVERSAMPLING
+        return limit
+
+    def _apply_filters(self, stmt: Any, filters: Any) -> Any:
+        """Apply dict or FilterExpr filters (same semantics as vector_search)."""
+        if filters is None:
+            return stmt
+        if isinstance(filters, dict):
+            return stmt.where(self.table.c.meta_data.contains(filters))
+        conditions = [self._dsl_to_sqlalchemy(f.to_dict() if hasattr(f, "to_dict") else f, self.table) for f in filters]
+        return stmt.where(and_(*conditions))
+
+    def vector_search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Any = None,
+        user_id: str | None = None,
+    ) -> list[Document]:
+        """
+        Search the compressed index, then re-rank candidates at full precision.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+            filters: Metadata filters
+            user_id: Restrict results to this user's rows plus shared rows
+
+        Returns:
+            Matching documents ordered by exact distance
+        """
+        query_embedding = self.embedder.get_embedding(query)
+        if query_embedding is None:
+            logger.error("Error getting embedding for query", query=query)
+            return []
+
+        candidates_count = self._candidate_count(limit)
+        candidates = select(self.table.c.id)
+        candidates = self._apply_user_scope(candidates, user_id)
+        candidates = self._apply_filters(candidates, filters)
+        candidates = candidates.order_by(self._quantized_expression(query_embedding)).limit(candidates_count)
+
+        distance_expr = self._full_distance(query_embedding)
+        stmt = select(
+            self.table.c.id,
+            self.table.c.name,
+            self.table.c.meta_data,
+            self.table.c.content,
+            self.table.c.embedding,
+            self.table.c.usage,
+            self._recency_column(),
+            distance_expr.label("distance"),
+        ).where(self.table.c.id.in_(candidates.scalar_subquery()))
+
+        if self.similarity_threshold is not None:
+            threshold = score_to_distance_threshold(self.similarity_threshold, self.distance)
+            if self.distance == Distance.max_inner_product:
+                stmt = stmt.where(distance_expr <= -threshold)
+            else:
+                stmt = stmt.where(distance_expr <= threshold)
+
+        stmt = stmt.order_by(distance_expr).limit(limit)
+
+        try:
+            with self.Session() as sess, sess.begin():
+                if isinstance(self.vector_index, HNSW):
+                    # ef_search bounds how many candidates the index can return
+                    ef_search = max(self.vector_index.ef_search, candidates_count)
+                    sess.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+                results = sess.execute(stmt).fetchall()
+        except Exception as e:
+            logger.error("Quantized vector search failed", error=str(e), table=self.table_name)
+            return []
+
+        documents: list[Document] = []
+        for result in results:
+            raw_distance = -result.distance if self.distance == Distance.max_inner_product else result.distance
+            meta_data = self._with_recency(result.meta_data, result)
+            meta_data["similarity_score"] = normalize_score(raw_distance, self.distance)
+            documents.append(
+                Document(
+                    id=result.id,
+                    name=result.name,
+                    meta_data=meta_data,
+                    content=result.content,
+                    embedder=self.embedder,
+                    embedding=result.embedding,
+                    usage=result.usage,
+                )
+            )
+
+        if self.reranker:
+            documents = self.reranker.rerank(query=query, documents=documents)
+        return documents
+
+    def _create_hnsw_index(self, sess: Any, table_fullname: str, index_distance: str) -> None:
+        """
+        Create the HNSW index over the quantized expression.
+
+        Args:
+            sess: SQLAlchemy session
+            table_fullname: Fully qualified table name
+            index_distance: Full-precision operator class (ignored, replaced by the quantized one)
+        """
+        index: Any = self.vector_index
+
+        if self.quantization == "binary":
+            expression = f"(binary_quantize(embedding)::bit({self.dimensions})) bit_hamming_ops"
+        else:
+            ops = _HALFVEC_OPS.get(self.distance, "halfvec_cosine_ops")
+            expression = f"(embedding::halfvec({self.dimensions})) {ops}"
+
+        logger.info(
+            "Creating quantized HNSW index",
+            index=index.name,
+            table=table_fullname,
+            quantization=self.quantization,
+            dimensions=self.dimensions,
+        )
+        sess.execute(
+            text(
+                f'CREATE INDEX "{index.name}" ON {table_fullname} '
+                f"USING hnsw ({expression}) WITH (m = :m, ef_construction = :ef_construction);"
+            ),
+            {"m": index.m, "ef_construction": index.ef_construction},
+        )
+
+
+def storage_report(vector_db: Any) -> dict[str, Any]:
+    """
+    Report on-disk size of a knowledge table and its indexes.
+
+    Args:
+        vector_db: PgVector instance
+
+    Returns:
+        Dictionary with rows, dimensions, table_bytes, index_bytes and per-index sizes
+    """
+    query = text(
+        """
+        SELECT indexrelname AS name, pg_relation_size(indexrelid) AS bytes
+        FROM pg_stat_user_indexes
+        WHERE schemaname = :schema AND relname = :table
+        """
+    )
+    table = f'"{vector_db.schema}"."{vector_db.table_name}"'
+    with vector_db.Session() as session:
+        table_bytes = session.execute(text(f"SELECT pg_table_size('{table}')")).scalar() or 0
+        indexes = {
+            row.name: int(row.bytes)
+            for row in session.execute(query, {"schema": vector_db.schema, "table": vector_db.table_name})
+        }
+
+    return {
+        "rows": vector_db.get_count(),
+        "dimensions": vector_db.dimensions,
+        "quantization": getattr(vector_db, "quantization", "none"),
+        "table_bytes": int(table_bytes),
+        "index_bytes": sum(indexes.values()),
+        "indexes": indexes,
+    }
@@ -0,0 +1,292 @@
+"""
+Background initial knowledge loads with readiness reporting.
+
+``create_knowledge_base`` normally loads its source before returning, so a
+large CSV delays agent construction (and with it API startup) until every
+row is embedded. With ``background_load`` configured the knowledge base is
+returned at once and the initial load runs on a daemon thread:
+
+- Searches wait up to ``wait_timeout`` seconds for the source to become
+  searchable, then return no results (``wait_timeout: 0`` never waits)
+- A source whose table already holds a previous load (the load is an
+  incremental sync) is searchable immediately; a first load is searchable
+  once it finishes
+- Hot reload starts after the initial load, so file events never race it
+- Every source reports its state and progress in a process-wide registry;
+  the API serves it at ``GET /ready`` (503 until every load has finished)
+
+Configuration (agent config.yaml or hive.yaml):
+    knowledge:
+      background_load:
+        wait_timeout: 5           # seconds a search waits for the initial load
+
+States: ``pending`` -> ``loading`` -> ``ready`` (or ``failed``; searches then
+use whatever the table already holds).
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from agno.knowledge import Knowledge
+from agno.knowledge.document import Document
+from loguru import logger
+
+# Seconds between readiness checks of a waiting async search
+_ASYNC_POLL_INTERVAL = 0.05
+
+
+@dataclass
+class LoadStatus:
+    """State and progress of one knowledge source's initial load."""
+
+    table: str
+    source: str
+    state: str = "pending"
+    documents_total: int | None = None
+    documents_done: int = 0
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+    searchable: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def is_ready(self) -> bool:
+        """True once the initial load finished successfully."""
+        return self.state == "ready"
+
+    def advance(self, documents: int) -> None:
+        """Record written documents."""
+        self.documents_done += documents
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable status."""
+        progress = None
+        if self.documents_total:
+            progress = round(self.documents_done / self.documents_total, 4)
+        elif self.is_ready:
+            progress = 1.0
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "table": self.table,
+            "source": self.source,
+            "state": self.state,
+            "searchable": self.searchable.is_set(),
+            "documents_total": self.documents_total,
+            "documents_done": self.documents_done,
+            "progress": progress,
+            "elapsed_seconds": elapsed,
+            "error": self.error,
+        }
+
+
+_statuses: dict[str, LoadStatus] = {}
+_statuses_lock = threading.Lock()
+
+
+def register_load(table: str, source: str) -> LoadStatus:
+    """
+    Register a background load (replacing an earlier one for the same table).
+
+    Args:
+        table: Knowledge table
+        source: Source path or table name
+
+    Returns:
+        Pending LoadStatus
+    """
+    status = LoadStatus(table=table, source=source)
+    with _statuses_lock:
+        _statuses[table] = status
+    return status
+
+
+def load_statuses() -> list[LoadStatus]:
+    """Statuses of every registered background load."""
+    with _statuses_lock:
+        return list(_statuses.values())
+
+
+def readiness() -> dict[str, Any]:
+    """
+    Readiness report for probes.
+
+    Returns:
+        ``{"ready": bool, "sources": [...]}``; ready when every background load has finished
+    """
+    statuses = load_statuses()
+    return {
+        "ready": all(status.is_ready for status in statuses),
+        "sources": [status.to_dict() for status in statuses],
+    }
+
+
+def clear_load_statuses() -> None:
+    """Forget every registered load (useful for testing)."""
+    with _statuses_lock:
+        _statuses.clear()
+
+
+class BackgroundLoad(threading.Thread):
+    """Runs a loader's initial load on a daemon thread and reports its progress."""
+
+    def __init__(
+        self,
+        loader: Any,
+        source: Path,
+        status: LoadStatus,
+        on_ready: Callable[[], None] | None = None,
+        coordinator: Any = None,
+    ) -> None:
+        """
+        Prepare the load.
+
+        Args:
+            loader: CSV, document-folder or database-table loader
+            source: Source path passed to the loader
+            status: Registered status to update
+            on_ready: Called after a successful load (e.g. to start hot reload)
+            coordinator: IngestCoordinator; the load then waits for the source's lock
+                and notifies the other processes when it finishes
+        """
+        super().__init__(name=f"knowledge-load-{status.table}", daemon=True)
+        self.loader = loader
+        self.source = source
+        self.status = status
+        self.on_ready = on_ready
+        self.coordinator = coordinator
+
+    def _load(self) -> dict[str, Any]:
+        """Plan and apply with progress for tabular sources; plain load() for the others."""
+        try:
+            plan = self.loader.plan(self.source)
+        except (AttributeError, NotImplementedError):
+            return dict(self.loader.load(self.source))
+        self.status.documents_total = len(plan.documents)
+        if plan.mode == "incremental":
+            # The table holds the previous load; serve it while the sync runs
+            self.status.searchable.set()
+        return {"mode": plan.mode, **self.loader.apply(plan, progress=self.status.advance)}
+
+    def run(self) -> None:
+        """Load, build indexes and mark the source ready (or failed)."""
+        status = self.status
+        status.state = "loading"
+        status.started_at = time.time()
+        try:
+            if self.coordinator is None:
+                stats = self._load()
+            else:
+                stats = self.coordinator.run(status.table, self._load, wait=True)
+            # Build the HNSW, full-text and filter-column indexes once rows exist
+            try:
+                self.loader.vector_db.optimize()
+            except Exception as e:
+                logger.warning("Vector index creation failed", table_name=status.table, error=str(e))
+            status.state = "ready"
+            logger.info("Background knowledge load complete", table=status.table, **stats)
+        except Exception as e:
+            status.state = "failed"
+            status.error = str(e)
+            logger.error("Background knowledge load failed", table=status.table, error=str(e))
+        finally:
+            status.finished_at = time.time()
+            # Failed loads stop blocking searches; they use whatever the table holds
+            status.searchable.set()
+
+        if status.is_ready and self.on_ready is not None:
+            self.on_ready()
+
+
+class BackgroundLoadedKnowledge(Knowledge):
+    """Knowledge whose searches wait (bounded) for a background initial load."""
+
+    def __init__(self, knowledge: Knowledge, status: LoadStatus, wait_timeout: float = 5.0) -> None:
+        """
+        Wrap a knowledge base.
+
+        Args:
+            knowledge: Knowledge base being loaded
+            status: Status of its background load
+            wait_timeout: Seconds a search waits for the load before returning no results
+        """
+        super().__init__(name=knowledge.name, max_results=knowledge.max_results)
+        # Set after init so the wrapped store is not checked or created again
+        self.vector_db = getattr(knowledge, "vector_db", None)
+        self.knowledge = knowledge
+        self.status = status
+        self.wait_timeout = wait_timeout
+
+    def _not_searchable(self, query: str) -> list[Document]:
+        """Log and return the empty result of a search that timed out."""
+        logger.debug(
+            "Knowledge not loaded yet, returning no results",
+            table=self.status.table,
+            state=self.status.state,
+            query=query[:80],
+        )
+        return []
+
+    def search(
+        self,
+        query: str,
+        max_results: int | None = None,
+        filters: Any = None,
+        search_type: str | None = None,
+        user_id: str | None = None,
+        run_response: Any = None,
+    ) -> list[Document]:
+        """
+        Search once the source is searchable.
+
+        Args:
+            query: Search query
+            max_results: Maximum documents to return
+            filters: Metadata filters
+            search_type: Search type override
+            user_id: Owner scope
+            run_response: Run that query-transformer model calls are billed to
+
+        Returns:
+            Documents, or [] when the load did not become searchable within wait_timeout
+        """
+        if not self.status.searchable.wait(self.wait_timeout):
+            return self._not_searchable(query)
+        return self.knowledge.search(
+            query=query,
+            max_results=max_results,
+            filters=filters,
+            search_type=search_type,
+            user_id=user_id,
+            run_response=run_response,
+        )
+
+    async def asearch(
+        self,
+        query: str,
+        max_results: int | None = None,
+        filters: Any = None,
+        search_type: str | None = None,
+        user_id: str | None = None,
+        run_response: Any = None,
+    ) -> list[Document]:
+        """Async version of search (waits without blocking the event loop)."""
+        deadline = time.monotonic() + self.wait_timeout
+        while not self.status.searchable.is_set():
+            if time.monotonic() >= deadline:
+                return self._not_searchable(query)
+            await asyncio.sleep(_ASYNC_POLL_INTERVAL)
+        return await self.knowledge.asearch(
+            query=query,
+            max_results=max_results,
+            filters=filters,
+            search_type=search_type,
+            user_id=user_id,
+            run_response=run_response,
+        )
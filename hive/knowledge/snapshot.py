@@ -0,0 +1,492 @@
+"""
+Knowledge snapshots: export a loaded knowledge base and bulk-load it elsewhere.
+
+A new node pointed at an empty database would otherwise re-embed the whole
+source through ``load_full``. A snapshot carries the embeddings together with
+the change-detection state, so after an import the next ``load()`` is an
+incremental sync that only embeds rows changed since the export.
+
+Tables exported:
+- The knowledge table, its partitions (``{table}_p_*``) and partition registry
+- Change-detection state: ``{table}_hashes``, ``{table}_chunk_hashes``,
+  ``{table}_file_hashes``, ``{table}_file_chunk_hashes``, ``{table}_watermarks``,
+  the near-duplicate clusters ``{table}_duplicates``, the ingest run log
+  ``{table}_ingest_runs`` and the change log ``{table}_changes``
+- The change log's version sequence ``{table}_change_version`` (its value, so
+  versions keep increasing after an import)
+
+Layout of a snapshot directory:
+
+    manifest.json                     table definitions, indexes, row counts, sequence values
+    <table>.parquet                   non-vector columns (Postgres text form)
+    <table>.<column>.npy              float32 matrix per vector column
+
+Rows are exported inside one REPEATABLE READ transaction, so all tables come
+from the same point in time. Import creates the tables, bulk-inserts every
+row in one transaction, then builds the exported indexes once. Building the
+HNSW index after the load is much faster than maintaining it row by row.
+
+Parquet needs ``pyarrow``, installed by the ``parquet`` extra
+(``uv add "automagik-hive[parquet]"``).
+
+Usage:
+    from sqlalchemy import create_engine
+    from hive.knowledge.snapshot import export_snapshot, import_snapshot
+
+    export_snapshot(create_engine(source_url), "knowledge_base", "snapshots/kb")
+    import_snapshot(create_engine(target_url), "snapshots/kb")
+"""
+
+import json
+import re
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from hive.knowledge.sources import _pyarrow
+
+SNAPSHOT_VERSION = 1
+MANIFEST = "manifest.json"
+
+# Change-detection tables created next to the knowledge table (in the default schema)
+STATE_SUFFIXES = (
+    "_hashes",
+    "_chunk_hashes",
+    "_file_hashes",
+    "_file_chunk_hashes",
+    "_watermarks",
+    "_duplicates",
+    "_ingest_runs",
+    "_changes",
+)
+
+# Sequences created next to the knowledge table (in the default schema)
+SEQUENCE_SUFFIXES = ("_change_version",)
+
+# Vector types exported as float32 matrices instead of text
+_VECTOR_TYPE = re.compile(r"^(vector|halfvec)\((\d+)\)$")
+_CREATE_INDEX = re.compile(r"^CREATE (UNIQUE )?INDEX ", re.IGNORECASE)
+
+
+def _quote(name: str) -> str:
+    """Quote an identifier."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _qualified(schema: str | None, name: str) -> str:
+    """Quoted, optionally schema-qualified table name."""
+    return f"{_quote(schema)}.{_quote(name)}" if schema else _quote(name)
+
+
+def _file_stem(schema: str | None, name: str) -> str:
+    """Snapshot file name prefix for a table."""
+    return f"{schema}.{name}" if schema else name
+
+
+def _vector_dimensions(type_name: str) -> int | None:
+    """Dimensions of a vector/halfvec column type, or None for other types."""
+    match = _VECTOR_TYPE.match(type_name)
+    return int(match.group(2)) if match else None
+
+
+def _create_table_sql(spec: dict[str, Any]) -> str:
+    """
+    CREATE TABLE statement for an exported table definition.
+
+    Args:
+        spec: Table entry from the manifest
+
+    Returns:
+        SQL statement
+    """
+    columns = []
+    for column in spec["columns"]:
+        definition = f"{_quote(column['name'])} {column['type']}"
+        if column.get("default") is not None:
+            definition += f" DEFAULT {column['default']}"
+        if column.get("not_null"):
+            definition += " NOT NULL"
+        columns.append(definition)
+    if spec.get("primary_key"):
+        columns.append(f"PRIMARY KEY ({', '.join(_quote(name) for name in spec['primary_key'])})")
+    body = ",\n    ".join(columns)
+    return f"CREATE TABLE IF NOT EXISTS {_qualified(spec['schema'], spec['name'])} (\n    {body}\n)"
+
+
+def _insert_sql(spec: dict[str, Any]) -> str:
+    """
+    INSERT statement for an exported table, casting each parameter back to its column type.
+
+    Vector columns are bound as float arrays, every other column as its Postgres text form.
+
+    Args:
+        spec: Table entry from the manifest
+
+    Returns:
+        SQL statement with parameters ``c0``, ``c1``, ...
+    """
+    names = []
+    values = []
+    for position, column in enumerate(spec["columns"]):
+        names.append(_quote(column["name"]))
+        if _vector_dimensions(column["type"]) is not None:
+            values.append(f"CAST(CAST(:c{position} AS real[]) AS {column['type']})")
+        else:
+            values.append(f"CAST(:c{position} AS {column['type']})")
+    table = _qualified(spec["schema"], spec["name"])
+    return f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join(values)})"  # noqa: S608
+
+
+def _index_sql(definition: str) -> str:
+    """Make an exported index definition idempotent."""
+    return _CREATE_INDEX.sub(lambda match: f"CREATE {match.group(1) or ''}INDEX IF NOT EXISTS ", definition, count=1)
+
+
+def _find_tables(conn: Connection, table_name: str, schema: str) -> list[tuple[str | None, str]]:
+    """Knowledge, partition and change-detection tables of a knowledge base, as (schema, name)."""
+    partition_pattern = table_name.replace("_", r"\_") + r"\_p\_%"
+    query = text(
+        """
+        SELECT table_schema, table_name, table_schema = current_schema() AS is_default
+        FROM information_schema.tables
+        WHERE (table_schema = :schema
+               AND (table_name = :table OR table_name = :registry OR table_name LIKE :partitions))
+           OR (table_schema = current_schema() AND table_name = ANY(:state))
+        ORDER BY table_name
+        """
+    )
+    rows = conn.execute(
+        query,
+        {
+            "schema": schema,
+            "table": table_name,
+            "registry": f"{table_name}_partitions",
+            "partitions": partition_pattern,
+            "state": [table_name + suffix for suffix in STATE_SUFFIXES],
+        },
+    ).fetchall()
+
+    tables: list[tuple[str | None, str]] = []
+    for row_schema, name, is_default in rows:
+        state_table = name in {table_name + suffix for suffix in STATE_SUFFIXES}
+        # State tables are created unqualified, so they follow the target's default schema
+        tables.append((None if state_table and is_default else row_schema, name))
+    # The knowledge table first, so a manifest reads top-down
+    tables.sort(key=lambda entry: (entry[1] != table_name, entry[1]))
+    return tables
+
+
+def _describe_table(conn: Connection, schema: str | None, name: str) -> dict[str, Any]:
+    """Column types, defaults, primary key and secondary indexes of a table."""
+    relation = _qualified(schema, name)
+    columns = conn.execute(
+        text(
+            """
+            SELECT a.attname, format_type(a.atttypid, a.atttypmod), a.attnotnull,
+                   pg_get_expr(d.adbin, d.adrelid)
+            FROM pg_attribute a
+            LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+            WHERE a.attrelid = CAST(:relation AS regclass) AND a.attnum > 0 AND NOT a.attisdropped
+            ORDER BY a.attnum
+            """
+        ),
+        {"relation": relation},
+    ).fetchall()
+    primary_key = conn.execute(
+        text(
+            """
+            SELECT a.attname
+            FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+            WHERE i.indrelid = CAST(:relation AS regclass) AND i.indisprimary
+            ORDER BY array_position(CAST(i.indkey AS int2[]), a.attnum)
+            """
+        ),
+        {"relation": relation},
+    ).fetchall()
+    # The primary key index is recreated by CREATE TABLE
+    indexes = conn.execute(
+        text(
+            """
+            SELECT pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            WHERE i.indrelid = CAST(:relation AS regclass) AND NOT i.indisprimary
+            ORDER BY i.indexrelid
+            """
+        ),
+        {"relation": relation},
+    ).fetchall()
+    return {
+        "schema": schema,
+        "name": name,
+        "columns": [
+            {"name": column, "type": type_name, "not_null": bool(not_null), "default": default}
+            for column, type_name, not_null, default in columns
+        ],
+        "primary_key": [row[0] for row in primary_key],
+        "indexes": [row[0] for row in indexes],
+    }
+
+
+def _export_sequences(conn: Connection, table_name: str) -> list[dict[str, Any]]:
+    """Current value of each sequence of a knowledge base that exists (default schema)."""
+    sequences = []
+    for suffix in SEQUENCE_SUFFIXES:
+        name = table_name + suffix
+        if conn.execute(text("SELECT to_regclass(:relation)"), {"relation": _quote(name)}).scalar_one_or_none():
+            last_value, is_called = conn.execute(
+                text(f"SELECT last_value, is_called FROM {_quote(name)}")  # noqa: S608
+            ).one()
+            sequences.append({"name": name, "last_value": int(last_value), "is_called": bool(is_called)})
+    return sequences
+
+
+def _export_table(conn: Connection, spec: dict[str, Any], directory: Path, batch_size: int) -> int:
+    """Stream one table's rows into its Parquet file and vector matrices; returns the row count."""
+    pa = _pyarrow()
+    relation = _qualified(spec["schema"], spec["name"])
+    stem = _file_stem(spec["schema"], spec["name"])
+    rows = conn.execute(text(f"SELECT count(*) FROM {relation}")).scalar_one()  # noqa: S608
+
+    selected = []
+    text_columns = []
+    vectors: dict[str, np.ndarray] = {}
+    for column in spec["columns"]:
+        dimensions = _vector_dimensions(column["type"])
+        if dimensions is None:
+            selected.append(f"CAST({_quote(column['name'])} AS text)")
+            text_columns.append(column["name"])
+        else:
+            selected.append(f"CAST(CAST({_quote(column['name'])} AS vector) AS real[])")
+            file = directory / f"{stem}.{column['name']}.npy"
+            if rows:
+                # Written in place as batches arrive, so a large table never sits in memory
+                vectors[column["name"]] = np.lib.format.open_memmap(
+                    file, mode="w+", dtype=np.float32, shape=(rows, dimensions)
+                )
+            else:
+                np.save(file, np.empty((0, dimensions), dtype=np.float32))
+            spec.setdefault("vectors", {})[column["name"]] = file.name
+    spec["data"] = f"{stem}.parquet"
+
+    order = ", ".join(_quote(name) for name in spec["primary_key"]) or "1"
+    query = f"SELECT {', '.join(selected)} FROM {relation} ORDER BY {order}"  # noqa: S608
+    schema = pa.schema([(name, pa.string()) for name in text_columns])
+
+    offset = 0
+    with pa.parquet.ParquetWriter(directory / spec["data"], schema) as writer:
+        result = conn.execution_options(stream_results=True).execute(text(query))
+        for batch in result.partitions(batch_size):
+            columns = list(zip(*batch, strict=True))
+            values = iter(columns)
+            arrays = {}
+            for column in spec["columns"]:
+                data = next(values)
+                if column["name"] in vectors:
+                    matrix = vectors[column["name"]]
+                    for position, vector in enumerate(data):
+                        # NULL embeddings are stored as NaN rows
+                        matrix[offset + position] = np.nan if vector is None else vector
+                else:
+                    arrays[column["name"]] = pa.array(data, type=pa.string())
+            writer.write_table(pa.table(arrays, schema=schema))
+            offset += len(batch)
+    for matrix in vectors.values():
+        matrix.flush()
+
+    spec["rows"] = offset
+    return offset
+
+
+def export_snapshot(
+    engine: Engine,
+    table_name: str,
+    path: str | Path,
+    schema: str = "agno",
+    batch_size: int = 1000,
+) -> dict[str, Any]:
+    """
+    Export a knowledge base to a snapshot directory.
+
+    Args:
+        engine: Engine connected to the knowledge database
+        table_name: Knowledge table (``table_name`` in the knowledge config)
+        path: Snapshot directory (created; existing snapshot files are overwritten)
+        schema: Schema of the knowledge table
+        batch_size: Rows fetched per round trip
+
+    Returns:
+        The manifest (tables with row counts and files, sequence values)
+
+    Raises:
+        ValueError: If the knowledge table does not exist
+        ImportError: If pyarrow is not installed
+    """
+    _pyarrow()
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with engine.connect().execution_options(isolation_level="REPEATABLE READ") as conn, conn.begin():
+        tables = _find_tables(conn, table_name, schema)
+        if (schema, table_name) not in tables:
+            raise ValueError(f"Knowledge table not found: {schema}.{table_name}")
+
+        specs = []
+        for table_schema, name in tables:
+            spec = _describe_table(conn, table_schema, name)
+            rows = _export_table(conn, spec, directory, batch_size)
+            logger.debug("Exported table", table=name, rows=rows)
+            specs.append(spec)
+        sequences = _export_sequences(conn, table_name)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "table": table_name,
+        "schema": schema,
+        "created_at": datetime.now(UTC).isoformat(),
+        "tables": specs,
+        "sequences": sequences,
+    }
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    logger.info(
+        "Knowledge snapshot exported",
+        table=table_name,
+        path=str(directory),
+        tables=len(specs),
+        rows=sum(spec["rows"] for spec in specs),
+    )
+    return manifest
+
+
+def read_manifest(path: str | Path) -> dict[str, Any]:
+    """
+    Read a snapshot manifest.
+
+    Args:
+        path: Snapshot directory
+
+    Returns:
+        Manifest dictionary
+
+    Raises:
+        FileNotFoundError: If the directory has no manifest
+        ValueError: If the snapshot was written by an unsupported version
+    """
+    manifest_path = Path(path) / MANIFEST
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Not a knowledge snapshot (no {MANIFEST}): {path}")
+    manifest: dict[str, Any] = json.loads(manifest_path.read_text())
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {manifest.get('version')}")
+    return manifest
+
+
+def _import_table(conn: Connection, spec: dict[str, Any], directory: Path, batch_size: int) -> int:
+    """Bulk-insert one table's rows from its snapshot files; returns the row count."""
+    pa = _pyarrow()
+    vectors = {name: np.load(directory / file, mmap_mode="r") for name, file in spec.get("vectors", {}).items()}
+    insert = text(_insert_sql(spec))
+
+    offset = 0
+    for batch in pa.parquet.ParquetFile(directory / spec["data"]).iter_batches(batch_size=batch_size):
+        size = batch.num_rows
+        columns = batch.to_pydict()
+        params: list[dict[str, Any]] = [{} for _ in range(size)]
+        for position, column in enumerate(spec["columns"]):
+            key = f"c{position}"
+            if column["name"] in vectors:
+                matrix = np.asarray(vectors[column["name"]][offset : offset + size])
+                for row, vector in zip(params, matrix, strict=True):
+                    row[key] = None if np.isnan(vector[0]) else vector.tolist()
+            else:
+                for row, value in zip(params, columns[column["name"]], strict=True):
+                    row[key] = value
+        if params:
+            conn.execute(insert, params)
+        offset += size
+    return offset
+
+
+def import_snapshot(
+    engine: Engine,
+    path: str | Path,
+    replace: bool = False,
+    batch_size: int = 1000,
+) -> dict[str, Any]:
+    """
+    Bulk-load a snapshot into a database.
+
+    All tables are created and filled in one transaction, so a failed import
+    leaves the target unchanged. Indexes are built after the rows are loaded.
+
+    Args:
+        engine: Engine connected to the target database
+        path: Snapshot directory written by ``export_snapshot``
+        replace: Drop existing tables of the knowledge base first
+        batch_size: Rows inserted per statement batch
+
+    Returns:
+        The manifest
+
+    Raises:
+        ValueError: If a target table already has rows and ``replace`` is False
+        ImportError: If pyarrow is not installed
+    """
+    _pyarrow()
+    directory = Path(path)
+    manifest = read_manifest(directory)
+    specs = manifest["tables"]
+
+    with engine.begin() as conn:
+        existing = {
+            (spec["schema"], spec["name"])
+            for spec in specs
+            if conn.execute(
+                text("SELECT to_regclass(:relation)"), {"relation": _qualified(spec["schema"], spec["name"])}
+            ).scalar_one_or_none()
+        }
+        if replace:
+            for spec in specs:
+                if (spec["schema"], spec["name"]) in existing:
+                    conn.execute(text(f"DROP TABLE {_qualified(spec['schema'], spec['name'])} CASCADE"))
+        else:
+            for schema, name in existing:
+                # Table names come from the manifest's own catalog export
+                if conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {_qualified(schema, name)})")).scalar_one():  # noqa: S608
+                    raise ValueError(f"Table {name} already has rows (use replace=True to overwrite)")
+
+        for schema in {spec["schema"] for spec in specs if spec["schema"]}:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {_quote(schema)}"))
+        for spec in specs:
+            conn.execute(text(_create_table_sql(spec)))
+            rows = _import_table(conn, spec, directory, batch_size)
+            logger.debug("Imported table", table=spec["name"], rows=rows)
+        # Snapshots written before sequences were exported have none
+        for sequence in manifest.get("sequences", []):
+            conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {_quote(sequence['name'])}"))
+            conn.execute(
+                text("SELECT setval(CAST(:sequence AS regclass), :value, :is_called)"),
+                {
+                    "sequence": _quote(sequence["name"]),
+                    "value": sequence["last_value"],
+                    "is_called": sequence["is_called"],
+                },
+            )
+        for spec in specs:
+            for definition in spec["indexes"]:
+                conn.execute(text(_index_sql(definition)))
+            conn.execute(text(f"ANALYZE {_qualified(spec['schema'], spec['name'])}"))
+
+    logger.info(
+        "Knowledge snapshot imported",
+        table=manifest["table"],
+        path=str(directory),
+        tables=len(specs),
+        rows=sum(spec["rows"] for spec in specs),
+    )
+    return manifest
@@ -0,0 +1,159 @@
+"""
+Tabular knowledge sources: CSV, Parquet, Arrow IPC and JSONL.
+
+``read_source`` picks the reader from the file suffix, so Parquet produced by
+upstream jobs loads directly instead of being converted to CSV first:
+
+- ``.csv``: ``pd.read_csv`` (``usecols`` projection)
+- ``.parquet``, ``.pq``: ``pyarrow.parquet`` (only projected columns are decoded)
+- ``.arrow``, ``.feather``, ``.ipc``: memory-mapped Arrow IPC file (buffers are
+  paged in from the file, not copied)
+- ``.jsonl``, ``.ndjson``: ``pd.read_json(lines=True)``
+
+Parquet and Arrow need ``pyarrow``, installed by the ``parquet`` extra
+(``uv add "automagik-hive[parquet]"``).
+
+``compute_row_hashes`` hashes a whole frame column by column instead of row
+by row. It produces the same MD5 hashes as the per-row hash used for CSV
+change detection, so switching a source's format (or upgrading) does not
+re-embed unchanged rows.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+# Supported suffixes per source format
+SOURCE_FORMATS: dict[str, tuple[str, ...]] = {
+    "csv": (".csv",),
+    "parquet": (".parquet", ".pq"),
+    "arrow": (".arrow", ".feather", ".ipc"),
+    "jsonl": (".jsonl", ".ndjson"),
+}
+
+
+def source_format(path: str | Path) -> str:
+    """
+    Detect the format of a tabular source from its suffix.
+
+    Args:
+        path: Source file path
+
+    Returns:
+        Format name (csv, parquet, arrow or jsonl)
+
+    Raises:
+        ValueError: If the suffix is not supported
+    """
+    suffix = Path(path).suffix.lower()
+    for name, suffixes in SOURCE_FORMATS.items():
+        if suffix in suffixes:
+            return name
+    supported = ", ".join(s for suffixes in SOURCE_FORMATS.values() for s in suffixes)
+    raise ValueError(f"Unsupported knowledge source '{suffix}' (expected one of: {supported})")
+
+
+def _pyarrow() -> Any:
+    """Import pyarrow, with an install hint when it is missing."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Parquet/Arrow knowledge sources and snapshots. "
+            'Install with: uv add "automagik-hive[parquet]"'
+        ) from e
+    return pyarrow
+
+
+def _project(names: list[str], columns: list[str] | None, path: str | Path) -> list[str] | None:
+    """Columns to read, in file order (None reads all)."""
+    if columns is None:
+        return None
+    missing = [column for column in columns if column not in names]
+    if missing:
+        raise ValueError(f"Columns not found in {Path(path).name}: {missing}")
+    wanted = set(columns)
+    return [name for name in names if name in wanted]
+
+
+def read_source(path: str | Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Read a tabular knowledge source into a dataframe.
+
+    Args:
+        path: CSV, Parquet, Arrow IPC or JSONL file
+        columns: Columns to read (default: all); other columns are never decoded
+
+    Returns:
+        Dataframe with a 0..n-1 index (row ids)
+
+    Raises:
+        ValueError: If the format is unsupported or a column is missing
+        ImportError: If a Parquet/Arrow source is read without pyarrow
+    """
+    fmt = source_format(path)
+
+    if fmt == "csv":
+        if columns is None:
+            return pd.read_csv(path)
+        header = pd.read_csv(path, nrows=0).columns.tolist()
+        return pd.read_csv(path, usecols=_project(header, columns, path))
+
+    if fmt == "jsonl":
+        df = pd.read_json(path, lines=True)
+        selected = _project(df.columns.tolist(), columns, path)
+        return df if selected is None else df[selected]
+
+    pa = _pyarrow()
+    if fmt == "parquet":
+        names = pa.parquet.ParquetFile(path).schema_arrow.names
+        table = pa.parquet.read_table(path, columns=_project(names, columns, path), memory_map=True)
+    else:
+        # Memory-mapped: column buffers are paged in from the file instead of copied
+        with pa.memory_map(str(path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        selected = _project(table.schema.names, columns, path)
+        if selected is not None:
+            table = table.select(selected)
+    return table.to_pandas()
+
+
+def compute_row_hashes(df: pd.DataFrame, hash_columns: list[str] | None = None) -> dict[int, str]:
+    """
+    Compute the MD5 change-detection hash of every row.
+
+    Equivalent to hashing each row with ``IncrementalCSVLoader._compute_row_hash``,
+    but values are converted to strings once per column.
+
+    Args:
+        df: Source dataframe
+        hash_columns: Columns to hash (default: all)
+
+    Returns:
+        Dictionary mapping row id to MD5 hash hex string
+    """
+    columns = [column for column in (hash_columns or df.columns.tolist()) if column in df.columns]
+    if df.empty:
+        return {}
+    if not columns:
+        empty = hashlib.md5(b"").hexdigest()  # noqa: S324
+        return dict.fromkeys((int(idx) for idx in df.index), empty)
+
+    # Per-row hashing sees each row as a Series: mixed frames keep per-column types,
+    # all-numeric frames are upcast to the row dtype first
+    frame = df[columns]
+    row_dtype = df.iloc[0].dtype
+    if not pd.api.types.is_object_dtype(row_dtype):
+        frame = frame.astype(row_dtype)
+
+    parts = [frame[column].map(lambda value: str(value).strip()) for column in columns]
+    joined = parts[0].str.cat(parts[1:], sep="\u241f") if len(parts) > 1 else parts[0]
+    # MD5 is used for content fingerprinting, not cryptographic purposes
+    return {
+        int(idx): hashlib.md5(data.encode()).hexdigest()  # noqa: S324
+        for idx, data in zip(df.index, joined, strict=True)
+    }
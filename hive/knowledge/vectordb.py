@@ -0,0 +1,331 @@
+"""
+Hive PgVector store.
+
+Extends Agno's PgVector with the pieces the Hive knowledge layer needs:
+- Typed metadata filters (numeric/boolean range predicates, GTE/LTE/NEQ)
+- Indexes on declared filter columns, built alongside the vector index
+- Async writes and deletes over an async engine (psycopg 3), for loads that
+  run inside the API event loop (see ``CSVKnowledgeLoader.aload``)
+- Async search on the same pooled engine: the query is embedded with the
+  embedder's async API, then the regular search statements run through
+  SQLAlchemy's greenlet bridge (``AsyncSession.run_sync``), so no search
+  blocks the loop or holds a worker thread (agno's ``async_search`` runs the
+  sync search in ``asyncio.to_thread``)
+- Embedding time reported apart from writing to a load's ingestion metrics
+  (see ``hive.knowledge.metrics``)
+"""
+
+import asyncio
+import copy
+from typing import Any
+
+from agno.knowledge.document import Document
+from agno.vectordb.base import aembed_before_replace, embed_before_replace, retrievable_documents
+from agno.vectordb.pgvector import PgVector, SearchType
+from loguru import logger
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.sql.elements import ColumnElement
+
+from hive.knowledge.metadata import compile_filter, index_expression
+from hive.knowledge.metrics import ingest_phase
+
+# Columns refreshed when an upsert hits an existing record id
+_UPSERT_COLUMNS = ("name", "meta_data", "filters", "content", "embedding", "usage", "content_hash", "content_id")
+
+
+def async_database_url(url: str) -> str:
+    """
+    SQLAlchemy URL of an async driver for a Postgres URL.
+
+    Args:
+        url: Sync URL (``postgresql://``, ``postgresql+psycopg2://`` or ``postgresql+psycopg://``)
+
+    Returns:
+        URL using psycopg 3, whose dialect is async under ``create_async_engine``
+        (asyncpg URLs are returned unchanged)
+    """
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix) :]
+    return url
+
+
+class _PrecomputedQueryEmbedder:
+    """Embedder proxy that answers one query with an embedding computed beforehand."""
+
+    def __init__(self, embedder: Any, query: str, embedding: list[float]) -> None:
+        """Wrap an embedder."""
+        self._embedder = embedder
+        self._query = query
+        self._embedding = embedding
+
+    def get_embedding(self, text: str) -> list[float]:
+        """Return the precomputed embedding for the query, embed anything else."""
+        if text == self._query:
+            return self._embedding
+        return self._embedder.get_embedding(text)
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the wrapped embedder."""
+        return getattr(self._embedder, name)
+
+
+class HivePgVector(PgVector):
+    """PgVector with typed metadata filtering and filter-column indexes."""
+
+    # Async engine pool (searches and async loads); sized for concurrent agent runs
+    async_pool_size = 10
+    async_max_overflow = 20
+
+    def __init__(
+        self,
+        *args: Any,
+        metadata_types: dict[str, str] | None = None,
+        filter_columns: list[str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize the vector store.
+
+        Args:
+            *args: PgVector positional arguments
+            metadata_types: Metadata type per column (updated by the loader when inferred)
+            filter_columns: Metadata columns to index for filtered search
+            **kwargs: PgVector keyword arguments
+        """
+        super().__init__(*args, **kwargs)
+        self.metadata_types: dict[str, str] = dict(metadata_types or {})
+        self.filter_columns: list[str] = list(filter_columns or [])
+        self._async_engine: AsyncEngine | None = None
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        """Async engine on the same database (created on first use)."""
+        if self._async_engine is None:
+            url = self.db_url or self.db_engine.url.render_as_string(hide_password=False)
+            self._async_engine = create_async_engine(
+                async_database_url(url),
+                pool_size=self.async_pool_size,
+                max_overflow=self.async_max_overflow,
+                pool_pre_ping=True,
+            )
+        return self._async_engine
+
+    async def async_search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Any = None,
+        user_id: str | None = None,
+    ) -> list[Document]:
+        """
+        Search without blocking the event loop or a worker thread.
+
+        The query is embedded with the embedder's async API; the search then
+        runs on a shallow copy of this store whose ``Session`` is the sync
+        facade of an ``AsyncSession``, so vector, keyword, hybrid and quantized
+        searches share one implementation with ``search()``.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+            filters: Metadata filters
+            user_id: Restrict results to this user's rows plus shared rows
+
+        Returns:
+            Matching documents
+        """
+        searcher = copy.copy(self)
+        if self.search_type != SearchType.keyword:
+            embedding = await self.embedder.async_get_embedding(query)
+            if embedding:
+                searcher.embedder = _PrecomputedQueryEmbedder(self.embedder, query, embedding)
+        if self._owner_column_exists is None:
+            # One-time table inspection on the sync engine; keep it off the loop
+            await asyncio.to_thread(self._user_id_column_exists)
+
+        async with AsyncSession(self.async_engine) as session:
+            searcher.Session = lambda: session.sync_session  # type: ignore[assignment,method-assign]
+            return await session.run_sync(lambda _: searcher.search(query, limit, filters, user_id))
+
+    def invalidate_cache(self) -> None:
+        """Forget cached table inspection (called when another process changed the table)."""
+        self._owner_column_exists = None
+
+    def _dsl_to_sqlalchemy(self, filter_expr: dict[str, Any], table: Any) -> ColumnElement[bool]:
+        """Compile FilterExpr dicts with typed comparisons."""
+        return compile_filter(filter_expr, table, self.metadata_types)
+
+    def delete(self, name: str | None = None) -> bool:
+        """
+        Delete documents by name, or every document when no name is given.
+
+        The CSV loader removes deleted rows with ``delete(name=...)``.
+
+        Args:
+            name: Document name (e.g. ``csv_row_12``)
+
+        Returns:
+            True if the deletion succeeded
+        """
+        if name is None:
+            return super().delete()
+        return self.delete_by_name(name)
+
+    def delete_by_names(self, names: list[str]) -> bool:
+        """
+        Delete documents by name in one statement.
+
+        Args:
+            names: Document names
+
+        Returns:
+            True if the deletion succeeded
+        """
+        if not names:
+            return True
+        try:
+            with self.Session() as sess, sess.begin():
+                sess.execute(self.table.delete().where(self.table.c.name.in_(names)))
+            return True
+        except Exception as e:
+            logger.error("Failed to delete documents by name", table=self.table_name, error=str(e))
+            return False
+
+    async def async_delete_by_names(self, names: list[str]) -> bool:
+        """Async version of delete_by_names (runs on the async engine)."""
+        if not names:
+            return True
+        try:
+            async with self.async_engine.begin() as conn:
+                await conn.execute(self.table.delete().where(self.table.c.name.in_(names)))
+            return True
+        except Exception as e:
+            logger.error("Failed to delete documents by name", table=self.table_name, error=str(e))
+            return False
+
+    def upsert(
+        self,
+        content_hash: str,
+        documents: list[Document],
+        filters: dict[str, Any] | None = None,
+        batch_size: int = 100,
+        user_id: str | None = None,
+    ) -> None:
+        """
+        Embed documents, then upsert them (embedding is timed as the ``embed`` ingest phase).
+
+        Args:
+            content_hash: Content hash to store the documents under
+            documents: Documents to write (embedded in place when not already)
+            filters: Filters stored with the documents
+            batch_size: Documents per insert statement
+            user_id: Owner of the documents (None: shared)
+        """
+        with ingest_phase("embed"):
+            for doc in documents:
+                # Empty embeddings count as missing, as in PgVector.upsert
+                if not doc.embedding:
+                    doc.embedding = None
+            embed_before_replace(documents, self.embedder)
+        super().upsert(content_hash, documents, filters, batch_size, user_id=user_id)
+
+    async def async_write(self, content_hash: str, documents: list[Document]) -> None:
+        """
+        Embed documents with the embedder's async API and upsert them on the async engine.
+
+        Unlike ``async_upsert`` (async embedding, then a blocking session), no
+        step blocks the event loop. Documents are written under their ids, so a
+        batch that is rewritten replaces its earlier records.
+
+        Args:
+            content_hash: Content hash to store the documents under
+            documents: Documents to write (embedded in place when not already)
+        """
+        with ingest_phase("embed"):
+            await aembed_before_replace(documents, self.embedder)
+        documents = retrievable_documents(documents)
+        if not documents:
+            return
+        # Inspects the live table once (cached); keep that blocking call off the loop
+        await asyncio.to_thread(self._user_id_column_exists)
+
+        records: dict[str, dict[str, Any]] = {}
+        for doc in documents:
+            record = self._get_document_record(doc, None, content_hash, prepared=True)
+            records[record["id"]] = record
+        insert = postgresql.insert(self.table).values(list(records.values()))
+        columns = [*_UPSERT_COLUMNS, *(["user_id"] if self._user_id_column_exists() else [])]
+        set_clause: dict[str, Any] = {column: insert.excluded[column] for column in columns}
+        set_clause["updated_at"] = func.now()
+        async with self.async_engine.begin() as conn:
+            await conn.execute(insert.on_conflict_do_update(index_elements=["id"], set_=set_clause))
+
+    def delete_stale(self, *content_hashes: str) -> int:
+        """
+        Delete every document not written under one of ``content_hashes``.
+
+        A full load writes all documents first and then drops the previous
+        version, so the table is never empty mid-reload.
+
+        Args:
+            *content_hashes: Content hashes the current load wrote under
+
+        Returns:
+            Number of documents deleted
+        """
+        with self.Session() as sess, sess.begin():
+            stale = self.table.c.content_hash.is_(None) | self.table.c.content_hash.not_in(content_hashes)
+            result = sess.execute(self.table.delete().where(stale))
+        return result.rowcount or 0
+
+    async def async_delete_stale(self, *content_hashes: str) -> int:
+        """Async version of delete_stale (runs on the async engine)."""
+        async with self.async_engine.begin() as conn:
+            stale = self.table.c.content_hash.is_(None) | self.table.c.content_hash.not_in(content_hashes)
+            result = await conn.execute(self.table.delete().where(stale))
+        return result.rowcount or 0
+
+    def create_metadata_indexes(self) -> None:
+        """
+        Create indexes for declared filter columns.
+
+        Builds a GIN ``jsonb_path_ops`` index for containment filters
+        (``filters={"category": "x"}``) and one B-tree expression index per
+        filter column, typed to match ``compile_filter`` so range predicates
+        can use it.
+        """
+        if not self.filter_columns:
+            return
+
+        table = self.table.fullname
+        statements = [
+            f'CREATE INDEX IF NOT EXISTS "{self.table_name}_meta_gin" ON {table} USING gin (meta_data jsonb_path_ops)'
+        ]
+        for column in self.filter_columns:
+            type_name = self.metadata_types.get(column, "str")
+            safe_name = "".join(ch if ch.isalnum() else "_" for ch in column)
+            statements.append(
+                f'CREATE INDEX IF NOT EXISTS "{self.table_name}_meta_{safe_name}_idx" '
+                f"ON {table} ({index_expression(column, type_name)})"
+            )
+
+        with self.Session() as sess, sess.begin():
+            for statement in statements:
+                sess.execute(text(statement))
+            # Fresh statistics so the planner knows how selective each filter column is
+            sess.execute(text(f"ANALYZE {table}"))
+
+        logger.info("Metadata indexes ready", table=self.table_name, columns=self.filter_columns)
+
+    def optimize(self, force_recreate: bool = False) -> None:
+        """
+        Create vector, full-text and metadata indexes.
+
+        Args:
+            force_recreate: Drop and rebuild the vector and full-text indexes
+        """
+        super().optimize(force_recreate=force_recreate)
+        self.create_metadata_indexes()
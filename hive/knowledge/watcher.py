@@ -1,19 +1,23 @@
 """
 File watcher with debounced reload.
 
-Watches CSV files for changes and triggers incremental reloads.
-Uses debouncing to avoid reload storms during bulk edits.
+Watches CSV files (or a document folder, recursively) for changes and
+triggers incremental reloads. Uses debouncing to avoid reload storms during
+bulk edits.
 
 Features:
 - Debounced reload (default: 1 second)
-- Handles file modifications, creations, deletions
-- Async-safe for use in API servers
+- Handles file modifications, creations, deletions and moves
+- Async-safe for use in API servers: coroutine callbacks (e.g.
+  ``CSVKnowledgeLoader.aload_incremental``) run on the event loop the
+  watcher was started from
 - Clean shutdown handling
 """
 
 import asyncio
+import inspect
 import threading
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -25,42 +29,56 @@ if TYPE_CHECKING:
     from watchdog.observers.api import BaseObserver
 
 
+# Reload callback: a function, or a coroutine function run on the watcher's event loop
+ReloadCallback = Callable[[str], None] | Callable[[str], Awaitable[None]]
+
+
 class DebouncedFileWatcher(FileSystemEventHandler):
     """File watcher with debounced callbacks."""
 
     def __init__(
         self,
         file_path: str | Path,
-        callback: Callable[[str], None],
+        callback: ReloadCallback,
         debounce_delay: float = 1.0,
+        loop: asyncio.AbstractEventLoop | None = None,
     ) -> None:
         """
         Initialize the file watcher.
 
         Args:
-            file_path: Path to file to watch
-            callback: Function to call on file changes
+            file_path: Path to file (or directory) to watch
+            callback: Function (or coroutine function) to call on file changes
             debounce_delay: Seconds to wait before triggering callback
+            loop: Event loop that runs coroutine callbacks (default: a fresh loop per reload)
         """
         self.file_path = Path(file_path).resolve()
+        self.is_directory = self.file_path.is_dir()
         self.callback = callback
         self.debounce_delay = debounce_delay
+        self.loop = loop
         self.observer: BaseObserver | None = None
         self._timer: threading.Timer | None = None
         self._lock = threading.Lock()
         self._stopped = False
 
+    def _is_target(self, path: str | bytes) -> bool:
+        """Check whether an event path is the watched file (or inside the watched directory)."""
+        event_path = Path(str(path)).resolve()
+        if self.is_directory:
+            return event_path.is_relative_to(self.file_path)
+        return event_path == self.file_path
+
     def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification events."""
         if event.is_directory:
             return
 
         # Check if this is our target file
-        event_path = Path(str(event.src_path)).resolve()
-        if event_path != self.file_path:
+        if not self._is_target(event.src_path):
             return
 
-        logger.debug("File modified detected", path=str(self.file_path))
+        logger.debug("File modified detected", path=str(event.src_path))
         self._schedule_reload()
 
     def on_created(self, event: FileSystemEvent) -> None:
@@ -68,11 +86,28 @@ class DebouncedFileWatcher(FileSystemEventHandler):
         if event.is_directory:
             return
 
-        event_path = Path(str(event.src_path)).resolve()
-        if event_path != self.file_path:
+        if not self._is_target(event.src_path):
+            return
+
+        logger.debug("File created detected", path=str(event.src_path))
+        self._schedule_reload()
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        """Handle deletions inside a watched directory."""
+        if not self.is_directory or not self._is_target(event.src_path):
             return
 
-        logger.debug("File created detected", path=str(self.file_path))
+        logger.debug("File deleted detected", path=str(event.src_path))
+        self._schedule_reload()
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """Handle renames into, out of, or within a watched directory."""
+        if not self.is_directory:
+            return
+        if not (self._is_target(event.src_path) or self._is_target(event.dest_path)):
+            return
+
+        logger.debug("File moved detected", path=str(event.dest_path))
         self._schedule_reload()
 
     def _schedule_reload(self) -> None:
@@ -104,10 +139,19 @@ class DebouncedFileWatcher(FileSystemEventHandler):
 
             try:
                 logger.info("Triggering reload", path=str(self.file_path))
-                self.callback(str(self.file_path))
+                result = self.callback(str(self.file_path))
+                if inspect.isawaitable(result):
+                    self._await(result)
             except Exception as e:
                 logger.error("Reload callback failed", error=str(e), path=str(self.file_path))
 
+    def _await(self, result: Awaitable[None]) -> None:
+        """Run a coroutine callback to completion (on the loop when it runs, so reloads stay serialized)."""
+        if self.loop is not None and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(result, self.loop).result()  # type: ignore[arg-type]
+        else:
+            asyncio.run(result)  # type: ignore[arg-type]
+
     def start(self) -> None:
         """Start watching the file."""
         if self.observer is not None:
@@ -119,10 +163,10 @@ class DebouncedFileWatcher(FileSystemEventHandler):
             logger.error("File does not exist", path=str(self.file_path))
             raise FileNotFoundError(f"Cannot watch non-existent file: {self.file_path}")
 
-        # Start observer
+        # Start observer (a directory is watched with its subfolders)
         self.observer = Observer()
-        watch_dir = self.file_path.parent
-        self.observer.schedule(self, str(watch_dir), recursive=False)
+        watch_dir = self.file_path if self.is_directory else self.file_path.parent
+        self.observer.schedule(self, str(watch_dir), recursive=self.is_directory)
         self.observer.start()
 
         logger.info(
@@ -165,7 +209,7 @@ class AsyncDebouncedFileWatcher:
     def __init__(
         self,
         file_path: str | Path,
-        callback: Callable[[str], None],
+        callback: ReloadCallback,
         debounce_delay: float = 1.0,
     ) -> None:
         """
@@ -173,7 +217,7 @@ class AsyncDebouncedFileWatcher:
 
         Args:
             file_path: Path to file to watch
-            callback: Function to call on file changes
+            callback: Function or coroutine function (run on the loop that calls start()) to call on file changes
             debounce_delay: Seconds to wait before triggering callback
         """
         self.watcher = DebouncedFileWatcher(
@@ -184,7 +228,8 @@ class AsyncDebouncedFileWatcher:
 
     async def start(self) -> None:
         """Start watching (async-safe)."""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+        self.watcher.loop = loop
         await loop.run_in_executor(None, self.watcher.start)
 
     async def stop(self) -> None:
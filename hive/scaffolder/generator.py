@@ -80,6 +80,7 @@ class ConfigGenerator:
         markdown = settings.get("markdown")
         stream = settings.get("stream")
         debug_mode = settings.get("debug_mode")
+        eager_retrieval = settings.get("eager_retrieval")
 
         # MCP servers
         mcp_servers = config.get("mcp_servers")
@@ -96,10 +97,25 @@ class ConfigGenerator:
         }
 
         # Add optional parameters
+        agent_bases: list[type[Agent]] = []
         if tools:
             agent_params["tools"] = tools
         if knowledge:
             agent_params["knowledge"] = knowledge
+            knowledge_config = config.get("knowledge") or {}
+            if knowledge_config.get("type") == "csv" and knowledge_config.get("faq"):
+                # Answer high-confidence FAQ matches without a model call
+                from hive.knowledge.faq import FAQAgent, FAQConfig
+
+                agent_bases.append(FAQAgent)
+                agent_params["faq"] = FAQConfig.from_dict(knowledge_config["faq"])
+                agent_params["content_column"] = knowledge_config.get("content_column", "content")
+            if eager_retrieval:
+                # Search on the raw message during run setup and put the results in the first prompt
+                from hive.knowledge.eager import EagerRetrievalAgent, EagerRetrievalConfig
+
+                agent_bases.append(EagerRetrievalAgent)
+                agent_params["eager_retrieval"] = EagerRetrievalConfig.from_dict(eager_retrieval)
         if storage:
             agent_params["storage"] = storage
         if mcp_servers:
@@ -122,11 +138,20 @@ class ConfigGenerator:
 
         # Create agent
         try:
-            agent = Agent(**agent_params)
+            agent = cls._agent_class(agent_bases)(**agent_params)
             return agent
         except Exception as e:
             raise GeneratorError(f"Failed to create agent: {e}") from e
 
+    @classmethod
+    def _agent_class(cls, bases: list[type[Agent]]) -> type[Agent]:
+        """Combine Agent subclasses for the enabled run stages (earlier bases run first)."""
+        if not bases:
+            return Agent
+        if len(bases) == 1:
+            return bases[0]
+        return type("HiveAgent", tuple(bases), {})
+
     @classmethod
     def generate_team_from_yaml(cls, yaml_path: str, validate: bool = True, **overrides) -> Team:
         """Generate an Agno Team from YAML configuration.
@@ -505,30 +530,58 @@ class ConfigGenerator:
             return None
 
         kb_type = knowledge_config.get("type")
-        source = knowledge_config.get("source")
 
-        if kb_type == "csv":
-            # CSV knowledge base
-            from agno.document import CSVReader  # type: ignore[import-not-found]
-            from agno.knowledge import DocumentKnowledgeBase  # type: ignore[attr-defined]
+        if kb_type in ("csv", "parquet", "arrow", "jsonl", "documents", "database"):
+            # File, document folder or database table (hive.yaml knowledge section provides project defaults)
+            from hive.knowledge import create_knowledge_base
+            from hive.knowledge.config import knowledge_kwargs, load_project_knowledge_config, merge_knowledge_config
 
             try:
-                reader = CSVReader(path=source)
-                kb = DocumentKnowledgeBase(
-                    reader=reader,
-                    num_documents=knowledge_config.get("num_documents", 5),
-                )
-                return kb
+                config = merge_knowledge_config(load_project_knowledge_config(), knowledge_config)
+                return create_knowledge_base(**knowledge_kwargs(config))
             except Exception as e:
-                raise GeneratorError(f"Failed to setup CSV knowledge base: {e}") from e
-
-        elif kb_type == "database":
-            # Database knowledge base
-            knowledge_config.get("connection")
-            knowledge_config.get("table")
-
-            # TODO: Implement database knowledge base
-            raise GeneratorError("Database knowledge base not yet implemented")
+                label = {
+                    "csv": "CSV",
+                    "parquet": "Parquet",
+                    "arrow": "Arrow",
+                    "jsonl": "JSONL",
+                    "documents": "document folder",
+                }.get(kb_type, "database")
+                raise GeneratorError(f"Failed to setup {label} knowledge base: {e}") from e
+
+        elif kb_type == "federated":
+            # Several knowledge bases searched concurrently, merged with reciprocal-rank fusion
+            from hive.knowledge.config import ContextConfig, default_table_name
+            from hive.knowledge.context import BudgetedKnowledge
+            from hive.knowledge.federated import DEFAULT_RRF_K, FederatedKnowledge
+
+            source_configs = knowledge_config.get("sources") or []
+            if not source_configs:
+                raise GeneratorError("Federated knowledge requires at least one entry in 'sources'")
+
+            sources = {}
+            weights = {}
+            for index, source_config in enumerate(source_configs):
+                default_name = os.path.splitext(os.path.basename(str(source_config.get("source", index))))[0]
+                source_name = source_config.get("name") or default_name
+                if source_name in sources:
+                    raise GeneratorError(f"Duplicate federated knowledge source name: {source_name}")
+                # Sources must not share the default table
+                source_config = {"table_name": default_table_name(source_name), **source_config}
+                sources[source_name] = cls._setup_knowledge(source_config)
+                if "weight" in source_config:
+                    weights[source_name] = float(source_config["weight"])
+
+            federated = FederatedKnowledge(
+                sources=sources,
+                max_results=knowledge_config.get("num_documents", 10),
+                time_budget=knowledge_config.get("time_budget", 2.0),
+                rrf_k=knowledge_config.get("rrf_k", DEFAULT_RRF_K),
+                weights=weights,
+            )
+            # Budget the fused results (per-source budgets apply before fusion)
+            context = ContextConfig.from_dict(knowledge_config.get("context"))
+            return BudgetedKnowledge(federated, context) if context else federated
 
         else:
             raise GeneratorError(f"Unknown knowledge base type: {kb_type}")
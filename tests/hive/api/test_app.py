@@ -0,0 +1,76 @@
+"""Tests for the custom routes of the Hive API."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from agno.agent import Agent
+from fastapi.testclient import TestClient
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from hive.api import app as api
+from hive.config import settings
+from hive.knowledge.metrics import clear_ingest_metrics
+from hive.knowledge.readiness import clear_load_statuses, register_load
+
+
+@pytest.fixture(autouse=True)
+def _clear_registries():
+    """Each test starts with no registered or recorded loads."""
+    clear_load_statuses()
+    clear_ingest_metrics()
+    yield
+    clear_load_statuses()
+    clear_ingest_metrics()
+
+
+def _client(**overrides: object) -> TestClient:
+    """Client of an app serving one stub agent, with settings overrides."""
+    config = settings().model_copy(update=overrides)
+    with (
+        patch.object(api, "settings", return_value=config),
+        patch.object(api, "discover_agents", return_value=[Agent(id="echo", name="Echo")]),
+        patch.object(api, "discover_teams", return_value=[]),
+        patch.object(api, "discover_workflows", return_value=[]),
+    ):
+        return TestClient(api.create_app())
+
+
+def test_ready_follows_registered_loads() -> None:
+    """/ready is 200 without loads, 503 while one is pending or loading, 200 once all are ready."""
+    client = _client()
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"ready": True, "sources": []}
+
+    faq = register_load("knowledge_faq", "data/faq.csv")
+    faq.state = "loading"
+    register_load("knowledge_specs", "data/specs.csv").state = "ready"
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+    assert {source["table"]: source["state"] for source in response.json()["sources"]} == {
+        "knowledge_faq": "loading",
+        "knowledge_specs": "ready",
+    }
+
+    faq.state = "ready"
+    assert client.get("/ready").status_code == 200
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_ingestion_metrics_route_follows_the_flag(enabled: bool) -> None:
+    """/knowledge/metrics is only served with HIVE_ENABLE_METRICS; AgentOS keeps /metrics either way."""
+    client = _client(hive_enable_metrics=enabled)
+    response = client.get("/knowledge/metrics")
+    if enabled:
+        assert response.status_code == 200
+        assert response.json() == {"enabled": True, "tables": []}
+    else:
+        assert response.status_code == 404
+    assert "tables" not in client.get("/metrics").json()
@@ -0,0 +1,173 @@
+"""Tests for the knowledge snapshot commands."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from rich.console import Console
+from typer.testing import CliRunner
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from hive.cli import app
+
+runner = CliRunner()
+
+MANIFEST = {
+    "table": "knowledge_base",
+    "created_at": "2024-01-01T00:00:00+00:00",
+    "tables": [
+        {"schema": "agno", "name": "knowledge_base", "rows": 3, "vectors": {"embedding": "x.npy"}},
+        {"schema": None, "name": "knowledge_base_hashes", "rows": 3},
+    ],
+}
+
+
+def test_export_requires_database_url(tmp_path: Path, monkeypatch) -> None:
+    """Export fails cleanly without a database URL."""
+    monkeypatch.delenv("HIVE_DATABASE_URL", raising=False)
+
+    result = runner.invoke(app, ["knowledge", "export", str(tmp_path)])
+
+    assert result.exit_code == 1
+    assert "HIVE_DATABASE_URL" in result.output
+
+
+def test_export_passes_table_and_schema(tmp_path: Path) -> None:
+    """Export snapshots the requested table and lists what was written."""
+    with patch("hive.knowledge.snapshot.export_snapshot", return_value=MANIFEST) as export:
+        result = runner.invoke(
+            app,
+            ["knowledge", "export", str(tmp_path), "--table", "knowledge_base", "--db-url", "sqlite://"],
+        )
+
+    assert result.exit_code == 0, result.output
+    _, table, path = export.call_args.args
+    assert (table, path, export.call_args.kwargs["schema"]) == ("knowledge_base", tmp_path, "agno")
+    assert "knowledge_base_hashes" in result.output
+
+
+def test_import_reports_errors(tmp_path: Path) -> None:
+    """Import refuses to overwrite populated tables unless --replace is given."""
+    error = ValueError("Table knowledge_base already has rows (use replace=True to overwrite)")
+    with patch("hive.knowledge.snapshot.import_snapshot", side_effect=error) as load:
+        result = runner.invoke(app, ["knowledge", "import", str(tmp_path), "--db-url", "sqlite://"])
+
+    assert result.exit_code == 1
+    assert "already has rows" in result.output
+    assert load.call_args.kwargs["replace"] is False
+
+
+@pytest.fixture(autouse=True)
+def wide_console():
+    """Render tables without wrapping cells."""
+    with patch("hive.cli.knowledge.console", Console(width=200)):
+        yield
+
+
+def _fake_loader(plan) -> MagicMock:
+    """Tabular loader stub returning a fixed plan."""
+    loader = MagicMock()
+    loader.plan.return_value = plan
+    loader.incremental_loader.throughput.return_value = None
+    loader.apply.return_value = {"added": 1, "changed": 0, "deleted": 0}
+    loader.vector_db.table_name = "knowledge_faq"
+    return loader
+
+
+def _ingest_plan():
+    """Plan adding one row."""
+    import pandas as pd
+    from agno.knowledge.document import Document
+
+    from hive.knowledge.csv_loader import IngestPlan
+
+    return IngestPlan(
+        mode="incremental",
+        dataframe=pd.DataFrame(),
+        hashes={0: "h"},
+        added=[0],
+        changed=[],
+        deleted=[],
+        documents=[Document(name="csv_row_0", content="Refunds take five days.")],
+        stale=[],
+        timings={"diff": 0.01, "prepare": 0.002},
+    )
+
+
+def test_plan_shows_estimates() -> None:
+    """plan reports the row diff and embedding estimate without applying it."""
+    loader = _fake_loader(_ingest_plan())
+    with (
+        patch("hive.knowledge.config.discover_knowledge_sources", return_value={"faq-bot": {"type": "csv"}}),
+        patch("hive.cli.knowledge._loader", return_value=(loader, Path("faq.csv"), "text-embedding-3-small")),
+    ):
+        result = runner.invoke(app, ["knowledge", "plan"])
+
+    assert result.exit_code == 0, result.output
+    assert "faq-bot" in result.output and "incremental" in result.output
+    loader.apply.assert_not_called()
+
+
+def test_ingest_applies_plan_and_reports_phases() -> None:
+    """ingest applies the plan computed once and prints per-phase timings."""
+    plan = _ingest_plan()
+    loader = _fake_loader(plan)
+    with (
+        patch("hive.knowledge.config.discover_knowledge_sources", return_value={"faq-bot": {"type": "csv"}}),
+        patch("hive.cli.knowledge._loader", return_value=(loader, Path("faq.csv"), "text-embedding-3-small")),
+    ):
+        result = runner.invoke(app, ["knowledge", "ingest", "faq-bot"])
+
+    assert result.exit_code == 0, result.output
+    loader.plan.assert_called_once_with(Path("faq.csv"), force_full=False)
+    assert loader.apply.call_args.args[0] is plan
+    loader.vector_db.optimize.assert_called_once()
+    assert "diff" in result.output and "index" in result.output
+
+
+def test_status_shows_freshness() -> None:
+    """status marks sources with pending changes as stale."""
+    from datetime import datetime
+
+    loader = _fake_loader(None)
+    loader.last_synced.return_value = datetime(2024, 5, 1, 12, 0)
+    loader.pending.return_value = 3
+    with (
+        patch("hive.knowledge.config.discover_knowledge_sources", return_value={"faq-bot": {"type": "csv"}}),
+        patch("hive.cli.knowledge._loader", return_value=(loader, Path("faq.csv"), "text-embedding-3-small")),
+    ):
+        result = runner.invoke(app, ["knowledge", "status"])
+
+    assert result.exit_code == 0, result.output
+    assert "2024-05-01 12:00:00" in result.output
+    assert "stale" in result.output
+
+
+def test_health_reports_and_runs_due_maintenance() -> None:
+    """health lists each table's bloat and churn; --run maintains the tables that are due."""
+    from hive.knowledge.maintenance import TableHealth
+
+    loader = _fake_loader(None)
+    loader.vector_db.active = loader.vector_db.partitions = None
+    health = TableHealth(table="knowledge_faq", live_rows=900, dead_rows=100, churn_since_reindex=600)
+    health.table_bytes, health.index_bytes = 10 * 1024 * 1024, {"knowledge_faq_embedding_idx": 4096}
+    with (
+        patch("hive.knowledge.config.discover_knowledge_sources", return_value={"faq-bot": {"type": "csv"}}),
+        patch("hive.cli.knowledge._loader", return_value=(loader, Path("faq.csv"), "text-embedding-3-small")),
+        patch("hive.knowledge.maintenance.IndexMaintainer.health", return_value=health),
+        patch("hive.knowledge.maintenance.IndexMaintainer.maintain") as maintain,
+    ):
+        result = runner.invoke(app, ["knowledge", "health"])
+        assert result.exit_code == 0, result.output
+        assert "knowledge_faq" in result.output and "1.0 MB" in result.output
+        assert "vacuum, reindex" in result.output
+        maintain.assert_not_called()
+
+        result = runner.invoke(app, ["knowledge", "health", "--run"])
+        assert result.exit_code == 0, result.output
+        maintain.assert_called_once_with(0.1, 0.5)
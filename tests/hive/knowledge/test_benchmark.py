@@ -0,0 +1,141 @@
+"""Tests for the recall/latency benchmark harness."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+from agno.knowledge.document import Document
+
+from hive.knowledge.benchmark import (
+    BenchmarkResult,
+    LabelledQuery,
+    evaluate,
+    format_concurrency_results,
+    format_results,
+    load_labelled_queries,
+    percentile,
+    recall_at_k,
+    run_concurrency_benchmark,
+    storage_savings,
+    sweep_grid,
+)
+from hive.knowledge.config import SearchConfig, StorageConfig
+
+
+def test_load_labelled_queries(tmp_path: Path) -> None:
+    """Row ids are normalized to document names."""
+    path = tmp_path / "queries.csv"
+    path.write_text("query,relevant\nreset password,3\nrefunds,12;csv_row_13\n")
+
+    queries = load_labelled_queries(path)
+
+    assert queries[0].relevant == {"csv_row_3"}
+    assert queries[1].relevant == {"csv_row_12", "csv_row_13"}
+
+
+def test_recall_at_k() -> None:
+    """Recall counts relevant hits within the cutoff."""
+    assert recall_at_k(["a", "b", "c"], {"a", "c"}, k=2) == 0.5
+    assert recall_at_k(["a", "b", "c"], {"a", "c"}, k=3) == 1.0
+    assert recall_at_k([], set(), k=5) == 1.0
+
+
+def test_percentile() -> None:
+    """Nearest-rank percentile."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+
+def test_evaluate() -> None:
+    """Evaluate reports mean recall and latency percentiles."""
+    index = {"q1": ["csv_row_1", "csv_row_2"], "q2": ["csv_row_9"]}
+
+    def search(query: str, limit: int) -> list[Document]:
+        return [Document(name=name, content="") for name in index[query][:limit]]
+
+    queries = [LabelledQuery("q1", {"csv_row_1"}), LabelledQuery("q2", {"csv_row_3"})]
+    recall, p50, p99 = evaluate(search, queries, k=2)
+
+    assert recall == 0.5
+    assert 0 <= p50 <= p99
+
+
+def test_sweep_grid_dedupes_hybrid_weight() -> None:
+    """Weights only multiply hybrid configs."""
+    configs = sweep_grid(search_types=["vector", "hybrid"], vector_score_weights=[0.3, 0.7], hnsw_ef_search=[10, 40])
+
+    vector = [c for c in configs if c.search_type == "vector"]
+    hybrid = [c for c in configs if c.search_type == "hybrid"]
+    assert len(vector) == 2
+    assert len(hybrid) == 4
+    assert len({c.index_key for c in configs}) == 1
+
+
+def test_format_results_sorted_by_recall() -> None:
+    """Best recall is listed first."""
+    low = BenchmarkResult(SearchConfig(hnsw_ef_search=10), k=5, queries=2, recall_at_k=0.4, p50_ms=1, p99_ms=2)
+    high = BenchmarkResult(SearchConfig(hnsw_ef_search=80), k=5, queries=2, recall_at_k=0.9, p50_ms=3, p99_ms=6)
+
+    lines = format_results([low, high]).splitlines()
+
+    assert "efs=80" in lines[2]
+    assert "efs=10" in lines[3]
+
+
+def test_storage_savings_against_default() -> None:
+    """Quantized variants are compared with the float32 baseline for the same search config."""
+    config = SearchConfig(hnsw_ef_search=40)
+    baseline = BenchmarkResult(config, k=5, queries=2, recall_at_k=0.9, p50_ms=10, p99_ms=20, index_bytes=1000)
+    halfvec = BenchmarkResult(
+        config,
+        k=5,
+        queries=2,
+        recall_at_k=0.88,
+        p50_ms=8,
+        p99_ms=15,
+        storage=StorageConfig(quantization="halfvec"),
+        index_bytes=500,
+    )
+
+    rows = storage_savings([baseline, halfvec])
+
+    assert len(rows) == 1
+    assert rows[0]["index_saving_pct"] == 50.0
+    assert rows[0]["p50_saving_pct"] == 20.0
+    assert rows[0]["recall_delta"] == pytest.approx(-0.02)
+
+
+class _SlowStore:
+    """Store whose sync search blocks and whose async search awaits for the same time."""
+
+    def search(self, query: str, limit: int = 5) -> list[Document]:
+        time.sleep(0.005)
+        return [Document(name=query, content=query)]
+
+    async def async_search(self, query: str, limit: int = 5) -> list[Document]:
+        await asyncio.sleep(0.005)
+        return [Document(name=query, content=query)]
+
+
+def test_concurrency_benchmark_shows_loop_lag_of_blocking_search() -> None:
+    """Blocking searches stall the loop and serialize; async searches overlap without lag."""
+    results = run_concurrency_benchmark(
+        _SlowStore(), ["refunds", "shipping"], levels=(50,), modes=("blocking", "async"), searches_per_request=1
+    )
+    by_mode = {r.mode: r for r in results}
+
+    assert [r.requests for r in results] == [200, 200]
+    assert by_mode["blocking"].lag_max_ms >= 4
+    assert by_mode["async"].throughput > 5 * by_mode["blocking"].throughput
+    assert "lag p99 ms" in format_concurrency_results(results)
+    with pytest.raises(ValueError):
+        run_concurrency_benchmark(_SlowStore(), ["q"], modes=("sideways",))
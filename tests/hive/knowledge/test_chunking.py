@@ -0,0 +1,82 @@
+"""Tests for content chunking."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from hive.knowledge.chunking import chunk_text
+from hive.knowledge.config import ChunkingConfig
+
+PARAGRAPHS = [
+    "Refunds are issued within five business days of receiving the return. " * 3,
+    "Gift cards cannot be exchanged for cash and do not expire. " * 3,
+    "Shipping labels are emailed once the return has been approved. " * 3,
+]
+
+
+def test_chunking_config_from_dict() -> None:
+    """YAML keys map onto the config; an empty section disables chunking."""
+    config = ChunkingConfig.from_dict({"strategy": "fixed", "size": 500, "overlap": 50})
+
+    assert (config.strategy, config.size, config.overlap) == ("fixed", 500, 50)
+    assert ChunkingConfig.from_dict(None) is None
+    with pytest.raises(ValueError):
+        ChunkingConfig(strategy="semantic")
+    with pytest.raises(ValueError):
+        ChunkingConfig(size=100, overlap=100)
+
+
+def test_short_text_is_one_chunk() -> None:
+    """Cells that fit in one chunk are not split."""
+    assert chunk_text("  Short answer.  ", ChunkingConfig(size=100, overlap=0)) == ["Short answer."]
+
+
+def test_sentence_chunks_follow_paragraphs() -> None:
+    """Each paragraph becomes its own chunk, so editing one leaves the others unchanged."""
+    config = ChunkingConfig(strategy="sentence", size=250, overlap=0)
+    original = chunk_text("\n\n".join(PARAGRAPHS), config)
+
+    edited = list(PARAGRAPHS)
+    edited[1] = edited[1].replace("do not expire", "expire after a year")
+    updated = chunk_text("\n\n".join(edited), config)
+
+    assert original == [p.strip() for p in PARAGRAPHS]
+    assert [chunk for chunk in updated if chunk not in original] == [edited[1].strip()]
+
+
+def test_long_paragraph_is_packed_by_sentence() -> None:
+    """Paragraphs over the size limit are split at sentence ends, with overlap between chunks."""
+    paragraph = " ".join(f"Sentence number {i} explains one step." for i in range(20))
+
+    chunks = chunk_text(paragraph, ChunkingConfig(strategy="sentence", size=200, overlap=60))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 200 and chunk.endswith(".") for chunk in chunks)
+    assert chunks[1].startswith(chunks[0].rsplit(". ", 1)[-1])
+
+
+def test_short_paragraph_merges_with_next() -> None:
+    """Headings are kept with the paragraph that follows them."""
+    text = "Returns\n\n" + PARAGRAPHS[0] + "\n\n" + PARAGRAPHS[1]
+
+    chunks = chunk_text(text, ChunkingConfig(strategy="sentence", size=250, overlap=0))
+
+    assert chunks[0].startswith("Returns\n\n")
+    assert len(chunks) == 2
+
+
+def test_fixed_chunks_overlap() -> None:
+    """Fixed windows cover the whole text, overlap, and do not cut words."""
+    text = " ".join(f"word{i}" for i in range(200))
+
+    chunks = chunk_text(text, ChunkingConfig(strategy="fixed", size=100, overlap=20))
+
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert chunks[0].split()[-1] in chunks[1]
+    assert set(" ".join(chunks).split()) == set(text.split())
@@ -0,0 +1,212 @@
+"""Tests for knowledge YAML configuration."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agno.vectordb.distance import Distance
+from agno.vectordb.pgvector import SearchType
+
+from hive.knowledge.config import (
+    MetadataConfig,
+    SearchConfig,
+    StorageConfig,
+    default_table_name,
+    discover_knowledge_sources,
+    knowledge_kwargs,
+    load_project_knowledge_config,
+    merge_knowledge_config,
+)
+
+
+def test_search_config_defaults_match_previous_behavior() -> None:
+    """Default config keeps hybrid/cosine with stock HNSW parameters."""
+    config = SearchConfig()
+
+    assert config.search_type == SearchType.hybrid
+    assert config.distance == Distance.cosine
+    index = config.vector_index()
+    assert (index.m, index.ef_construction, index.ef_search) == (16, 200, 5)
+
+
+def test_search_config_from_dict() -> None:
+    """YAML mapping populates search settings."""
+    config = SearchConfig.from_dict(
+        {"type": "vector", "distance": "l2", "vector_score_weight": 0.8, "hnsw": {"m": 32, "ef_search": 64}}
+    )
+
+    assert config.search_type == SearchType.vector
+    assert config.distance == Distance.l2
+    assert config.vector_score_weight == 0.8
+    assert config.hnsw_m == 32
+    assert config.hnsw_ef_construction == 200
+    assert config.hnsw_ef_search == 64
+
+
+@pytest.mark.parametrize(
+    "data",
+    [{"type": "fuzzy"}, {"distance": "manhattan"}, {"vector_score_weight": 1.5}, {"hnsw": {"m": 1}}],
+)
+def test_search_config_rejects_invalid_values(data: dict) -> None:
+    """Invalid search settings fail fast."""
+    with pytest.raises(ValueError):
+        SearchConfig.from_dict(data)
+
+
+def test_storage_config_from_dict() -> None:
+    """YAML storage mapping populates dimensions and quantization."""
+    config = StorageConfig.from_dict({"dimensions": 512, "quantization": "binary", "rerank_candidates": 40})
+
+    assert config.dimensions == 512
+    assert config.is_quantized
+    assert config.rerank_candidates == 40
+    assert StorageConfig.from_dict(None) == StorageConfig()
+    assert not StorageConfig().is_quantized
+
+
+@pytest.mark.parametrize("data", [{"quantization": "int8"}, {"dimensions": 0}, {"rerank_candidates": -1}])
+def test_storage_config_rejects_invalid_values(data: dict) -> None:
+    """Invalid storage settings fail fast."""
+    with pytest.raises(ValueError):
+        StorageConfig.from_dict(data)
+
+
+def test_metadata_config_from_dict() -> None:
+    """YAML metadata mapping populates schema and filter columns."""
+    config = MetadataConfig.from_dict(
+        {"infer_types": True, "schema": {"price": "float"}, "filter_columns": ["category", "price"]}
+    )
+
+    assert config.is_typed
+    assert config.schema == {"price": "float"}
+    assert config.filter_columns == ["category", "price"]
+    assert not MetadataConfig.from_dict(None).is_typed
+
+
+def test_metadata_config_rejects_unknown_type() -> None:
+    """Unknown metadata types fail fast."""
+    with pytest.raises(ValueError):
+        MetadataConfig(schema={"price": "money"})
+
+
+def test_index_key_ignores_query_time_parameters() -> None:
+    """Only build-time parameters distinguish index variants."""
+    a = SearchConfig(search_type="vector", hnsw_ef_search=10)  # type: ignore[arg-type]
+    b = SearchConfig(search_type="hybrid", hnsw_ef_search=100)  # type: ignore[arg-type]
+    c = SearchConfig(hnsw_m=32)
+
+    assert a.index_key == b.index_key
+    assert a.index_key != c.index_key
+
+
+def test_merge_knowledge_config_nested() -> None:
+    """Agent overrides merge into nested project defaults."""
+    project = {"embedder": "small", "search": {"type": "hybrid", "hnsw": {"m": 16, "ef_search": 40}}}
+    agent = {"source": "faq.csv", "search": {"hnsw": {"ef_search": 80}}}
+
+    merged = merge_knowledge_config(project, agent)
+
+    assert merged["embedder"] == "small"
+    assert merged["search"]["type"] == "hybrid"
+    assert merged["search"]["hnsw"] == {"m": 16, "ef_search": 80}
+    assert project["search"]["hnsw"]["ef_search"] == 40  # Defaults not mutated
+
+
+def test_load_project_knowledge_config(tmp_path: Path) -> None:
+    """hive.yaml knowledge keys are normalized to agent config names; auto_reload doesn't enable watchers."""
+    (tmp_path / "hive.yaml").write_text(
+        "knowledge:\n  embedder_model: text-embedding-3-large\n  auto_reload: true\n  search:\n    type: vector\n"
+    )
+
+    config = load_project_knowledge_config(tmp_path)
+
+    assert config["embedder"] == "text-embedding-3-large"
+    assert "hot_reload" not in config
+    assert config["search"] == {"type": "vector"}
+
+
+def test_load_project_knowledge_config_missing(tmp_path: Path) -> None:
+    """Missing hive.yaml yields no defaults."""
+    assert load_project_knowledge_config(tmp_path) == {}
+
+
+def test_knowledge_kwargs() -> None:
+    """Config maps onto create_knowledge_base arguments."""
+    kwargs = knowledge_kwargs(
+        {
+            "type": "csv",
+            "source": "faq.csv",
+            "num_documents": 3,
+            "table": "faq",
+            "search": {},
+            "partition_by": "product",
+        }
+    )
+
+    assert kwargs["csv_path"] == "faq.csv"
+    assert kwargs["num_documents"] == 3
+    assert kwargs["table_name"] == "faq"
+    assert kwargs["partition_by"] == "product"
+    assert kwargs["use_shared"] is False
+    assert isinstance(kwargs["search"], SearchConfig)
+    assert kwargs["storage"] == StorageConfig()
+    assert kwargs["chunking"] is None
+    assert kwargs["context"] is None
+    assert "type" not in kwargs
+    assert knowledge_kwargs({"type": "jsonl", "source": "data/specs.jsonl"})["table_name"] == "knowledge_specs"
+
+
+def test_default_table_name() -> None:
+    """Default tables are unquoted-safe identifiers; lossy or long names get a hash suffix."""
+    assert default_table_name("faq") == "knowledge_faq"
+    assert default_table_name("product-faq") != default_table_name("product_faq") == "knowledge_product_faq"
+    assert default_table_name("product-faq").startswith("knowledge_product_faq_")
+    assert default_table_name("My Docs").startswith("knowledge_my_docs_")
+    assert len(default_table_name("x" * 80)) == 63
+    assert knowledge_kwargs({"type": "csv", "source": "data/product-faq.csv"})["table_name"] == default_table_name(
+        "product-faq"
+    )
+
+
+def test_discover_knowledge_sources(tmp_path: Path) -> None:
+    """Agent knowledge sections are merged with hive.yaml; agents sharing a table are listed once."""
+    (tmp_path / "hive.yaml").write_text("knowledge:\n  embedder_model: text-embedding-3-large\n")
+    for agent, knowledge in {
+        "faq-bot": "type: csv\n  source: data/faq.csv\n  table_name: faq",
+        "helper": "type: csv\n  source: data/faq.csv\n  table_name: faq",
+        "docs-bot": "type: documents\n  source: data/documents",
+        "plain": "",
+    }.items():
+        agent_dir = tmp_path / "ai" / "agents" / agent
+        agent_dir.mkdir(parents=True)
+        section = f"knowledge:\n  {knowledge}\n" if knowledge else "agent:\n  name: plain\n"
+        (agent_dir / "config.yaml").write_text(section)
+
+    sources = discover_knowledge_sources(tmp_path)
+
+    assert list(sources) == ["docs-bot", "faq-bot, helper"]
+    assert sources["faq-bot, helper"]["source"] == str(tmp_path / "data/faq.csv")
+    assert sources["faq-bot, helper"]["embedder"] == "text-embedding-3-large"
+
+
+def test_discover_knowledge_sources_conflicting_table(tmp_path: Path) -> None:
+    """Different sources on one table are not merged: the later agent is skipped with a warning."""
+    for agent, source in {"faq-bot": "data/faq.csv", "specs-bot": "data/specs.csv"}.items():
+        agent_dir = tmp_path / "ai" / "agents" / agent
+        agent_dir.mkdir(parents=True)
+        (agent_dir / "config.yaml").write_text(f"knowledge:\n  type: csv\n  source: {source}\n  table_name: shared\n")
+
+    with patch("hive.knowledge.config.logger") as logger:
+        sources = discover_knowledge_sources(tmp_path)
+
+    assert list(sources) == ["faq-bot"]
+    assert sources["faq-bot"]["source"] == str(tmp_path / "data/faq.csv")
+    warning = logger.warning.call_args
+    assert warning.kwargs == {"table": "shared", "loaded": "faq-bot", "skipped": "specs-bot"}
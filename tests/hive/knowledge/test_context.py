@@ -0,0 +1,109 @@
+"""Tests for token-budgeted context assembly."""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agno.knowledge.document import Document
+
+from hive.knowledge.config import ContextConfig
+from hive.knowledge.context import BudgetedKnowledge, ContextAssembler
+
+LONG_ROW = (
+    "Our warehouse ships orders Monday to Friday. "
+    "Refunds are issued within five business days of receiving the return. "
+    "Gift cards cannot be exchanged for cash. "
+    "Shipping labels are emailed after the return is approved. "
+) * 6
+
+
+def _doc(name: str, content: str, score: float | None = None) -> Document:
+    """Document with an optional similarity score."""
+    meta = {"similarity_score": score} if score is not None else {}
+    return Document(name=name, content=content, meta_data=meta)
+
+
+def test_context_config_from_dict() -> None:
+    """YAML keys map onto the config; an empty section disables budgeting."""
+    config = ContextConfig.from_dict({"max_tokens": 800, "min_score": 0.4, "relative_score": 0.5})
+
+    assert (config.max_tokens, config.min_score, config.relative_score) == (800, 0.4, 0.5)
+    assert ContextConfig.from_dict(None) is None
+    with pytest.raises(ValueError):
+        ContextConfig(relative_score=1.5)
+
+
+def test_adaptive_k_drops_weak_tail() -> None:
+    """Hits far below the top score are not padded in to reach k."""
+    assembler = ContextAssembler(ContextConfig(min_score=0.2, relative_score=0.6))
+    docs = [_doc("a", "refund policy", 0.9), _doc("b", "return window", 0.7), _doc("c", "store hours", 0.3)]
+
+    result = assembler.assemble("refunds", docs)
+
+    assert [d.name for d in result.documents] == ["a", "b"]
+    assert result.below_cutoff == 1
+    assert result.tokens_saved > 0
+
+
+def test_near_duplicates_are_dropped() -> None:
+    """A hit that repeats a higher-ranked one is removed."""
+    assembler = ContextAssembler(ContextConfig(dedupe_threshold=0.8))
+    text = "refunds are issued within five business days of receiving the return"
+    docs = [_doc("a", text, 0.9), _doc("b", text + ".", 0.88), _doc("c", "gift cards cannot be exchanged", 0.8)]
+
+    result = assembler.assemble("refunds", docs)
+
+    assert [d.name for d in result.documents] == ["a", "c"]
+    assert result.duplicates == 1
+
+
+def test_long_document_keeps_relevant_sentences() -> None:
+    """Documents over the per-document cap keep the sentences matching the query."""
+    assembler = ContextAssembler(ContextConfig(max_document_tokens=60))
+
+    result = assembler.assemble("how long do refunds take", [_doc("row", LONG_ROW, 0.9)])
+
+    content = result.documents[0].content
+    assert "Refunds are issued" in content
+    assert result.truncated == 1
+    assert result.tokens_used <= 60
+    assert result.tokens_saved > 0
+
+
+def test_budget_limits_total_tokens() -> None:
+    """Documents are added in rank order until the budget is spent."""
+    assembler = ContextAssembler(ContextConfig(max_tokens=150))
+    docs = [_doc(f"row_{i}", f"unique answer number {i} " * 20, 0.9 - i * 0.01) for i in range(5)]
+
+    result = assembler.assemble("answer", docs)
+
+    assert 0 < len(result.documents) < 5
+    assert result.tokens_used <= 150
+    assert [d.name for d in result.documents] == [f"row_{i}" for i in range(len(result.documents))]
+
+
+def test_budgeted_knowledge_over_fetches_and_trims() -> None:
+    """The wrapper asks for extra candidates, returns at most max_results and records savings."""
+    inner = MagicMock()
+    inner.name = "faq"
+    inner.max_results = 2
+    inner.vector_db = None
+    docs = [_doc("a", "refund policy", 0.9), _doc("b", "refund policy!", 0.89), _doc("c", "returns", 0.8)]
+    inner.search.return_value = docs
+    inner.asearch = AsyncMock(return_value=docs)
+    kb = BudgetedKnowledge(inner, ContextConfig())
+
+    results = kb.search("refunds")
+
+    assert [d.name for d in results] == ["a", "c"]
+    assert inner.search.call_args.kwargs["max_results"] == 4
+    assert [d.name for d in asyncio.run(kb.asearch("refunds"))] == ["a", "c"]
+    assert kb.stats.to_dict()["searches"] == 2
@@ -1,8 +1,10 @@
 """Tests for CSV knowledge loader."""
 
+import asyncio
 import sys
+import threading
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pandas as pd
 import pytest
@@ -12,7 +14,11 @@ project_root = Path(__file__).parent.parent.parent.parent.absolute()
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from agno.knowledge.document import Document
+
+from hive.knowledge.config import ChunkingConfig, MetadataConfig
 from hive.knowledge.csv_loader import CSVKnowledgeLoader
+from hive.knowledge.sources import compute_row_hashes
 
 
 @pytest.fixture
@@ -49,6 +55,71 @@ def test_row_to_document(csv_loader: CSVKnowledgeLoader) -> None:
     assert "answer" not in doc.meta_data  # Content column excluded from metadata
 
 
+def test_row_to_document_typed_metadata(mock_vector_db: MagicMock) -> None:
+    """Typed metadata keeps numbers and booleans instead of strings."""
+    mock_vector_db.metadata_types = {}
+    loader = CSVKnowledgeLoader(
+        vector_db=mock_vector_db,
+        content_column="answer",
+        metadata=MetadataConfig(schema={"published": "date"}, infer_types=True),
+    )
+    df = pd.DataFrame({"answer": ["A1"], "price": [9.5], "stock": [3], "active": [True], "published": ["2024-01-02"]})
+
+    loader._resolve_metadata_types(df)
+    doc = loader._row_to_document(df.iloc[0], row_id=0)
+
+    assert doc.meta_data["price"] == 9.5
+    assert doc.meta_data["stock"] == 3
+    assert doc.meta_data["active"] is True
+    assert doc.meta_data["published"] == "2024-01-02"
+    # Vector store filters compile against the same types
+    assert mock_vector_db.metadata_types["price"] == "float"
+    assert "answer" not in mock_vector_db.metadata_types
+
+
+def test_row_to_document_invalid_typed_value_is_null(mock_vector_db: MagicMock) -> None:
+    """Cells that do not match the declared type are stored as null."""
+    loader = CSVKnowledgeLoader(
+        vector_db=mock_vector_db,
+        content_column="answer",
+        metadata=MetadataConfig(schema={"price": "float"}),
+    )
+
+    doc = loader._row_to_document(pd.Series({"answer": "A", "price": "call us"}), row_id=1)
+
+    assert doc.meta_data["price"] is None
+
+
+def test_load_full_requires_partition_column(mock_vector_db: MagicMock, tmp_path: Path) -> None:
+    """A partition column missing from the CSV fails the load instead of filling one partition."""
+    loader = CSVKnowledgeLoader(vector_db=mock_vector_db, content_column="answer", partition_by="product")
+    csv_path = tmp_path / "test.csv"
+    pd.DataFrame({"question": ["Q1"], "answer": ["A1"]}).to_csv(csv_path, index=False)
+
+    with pytest.raises(ValueError, match="Partition column 'product'"):
+        loader.load_full(csv_path)
+    mock_vector_db.upsert.assert_not_called()
+
+
+def test_partition_by_must_match_vector_db(mock_vector_db: MagicMock) -> None:
+    """The loader cannot route on a different column than the store partitions on."""
+    mock_vector_db.partition_by = "category"
+
+    with pytest.raises(ValueError, match="partitioned by 'category'"):
+        CSVKnowledgeLoader(vector_db=mock_vector_db, partition_by="product")
+
+
+def test_partition_value_is_part_of_the_content_hash(mock_vector_db: MagicMock) -> None:
+    """A row moved to another partition gets a new content hash, so a full load's delete_stale drops the old copy."""
+    loader = CSVKnowledgeLoader(vector_db=mock_vector_db, content_column="answer", partition_by="product")
+
+    def content_hash(product: str) -> str:
+        return loader._content_hash([Document(name="csv_row_0", content="A1", meta_data={"product": product})])
+
+    assert content_hash("billing") != content_hash("shipping")
+    assert content_hash("billing") == content_hash("billing")
+
+
 def test_load_full(csv_loader: CSVKnowledgeLoader, tmp_path: Path, mock_vector_db: MagicMock) -> None:
     """Test full CSV load."""
     # Create test CSV
@@ -143,38 +214,220 @@ def test_load_incremental_deletions(csv_loader: CSVKnowledgeLoader, tmp_path: Pa
     assert stats["added"] == 0
     assert stats["changed"] == 0
     assert stats["deleted"] == 2
-    # Should call delete for each deleted row
-    assert mock_vector_db.delete.call_count == 2
+    # Deleted rows are removed in one statement
+    mock_vector_db.delete_by_names.assert_called_once_with(["csv_row_5", "csv_row_7"])
+
+
+def test_load_full_reads_projected_columns(mock_vector_db: MagicMock, tmp_path: Path) -> None:
+    """Only configured columns (plus the content column) become metadata; JSONL sources load directly."""
+    csv_path = tmp_path / "test.jsonl"
+    pd.DataFrame({"question": ["Q1"], "answer": ["A1"], "internal": ["x"]}).to_json(
+        csv_path, orient="records", lines=True
+    )
+    loader = CSVKnowledgeLoader(vector_db=mock_vector_db, content_column="answer", columns=["question"])
+
+    with patch.object(loader.incremental_loader, "update_hashes"):
+        loader.load_full(csv_path)
+
+    doc = mock_vector_db.upsert.call_args.kwargs["documents"][0]
+    assert doc.content == "A1"
+    assert "internal" not in doc.meta_data
+    assert doc.meta_data["question"] == "Q1"
 
 
-def test_load_auto_full(csv_loader: CSVKnowledgeLoader, tmp_path: Path) -> None:
+PARAGRAPHS = [
+    "Refunds are issued within five business days of receiving the return. " * 3,
+    "Gift cards cannot be exchanged for cash and do not expire. " * 3,
+    "Shipping labels are emailed once the return has been approved. " * 3,
+]
+
+
+@pytest.fixture
+def chunking_loader(mock_vector_db: MagicMock) -> CSVKnowledgeLoader:
+    """Create a CSV loader that chunks long answers."""
+    return CSVKnowledgeLoader(
+        vector_db=mock_vector_db,
+        content_column="answer",
+        chunking=ChunkingConfig(strategy="sentence", size=250, overlap=0),
+    )
+
+
+def _chunked_full_load(loader: CSVKnowledgeLoader, csv_path: Path) -> dict[int, list[str]]:
+    """Run a full load and return the chunk hashes it stored."""
+    pd.DataFrame({"question": ["Returns?"], "answer": ["\n\n".join(PARAGRAPHS)]}).to_csv(csv_path, index=False)
+    with (
+        patch.object(loader.incremental_loader, "update_hashes"),
+        patch.object(loader.incremental_loader, "update_chunk_hashes") as update_chunk_hashes,
+    ):
+        loader.load_full(csv_path)
+    return update_chunk_hashes.call_args.args[0]
+
+
+def test_load_full_chunks_long_content(
+    chunking_loader: CSVKnowledgeLoader, tmp_path: Path, mock_vector_db: MagicMock
+) -> None:
+    """Each paragraph is stored as its own document, in one batch, then older documents are dropped."""
+    stored = _chunked_full_load(chunking_loader, tmp_path / "test.csv")
+
+    upsert = mock_vector_db.upsert.call_args.kwargs
+    assert [doc.content for doc in upsert["documents"]] == [p.strip() for p in PARAGRAPHS]
+    assert all(doc.name.startswith("csv_row_0_chunk_") and doc.id == doc.name for doc in upsert["documents"])
+    assert len(stored[0]) == 3
+    mock_vector_db.delete_stale.assert_called_once_with(upsert["content_hash"])
+
+
+def test_incremental_reembeds_only_edited_chunk(
+    chunking_loader: CSVKnowledgeLoader, tmp_path: Path, mock_vector_db: MagicMock
+) -> None:
+    """Editing one paragraph embeds one chunk and deletes only that paragraph's old chunk."""
+    csv_path = tmp_path / "test.csv"
+    stored = _chunked_full_load(chunking_loader, csv_path)
+    mock_vector_db.reset_mock()
+
+    edited = list(PARAGRAPHS)
+    edited[1] = edited[1].replace("do not expire", "expire after a year")
+    df = pd.DataFrame({"question": ["Returns?"], "answer": ["\n\n".join(edited)]})
+    changes = {"dataframe": df, "current_hashes": {0: "new"}, "added": [], "changed": [0], "deleted": []}
+    with (
+        patch.object(chunking_loader.incremental_loader, "detect_changes", return_value=changes),
+        patch.object(chunking_loader.incremental_loader, "load_chunk_hashes", return_value={0: set(stored[0])}),
+        patch.object(chunking_loader.incremental_loader, "update_hashes"),
+        patch.object(chunking_loader.incremental_loader, "update_chunk_hashes") as update_chunk_hashes,
+    ):
+        stats = chunking_loader.load_incremental(csv_path)
+
+    assert stats == {"added": 0, "changed": 1, "deleted": 0, "embedded": 1}
+    assert [doc.content for doc in mock_vector_db.upsert.call_args.kwargs["documents"]] == [edited[1].strip()]
+    mock_vector_db.delete_by_names.assert_called_once()
+    assert len(mock_vector_db.delete_by_names.call_args.args[0]) == 1
+    assert len(set(update_chunk_hashes.call_args.args[0][0]) - set(stored[0])) == 1
+
+
+def test_incremental_deletes_removed_row_chunks(
+    chunking_loader: CSVKnowledgeLoader, tmp_path: Path, mock_vector_db: MagicMock
+) -> None:
+    """A deleted row's chunks are removed by name along with its chunk hashes."""
+    csv_path = tmp_path / "test.csv"
+    stored = _chunked_full_load(chunking_loader, csv_path)
+    mock_vector_db.reset_mock()
+
+    df = pd.DataFrame({"question": [], "answer": []})
+    changes = {"dataframe": df, "current_hashes": {}, "added": [], "changed": [], "deleted": [0]}
+    with (
+        patch.object(chunking_loader.incremental_loader, "detect_changes", return_value=changes),
+        patch.object(chunking_loader.incremental_loader, "load_chunk_hashes", return_value={0: set(stored[0])}),
+        patch.object(chunking_loader.incremental_loader, "update_hashes"),
+        patch.object(chunking_loader.incremental_loader, "delete_hashes"),
+        patch.object(chunking_loader.incremental_loader, "delete_chunk_hashes") as delete_chunk_hashes,
+    ):
+        chunking_loader.load_incremental(csv_path)
+
+    deleted_names = {name for c in mock_vector_db.delete_by_names.call_args_list for name in c.args[0]}
+    assert {f"csv_row_0_chunk_{h[:12]}" for h in stored[0]} <= deleted_names
+    mock_vector_db.upsert.assert_not_called()
+    delete_chunk_hashes.assert_called_once_with([0])
+
+
+def test_load_auto_full(csv_loader: CSVKnowledgeLoader, tmp_path: Path, mock_vector_db: MagicMock) -> None:
     """Test auto-detection of full load."""
     csv_path = tmp_path / "test.csv"
     df = pd.DataFrame({"question": ["Q1"], "answer": ["A1"]})
     df.to_csv(csv_path, index=False)
 
     # Mock no existing hashes (first load)
-    with patch.object(csv_loader.incremental_loader, "_load_existing_hashes", return_value={}):
-        with patch.object(csv_loader, "load_full", return_value=1) as mock_full:
-            result = csv_loader.load(csv_path)
+    with patch.object(csv_loader.incremental_loader, "_load_existing_hashes", return_value={}) as existing:
+        result = csv_loader.load(csv_path)
 
     assert result["mode"] == "full"
     assert result["documents"] == 1
-    mock_full.assert_called_once_with(csv_path)
+    existing.assert_called_once()
+    mock_vector_db.delete_stale.assert_called_once()
 
 
-def test_load_auto_incremental(csv_loader: CSVKnowledgeLoader, tmp_path: Path) -> None:
-    """Test auto-detection of incremental load."""
+def test_load_auto_incremental(csv_loader: CSVKnowledgeLoader, tmp_path: Path, mock_vector_db: MagicMock) -> None:
+    """Test auto-detection of incremental load (stored hashes are read once)."""
     csv_path = tmp_path / "test.csv"
     df = pd.DataFrame({"question": ["Q1"], "answer": ["A1"]})
     df.to_csv(csv_path, index=False)
+    stored = compute_row_hashes(df, ["question", "answer"])
 
     # Mock existing hashes (subsequent load)
-    with patch.object(csv_loader.incremental_loader, "_load_existing_hashes", return_value={0: "hash0"}):
-        with patch.object(
-            csv_loader, "load_incremental", return_value={"added": 0, "changed": 0, "deleted": 0}
-        ) as mock_inc:
-            result = csv_loader.load(csv_path)
-
-    assert result["mode"] == "incremental"
-    mock_inc.assert_called_once_with(csv_path)
+    with patch.object(csv_loader.incremental_loader, "_load_existing_hashes", return_value=stored) as existing:
+        result = csv_loader.load(csv_path)
+
+    assert result == {"mode": "incremental", "added": 0, "changed": 0, "deleted": 0}
+    existing.assert_called_once()
+    mock_vector_db.upsert.assert_not_called()
+
+
+def test_plan_reports_documents_to_embed(
+    csv_loader: CSVKnowledgeLoader, tmp_path: Path, mock_vector_db: MagicMock
+) -> None:
+    """A plan lists what would be embedded without writing; apply executes it."""
+    csv_path = tmp_path / "test.csv"
+    df = pd.DataFrame({"question": ["Q1", "Q2", "Q3"], "answer": ["A1", "A2", "A3"]})
+    df.to_csv(csv_path, index=False)
+    stored = compute_row_hashes(df, ["question", "answer"])
+    stored[1] = "old"
+    stored[7] = "gone"
+    del stored[2]
+
+    with patch.object(csv_loader.incremental_loader, "_load_existing_hashes", return_value=stored):
+        plan = csv_loader.plan(csv_path)
+
+    assert (plan.mode, plan.added, plan.changed, plan.deleted) == ("incremental", [2], [1], [7])
+    assert [doc.content for doc in plan.documents] == ["A3", "A2"]
+    assert plan.characters == 4
+    assert set(plan.timings) == {"parse", "hash", "diff", "prepare"}
+    mock_vector_db.upsert.assert_not_called()
+
+    csv_loader.write_batch_size = 1
+    progress = MagicMock()
+    stats = csv_loader.apply(plan, progress=progress)
+
+    assert stats == {"added": 1, "changed": 1, "deleted": 1}
+    assert mock_vector_db.upsert.call_count == 2
+    assert progress.call_count == 2
+    assert {"embed", "cleanup", "hashes"} <= set(plan.timings)
+
+
+def test_aload_writes_through_async_store(
+    csv_loader: CSVKnowledgeLoader, tmp_path: Path, mock_vector_db: MagicMock
+) -> None:
+    """aload() uses the store's async write and stale cleanup instead of the blocking ones."""
+    csv_path = tmp_path / "test.csv"
+    pd.DataFrame({"question": ["Q1", "Q2"], "answer": ["A1", "A2"]}).to_csv(csv_path, index=False)
+    mock_vector_db.async_write = AsyncMock()
+    mock_vector_db.async_delete_stale = AsyncMock()
+
+    with patch.object(csv_loader.incremental_loader, "_load_existing_hashes", return_value={}):
+        result = asyncio.run(csv_loader.aload(csv_path))
+
+    assert result == {"mode": "full", "documents": 2}
+    assert [d.name for d in mock_vector_db.async_write.await_args.args[1]] == ["csv_row_0", "csv_row_1"]
+    mock_vector_db.async_delete_stale.assert_awaited_once()
+    mock_vector_db.upsert.assert_not_called()
+    mock_vector_db.delete_stale.assert_not_called()
+
+
+def test_aload_incremental_falls_back_to_worker_pool(
+    csv_loader: CSVKnowledgeLoader, tmp_path: Path, mock_vector_db: MagicMock
+) -> None:
+    """Stores without async methods are written in the ingestion pool, off the event loop."""
+    csv_path = tmp_path / "test.csv"
+    df = pd.DataFrame({"question": ["Q1", "Q2"], "answer": ["A1", "A2"]})
+    df.to_csv(csv_path, index=False)
+    stored = compute_row_hashes(df, ["question", "answer"])
+    stored[1] = "old"
+    stored[9] = "gone"
+    caller = threading.get_ident()
+    writer_threads = []
+    mock_vector_db.upsert.side_effect = lambda **kwargs: writer_threads.append(threading.get_ident())
+
+    with patch.object(csv_loader.incremental_loader, "_load_existing_hashes", return_value=stored):
+        result = asyncio.run(csv_loader.aload_incremental(csv_path))
+
+    assert result == {"added": 0, "changed": 1, "deleted": 1}
+    assert writer_threads and caller not in writer_threads
+    deleted = {name for call in mock_vector_db.delete_by_names.call_args_list for name in call.args[0]}
+    assert deleted == {"csv_row_1", "csv_row_9"}
@@ -0,0 +1,128 @@
+"""Tests for near-duplicate clustering before embedding."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from hive.knowledge.config import ChunkingConfig, DedupConfig
+from hive.knowledge.csv_loader import CSVKnowledgeLoader
+from hive.knowledge.dedup import cluster_near_duplicates, lsh_bands, shingles
+
+BOILERPLATE = (
+    "Thank you for contacting support about the {product}. To reset the device, hold the power button for "
+    "ten seconds, wait until the light turns green, then reconnect it to the app and sign in again."
+)
+UNRELATED = "Refunds are issued to the original payment method within five business days of receiving the return."
+
+
+def _rows() -> pd.DataFrame:
+    """Three boilerplate answers differing in the product name, and one unrelated answer."""
+    return pd.DataFrame(
+        {
+            "answer": [
+                BOILERPLATE.format(product="Hive Cam"),
+                UNRELATED,
+                BOILERPLATE.format(product="Hive Doorbell"),
+                BOILERPLATE.format(product="Hive Hub"),
+            ],
+            "product": ["cam", "-", "doorbell", "hub"],
+            "region": ["eu", "eu", "eu", "us"],
+        }
+    )
+
+
+def test_clusters_near_identical_text() -> None:
+    """Rows differing in a word cluster under the lowest row id; groups never mix."""
+    texts = {i: str(text) for i, text in enumerate(_rows()["answer"])}
+
+    assert cluster_near_duplicates(texts) == {0: 0, 1: 1, 2: 0, 3: 0}
+    # Same text in different partitions stays apart
+    assert cluster_near_duplicates(texts, groups={0: "a", 1: "a", 2: "a", 3: "b"}) == {0: 0, 1: 1, 2: 0, 3: 3}
+    # Rows without words are never duplicates
+    assert cluster_near_duplicates({0: "", 1: "  "}) == {0: 0, 1: 1}
+
+    assert shingles("Hold the power button!", size=3) == shingles("hold THE power, button", size=3)
+    bands, rows = lsh_bands(128, 0.8)
+    assert bands * rows == 128 and (1 / bands) ** (1 / rows) <= 0.8
+
+
+def _loader(vector_db: MagicMock) -> CSVKnowledgeLoader:
+    """Loader clustering boilerplate answers."""
+    return CSVKnowledgeLoader(vector_db=vector_db, content_column="answer", dedup=DedupConfig(threshold=0.7))
+
+
+def test_full_load_embeds_one_document_per_cluster(tmp_path: Path) -> None:
+    """The representative's document lists the other rows and the metadata where they differ."""
+    vector_db = MagicMock(table_name="faq")
+    loader = _loader(vector_db)
+    csv_path = tmp_path / "faq.csv"
+    _rows().to_csv(csv_path, index=False)
+
+    with patch.object(loader.incremental_loader, "update_representatives") as update:
+        stats = loader.load_full(csv_path)
+
+    assert stats == 2
+    documents = vector_db.upsert.call_args.kwargs["documents"]
+    assert [doc.name for doc in documents] == ["csv_row_0", "csv_row_1"]
+    assert documents[0].meta_data["duplicate_rows"] == [2, 3]
+    assert documents[0].meta_data["duplicates"] == [
+        {"row_id": 2, "product": "doorbell"},
+        {"row_id": 3, "product": "hub", "region": "us"},
+    ]
+    assert "duplicates" not in documents[1].meta_data
+    update.assert_called_once()
+    assert update.call_args.args[0] == {0: 0, 1: 1, 2: 0, 3: 0}
+
+    with pytest.raises(ValueError, match="chunking"):
+        CSVKnowledgeLoader(vector_db=vector_db, dedup=DedupConfig(), chunking=ChunkingConfig())
+
+
+def test_incremental_load_rewrites_only_affected_clusters(tmp_path: Path) -> None:
+    """Edits inside a cluster rewrite its document; a removed representative hands over to the next row."""
+    vector_db = MagicMock(table_name="faq")
+    loader = _loader(vector_db)
+    df = _rows()
+    stored = {2: 0, 3: 0}
+
+    # Row 3 edited (still a duplicate): the cluster document is replaced, the unrelated row is untouched
+    df.loc[3, "region"] = "ca"
+    changes = {"dataframe": df, "current_hashes": dict.fromkeys(range(4), "h"), "added": [], "changed": [3]}
+    with (
+        patch.object(loader.incremental_loader, "detect_changes", return_value={**changes, "deleted": []}),
+        patch.object(loader.incremental_loader, "load_representatives", return_value=stored),
+        patch.object(loader.incremental_loader, "update_hashes"),
+        patch.object(loader.incremental_loader, "update_representatives"),
+    ):
+        stats = loader.load_incremental(tmp_path / "faq.csv")
+
+    assert stats == {"added": 0, "changed": 1, "deleted": 0, "embedded": 1}
+    [document] = vector_db.upsert.call_args.kwargs["documents"]
+    assert document.name == "csv_row_0" and document.meta_data["duplicates"][1]["region"] == "ca"
+    vector_db.delete_by_names.assert_called_once_with(["csv_row_0"])
+
+    # Representative row 0 deleted: row 2 represents the cluster now, row 0's document goes
+    vector_db.reset_mock()
+    df = df.drop(index=0)
+    changes = {"dataframe": df, "current_hashes": dict.fromkeys(range(1, 4), "h"), "added": [], "changed": []}
+    with (
+        patch.object(loader.incremental_loader, "detect_changes", return_value={**changes, "deleted": [0]}),
+        patch.object(loader.incremental_loader, "load_representatives", return_value=stored),
+        patch.object(loader.incremental_loader, "update_hashes"),
+        patch.object(loader.incremental_loader, "delete_hashes"),
+        patch.object(loader.incremental_loader, "update_representatives") as update,
+    ):
+        loader.load_incremental(tmp_path / "faq.csv")
+
+    [document] = vector_db.upsert.call_args.kwargs["documents"]
+    assert document.name == "csv_row_2" and document.meta_data["duplicate_rows"] == [3]
+    assert "csv_row_0" in [name for c in vector_db.delete_by_names.call_args_list for name in c.args[0]]
+    update.assert_called_once()
+    assert update.call_args.args[0] == {1: 1, 2: 2, 3: 2}
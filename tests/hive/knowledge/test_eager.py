@@ -0,0 +1,175 @@
+"""Tests for eager knowledge retrieval."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agno.agent import Agent
+from agno.knowledge import Knowledge
+from agno.knowledge.document import Document
+
+from hive.knowledge.eager import EagerRetrievalAgent, EagerRetrievalConfig, EagerRetriever, _current
+
+
+class _SlowKnowledge(Knowledge):
+    """Knowledge whose searches take a fixed time and are recorded."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__(name="faq", max_results=5)
+        self.delay = delay
+        self.calls: list[tuple[str, str, int]] = []
+        self.user_ids: list[str | None] = []
+
+    def search(self, query: str, max_results: int | None = None, filters=None, **kwargs) -> list[Document]:
+        self.calls.append(("sync", query, max_results))
+        self.user_ids.append(kwargs.get("user_id"))
+        time.sleep(self.delay)
+        return [Document(name="row_1", content=f"answer for {query}")]
+
+    async def asearch(self, query: str, max_results: int | None = None, filters=None, **kwargs) -> list[Document]:
+        self.calls.append(("async", query, max_results))
+        self.user_ids.append(kwargs.get("user_id"))
+        await asyncio.sleep(self.delay)
+        return [Document(name="row_1", content=f"answer for {query}")]
+
+
+def _building_prompt(agent: Agent, query: str):
+    """Stand-in for Agent.run: setup work, then the prompt's retriever call."""
+
+    def run(self, input, **kwargs):  # noqa: A002
+        time.sleep(0.2)
+        return agent.knowledge_retriever(query=query, num_documents=5)
+
+    return run
+
+
+def test_config_from_setting() -> None:
+    """The setting may be a boolean or a mapping."""
+    assert EagerRetrievalConfig.from_dict(False) is None
+    assert EagerRetrievalConfig.from_dict(True) == EagerRetrievalConfig()
+    assert EagerRetrievalConfig.from_dict({"num_documents": 3}).num_documents == 3
+
+
+def test_agent_enables_references() -> None:
+    """Eager retrieval puts knowledge in the first prompt via the retriever."""
+    agent = EagerRetrievalAgent(knowledge=_SlowKnowledge(), eager_retrieval=EagerRetrievalConfig())
+
+    assert agent.add_knowledge_to_context is True
+    assert agent.knowledge_retriever is agent.eager
+
+
+def test_retrieval_overlaps_run_setup() -> None:
+    """The search runs during setup, so the prompt gets results without waiting for a second search."""
+    kb = _SlowKnowledge(delay=0.2)
+    agent = EagerRetrievalAgent(knowledge=kb, eager_retrieval=EagerRetrievalConfig(num_documents=2))
+
+    start = time.perf_counter()
+    with patch.object(Agent, "run", _building_prompt(agent, "refunds?")):
+        references = agent.run("refunds?")
+    elapsed = time.perf_counter() - start
+
+    assert references == [{"name": "row_1", "content": "answer for refunds?", "meta_data": {}}]
+    assert kb.calls == [("sync", "refunds?", 2)]
+    assert elapsed < 0.35
+
+
+def test_other_queries_search_directly() -> None:
+    """A tool search with a rewritten query does not reuse the prefetch."""
+    kb = _SlowKnowledge()
+    agent = EagerRetrievalAgent(knowledge=kb, eager_retrieval=EagerRetrievalConfig())
+
+    with patch.object(Agent, "run", _building_prompt(agent, "refund policy")):
+        references = agent.run("refunds?")
+
+    assert references[0]["content"] == "answer for refund policy"
+    assert [call[1] for call in kb.calls] == ["refunds?", "refund policy"]
+
+
+def test_async_run_uses_async_search() -> None:
+    """arun prefetches with asearch and the retriever result is awaitable."""
+    kb = _SlowKnowledge(delay=0.05)
+    agent = EagerRetrievalAgent(knowledge=kb, eager_retrieval=EagerRetrievalConfig())
+
+    async def arun(self, input, **kwargs):  # noqa: A002
+        return await agent.knowledge_retriever(query=input, num_documents=5)
+
+    with patch.object(Agent, "arun", arun):
+        references = asyncio.run(agent.arun("refunds?"))
+
+    assert references[0]["content"] == "answer for refunds?"
+    assert kb.calls == [("async", "refunds?", 5)]
+
+
+def test_timeout_answers_without_references() -> None:
+    """A search slower than the timeout is skipped rather than delaying the answer."""
+    kb = _SlowKnowledge(delay=0.5)
+    agent = EagerRetrievalAgent(knowledge=kb, eager_retrieval=EagerRetrievalConfig(timeout=0.05))
+
+    with patch.object(Agent, "run", lambda self, message, **kwargs: agent.knowledge_retriever(query=message)):
+        assert agent.run("refunds?") is None
+    agent.eager.close()
+
+
+def test_retriever_without_run_searches() -> None:
+    """Outside an eager run the retriever is a plain knowledge search."""
+    kb = _SlowKnowledge()
+
+    references = EagerRetriever(kb)(query="refunds?", num_documents=1)
+
+    assert references == [{"name": "row_1", "content": "answer for refunds?", "meta_data": {}}]
+
+
+def test_prefetch_keeps_the_owner_scope() -> None:
+    """The prefetch searches as the run's user and only answers retriever calls for that user."""
+    kb = _SlowKnowledge()
+    agent = EagerRetrievalAgent(knowledge=kb, eager_retrieval=EagerRetrievalConfig(), user_id="default")
+
+    def run(self, input, **kwargs):  # noqa: A002
+        return [agent.knowledge_retriever(query=input, user_id=user) for user in ("bob", "alice")]
+
+    with patch.object(Agent, "run", run):
+        agent.run("refunds?", user_id="alice")
+    assert kb.user_ids == ["alice", "bob"]
+
+    async def arun(self, input, **kwargs):  # noqa: A002
+        return await agent.knowledge_retriever(query=input, user_id="default")
+
+    with patch.object(Agent, "arun", arun):
+        asyncio.run(agent.arun("refunds?"))
+    assert kb.user_ids[2:] == ["default"]
+
+
+def _stream_current(self, input, **kwargs):  # noqa: A002
+    """Streaming Agent.run stand-in yielding the prefetch it sees."""
+    yield _current.get()
+
+
+async def _astream_current(self, input, **kwargs):  # noqa: A002
+    """Streaming Agent.arun stand-in yielding the prefetch it sees."""
+    yield _current.get()
+
+
+def test_streaming_run_restores_the_enclosing_prefetch() -> None:
+    """A nested streaming run puts back the prefetch of the run around it."""
+    agent = EagerRetrievalAgent(knowledge=_SlowKnowledge(), eager_retrieval=EagerRetrievalConfig())
+
+    async def consume() -> list:
+        return [event async for event in agent.arun("inner", stream=True)]
+
+    outer = agent.eager.start("outer")
+    token = _current.set(outer)
+    try:
+        with patch.object(Agent, "run", _stream_current), patch.object(Agent, "arun", _astream_current):
+            [inner] = list(agent.run("inner", stream=True))
+            [ainner] = asyncio.run(consume())
+            assert _current.get() is outer
+    finally:
+        _current.reset(token)
+    assert inner.query == ainner.query == "inner"
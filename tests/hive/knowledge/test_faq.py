@@ -0,0 +1,187 @@
+"""Tests for the FAQ short-circuit."""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agno.agent import Agent
+from agno.knowledge.document import Document
+from agno.run.agent import RunCompletedEvent, RunContentEvent
+
+from hive.knowledge.faq import FAQAgent, FAQConfig, FAQShortCircuit, FAQStats, get_faq_stats
+
+
+def _knowledge(score: float, answer: str | None = "Click 'Forgot password'.") -> MagicMock:
+    """Knowledge mock whose top hit has the given score."""
+    meta = {"similarity_score": score, "category": "account"}
+    if answer is not None:
+        meta["answer"] = answer
+    docs = [Document(name="csv_row_3", content="How do I reset my password?", meta_data=meta)]
+    kb = MagicMock()
+    kb.search.return_value = docs
+    kb.asearch = AsyncMock(return_value=docs)
+    return kb
+
+
+def test_faq_config_from_dict() -> None:
+    """YAML keys map onto the config; thresholds outside (0, 1] are rejected."""
+    config = FAQConfig.from_dict({"threshold": 0.95, "answer_column": "reply", "template": "{reply}"})
+
+    assert config == FAQConfig(threshold=0.95, answer_column="reply", template="{reply}")
+    assert FAQConfig.from_dict(None) == FAQConfig()
+    with pytest.raises(ValueError):
+        FAQConfig(threshold=0)
+
+
+def test_match_above_threshold() -> None:
+    """A confident hit with an answer column short-circuits."""
+    faq = FAQShortCircuit(_knowledge(0.95), FAQConfig(threshold=0.9), content_column="question", agent_name="t1")
+
+    hit = faq.match("how do i reset my password")
+
+    assert hit is not None
+    assert hit.answer == "Click 'Forgot password'."
+    assert hit.score == 0.95
+
+
+@pytest.mark.parametrize(("score", "answer"), [(0.5, "yes"), (0.95, None), (0.95, "  ")])
+def test_match_misses(score: float, answer: str | None) -> None:
+    """Low scores and rows without an answer fall through to the model."""
+    faq = FAQShortCircuit(_knowledge(score, answer), FAQConfig(threshold=0.9), agent_name="t2")
+
+    assert faq.match("reset password") is None
+
+
+def test_answer_from_content_column() -> None:
+    """When the answer column is the content column, the document content is the answer."""
+    faq = FAQShortCircuit(_knowledge(0.95), FAQConfig(answer_column="question"), content_column="question")
+
+    assert faq.match("reset").answer == "How do I reset my password?"
+
+
+def test_template_uses_row_columns() -> None:
+    """Templates can reference the answer, the content column and metadata."""
+    config = FAQConfig(template="{answer} [{category}] Q: {question}")
+    faq = FAQShortCircuit(_knowledge(0.95), config, content_column="question")
+
+    assert faq.match("reset").answer == "Click 'Forgot password'. [account] Q: How do I reset my password?"
+
+
+def test_failed_lookup_is_a_miss() -> None:
+    """Search errors never fail the run."""
+    kb = MagicMock()
+    kb.search.side_effect = RuntimeError("db down")
+
+    assert FAQShortCircuit(kb).match("reset") is None
+
+
+def test_stats_track_hit_rate_and_saved_latency() -> None:
+    """Hits save the average model-run latency minus the lookup time."""
+    stats = FAQStats()
+    stats.record_model_run(1000.0)
+    stats.record_lookup(10.0, hit=True)
+    stats.record_lookup(10.0, hit=False)
+
+    report = stats.to_dict()
+    assert report["hit_rate"] == 0.5
+    assert report["saved_ms"] == pytest.approx(990.0)
+    assert report["lookup_ms"] == pytest.approx(20.0)
+
+
+def test_agent_run_short_circuits() -> None:
+    """A hit returns a completed run without calling the model."""
+    agent = FAQAgent(name="faq-bot-sync", knowledge=_knowledge(0.97), faq=FAQConfig(threshold=0.9))
+
+    with patch.object(Agent, "run") as model_run:
+        output = agent.run("How do I reset my password?")
+
+    model_run.assert_not_called()
+    assert output.content == "Click 'Forgot password'."
+    assert output.metadata["faq_short_circuit"]["document"] == "csv_row_3"
+    assert get_faq_stats("faq-bot-sync")["faq-bot-sync"]["hits"] == 1
+
+
+def test_agent_run_miss_calls_model() -> None:
+    """A miss runs the agent normally and feeds the latency average."""
+    agent = FAQAgent(name="faq-bot-miss", knowledge=_knowledge(0.2), faq=FAQConfig(threshold=0.9))
+
+    with patch.object(Agent, "run", return_value="model answer") as model_run:
+        assert agent.run("Something else") == "model answer"
+
+    model_run.assert_called_once()
+    assert agent.faq.stats.model_runs == 1
+
+
+def test_agent_stream_miss_times_the_model_stream() -> None:
+    """Streaming misses feed the latency average once the model stream is exhausted."""
+    agent = FAQAgent(name="faq-bot-stream-miss", knowledge=_knowledge(0.2), faq=FAQConfig())
+
+    async def model_stream(self, input, **kwargs):  # noqa: A002
+        yield "async chunk"
+
+    with patch.object(Agent, "run", return_value=iter(["chunk"])):
+        events = agent.run("Something else", stream=True)
+        assert agent.faq.stats.model_runs == 0
+        assert list(events) == ["chunk"]
+    assert agent.faq.stats.model_runs == 1
+
+    async def consume() -> list:
+        return [event async for event in agent.arun("Something else", stream=True)]
+
+    with patch.object(Agent, "arun", model_stream):
+        assert asyncio.run(consume()) == ["async chunk"]
+    assert agent.faq.stats.model_runs == 2
+
+
+def test_agent_stream_short_circuits() -> None:
+    """Streaming runs get content and completed events."""
+    agent = FAQAgent(name="faq-bot-stream", knowledge=_knowledge(0.97), faq=FAQConfig())
+
+    events = list(agent.run("reset password", stream=True))
+
+    assert isinstance(events[0], RunContentEvent)
+    assert isinstance(events[-1], RunCompletedEvent)
+    assert events[0].content == "Click 'Forgot password'."
+
+
+def test_agent_arun_short_circuits() -> None:
+    """Async runs use the async search path."""
+    kb = _knowledge(0.97)
+    agent = FAQAgent(name="faq-bot-async", knowledge=kb, faq=FAQConfig())
+
+    output = asyncio.run(agent.arun("reset password"))
+
+    kb.asearch.assert_awaited_once()
+    assert output.content == "Click 'Forgot password'."
+
+
+def test_lookup_uses_the_run_scope() -> None:
+    """The lookup searches with the run's filters and owner, falling back to the agent's."""
+    kb = _knowledge(0.97)
+    agent = FAQAgent(
+        name="faq-bot-scoped", knowledge=kb, faq=FAQConfig(), knowledge_filters={"region": "eu"}, user_id="default"
+    )
+
+    agent.run("reset password", user_id="alice", knowledge_filters={"region": "us"})
+    kb.search.assert_called_once_with(query="reset password", max_results=1, filters={"region": "us"}, user_id="alice")
+    asyncio.run(agent.arun("reset password"))
+    kb.asearch.assert_awaited_once_with(
+        query="reset password", max_results=1, filters={"region": "eu"}, user_id="default"
+    )
+
+
+def test_agent_without_faq_is_plain_agent() -> None:
+    """Without an FAQ config the run is delegated unchanged."""
+    agent = FAQAgent(name="plain", knowledge=_knowledge(0.99))
+
+    with patch.object(Agent, "run", return_value="model answer"):
+        assert agent.run("reset password") == "model answer"
+    assert agent.faq is None
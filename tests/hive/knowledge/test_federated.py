@@ -0,0 +1,111 @@
+"""Tests for federated knowledge search."""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agno.knowledge.document import Document
+
+from hive.knowledge.federated import RRF_SCORE_KEY, SOURCE_KEY, FederatedKnowledge, reciprocal_rank_fusion
+
+
+def _docs(*names: str) -> list[Document]:
+    """Documents whose content equals their name."""
+    return [Document(name=name, content=name) for name in names]
+
+
+def _source(names: list[str], delay: float = 0.0) -> MagicMock:
+    """Knowledge mock returning fixed results after an optional delay."""
+    source = MagicMock()
+
+    def search(**kwargs):
+        time.sleep(delay)
+        return _docs(*names)
+
+    async def asearch(**kwargs):
+        await asyncio.sleep(delay)
+        return _docs(*names)
+
+    source.search.side_effect = search
+    source.asearch = AsyncMock(side_effect=asearch)
+    return source
+
+
+def test_rrf_rewards_agreement() -> None:
+    """A document ranked by two sources beats single-source top hits."""
+    fused = reciprocal_rank_fusion({"faq": _docs("a", "shared"), "specs": _docs("b", "shared")})
+
+    assert fused[0].name == "shared"
+    assert fused[0].meta_data[SOURCE_KEY] == ["faq", "specs"]
+    assert fused[1].meta_data[SOURCE_KEY] in ("faq", "specs")
+    assert fused[0].meta_data[RRF_SCORE_KEY] == pytest.approx(2 / 62)
+
+
+def test_rrf_weights() -> None:
+    """Source weights scale each source's contribution."""
+    fused = reciprocal_rank_fusion({"faq": _docs("a"), "specs": _docs("b")}, weights={"specs": 2.0})
+
+    assert [d.name for d in fused] == ["b", "a"]
+
+
+def test_search_runs_sources_concurrently() -> None:
+    """Total latency is close to the slowest source, not the sum."""
+    kb = FederatedKnowledge({"faq": _source(["a"], 0.2), "specs": _source(["b"], 0.2)}, max_results=5)
+
+    start = time.perf_counter()
+    results = kb.search("refund")
+    elapsed = time.perf_counter() - start
+
+    assert {d.name for d in results} == {"a", "b"}
+    assert elapsed < 0.35
+    kb.close()
+
+
+def test_search_skips_sources_over_budget() -> None:
+    """Sources that miss the time budget are dropped from the results."""
+    release = threading.Event()
+    slow = MagicMock()
+    slow.search.side_effect = lambda **kwargs: release.wait(1) and _docs("late")
+    kb = FederatedKnowledge({"fast": _source(["a"]), "slow": slow}, time_budget=0.1)
+
+    results = kb.search("refund")
+    release.set()
+
+    assert [d.name for d in results] == ["a"]
+    kb.close()
+
+
+def test_search_tolerates_failing_source() -> None:
+    """A failing source does not fail the federated search."""
+    broken = MagicMock()
+    broken.search.side_effect = RuntimeError("db down")
+    kb = FederatedKnowledge([_source(["a"]), broken])
+
+    assert [d.name for d in kb.search("refund")] == ["a"]
+    kb.close()
+
+
+def test_asearch_cancels_late_sources() -> None:
+    """Async search applies the same budget and fuses what finished."""
+    kb = FederatedKnowledge({"fast": _source(["a"]), "slow": _source(["b"], 1.0)}, time_budget=0.1)
+
+    results = asyncio.run(kb.asearch("refund", max_results=3))
+
+    assert [d.name for d in results] == ["a"]
+    kb.close()
+
+
+def test_requires_sources() -> None:
+    """An empty federation is a configuration error."""
+    with pytest.raises(ValueError, match="at least one source"):
+        FederatedKnowledge({})
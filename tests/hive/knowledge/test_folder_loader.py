@@ -0,0 +1,178 @@
+"""Tests for the document-folder loader."""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from hive.knowledge.config import ChunkingConfig
+from hive.knowledge.folder_loader import DocumentFolderLoader, FileFingerprint, read_document
+
+PARAGRAPHS = [
+    "Refunds are issued within five business days of receiving the return. " * 3,
+    "Gift cards cannot be exchanged for cash and do not expire. " * 3,
+]
+
+
+class _MemoryFolderLoader(DocumentFolderLoader):
+    """Folder loader that keeps fingerprints in memory instead of Postgres."""
+
+    def __init__(self, vector_db: MagicMock) -> None:
+        super().__init__(vector_db, chunking=ChunkingConfig(size=250, overlap=0), max_workers=2, batch_size=2)
+        self.fingerprints: dict[str, FileFingerprint] = {}
+        self.chunks: dict[str, set[str]] = {}
+
+    def _ensure_tables(self) -> None:
+        pass
+
+    def _reset(self) -> None:
+        self.fingerprints.clear()
+        self.chunks.clear()
+
+    def _load_fingerprints(self) -> dict[str, FileFingerprint]:
+        return dict(self.fingerprints)
+
+    def _load_chunk_hashes(self, paths: list[str]) -> dict[str, set[str]]:
+        return {path: set(self.chunks[path]) for path in paths if path in self.chunks}
+
+    def _save(self, fingerprints: dict[str, FileFingerprint], chunk_hashes: dict[str, list[str]]) -> None:
+        self.fingerprints.update(fingerprints)
+        self.chunks.update({path: set(hashes) for path, hashes in chunk_hashes.items()})
+
+    def _forget(self, paths: list[str]) -> None:
+        for path in paths:
+            self.fingerprints.pop(path, None)
+            self.chunks.pop(path, None)
+
+
+@pytest.fixture
+def vector_db() -> MagicMock:
+    """Create a mock vector store."""
+    db = MagicMock()
+    db.table_name = "docs"
+    return db
+
+
+@pytest.fixture
+def folder(tmp_path: Path) -> Path:
+    """Document folder with a Markdown guide, a text note and an ignored file."""
+    root = tmp_path / "documents"
+    (root / "guides").mkdir(parents=True)
+    (root / "guides" / "returns.md").write_text("# Returns policy\n\n" + "\n\n".join(PARAGRAPHS))
+    (root / "notes.txt").write_text("Store opens at nine.")
+    (root / "image.png").write_bytes(b"\x89PNG")
+    (root / ".draft.md").write_text("hidden")
+    return root
+
+
+def _written(vector_db: MagicMock) -> list:
+    """Documents passed to every upsert call."""
+    return [doc for call in vector_db.upsert.call_args_list for doc in call.kwargs["documents"]]
+
+
+def test_scan_lists_document_files(folder: Path, vector_db: MagicMock) -> None:
+    """Only supported, non-hidden files are listed, by relative POSIX path."""
+    assert sorted(_MemoryFolderLoader(vector_db).scan(folder)) == ["guides/returns.md", "notes.txt"]
+
+
+def test_full_load_chunks_files_in_batches(folder: Path, vector_db: MagicMock) -> None:
+    """Every chunk is written with file metadata, then older documents are removed."""
+    loader = _MemoryFolderLoader(vector_db)
+
+    stats = loader.load(folder)
+
+    docs = _written(vector_db)
+    assert stats == {"mode": "full", "documents": 3}
+    assert {doc.meta_data["path"] for doc in docs} == {"guides/returns.md", "notes.txt"}
+    assert {doc.meta_data["title"] for doc in docs} == {"Returns policy", "notes"}
+    assert all(doc.id == doc.name and doc.name.startswith("doc_") for doc in docs)
+    assert vector_db.upsert.call_count == 2  # batch_size=2
+    content_hashes = {call.kwargs["content_hash"] for call in vector_db.upsert.call_args_list}
+    assert set(vector_db.delete_stale.call_args.args) == content_hashes
+
+
+def test_adding_a_file_ingests_only_that_file(folder: Path, vector_db: MagicMock) -> None:
+    """Unchanged files are skipped by size and mtime; the new file is the only one embedded."""
+    loader = _MemoryFolderLoader(vector_db)
+    loader.load(folder)
+    vector_db.reset_mock()
+
+    (folder / "guides" / "shipping.md").write_text("Orders ship on weekdays.")
+    stats = loader.load(folder)
+
+    assert stats == {"mode": "incremental", "added": 1, "changed": 0, "deleted": 0, "embedded": 1, "failed": 0}
+    assert [doc.meta_data["path"] for doc in _written(vector_db)] == ["guides/shipping.md"]
+    vector_db.delete_by_names.assert_not_called()
+
+
+def test_editing_a_file_reembeds_changed_chunks(folder: Path, vector_db: MagicMock) -> None:
+    """An edit embeds the changed paragraph's chunk and deletes its old chunk."""
+    loader = _MemoryFolderLoader(vector_db)
+    loader.load(folder)
+    vector_db.reset_mock()
+
+    edited = PARAGRAPHS[1].replace("do not expire", "expire after a year")
+    (folder / "guides" / "returns.md").write_text("# Returns policy\n\n" + PARAGRAPHS[0] + "\n\n" + edited)
+    stats = loader.load(folder)
+
+    assert (stats["changed"], stats["embedded"]) == (1, 1)
+    assert [doc.content for doc in _written(vector_db)] == [edited.strip()]
+    assert len(vector_db.delete_by_names.call_args.args[0]) == 1
+
+
+def test_touched_file_is_not_reparsed(folder: Path, vector_db: MagicMock) -> None:
+    """A new mtime with identical bytes only refreshes the fingerprint."""
+    loader = _MemoryFolderLoader(vector_db)
+    loader.load(folder)
+    vector_db.reset_mock()
+
+    note = folder / "notes.txt"
+    stat = note.stat()
+    os.utime(note, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    stats = loader.load(folder)
+
+    assert (stats["changed"], stats["embedded"]) == (0, 0)
+    vector_db.upsert.assert_not_called()
+    assert loader.fingerprints["notes.txt"].mtime_ns == note.stat().st_mtime_ns
+
+
+def test_deleted_file_removes_its_chunks(folder: Path, vector_db: MagicMock) -> None:
+    """Chunks of a removed file are deleted by name and its fingerprints forgotten."""
+    loader = _MemoryFolderLoader(vector_db)
+    loader.load(folder)
+    chunks = set(loader.chunks["guides/returns.md"])
+    vector_db.reset_mock()
+
+    (folder / "guides" / "returns.md").unlink()
+    stats = loader.load(folder)
+
+    assert stats["deleted"] == 1
+    names = set(vector_db.delete_by_names.call_args.args[0])
+    assert names == {f"doc_guides/returns.md_chunk_{h[:12]}" for h in chunks}
+    assert "guides/returns.md" not in loader.fingerprints
+
+
+def test_parse_failure_keeps_file_pending(folder: Path, vector_db: MagicMock) -> None:
+    """A file that cannot be parsed is reported and retried on the next load."""
+    (folder / "broken.pdf").write_bytes(b"not a pdf")
+    loader = _MemoryFolderLoader(vector_db)
+
+    loader.load(folder)
+
+    assert "broken.pdf" not in loader.fingerprints
+    assert "notes.txt" in loader.fingerprints
+
+
+def test_read_document_decodes_text(tmp_path: Path) -> None:
+    """Text files are decoded as UTF-8, replacing invalid bytes."""
+    path = tmp_path / "note.txt"
+    path.write_bytes("café \xff".encode("latin-1"))
+
+    assert read_document(path).startswith("caf")
@@ -12,7 +12,7 @@ project_root = Path(__file__).parent.parent.parent.parent.absolute()
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from hive.knowledge.incremental import IncrementalCSVLoader
+from hive.knowledge.incremental import ChangeSet, IncrementalCSVLoader
 
 
 @pytest.fixture
@@ -137,3 +137,122 @@ def test_delete_hashes_empty_list(incremental_loader: IncrementalCSVLoader, mock
     # Should not execute anything
     mock_session.execute.assert_not_called()
     mock_session.commit.assert_not_called()
+
+
+def test_chunk_hash_includes_metadata(incremental_loader: IncrementalCSVLoader) -> None:
+    """Chunk hashes change with the chunk text and with the row metadata stored alongside it."""
+    base = incremental_loader.compute_chunk_hash("Refunds take five days.", {"row_id": 0, "category": "billing"})
+
+    assert base == incremental_loader.compute_chunk_hash(
+        "Refunds take five days.", {"category": "billing", "row_id": 0}
+    )
+    assert base != incremental_loader.compute_chunk_hash("Refunds take six days.", {"row_id": 0, "category": "billing"})
+    assert base != incremental_loader.compute_chunk_hash("Refunds take five days.", {"row_id": 0, "category": "shop"})
+
+
+def test_update_chunk_hashes_replaces_rows(incremental_loader: IncrementalCSVLoader, mock_vector_db: MagicMock) -> None:
+    """The rows' old chunk hashes are deleted and the new ones inserted in one statement."""
+    mock_session = MagicMock()
+    mock_vector_db.Session.return_value.__enter__.return_value = mock_session
+
+    incremental_loader.update_chunk_hashes({0: ["a", "b"], 1: ["c"]})
+
+    delete_call, insert_call = mock_session.execute.call_args_list
+    assert delete_call.args[1] == {"row_ids": [0, 1]}
+    assert [row["hash"] for row in insert_call.args[1]] == ["a", "b", "c"]
+    mock_session.commit.assert_called_once()
+
+
+def test_record_changes_appends_one_version(
+    incremental_loader: IncrementalCSVLoader, mock_vector_db: MagicMock
+) -> None:
+    """A load's changes are inserted under one new version; loads without changes are not logged."""
+    mock_session = MagicMock()
+    mock_session.execute.return_value.scalar_one.return_value = 7
+    mock_vector_db.Session.return_value.__enter__.return_value = mock_session
+
+    version = incremental_loader.record_changes("incremental", [3], [1], [2], {1: "h1", 3: "h3", 4: "h4"})
+
+    assert version == 7
+    entries = mock_session.execute.call_args_list[-1].args[1]
+    assert entries == [
+        {"version": 7, "op": "added", "row_id": 3, "hash": "h3"},
+        {"version": 7, "op": "changed", "row_id": 1, "hash": "h1"},
+        {"version": 7, "op": "deleted", "row_id": 2, "hash": None},
+    ]
+    mock_session.commit.assert_called_once()
+    assert incremental_loader.record_changes("incremental", [], [], [], {}) is None
+
+
+def test_full_load_logs_reset_and_prunes(incremental_loader: IncrementalCSVLoader, mock_vector_db: MagicMock) -> None:
+    """A full load drops the entries it supersedes and logs a reset followed by every row."""
+    mock_session = MagicMock()
+    mock_session.execute.return_value.scalar_one.return_value = 4
+    mock_vector_db.Session.return_value.__enter__.return_value = mock_session
+
+    incremental_loader.record_changes("full", [0, 1], [], [], {0: "h0", 1: "h1"})
+
+    statements = [str(call.args[0]) for call in mock_session.execute.call_args_list]
+    assert any("DELETE FROM test_knowledge_changes WHERE version < :version" in s for s in statements)
+    entries = mock_session.execute.call_args_list[-1].args[1]
+    assert [(e["op"], e["row_id"]) for e in entries] == [("reset", None), ("added", 0), ("added", 1)]
+
+
+def test_store_load_is_one_transaction(incremental_loader: IncrementalCSVLoader, mock_vector_db: MagicMock) -> None:
+    """Hashes, clusters and the change-log entry commit together; versions are allocated under a lock."""
+    mock_session = MagicMock()
+    mock_session.execute.return_value.scalar_one.return_value = 9
+    mock_vector_db.Session.return_value.__enter__.return_value = mock_session
+
+    version = incremental_loader.store_load("incremental", {1: "h1"}, [], [1], [], representatives={1: 1})
+
+    assert version == 9
+    mock_vector_db.Session.assert_called_once()
+    mock_session.commit.assert_called_once()
+    statements = [str(call.args[0]) for call in mock_session.execute.call_args_list]
+    lock = statements.index("SELECT pg_advisory_xact_lock(:key)")
+    assert lock < next(i for i, s in enumerate(statements) if "nextval" in s)
+    assert statements.index(next(s for s in statements if "test_knowledge_hashes" in s)) < lock
+
+
+def test_change_set_collapses_entries() -> None:
+    """Each row appears once under its net operation; a reset discards earlier entries."""
+    entries = [
+        (2, "added", 5, "a"),
+        (2, "changed", 1, "b"),
+        (3, "changed", 5, "a2"),
+        (3, "deleted", 1, None),
+        (4, "changed", 8, "c"),
+    ]
+    changes = ChangeSet.from_entries(1, entries)
+    assert (changes.since, changes.version, changes.reset) == (1, 4, False)
+    assert changes.added == {5: "a2"}
+    assert changes.changed == {8: "c"}
+    assert changes.deleted == [1]
+
+    reset = ChangeSet.from_entries(1, [(2, "changed", 1, "b"), (3, "reset", None, None), (3, "added", 0, "z")])
+    assert reset.reset and reset.added == {0: "z"} and not reset.changed
+
+    assert ChangeSet.from_entries(9, []).is_empty
+    assert ChangeSet.from_entries(9, []).version == 9
+
+
+def test_changes_since_reads_after_version(incremental_loader: IncrementalCSVLoader, mock_vector_db: MagicMock) -> None:
+    """The catch-up query reads entries above the given version, optionally a page of versions."""
+    mock_session = MagicMock()
+    mock_session.execute.return_value = [(6, "added", 2, "h2")]
+    mock_vector_db.Session.return_value.__enter__.return_value = mock_session
+
+    changes = incremental_loader.changes_since(5, limit=10)
+
+    query, params = mock_session.execute.call_args.args
+    assert "version > :since" in str(query) and "LIMIT :limit" in str(query)
+    assert params == {"since": 5, "limit": 10}
+    assert changes.to_dict() == {
+        "since": 5,
+        "version": 6,
+        "reset": False,
+        "added": {2: "h2"},
+        "changed": {},
+        "deleted": [],
+    }
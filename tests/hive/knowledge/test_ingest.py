@@ -0,0 +1,69 @@
+"""Tests for ingestion estimates."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agno.knowledge.document import Document
+
+from hive.knowledge.csv_loader import IngestPlan
+from hive.knowledge.ingest import DEFAULT_CHARACTERS_PER_SECOND, estimate_plan, format_duration
+
+
+def _plan(contents: list[str]) -> IngestPlan:
+    """Incremental plan embedding one document per content string."""
+    return IngestPlan(
+        mode="incremental",
+        dataframe=pd.DataFrame(),
+        hashes={},
+        added=list(range(len(contents))),
+        changed=[],
+        deleted=[],
+        documents=[Document(name=f"csv_row_{i}", content=content) for i, content in enumerate(contents)],
+        stale=[],
+    )
+
+
+def test_estimate_uses_measured_throughput() -> None:
+    """Time follows the recorded throughput; cost the embedder's list price."""
+    plan = _plan(["a" * 4000, "b" * 6000])
+
+    estimate = estimate_plan(plan, "text-embedding-3-small", throughput=1000.0)
+
+    assert (estimate.documents, estimate.characters) == (2, 10_000)
+    assert estimate.tokens > 0
+    assert estimate.seconds == 10.0
+    assert estimate.measured
+    assert estimate.cost == estimate.tokens * 0.02 / 1_000_000
+
+
+def test_estimate_defaults_without_runs_or_price() -> None:
+    """Before the first run the default throughput is used; unknown embedders have no cost."""
+    estimate = estimate_plan(_plan(["x" * 100]), "custom-embedder")
+
+    assert estimate.seconds == 100 / DEFAULT_CHARACTERS_PER_SECOND
+    assert not estimate.measured
+    assert estimate.cost is None
+
+
+def test_noop_plan() -> None:
+    """An incremental plan without row changes does nothing."""
+    plan = _plan([])
+    plan.added = []
+
+    assert plan.is_noop
+    assert estimate_plan(plan, "text-embedding-3-small").tokens == 0
+
+
+def test_format_duration() -> None:
+    """Durations are shown at a readable resolution."""
+    assert format_duration(0.2) == "<1s"
+    assert format_duration(42) == "42s"
+    assert format_duration(200) == "3m 20s"
+    assert format_duration(3900) == "1h 05m"
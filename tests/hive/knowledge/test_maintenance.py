@@ -0,0 +1,136 @@
+"""Tests for scheduled knowledge table maintenance."""
+
+import sys
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from hive.knowledge.config import MaintenanceConfig, knowledge_kwargs
+from hive.knowledge.maintenance import (
+    IndexMaintainer,
+    MaintenanceScheduler,
+    TableHealth,
+    in_window,
+    knowledge_tables,
+    parse_window,
+)
+
+
+def _store(table_name: str) -> MagicMock:
+    """Plain PgVector store stub."""
+    store = MagicMock(spec=["table_name", "schema", "Session", "db_engine"])
+    store.table_name = table_name
+    store.schema = "ai"
+    return store
+
+
+def test_window_and_config() -> None:
+    """Windows are local HH:MM ranges that may wrap midnight; bad windows fail at config time."""
+    assert parse_window("02:00-05:00") == (datetime(2024, 1, 1, 2).time(), datetime(2024, 1, 1, 5).time())
+    assert in_window("02:00-05:00", datetime(2024, 1, 1, 3, 30))
+    assert not in_window("02:00-05:00", datetime(2024, 1, 1, 5, 0))
+    assert in_window("22:00-04:00", datetime(2024, 1, 1, 23, 0))
+    assert in_window("22:00-04:00", datetime(2024, 1, 1, 1, 0))
+    assert not in_window("22:00-04:00", datetime(2024, 1, 1, 12, 0))
+    assert in_window(None)
+
+    with pytest.raises(ValueError, match="maintenance window"):
+        MaintenanceConfig(window="2am-5am")
+    assert MaintenanceConfig.from_dict(None) is None
+    assert MaintenanceConfig.from_dict(True) == MaintenanceConfig()
+    kwargs = knowledge_kwargs({"type": "csv", "source": "faq.csv", "maintenance": {"window": None, "prewarm": True}})
+    assert kwargs["maintenance"].window is None and kwargs["maintenance"].prewarm
+
+
+def test_due_actions_follow_thresholds() -> None:
+    """Dead or unanalyzed rows call for VACUUM ANALYZE; churn since the last rebuild calls for REINDEX."""
+    healthy = TableHealth(table="kb", live_rows=1000, dead_rows=20, churn_since_reindex=100, table_bytes=1000)
+    assert healthy.due(0.1, 0.5) == []
+
+    bloated = TableHealth(table="kb", live_rows=800, dead_rows=200, churn_since_reindex=600, table_bytes=1000)
+    assert bloated.due(0.1, 0.5) == ["vacuum", "reindex"]
+    assert bloated.bloat_bytes == 200
+    assert bloated.to_dict()["churn_ratio"] == 0.75
+
+    unanalyzed = TableHealth(table="kb", live_rows=1000, modified_since_analyze=150)
+    assert unanalyzed.due(0.1, 0.5) == ["vacuum"]
+    assert TableHealth(table="empty").due(0.1, 0.5) == []
+
+
+def test_health_counts_churn_since_last_rebuild() -> None:
+    """Churn is the update/delete counter minus the baseline stored at the last rebuild."""
+    store = _store("kb")
+    sess = store.Session.return_value.__enter__.return_value
+    stats = MagicMock(
+        n_live_tup=1000, n_dead_tup=50, n_mod_since_analyze=10, churn=900, vacuumed=None, analyzed=None, size=8192
+    )
+    rebuilt = datetime(2024, 5, 1, 3, 0)
+    sess.execute.side_effect = [
+        MagicMock(first=MagicMock(return_value=stats)),
+        [("kb_embedding_idx", 4096), ("kb_pkey", 1024)],
+        MagicMock(first=MagicMock(return_value=(700, rebuilt))),
+    ]
+
+    health = IndexMaintainer(store).health()
+
+    assert health.churn_since_reindex == 200
+    assert health.index_bytes == {"kb_embedding_idx": 4096, "kb_pkey": 1024}
+    assert health.last_reindex == rebuilt
+
+    # A statistics reset restarts the counter below the baseline
+    stats.churn = 300
+    sess.execute.side_effect = [
+        MagicMock(first=MagicMock(return_value=stats)),
+        [],
+        MagicMock(first=MagicMock(return_value=(700, rebuilt))),
+    ]
+    assert IndexMaintainer(store).health().churn_since_reindex == 300
+
+
+def test_scheduler_maintains_in_window_under_lock() -> None:
+    """Checks do nothing outside the window, and skip tables another process is maintaining."""
+    partitioned = MagicMock(spec=["table_name", "partitions"])
+    partitioned.table_name = "kb"
+    partitioned.partitions.return_value = {"billing": _store("kb_p_billing"), "shipping": _store("kb_p_shipping")}
+    assert [s.table_name for s in knowledge_tables(partitioned)] == ["kb_p_billing", "kb_p_shipping"]
+
+    coordinator = MagicMock()
+    coordinator.leadership.side_effect = lambda name: nullcontext(None if "shipping" in name else MagicMock())
+    scheduler = MaintenanceScheduler(partitioned, MaintenanceConfig(window="02:00-05:00"), coordinator=coordinator)
+
+    with patch.object(IndexMaintainer, "maintain", return_value=["vacuum"]) as maintain:
+        assert scheduler.check(datetime(2024, 1, 1, 12, 0)) == {}
+        maintain.assert_not_called()
+
+        assert scheduler.check(datetime(2024, 1, 1, 3, 0)) == {"kb_p_billing": ["vacuum"]}
+        maintain.assert_called_once_with(0.1, 0.5)
+        coordinator.leadership.assert_any_call("kb_p_shipping_maintenance")
+
+
+def test_clearing_shared_knowledge_stops_background_threads() -> None:
+    """Clearing the shared knowledge base stops and joins its scheduler and migration backfill."""
+    from hive.knowledge import knowledge
+
+    store = MagicMock(spec=["table_name"])
+    store.table_name = "kb"
+    scheduler = MaintenanceScheduler(store, MaintenanceConfig())
+    scheduler.start()
+    migration = MagicMock()
+    kb = SimpleNamespace(_maintenance=scheduler, _migration=migration)
+
+    with patch.object(knowledge, "_shared_kb", kb):
+        knowledge.clear_shared_knowledge_base()
+        assert knowledge._shared_kb is None
+
+    assert not scheduler.is_alive()
+    migration.stop.assert_called_once()
+    migration.join.assert_called_once()
@@ -0,0 +1,107 @@
+"""Tests for typed metadata coercion and filter compilation."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agno.filters import AND, EQ, GTE, IN, LT, NOT
+from sqlalchemy import Column, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+
+from hive.knowledge.metadata import coerce_value, compile_filter, index_expression, infer_metadata_types
+
+TYPES = {"price": "float", "stock": "int", "active": "bool", "category": "str"}
+
+
+@pytest.fixture
+def table() -> Table:
+    """Minimal table with a JSONB meta_data column."""
+    return Table("kb", MetaData(), Column("id", String), Column("meta_data", postgresql.JSONB))
+
+
+def _sql(expression) -> str:
+    return str(expression.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_infer_metadata_types() -> None:
+    """Pandas dtypes map onto metadata types."""
+    df = pd.DataFrame({"a": [1, 2], "b": [1.5, 2.0], "c": [True, False], "d": ["x", "y"]})
+    assert infer_metadata_types(df) == {"a": "int", "b": "float", "c": "bool", "d": "str"}
+
+
+@pytest.mark.parametrize(
+    ("value", "type_name", "expected"),
+    [
+        ("12", "int", 12),
+        (3.0, "int", 3),
+        (" 9007199254740993 ", "int", 9007199254740993),
+        (np.int64(9007199254740993), "int", 9007199254740993),
+        ("3.0", "int", 3),
+        ("9.99", "float", 9.99),
+        ("yes", "bool", True),
+        ("0", "bool", False),
+        ("2024-03-05", "date", "2024-03-05"),
+        ("2024-03-05 10:30", "datetime", "2024-03-05T10:30:00"),
+        (42, "str", "42"),
+        (float("nan"), "float", None),
+        (None, "int", None),
+    ],
+)
+def test_coerce_value(value, type_name: str, expected) -> None:
+    """Cells are converted to JSON-native values."""
+    assert coerce_value(value, type_name) == expected
+
+
+@pytest.mark.parametrize(("value", "type_name"), [("abc", "int"), (2.5, "int"), ("2.5", "int"), ("maybe", "bool")])
+def test_coerce_value_invalid(value, type_name: str) -> None:
+    """Unconvertible cells raise ValueError."""
+    with pytest.raises(ValueError):
+        coerce_value(value, type_name)
+
+
+def test_compile_filter_numeric_range(table: Table) -> None:
+    """Numeric keys compare as numeric, not text or integer."""
+    expr = (EQ("category", "shoes") & LT("price", 9.99)).to_dict()
+
+    sql = _sql(compile_filter(expr, table, TYPES))
+
+    assert "CAST((kb.meta_data ->> 'price') AS NUMERIC) < 9.99" in sql
+    assert "(kb.meta_data ->> 'category') = 'shoes'" in sql
+
+
+def test_compile_filter_operators(table: Table) -> None:
+    """GTE, IN, NOT and boolean keys are supported."""
+    expr = AND(GTE("stock", 10), IN("stock", [1, 2]), NOT(EQ("active", True))).to_dict()
+
+    sql = _sql(compile_filter(expr, table, TYPES))
+
+    assert "AS NUMERIC) >= 10" in sql
+    assert "AS NUMERIC) IN (1, 2)" in sql
+    assert "AS BOOLEAN) != true" in sql or "NOT (CAST" in sql
+
+
+def test_compile_filter_untyped_key_is_text(table: Table) -> None:
+    """Undeclared keys keep the string comparison."""
+    sql = _sql(compile_filter(EQ("tag", 5).to_dict(), table, {}))
+    assert "(kb.meta_data ->> 'tag') = '5'" in sql
+
+
+def test_compile_filter_unknown_operator(table: Table) -> None:
+    """Unknown operators fail loudly."""
+    with pytest.raises(ValueError):
+        compile_filter({"op": "NEAR", "key": "x", "value": 1}, table, {})
+
+
+def test_index_expression() -> None:
+    """Index expressions mirror the filter casts."""
+    assert index_expression("price", "float") == "(CAST((meta_data ->> 'price') AS NUMERIC))"
+    assert index_expression("active", "bool") == "(CAST((meta_data ->> 'active') AS BOOLEAN))"
+    assert index_expression("o'brien", "str") == "((meta_data ->> 'o''brien'))"
@@ -0,0 +1,184 @@
+"""Tests for background embedding-model migration."""
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agno.knowledge.document import Document
+
+from hive.knowledge.config import MigrationConfig
+from hive.knowledge.migration import EmbeddingMigration, MigratingVectorDb, TokenRateLimiter, shadow_table_name
+
+
+def _store(table_name: str) -> MagicMock:
+    """Mock vector store."""
+    store = MagicMock(
+        spec=[
+            "table_name",
+            "schema",
+            "metadata_types",
+            "upsert",
+            "delete_by_names",
+            "search",
+            "create",
+            "optimize",
+            "Session",
+        ]
+    )
+    store.table_name = table_name
+    store.schema = "agno"
+    store.metadata_types = {}
+    return store
+
+
+def _pair() -> MigratingVectorDb:
+    """Current store and shadow."""
+    return MigratingVectorDb(_store("kb"), _store("kb_m_text_embedding_3_large"))
+
+
+def test_config_and_shadow_name() -> None:
+    """The throttle is a share of the per-minute quota; shadow names are per model and dimensions."""
+    config = MigrationConfig.from_dict({"embedder": "text-embedding-3-large", "tokens_per_minute": 600_000})
+    assert config is not None
+    assert config.token_rate == pytest.approx(2500.0)
+    assert MigrationConfig.from_dict(None) is None
+    with pytest.raises(ValueError):
+        MigrationConfig(embedder="text-embedding-3-large", quota_share=1.5)
+
+    assert shadow_table_name("kb", "text-embedding-3-large") == "kb_m_text_embedding_3_large"
+    assert shadow_table_name("kb", "text-embedding-3-large", 1024) == "kb_m_text_embedding_3_large_1024"
+    long_name = shadow_table_name("k" * 60, "text-embedding-3-large")
+    assert len(long_name) == 63
+
+
+def test_rate_limiter_paces_reservations() -> None:
+    """Each reservation waits for the tokens reserved before it."""
+    limiter = TokenRateLimiter(tokens_per_second=1000)
+    assert limiter.reserve(500) == pytest.approx(0.0, abs=0.01)
+    assert limiter.reserve(500) == pytest.approx(0.5, abs=0.01)
+    assert limiter.reserve(1) == pytest.approx(1.0, abs=0.01)
+
+
+def test_dual_writes_until_switch() -> None:
+    """Writes reach both stores (the shadow re-embeds copies); reads and writes follow the switch."""
+    store = _pair()
+    doc = Document(name="csv_row_1", content="Refunds take five days.", embedding=[0.1, 0.2])
+    store.upsert(content_hash="h1", documents=[doc])
+
+    store.source.upsert.assert_called_once_with(content_hash="h1", documents=[doc])
+    [shadow_doc] = store.shadow.upsert.call_args.kwargs["documents"]
+    assert shadow_doc.name == "csv_row_1" and shadow_doc.embedding is None
+    assert doc.embedding == [0.1, 0.2]
+    assert store.metadata_types is store.shadow.metadata_types
+
+    store.search("refunds", 5)
+    store.source.search.assert_called_once()
+
+    store.shadow.delete_by_names.side_effect = RuntimeError("shadow down")
+    assert store.delete_by_names(["csv_row_1"]) is True
+
+    store.switch()
+    store.search("refunds", 5)
+    store.shadow.search.assert_called_once()
+    store.upsert(content_hash="h2", documents=[doc])
+    assert store.source.upsert.call_count == 1
+    assert store.table_name == "kb"
+
+
+def test_migration_backfills_then_switches() -> None:
+    """Missing batches are re-embedded, the shadow is indexed, then reads switch and the state is saved."""
+    store = _pair()
+    config = MigrationConfig(embedder="text-embedding-3-large", tokens_per_minute=10**9)
+    migration = EmbeddingMigration(store, config)
+    documents = {"h1": [Document(name="csv_row_1", content="a")], "h2": [Document(name="csv_row_2", content="b")]}
+    missing = iter([["h1", "h2"], [], []])
+
+    with (
+        patch.object(migration, "_missing", side_effect=lambda *_: next(missing)),
+        patch.object(migration, "_documents", side_effect=lambda _s, h: documents[h]),
+        patch.object(migration, "_remove_orphans") as remove_orphans,
+        patch.object(migration, "_save_state") as save_state,
+    ):
+        stats = migration.migrate()
+
+    assert stats == {"switched": True, "documents": 2, "tokens": migration.tokens_embedded}
+    assert [c.kwargs["content_hash"] for c in store.shadow.upsert.call_args_list] == ["h1", "h2"]
+    store.shadow.optimize.assert_called_once()
+    remove_orphans.assert_called_once_with(store.source, store.shadow)
+    assert [c.args[0] for c in save_state.call_args_list] == ["migrating", "switched"]
+    assert store.switched and migration.to_dict()["state"] == "switched"
+
+
+def test_refresh_switches_when_another_process_finished() -> None:
+    """A process that did not run the backfill switches once the saved state says so."""
+    store = _pair()
+    migration = EmbeddingMigration(store, MigrationConfig(embedder="text-embedding-3-large"))
+    with patch.object(migration, "saved_state", return_value="migrating"):
+        migration.refresh()
+    assert not store.switched
+    with patch.object(migration, "saved_state", return_value="switched"):
+        migration.refresh()
+    assert store.switched
+
+
+def test_thread_lifecycle() -> None:
+    """The thread stops mid-backfill and joins; failures, other leaders and finished migrations end the run."""
+    store = _pair()
+    # The second batch waits a long time for its token budget
+    config = MigrationConfig(embedder="text-embedding-3-large", tokens_per_minute=60)
+    migration = EmbeddingMigration(store, config)
+    copying = threading.Event()
+
+    def documents(_source: object, content_hash: str) -> list[Document]:
+        copying.set()
+        return [Document(name="csv_row_1", content="Refunds take five days.")]
+
+    with (
+        patch.object(migration, "saved_state", return_value="migrating"),
+        patch.object(migration, "_save_state", side_effect=lambda state: setattr(migration, "state", state)),
+        patch.object(migration, "_missing", return_value=["h1"]),
+        patch.object(migration, "_documents", side_effect=documents),
+    ):
+        migration.start()
+        assert copying.wait(5)
+        migration.stop()
+        migration.join(5)
+
+    assert not migration.is_alive()
+    assert not store.switched
+    assert migration.to_dict()["state"] == "migrating" and migration.error is None
+    assert migration.documents_copied == 1
+
+    failing = EmbeddingMigration(_pair(), config)
+    with (
+        patch.object(failing, "saved_state", return_value=None),
+        patch.object(failing, "_save_state", side_effect=RuntimeError("database down")),
+    ):
+        failing.start()
+        failing.join(5)
+    assert (failing.state, failing.error) == ("failed", "database down")
+
+    coordinator = MagicMock()
+    coordinator.run.return_value = None  # another process holds the shadow table's lock
+    waiting = EmbeddingMigration(_pair(), config, coordinator=coordinator)
+    with patch.object(waiting, "saved_state", return_value="migrating"):
+        waiting.run()
+    assert waiting.state == "waiting"
+    assert coordinator.run.call_args.args[0] == "kb_m_text_embedding_3_large"
+
+    finished = EmbeddingMigration(_pair(), config)
+    with (
+        patch.object(finished, "saved_state", return_value="switched"),
+        patch.object(finished, "migrate") as migrate,
+    ):
+        finished.run()
+    migrate.assert_not_called()
+    assert finished.to_dict()["state"] == "switched"
@@ -0,0 +1,152 @@
+"""Tests for background initial loads and readiness reporting."""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agno.knowledge.document import Document
+
+from hive.knowledge.config import BackgroundLoadConfig
+from hive.knowledge.readiness import (
+    BackgroundLoad,
+    BackgroundLoadedKnowledge,
+    clear_load_statuses,
+    readiness,
+    register_load,
+)
+
+
+class FakeLoader:
+    """Tabular loader whose apply() blocks until released."""
+
+    def __init__(self, mode: str = "full", documents: int = 4, error: Exception | None = None) -> None:
+        self.mode = mode
+        self.documents = documents
+        self.error = error
+        self.release = threading.Event()
+        self.vector_db = MagicMock()
+
+    def plan(self, source: Path) -> SimpleNamespace:
+        return SimpleNamespace(mode=self.mode, documents=[object()] * self.documents)
+
+    def apply(self, plan: SimpleNamespace, progress=None) -> dict:
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        progress(len(plan.documents))
+        return {"added": len(plan.documents)}
+
+
+@pytest.fixture(autouse=True)
+def _clear_statuses():
+    """Each test starts with an empty registry."""
+    clear_load_statuses()
+    yield
+    clear_load_statuses()
+
+
+def _inner() -> MagicMock:
+    """Wrapped knowledge returning one document."""
+    inner = MagicMock()
+    inner.name = "faq"
+    inner.max_results = 3
+    inner.vector_db = None
+    inner.search.return_value = [Document(name="a", content="refunds")]
+    inner.asearch = AsyncMock(return_value=[Document(name="a", content="refunds")])
+    return inner
+
+
+def test_background_load_config_from_dict() -> None:
+    """``true`` enables the defaults; a mapping sets the wait; a falsy value disables."""
+    assert BackgroundLoadConfig.from_dict(True) == BackgroundLoadConfig()
+    assert BackgroundLoadConfig.from_dict({"wait_timeout": 0}).wait_timeout == 0.0
+    assert BackgroundLoadConfig.from_dict(None) is None
+    assert BackgroundLoadConfig.from_dict(False) is None
+    with pytest.raises(ValueError):
+        BackgroundLoadConfig(wait_timeout=-1)
+
+
+def test_first_load_gates_searches_until_ready() -> None:
+    """Searches return nothing during a first load, then reach the store; progress and readiness follow."""
+    loader = FakeLoader()
+    status = register_load("faq", "data/faq.csv")
+    inner = _inner()
+    kb = BackgroundLoadedKnowledge(inner, status, wait_timeout=0)
+    started = threading.Event()
+    load = BackgroundLoad(loader, Path("data/faq.csv"), status, on_ready=started.set)
+    load.start()
+
+    assert kb.search("refunds") == []
+    assert asyncio.run(kb.asearch("refunds")) == []
+    assert inner.search.call_count == 0
+    report = readiness()
+    assert report["ready"] is False
+    assert report["sources"][0]["state"] == "loading"
+    assert report["sources"][0]["documents_total"] == 4
+
+    loader.release.set()
+    load.join(5)
+
+    assert status.is_ready and started.is_set()
+    assert status.to_dict()["progress"] == 1.0
+    assert readiness()["ready"] is True
+    assert [d.name for d in kb.search("refunds")] == ["a"]
+    assert [d.name for d in asyncio.run(kb.asearch("refunds"))] == ["a"]
+    loader.vector_db.optimize.assert_called_once()
+
+
+def test_incremental_load_serves_previous_data() -> None:
+    """When the table holds an earlier load, searches are served while the sync runs."""
+    loader = FakeLoader(mode="incremental")
+    status = register_load("faq", "data/faq.csv")
+    kb = BackgroundLoadedKnowledge(_inner(), status, wait_timeout=2)
+    load = BackgroundLoad(loader, Path("data/faq.csv"), status)
+    load.start()
+
+    assert [d.name for d in kb.search("refunds")] == ["a"]
+    assert readiness()["ready"] is False
+
+    loader.release.set()
+    load.join(5)
+    assert readiness()["ready"] is True
+
+
+def test_failed_load_is_reported_and_stops_blocking() -> None:
+    """A failed load keeps the probe failing, records the error and no longer holds searches."""
+    loader = FakeLoader(error=RuntimeError("embedding quota exceeded"))
+    loader.release.set()
+    status = register_load("faq", "data/faq.csv")
+    on_ready = MagicMock()
+    load = BackgroundLoad(loader, Path("data/faq.csv"), status, on_ready=on_ready)
+    load.start()
+    load.join(5)
+
+    report = readiness()
+    assert report["ready"] is False
+    assert report["sources"][0]["state"] == "failed"
+    assert report["sources"][0]["error"] == "embedding quota exceeded"
+    assert status.searchable.is_set()
+    on_ready.assert_not_called()
+
+
+def test_loaders_without_plan_use_load() -> None:
+    """Document folders and database tables fall back to a plain load without progress totals."""
+    loader = MagicMock(spec=["load", "vector_db"])
+    loader.load.return_value = {"files": 2}
+    status = register_load("docs", "data/docs")
+
+    BackgroundLoad(loader, Path("data/docs"), status).run()
+
+    loader.load.assert_called_once_with(Path("data/docs"))
+    assert status.is_ready
+    assert status.to_dict()["documents_total"] is None
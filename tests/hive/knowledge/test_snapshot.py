@@ -0,0 +1,256 @@
+"""Tests for knowledge snapshot export/import."""
+
+import json
+import re
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from hive.knowledge.snapshot import (
+    SNAPSHOT_VERSION,
+    _create_table_sql,
+    _export_sequences,
+    _find_tables,
+    _index_sql,
+    _insert_sql,
+    _vector_dimensions,
+    export_snapshot,
+    import_snapshot,
+    read_manifest,
+)
+
+KNOWLEDGE_TABLE = {
+    "schema": "agno",
+    "name": "knowledge_base",
+    "columns": [
+        {"name": "id", "type": "character varying", "not_null": True, "default": None},
+        {"name": "meta_data", "type": "jsonb", "not_null": False, "default": "'{}'::jsonb"},
+        {"name": "embedding", "type": "vector(1536)", "not_null": False, "default": None},
+    ],
+    "primary_key": ["id"],
+    "indexes": [],
+}
+
+
+def test_vector_columns_detected() -> None:
+    """vector and halfvec columns are exported as matrices; other types as text."""
+    assert _vector_dimensions("vector(1536)") == 1536
+    assert _vector_dimensions("halfvec(256)") == 256
+    assert _vector_dimensions("jsonb") is None
+    assert _vector_dimensions("bit(1536)") is None
+
+
+def test_create_table_sql_restores_types_defaults_and_key() -> None:
+    """Table definitions are recreated from the exported catalog."""
+    sql = _create_table_sql(KNOWLEDGE_TABLE)
+
+    assert sql.startswith('CREATE TABLE IF NOT EXISTS "agno"."knowledge_base"')
+    assert '"id" character varying NOT NULL' in sql
+    assert "\"meta_data\" jsonb DEFAULT '{}'::jsonb" in sql
+    assert '"embedding" vector(1536)' in sql
+    assert 'PRIMARY KEY ("id")' in sql
+
+
+def test_insert_sql_casts_text_and_vectors() -> None:
+    """Text values are cast back to their type; vectors are bound as float arrays."""
+    sql = _insert_sql({**KNOWLEDGE_TABLE, "schema": None})
+
+    assert sql == (
+        'INSERT INTO "knowledge_base" ("id", "meta_data", "embedding") VALUES '
+        "(CAST(:c0 AS character varying), CAST(:c1 AS jsonb), CAST(CAST(:c2 AS real[]) AS vector(1536)))"
+    )
+
+
+def test_index_sql_is_idempotent() -> None:
+    """Exported index definitions can be replayed on a table that already has them."""
+    hnsw = "CREATE INDEX kb_embedding_idx ON agno.knowledge_base USING hnsw (embedding vector_cosine_ops)"
+    unique = "CREATE UNIQUE INDEX kb_name_idx ON agno.knowledge_base USING btree (name)"
+
+    assert _index_sql(hnsw).startswith("CREATE INDEX IF NOT EXISTS kb_embedding_idx ON")
+    assert _index_sql(unique).startswith("CREATE UNIQUE INDEX IF NOT EXISTS kb_name_idx ON")
+
+
+def test_read_manifest_validates_snapshot(tmp_path: Path) -> None:
+    """Directories without a manifest or from another format version are rejected."""
+    with pytest.raises(FileNotFoundError, match="manifest.json"):
+        read_manifest(tmp_path)
+
+    (tmp_path / "manifest.json").write_text(json.dumps({"version": SNAPSHOT_VERSION + 1}))
+    with pytest.raises(ValueError, match="Unsupported snapshot version"):
+        read_manifest(tmp_path)
+
+    manifest = {"version": SNAPSHOT_VERSION, "table": "knowledge_base", "tables": [KNOWLEDGE_TABLE]}
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    assert read_manifest(tmp_path)["tables"][0]["name"] == "knowledge_base"
+
+
+def test_find_tables_includes_duplicate_clusters() -> None:
+    """Near-duplicate clusters travel with the hashes, so an import doesn't re-embed cluster members."""
+    conn = MagicMock()
+    conn.execute.return_value.fetchall.return_value = [
+        ("public", "knowledge_base_duplicates", True),
+        ("public", "knowledge_base_hashes", True),
+        ("agno", "knowledge_base", False),
+    ]
+
+    tables = _find_tables(conn, "knowledge_base", "agno")
+
+    assert "knowledge_base_duplicates" in conn.execute.call_args.args[1]["state"]
+    assert tables == [("agno", "knowledge_base"), (None, "knowledge_base_duplicates"), (None, "knowledge_base_hashes")]
+
+
+def test_change_version_sequence_round_trips(tmp_path: Path) -> None:
+    """The change-log sequence value is exported and restored, so versions keep increasing after an import."""
+    pytest.importorskip("pyarrow")
+    source = MagicMock()
+    source.execute.return_value.scalar_one_or_none.return_value = "knowledge_base_change_version"
+    source.execute.return_value.one.return_value = (42, True)
+
+    sequences = _export_sequences(source, "knowledge_base")
+    assert sequences == [{"name": "knowledge_base_change_version", "last_value": 42, "is_called": True}]
+
+    manifest = {"version": SNAPSHOT_VERSION, "table": "knowledge_base", "tables": [], "sequences": sequences}
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    engine = MagicMock()
+    import_snapshot(engine, tmp_path)
+
+    calls = engine.begin.return_value.__enter__.return_value.execute.call_args_list
+    statements = [str(call.args[0]) for call in calls]
+    assert 'CREATE SEQUENCE IF NOT EXISTS "knowledge_base_change_version"' in statements
+    [setval] = [call.args[1] for call in calls if "setval" in str(call.args[0])]
+    assert setval == {"sequence": '"knowledge_base_change_version"', "value": 42, "is_called": True}
+
+
+class _Result:
+    """The parts of a SQLAlchemy result the snapshot code reads."""
+
+    def __init__(self, rows: list[tuple] | None = None, value: Any = None) -> None:
+        self.rows = rows or []
+        self.value = value
+
+    def fetchall(self) -> list[tuple]:
+        return self.rows
+
+    def one(self) -> tuple:
+        return self.rows[0]
+
+    def scalar_one(self) -> Any:
+        return self.value
+
+    scalar_one_or_none = scalar_one
+
+    def partitions(self, size: int) -> Iterator[list[tuple]]:
+        for start in range(0, len(self.rows), size):
+            yield self.rows[start : start + size]
+
+
+class _FakePostgres:
+    """Engine and connection answering the catalog queries of a snapshot and recording writes."""
+
+    def __init__(self, tables: dict[str, dict[str, Any]] | None = None, sequences: dict | None = None) -> None:
+        self.tables = tables or {}  # quoted relation -> {"schema", "name", "columns", "primary_key", "rows"}
+        self.sequences = sequences or {}  # quoted name -> (last_value, is_called)
+        self.statements: list[str] = []
+        self.inserts: dict[str, list[list[dict[str, Any]]]] = {}
+
+    def connect(self) -> "_FakePostgres":
+        return self
+
+    def begin(self) -> "_FakePostgres":
+        return self
+
+    def execution_options(self, **_options: Any) -> "_FakePostgres":
+        return self
+
+    def __enter__(self) -> "_FakePostgres":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+    def execute(self, statement: Any, params: Any = None) -> _Result:
+        sql = str(statement)
+        self.statements.append(sql)
+        relation = re.search(r'(?:FROM|INTO) ("[^"]+"(?:\."[^"]+")?)', sql)
+        table = self.tables.get(params["relation"] if isinstance(params, dict) and "relation" in params else "")
+        if "information_schema.tables" in sql:
+            return _Result([(t["schema"], t["name"], t["schema"] == "public") for t in self.tables.values()])
+        if "format_type" in sql:
+            return _Result(
+                [(name, type_name, name in table["primary_key"], None) for name, type_name in table["columns"]]
+            )
+        if "array_position" in sql:
+            return _Result([(name,) for name in table["primary_key"]])
+        if "pg_get_indexdef" in sql:
+            return _Result([(f"CREATE INDEX {table['name']}_idx ON {table['name']} (id)",)] if table["rows"] else [])
+        if "to_regclass" in sql:
+            return _Result(value=params["relation"] if params["relation"] in self.sequences else None)
+        if "last_value" in sql:
+            return _Result([self.sequences[relation.group(1)]])
+        if sql.startswith("SELECT count(*)"):
+            return _Result(value=len(self.tables[relation.group(1)]["rows"]))
+        if sql.startswith("SELECT CAST"):
+            return _Result(self.tables[relation.group(1)]["rows"])
+        if sql.startswith("INSERT"):
+            self.inserts.setdefault(relation.group(1), []).append(params)
+        return _Result()
+
+
+def test_snapshot_round_trip(tmp_path: Path) -> None:
+    """Export then import restores rows in batches; NULL vectors travel as NaN rows and come back as NULL."""
+    pytest.importorskip("pyarrow")
+    vectors = [[0.5, -1.0, 2.0], None, [0.25, 0.0, 1.5], [1.0, 1.0, 1.0], None]
+    rows = [(f"csv_row_{i}", None if i == 3 else f"Answer {i}", vector) for i, vector in enumerate(vectors)]
+    source = _FakePostgres(
+        {
+            '"agno"."knowledge_base"': {
+                "schema": "agno",
+                "name": "knowledge_base",
+                "columns": [("id", "character varying"), ("content", "text"), ("embedding", "vector(3)")],
+                "primary_key": ["id"],
+                "rows": rows,
+            },
+            '"knowledge_base_hashes"': {
+                "schema": "public",
+                "name": "knowledge_base_hashes",
+                "columns": [("row_id", "integer"), ("hash", "text")],
+                "primary_key": ["row_id"],
+                "rows": [("0", "h0"), ("1", "h1")],
+            },
+        },
+        sequences={'"knowledge_base_change_version"': (12, True)},
+    )
+
+    manifest = export_snapshot(source, "knowledge_base", tmp_path, batch_size=2)
+
+    assert [(t["schema"], t["name"], t["rows"]) for t in manifest["tables"]] == [
+        ("agno", "knowledge_base", 5),
+        (None, "knowledge_base_hashes", 2),
+    ]
+    assert manifest["sequences"] == [{"name": "knowledge_base_change_version", "last_value": 12, "is_called": True}]
+    assert (tmp_path / "agno.knowledge_base.embedding.npy").exists()
+
+    target = _FakePostgres()
+    import_snapshot(target, tmp_path, batch_size=2)
+
+    batches = target.inserts['"agno"."knowledge_base"']
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    imported = [row for batch in batches for row in batch]
+    assert [(row["c0"], row["c1"]) for row in imported] == [row[:2] for row in rows]
+    for row, vector in zip(imported, vectors, strict=True):
+        assert row["c2"] == (None if vector is None else pytest.approx(vector))
+    assert target.inserts['"knowledge_base_hashes"'] == [[{"c0": "0", "c1": "h0"}, {"c0": "1", "c1": "h1"}]]
+
+    created = [sql for sql in target.statements if sql.startswith("CREATE")]
+    assert created[0] == 'CREATE SCHEMA IF NOT EXISTS "agno"'
+    assert 'CREATE SEQUENCE IF NOT EXISTS "knowledge_base_change_version"' in created
+    assert "CREATE INDEX IF NOT EXISTS knowledge_base_idx ON knowledge_base (id)" in created
@@ -0,0 +1,97 @@
+"""Tests for tabular knowledge sources."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from hive.knowledge.incremental import IncrementalCSVLoader
+from hive.knowledge.sources import compute_row_hashes, read_source, source_format
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    """Source rows with mixed column types."""
+    return pd.DataFrame(
+        {
+            "question": ["Refunds? ", "Gift cards?"],
+            "answer": ["Five days.", "No cash."],
+            "price": [9.5, np.nan],
+            "stock": [3, 0],
+            "active": [True, False],
+        }
+    )
+
+
+def test_source_format_from_suffix() -> None:
+    """The reader is chosen from the file suffix."""
+    assert source_format("faq.csv") == "csv"
+    assert source_format("faq.PARQUET") == "parquet"
+    assert source_format("faq.feather") == "arrow"
+    assert source_format("faq.ndjson") == "jsonl"
+    with pytest.raises(ValueError, match="Unsupported"):
+        source_format("faq.xlsx")
+
+
+def test_csv_column_projection(frame: pd.DataFrame, tmp_path: Path) -> None:
+    """Only the requested columns are read, in file order."""
+    path = tmp_path / "faq.csv"
+    frame.to_csv(path, index=False)
+
+    df = read_source(path, ["answer", "question"])
+
+    assert df.columns.tolist() == ["question", "answer"]
+    with pytest.raises(ValueError, match="missing_column"):
+        read_source(path, ["missing_column"])
+
+
+def test_jsonl_source(frame: pd.DataFrame, tmp_path: Path) -> None:
+    """JSON Lines files load one row per line."""
+    path = tmp_path / "faq.jsonl"
+    frame.to_json(path, orient="records", lines=True)
+
+    df = read_source(path, ["question", "answer"])
+
+    assert df["answer"].tolist() == ["Five days.", "No cash."]
+
+
+def test_parquet_and_arrow_sources(frame: pd.DataFrame, tmp_path: Path) -> None:
+    """Parquet and memory-mapped Arrow IPC files read the projected columns."""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    pyarrow.parquet.write_table(table, tmp_path / "faq.parquet")
+    with pyarrow.ipc.new_file(str(tmp_path / "faq.arrow"), table.schema) as writer:
+        writer.write_table(table)
+
+    for name in ("faq.parquet", "faq.arrow"):
+        df = read_source(tmp_path / name, ["question", "answer"])
+        assert df.columns.tolist() == ["question", "answer"]
+        assert df["answer"].tolist() == ["Five days.", "No cash."]
+
+
+@pytest.mark.parametrize("hash_columns", [None, ["question", "answer"], ["price", "stock"]])
+def test_row_hashes_match_per_row_hash(frame: pd.DataFrame, hash_columns: list[str] | None) -> None:
+    """Column-wise hashing gives the hashes already stored by per-row hashing."""
+    loader = IncrementalCSVLoader(MagicMock(table_name="faq"), hash_columns=hash_columns)
+    expected = {idx: loader._compute_row_hash(row) for idx, row in frame.iterrows()}
+
+    assert compute_row_hashes(frame, hash_columns) == expected
+
+
+def test_row_hashes_match_for_numeric_frames() -> None:
+    """All-numeric rows are upcast the same way as with per-row hashing."""
+    frame = pd.DataFrame({"id": [1, 2], "score": [0.5, 1.25]})
+    loader = IncrementalCSVLoader(MagicMock(table_name="scores"))
+
+    assert compute_row_hashes(frame) == {idx: loader._compute_row_hash(row) for idx, row in frame.iterrows()}
@@ -0,0 +1,155 @@
+"""Tests for the database table knowledge source."""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import Boolean, Column, DateTime, Integer, MetaData, String, Table, create_engine, insert, update
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from hive.knowledge.config import SQLSourceConfig
+from hive.knowledge.sql_loader import SQLTableKnowledgeLoader
+
+
+@pytest.fixture
+def source(tmp_path: Path):
+    """SQLite source table with two articles."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    table = Table(
+        "articles",
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("title", String),
+        Column("body", String),
+        Column("updated_at", DateTime),
+        Column("deleted", Boolean, default=False),
+    )
+    table.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(table),
+            [
+                {
+                    "id": 1,
+                    "title": "Refunds",
+                    "body": "Five days.",
+                    "updated_at": datetime(2024, 1, 1),
+                    "deleted": False,
+                },
+                {
+                    "id": 2,
+                    "title": "Gift cards",
+                    "body": "No cash.",
+                    "updated_at": datetime(2024, 1, 2),
+                    "deleted": False,
+                },
+            ],
+        )
+    return engine, table
+
+
+def _loader(engine, tombstone_column: str | None = "deleted") -> SQLTableKnowledgeLoader:
+    """Table loader with hashes and the watermark kept in memory."""
+    vector_db = MagicMock()
+    vector_db.table_name = "knowledge_articles"
+    config = SQLSourceConfig(table="articles", tombstone_column=tombstone_column, batch_size=1)
+    loader = SQLTableKnowledgeLoader(vector_db, config, content_column="body", engine=engine)
+
+    hashes: dict[int, str] = {}
+    state: dict[str, object] = {"watermark": None}
+    inc = loader.incremental_loader
+    inc.reset_hashes = MagicMock(side_effect=hashes.clear)
+    inc.update_hashes = MagicMock(side_effect=lambda new, session=None: hashes.update(new))
+    inc.load_hashes = MagicMock(side_effect=lambda ids: {i: hashes[i] for i in ids if i in hashes})
+    inc._load_existing_hashes = MagicMock(side_effect=lambda: dict(hashes))
+    inc.delete_hashes = MagicMock(side_effect=lambda ids: [hashes.pop(i, None) for i in ids])
+    inc.update_chunk_hashes = MagicMock()
+    loader.load_watermark = MagicMock(side_effect=lambda: state["watermark"])
+    loader.save_watermark = MagicMock(side_effect=lambda value: state.update(watermark=value))
+    return loader
+
+
+def _written(loader: SQLTableKnowledgeLoader) -> list:
+    """Documents passed to every upsert call."""
+    return [doc for call in loader.vector_db.upsert.call_args_list for doc in call.kwargs["documents"]]
+
+
+def test_source_config_from_dict() -> None:
+    """A schema-qualified table is split; a table is required."""
+    config = SQLSourceConfig.from_dict({"table": "public.articles", "lookback_seconds": 30})
+
+    assert (config.schema, config.table, config.qualified_name) == ("public", "articles", "public.articles")
+    assert config.lookback_seconds == 30
+    with pytest.raises(ValueError, match="table"):
+        SQLSourceConfig.from_dict({})
+
+
+def test_full_load_stores_rows_and_watermark(source) -> None:
+    """The first load embeds every live row and records the largest updated_at."""
+    engine, _ = source
+    loader = _loader(engine)
+
+    stats = loader.load()
+
+    assert stats == {"mode": "full", "documents": 2}
+    docs = _written(loader)
+    assert [doc.name for doc in docs] == ["sql_row_1", "sql_row_2"]
+    assert docs[0].meta_data["source"] == "sql"
+    assert "updated_at" not in docs[0].meta_data and "deleted" not in docs[0].meta_data
+    assert loader.load_watermark() == datetime(2024, 1, 2)
+
+
+def test_sync_reads_only_rows_after_watermark(source) -> None:
+    """A sync embeds new and changed rows; a touched row with unchanged content is skipped."""
+    engine, table = source
+    loader = _loader(engine)
+    loader.load()
+    loader.vector_db.reset_mock()
+
+    with engine.begin() as conn:
+        conn.execute(update(table).where(table.c.id == 1).values(body="Seven days.", updated_at=datetime(2024, 2, 1)))
+        conn.execute(update(table).where(table.c.id == 2).values(updated_at=datetime(2024, 2, 2)))
+        conn.execute(insert(table).values(id=3, title="Hours", body="Nine to five.", updated_at=datetime(2024, 2, 3)))
+
+    stats = loader.load()
+
+    assert stats == {"mode": "incremental", "added": 1, "changed": 1, "deleted": 0}
+    assert sorted(doc.content for doc in _written(loader)) == ["Nine to five.", "Seven days."]
+    assert loader.load_watermark() == datetime(2024, 2, 3)
+
+
+def test_tombstoned_rows_are_deleted(source) -> None:
+    """Rows flagged in the tombstone column are removed from the knowledge table."""
+    engine, table = source
+    loader = _loader(engine)
+    loader.load()
+
+    with engine.begin() as conn:
+        conn.execute(update(table).where(table.c.id == 2).values(deleted=True, updated_at=datetime(2024, 3, 1)))
+
+    stats = loader.load_incremental()
+
+    assert stats["deleted"] == 1
+    loader.vector_db.delete_by_names.assert_called_with(["sql_row_2"])
+    loader.incremental_loader.delete_hashes.assert_called_with([2])
+
+
+def test_hard_deletes_found_by_key_diff(source) -> None:
+    """Without a tombstone column, removed keys are found by diffing the table's keys."""
+    engine, table = source
+    loader = _loader(engine, tombstone_column=None)
+    loader.load()
+
+    with engine.begin() as conn:
+        conn.execute(table.delete().where(table.c.id == 1))
+
+    stats = loader.load_incremental()
+
+    assert stats == {"added": 0, "changed": 0, "deleted": 1}
+    loader.vector_db.delete_by_names.assert_called_with(["sql_row_1"])
@@ -1,5 +1,6 @@
 """Tests for file watcher with debounced reload."""
 
+import asyncio
 import sys
 import time
 from pathlib import Path
@@ -12,7 +13,7 @@ project_root = Path(__file__).parent.parent.parent.parent.absolute()
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from hive.knowledge.watcher import DebouncedFileWatcher
+from hive.knowledge.watcher import AsyncDebouncedFileWatcher, DebouncedFileWatcher
 
 
 @pytest.fixture
@@ -154,3 +155,38 @@ def test_watcher_callback_error_handling(test_file: Path) -> None:
         callback.assert_called_once()
     finally:
         watcher.stop()
+
+
+def test_watcher_directory_detects_nested_files(tmp_path: Path) -> None:
+    """A watched directory reloads on files added anywhere below it."""
+    docs = tmp_path / "documents"
+    (docs / "guides").mkdir(parents=True)
+    callback = MagicMock()
+    watcher = DebouncedFileWatcher(file_path=docs, callback=callback, debounce_delay=0.1)
+
+    try:
+        watcher.start()
+        (docs / "guides" / "returns.md").write_text("# Returns")
+        time.sleep(0.4)
+
+        callback.assert_called_once_with(str(docs.resolve()))
+    finally:
+        watcher.stop()
+
+
+def test_async_watcher_runs_coroutine_callback_on_its_loop(test_file: Path) -> None:
+    """A coroutine callback (e.g. aload_incremental) runs on the loop the async watcher started from."""
+    seen: list[asyncio.AbstractEventLoop] = []
+
+    async def reload(path: str) -> None:
+        seen.append(asyncio.get_running_loop())
+
+    async def main() -> asyncio.AbstractEventLoop:
+        async with AsyncDebouncedFileWatcher(test_file, reload, debounce_delay=0.1):
+            test_file.write_text("changed")
+            await asyncio.sleep(0.5)
+        return asyncio.get_running_loop()
+
+    loop = asyncio.run(main())
+
+    assert seen and seen[0] is loop
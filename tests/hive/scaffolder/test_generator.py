@@ -1,5 +1,6 @@
 """Tests for ConfigGenerator - team modes, agent loading, and workflow steps."""
 
+import re
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
@@ -863,42 +864,75 @@ class TestSetupKnowledge:
         assert result is None
 
     def test_csv_knowledge_base_setup(self):
-        """Should setup CSV knowledge base."""
-        # Use patch.dict to mock sys.modules for lazy imports
-        mock_reader_class = MagicMock()
-        mock_kb_class = MagicMock()
+        """Should setup CSV knowledge base via create_knowledge_base."""
         mock_kb_instance = MagicMock()
-        mock_kb_class.return_value = mock_kb_instance
 
-        # Create mock modules
-        mock_document = MagicMock()
-        mock_document.CSVReader = mock_reader_class
-        mock_knowledge = MagicMock()
-        mock_knowledge.DocumentKnowledgeBase = mock_kb_class
-
-        with patch.dict("sys.modules", {"agno.document": mock_document, "agno.knowledge": mock_knowledge}):
+        with (
+            patch("hive.knowledge.create_knowledge_base", return_value=mock_kb_instance) as mock_create,
+            patch("hive.knowledge.config.load_project_knowledge_config", return_value={}),
+        ):
             kb_config = {"type": "csv", "source": "data.csv", "num_documents": 10}
             result = ConfigGenerator._setup_knowledge(kb_config)
 
-            assert result == mock_kb_instance
-            mock_reader_class.assert_called_once_with(path="data.csv")
-            mock_kb_class.assert_called_once()
+        assert result == mock_kb_instance
+        kwargs = mock_create.call_args.kwargs
+        assert kwargs["csv_path"] == "data.csv"
+        assert kwargs["num_documents"] == 10
+        assert kwargs["use_shared"] is False
 
-    def test_csv_knowledge_base_failure_raises_error(self):
-        """Failed CSV knowledge base setup should raise error."""
-        from types import ModuleType
+    def test_csv_knowledge_base_search_settings(self):
+        """Search settings from agent YAML should override hive.yaml defaults."""
+        project = {"embedder": "text-embedding-3-large", "search": {"type": "vector", "hnsw": {"m": 32}}}
+        kb_config = {"type": "csv", "source": "data.csv", "search": {"hnsw": {"ef_search": 64}}}
+
+        with (
+            patch("hive.knowledge.create_knowledge_base") as mock_create,
+            patch("hive.knowledge.config.load_project_knowledge_config", return_value=project),
+        ):
+            ConfigGenerator._setup_knowledge(kb_config)
+
+        kwargs = mock_create.call_args.kwargs
+        assert kwargs["embedder"] == "text-embedding-3-large"
+        assert kwargs["search"].search_type == "vector"
+        assert kwargs["search"].hnsw_m == 32
+        assert kwargs["search"].hnsw_ef_search == 64
+
+    def test_agents_on_different_csvs_get_their_own_tables(self):
+        """Two agents with different CSV sources and no table_name must not share a table."""
+        project = {"embedder": "text-embedding-3-small", "auto_reload": True}
 
-        # Create mocks that will fail during initialization
-        mock_reader_class = MagicMock()
-        mock_reader_class.side_effect = RuntimeError("CSV read error")
+        with (
+            patch("hive.knowledge.create_knowledge_base") as mock_create,
+            patch("hive.knowledge.config.load_project_knowledge_config", return_value=project),
+        ):
+            ConfigGenerator._setup_knowledge({"type": "csv", "source": "data/csv/faq.csv"})
+            ConfigGenerator._setup_knowledge({"type": "csv", "source": "data/csv/products.csv"})
+
+        first, second = (c.kwargs for c in mock_create.call_args_list)
+        assert (first["table_name"], second["table_name"]) == ("knowledge_faq", "knowledge_products")
+        assert "hot_reload" not in first and "hot_reload" not in second
+
+    def test_default_tables_are_valid_identifiers(self):
+        """Hyphens and spaces in file and source names are slugged, with a hash to keep names distinct."""
+        federated = {"type": "federated", "sources": [{"type": "documents", "source": "data/my docs"}]}
+
+        with (
+            patch("hive.knowledge.create_knowledge_base") as mock_create,
+            patch("hive.knowledge.config.load_project_knowledge_config", return_value={}),
+        ):
+            ConfigGenerator._setup_knowledge({"type": "csv", "source": "data/csv/product-faq.csv"})
+            ConfigGenerator._setup_knowledge(federated).close()
 
-        # Create mock modules
-        mock_document = ModuleType("agno.document")
-        mock_document.CSVReader = mock_reader_class
-        mock_knowledge = ModuleType("agno.knowledge")
-        mock_knowledge.DocumentKnowledgeBase = MagicMock()
+        tables = [c.kwargs["table_name"] for c in mock_create.call_args_list]
+        assert [table.rsplit("_", 1)[0] for table in tables] == ["knowledge_product_faq", "knowledge_my_docs"]
+        assert all(re.fullmatch(r"[a-z0-9_]+", table) and len(table) <= 63 for table in tables)
 
-        with patch.dict("sys.modules", {"agno.document": mock_document, "agno.knowledge": mock_knowledge}):
+    def test_csv_knowledge_base_failure_raises_error(self):
+        """Failed CSV knowledge base setup should raise error."""
+        with (
+            patch("hive.knowledge.create_knowledge_base", side_effect=RuntimeError("CSV read error")),
+            patch("hive.knowledge.config.load_project_knowledge_config", return_value={}),
+        ):
             kb_config = {"type": "csv", "source": "data.csv"}
 
             with pytest.raises(GeneratorError) as exc_info:
@@ -907,18 +941,92 @@ class TestSetupKnowledge:
             assert "Failed to setup CSV knowledge base" in str(exc_info.value)
             assert "CSV read error" in str(exc_info.value)
 
-    def test_database_knowledge_base_not_implemented(self):
-        """Database knowledge base should raise not implemented error."""
+    def test_documents_knowledge_base_setup(self):
+        """A document folder source goes through the same factory, with its chunking settings."""
+        with (
+            patch("hive.knowledge.create_knowledge_base") as mock_create,
+            patch("hive.knowledge.config.load_project_knowledge_config", return_value={}),
+        ):
+            kb_config = {"type": "documents", "source": "data/documents", "chunking": {"size": 600}}
+            ConfigGenerator._setup_knowledge(kb_config)
+
+        kwargs = mock_create.call_args.kwargs
+        assert kwargs["csv_path"] == "data/documents"
+        assert kwargs["chunking"].size == 600
+
+    def test_federated_knowledge_base_setup(self):
+        """Federated knowledge builds one knowledge base per source, each with its own table."""
+        kb_config = {
+            "type": "federated",
+            "num_documents": 4,
+            "time_budget": 1.5,
+            "sources": [
+                {"type": "csv", "source": "data/faq.csv"},
+                {"type": "csv", "source": "data/specs.csv", "name": "specs", "weight": 2},
+            ],
+        }
+
+        with (
+            patch("hive.knowledge.create_knowledge_base") as mock_create,
+            patch("hive.knowledge.config.load_project_knowledge_config", return_value={}),
+        ):
+            result = ConfigGenerator._setup_knowledge(kb_config)
+
+        assert set(result.sources) == {"faq", "specs"}
+        assert result.max_results == 4
+        assert result.time_budget == 1.5
+        assert result.weights == {"specs": 2.0}
+        tables = [c.kwargs["table_name"] for c in mock_create.call_args_list]
+        assert tables == ["knowledge_faq", "knowledge_specs"]
+        result.close()
+
+    def test_federated_knowledge_with_context_budget(self):
+        """A context section on federated knowledge budgets the fused results."""
+        from hive.knowledge.context import BudgetedKnowledge
+        from hive.knowledge.federated import FederatedKnowledge
+
+        kb_config = {
+            "type": "federated",
+            "context": {"max_tokens": 800},
+            "sources": [{"type": "csv", "source": "data/faq.csv"}],
+        }
+
+        with (
+            patch("hive.knowledge.create_knowledge_base"),
+            patch("hive.knowledge.config.load_project_knowledge_config", return_value={}),
+        ):
+            result = ConfigGenerator._setup_knowledge(kb_config)
+
+        assert isinstance(result, BudgetedKnowledge)
+        assert isinstance(result.knowledge, FederatedKnowledge)
+        assert result.assembler.config.max_tokens == 800
+        result.knowledge.close()
+
+    def test_federated_knowledge_requires_sources(self):
+        """Federated knowledge without sources should raise error."""
+        with pytest.raises(GeneratorError, match="at least one entry"):
+            ConfigGenerator._setup_knowledge({"type": "federated"})
+
+    def test_database_knowledge_base_setup(self):
+        """Database knowledge syncs a source table into its own knowledge table."""
         kb_config = {
             "type": "database",
             "connection": "postgresql://localhost/db",
-            "table": "knowledge",
+            "table": "public.articles",
+            "tombstone_column": "deleted",
         }
 
-        with pytest.raises(GeneratorError) as exc_info:
+        with (
+            patch("hive.knowledge.create_knowledge_base") as mock_create,
+            patch("hive.knowledge.config.load_project_knowledge_config", return_value={}),
+        ):
             ConfigGenerator._setup_knowledge(kb_config)
 
-        assert "Database knowledge base not yet implemented" in str(exc_info.value)
+        kwargs = mock_create.call_args.kwargs
+        assert "csv_path" not in kwargs
+        assert kwargs["table_name"] == "knowledge_articles"
+        source = kwargs["sql_source"]
+        assert (source.schema, source.table, source.tombstone_column) == ("public", "articles", "deleted")
 
     def test_unknown_kb_type_raises_error(self):
         """Unknown knowledge base type should raise error."""
@@ -1041,6 +1149,69 @@ instructions: Be helpful
         assert result == mock_agent_instance
         mock_agent_class.assert_called_once()
 
+    @patch("hive.scaffolder.generator.ConfigValidator.validate_agent")
+    def test_faq_knowledge_builds_faq_agent(self, mock_validate, tmp_path):
+        """A knowledge faq section should build an FAQAgent with the FAQ settings."""
+        yaml_file = tmp_path / "agent.yaml"
+        yaml_file.write_text("""
+agent:
+  name: support
+  model: openai:gpt-4o-mini
+instructions: Be helpful
+knowledge:
+  type: csv
+  source: faq.csv
+  content_column: question
+  faq:
+    threshold: 0.95
+""")
+        mock_validate.return_value = (True, [])
+
+        with (
+            patch("hive.scaffolder.generator.ConfigGenerator._setup_knowledge", return_value=MagicMock()),
+            patch("hive.knowledge.faq.FAQAgent") as mock_faq_agent,
+        ):
+            result = ConfigGenerator.generate_agent_from_yaml(str(yaml_file))
+
+        assert result == mock_faq_agent.return_value
+        kwargs = mock_faq_agent.call_args.kwargs
+        assert kwargs["faq"].threshold == 0.95
+        assert kwargs["content_column"] == "question"
+
+    @patch("hive.scaffolder.generator.ConfigValidator.validate_agent")
+    def test_eager_retrieval_combines_with_faq(self, mock_validate, tmp_path):
+        """eager_retrieval should add prefetching on top of the FAQ short-circuit."""
+        from agno.knowledge import Knowledge
+
+        from hive.knowledge.eager import EagerRetrievalAgent
+        from hive.knowledge.faq import FAQAgent
+
+        yaml_file = tmp_path / "agent.yaml"
+        yaml_file.write_text("""
+agent:
+  name: support
+  model: openai:gpt-4o-mini
+instructions: Be helpful
+knowledge:
+  type: csv
+  source: faq.csv
+  faq:
+    threshold: 0.95
+settings:
+  eager_retrieval:
+    num_documents: 3
+""")
+        mock_validate.return_value = (True, [])
+
+        with patch("hive.scaffolder.generator.ConfigGenerator._setup_knowledge", return_value=Knowledge(name="faq")):
+            agent = ConfigGenerator.generate_agent_from_yaml(str(yaml_file))
+
+        assert isinstance(agent, FAQAgent)
+        assert isinstance(agent, EagerRetrievalAgent)
+        assert agent.faq is not None
+        assert agent.knowledge_retriever is agent.eager
+        assert agent.eager.config.num_documents == 3
+
     @patch("hive.scaffolder.generator.ConfigValidator.validate_agent")
     def test_validation_failure_raises_error(self, mock_validate, tmp_path):
         """Validation failure should raise GeneratorError."""
@@ -1345,13 +1516,14 @@ settings:
         mock_agent_class.return_value = mock_agent_instance
 
         # Mock storage and knowledge setup
-        with patch.dict(
-            "sys.modules",
-            {
-                "agno.storage": MagicMock(SqliteStorage=MagicMock(return_value=MagicMock())),
-                "agno.document": MagicMock(CSVReader=MagicMock()),
-                "agno.knowledge": MagicMock(DocumentKnowledgeBase=MagicMock(return_value=MagicMock())),
-            },
+        with (
+            patch.dict(
+                "sys.modules",
+                {
+                    "agno.storage": MagicMock(SqliteStorage=MagicMock(return_value=MagicMock())),
+                },
+            ),
+            patch("hive.scaffolder.generator.ConfigGenerator._setup_knowledge", return_value=MagicMock()),
         ):
             result = ConfigGenerator.generate_agent_from_yaml(str(yaml_file))
 
@@ -1540,20 +1712,10 @@ class TestEdgeCases:
 
     def test_csv_knowledge_exception_lines_523_524(self):
         """Test CSV knowledge base exception handling (lines 523-524)."""
-        # Create a real exception during CSVReader initialization
-        from types import ModuleType
-
-        # Mock the modules to raise exception during kb creation
-        mock_reader_class = MagicMock()
-        mock_kb_class = MagicMock()
-        mock_kb_class.side_effect = RuntimeError("KB initialization failed")
-
-        mock_document = ModuleType("agno.document")
-        mock_document.CSVReader = mock_reader_class
-        mock_knowledge = ModuleType("agno.knowledge")
-        mock_knowledge.DocumentKnowledgeBase = mock_kb_class
-
-        with patch.dict("sys.modules", {"agno.document": mock_document, "agno.knowledge": mock_knowledge}):
+        with (
+            patch("hive.knowledge.create_knowledge_base", side_effect=RuntimeError("KB initialization failed")),
+            patch("hive.knowledge.config.load_project_knowledge_config", return_value={}),
+        ):
             kb_config = {"type": "csv", "source": "data.csv"}
 
             with pytest.raises(GeneratorError) as exc_info: